@@ -39,6 +39,7 @@ SELECT create_hypertable('air_quality_measurements', 'time', if_not_exists => TR
 CREATE INDEX IF NOT EXISTS idx_aq_station_time ON air_quality_measurements (station_id, time DESC);
 CREATE INDEX IF NOT EXISTS idx_aq_location ON air_quality_measurements USING GIST (location);
 CREATE INDEX IF NOT EXISTS idx_aq_parameter ON air_quality_measurements (parameter);
+CREATE INDEX IF NOT EXISTS idx_aq_created_at ON air_quality_measurements (created_at);
 
 -- Create weather data hypertable
 CREATE TABLE IF NOT EXISTS weather_data (
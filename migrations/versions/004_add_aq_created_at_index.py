@@ -0,0 +1,24 @@
+"""Index air quality measurements by ingestion time
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index created_at so the rolling AQI sync can tail new rows."""
+    op.create_index('idx_aq_created_at', 'air_quality_measurements', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop the created_at index."""
+    op.drop_index('idx_aq_created_at', table_name='air_quality_measurements')
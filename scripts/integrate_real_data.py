@@ -30,9 +30,6 @@ from src.data.ingestion_clients import (
 )
 from src.api.database import get_db
 from src.api.models import AirQualityMeasurement, WeatherData
-from src.tasks.data_ingestion import (
-    _store_air_quality_measurement, _store_weather_data
-)
 from geoalchemy2 import WKTElement
 
 # Configure logging
@@ -0,0 +1,309 @@
+"""
+Bulk write path for TimescaleDB hypertables.
+
+Rows are streamed with PostgreSQL ``COPY`` into a temporary staging table and
+merged into the hypertable with one ``INSERT ... SELECT ... ON CONFLICT`` per
+batch, so a batch costs one transaction and a handful of round trips instead
+of an INSERT and COMMIT per row. Points travel as EWKB bytes rather than WKT
+strings the server has to parse.
+
+Both drivers are supported:
+- asyncpg (``AsyncSession``): binary COPY via ``copy_records_to_table``
+- psycopg2 (``Session``, used by Celery tasks): CSV COPY via ``copy_expert``
+"""
+
+import io
+import logging
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from geoalchemy2 import Geometry
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.api.models import AirQualityMeasurement, WeatherData, Prediction
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY batch; each batch is one transaction
+BULK_WRITE_BATCH_SIZE = int(os.getenv("BULK_WRITE_BATCH_SIZE", "5000"))
+
+# EWKB point header: little-endian, POINT type with the SRID flag set
+_EWKB_POINT = struct.Struct("<BIIdd")
+_EWKB_POINT_SRID_FLAG = 0x20000001
+
+_WKT_POINT = re.compile(r"^\s*(?:SRID=(\d+);)?\s*POINT\s*\(\s*(\S+)\s+(\S+)\s*\)\s*$", re.IGNORECASE)
+
+
+def encode_point(lat: float, lon: float, srid: int = 4326) -> bytes:
+    """EWKB encoding of a point, accepted directly by PostGIS ``geometry`` input."""
+    return _EWKB_POINT.pack(1, _EWKB_POINT_SRID_FLAG, srid, float(lon), float(lat))
+
+
+def to_ewkb(value: Any) -> Optional[bytes]:
+    """
+    Convert a point given as EWKB bytes, a WKTElement or a WKT string to EWKB.
+
+    Raises:
+        ValueError: If the value is not a point
+    """
+    if value is None or isinstance(value, bytes):
+        return value
+
+    # WKTElement keeps the WKT in ``data`` and the SRID separately
+    wkt = getattr(value, "data", value)
+    srid = getattr(value, "srid", None)
+    match = _WKT_POINT.match(wkt) if isinstance(wkt, str) else None
+    if not match:
+        raise ValueError(f"Expected a POINT geometry, got {value!r}")
+
+    wkt_srid, lon, lat = match.groups()
+    srid = int(wkt_srid) if wkt_srid else srid
+    return encode_point(float(lat), float(lon), srid if srid and srid > 0 else 4326)
+
+
+@dataclass(frozen=True)
+class BulkTable:
+    """A hypertable written by the bulk path and how conflicting rows are resolved."""
+    name: str
+    columns: Tuple[str, ...]
+    conflict_columns: Tuple[str, ...]
+    update_columns: Tuple[str, ...] = ()  # Empty: ON CONFLICT DO NOTHING
+    geometry_columns: Tuple[str, ...] = ()
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def for_model(cls, model, update_columns: Sequence[str] = ()) -> "BulkTable":
+        """Describe an ORM model; server-defaulted columns such as created_at are left to the database."""
+        table = model.__table__
+        columns = [c for c in table.columns if c.server_default is None]
+        return cls(
+            name=table.name,
+            columns=tuple(c.name for c in columns),
+            conflict_columns=tuple(c.name for c in table.primary_key.columns),
+            update_columns=tuple(update_columns),
+            geometry_columns=tuple(c.name for c in columns if isinstance(c.type, Geometry)),
+            defaults={
+                c.name: c.default.arg for c in columns
+                if c.default is not None and c.default.is_scalar
+            }
+        )
+
+    @property
+    def staging_table(self) -> str:
+        return f"_bulk_{self.name}"
+
+    def create_staging_sql(self) -> str:
+        """Temporary table shaped like the target, with geometry columns as EWKB bytea."""
+        select = ", ".join(
+            f"ST_AsEWKB({c}) AS {c}" if c in self.geometry_columns else c
+            for c in self.columns
+        )
+        return (f"CREATE TEMP TABLE {self.staging_table} ON COMMIT DROP AS "
+                f"SELECT {select} FROM {self.name} WITH NO DATA")
+
+    def copy_sql(self) -> str:
+        """COPY statement for the psycopg2 CSV path."""
+        return f"COPY {self.staging_table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)"
+
+    def merge_sql(self) -> str:
+        """Move staged rows into the hypertable, resolving primary key conflicts."""
+        values = ", ".join(
+            f"ST_GeomFromEWKB({c})" if c in self.geometry_columns else c
+            for c in self.columns
+        )
+        conflict = ", ".join(self.conflict_columns)
+
+        if self.update_columns:
+            # An upsert may touch each key once, so keep one staged row per key
+            select = f"SELECT DISTINCT ON ({conflict}) {values}"
+            action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in self.update_columns)
+        else:
+            select = f"SELECT {values}"
+            action = "DO NOTHING"
+
+        return (f"INSERT INTO {self.name} ({', '.join(self.columns)}) "
+                f"{select} FROM {self.staging_table} "
+                f"ON CONFLICT ({conflict}) {action}")
+
+    def record(self, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Row values in column order, with model defaults filled and points as EWKB."""
+        return tuple(
+            to_ewkb(row.get(c)) if c in self.geometry_columns else row.get(c, self.defaults.get(c))
+            for c in self.columns
+        )
+
+
+AIR_QUALITY_MEASUREMENTS = BulkTable.for_model(AirQualityMeasurement)
+
+WEATHER_DATA = BulkTable.for_model(WeatherData)
+
+PREDICTIONS = BulkTable.for_model(
+    Prediction,
+    update_columns=(
+        "predicted_value", "confidence_lower", "confidence_upper",
+        "model_version", "aqi_value", "aqi_category"
+    )
+)
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of a bulk write."""
+    rows: int = 0      # Rows submitted
+    written: int = 0   # Rows inserted (or updated, for upserts)
+    failed: int = 0    # Rows in batches that were rolled back
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def skipped(self) -> int:
+        """Rows dropped as duplicates of stored rows."""
+        return self.rows - self.written - self.failed
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _batches(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_field(value: Any) -> str:
+    if value is None:
+        return ""  # Unquoted empty field is NULL
+    if isinstance(value, bytes):
+        return "\\x" + value.hex()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def encode_csv(records: Iterable[Tuple[Any, ...]]) -> io.StringIO:
+    """CSV body for ``COPY ... FROM STDIN WITH (FORMAT csv)``."""
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write(",".join(_csv_field(value) for value in record))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def _finish(table: BulkTable, result: BulkWriteResult, started: float) -> BulkWriteResult:
+    result.seconds = time.perf_counter() - started
+    logger.info(f"Bulk wrote {result.written}/{result.rows} rows to {table.name} in "
+                f"{result.batches} batches ({result.rows_per_second:.0f} rows/s, "
+                f"{result.skipped} duplicates, {result.failed} failed)")
+    try:
+        from src.api.prometheus_metrics import get_metrics_collector
+        get_metrics_collector().record_data_processing(table.name, "bulk_write", result.seconds)
+    except Exception:
+        pass
+    return result
+
+
+def bulk_write(db: Session,
+               table: BulkTable,
+               rows: Iterable[Dict[str, Any]],
+               batch_size: Optional[int] = None,
+               strict: bool = False) -> BulkWriteResult:
+    """
+    Write rows to a hypertable with COPY, one transaction per batch.
+
+    Args:
+        db: Synchronous (psycopg2) session
+        table: Target table description
+        rows: Row dictionaries keyed by column name; points as EWKB or WKT
+        batch_size: Rows per batch (default BULK_WRITE_BATCH_SIZE)
+        strict: Re-raise a failed batch instead of logging it and moving on
+
+    Returns:
+        BulkWriteResult with written, duplicate and failed row counts
+    """
+    result = BulkWriteResult()
+    started = time.perf_counter()
+
+    for batch in _batches(rows, batch_size or BULK_WRITE_BATCH_SIZE):
+        result.rows += len(batch)
+        result.batches += 1
+        try:
+            db.execute(text(table.create_staging_sql()))
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(table.copy_sql(), encode_csv(table.record(row) for row in batch))
+            finally:
+                cursor.close()
+            merged = db.execute(text(table.merge_sql()))
+            db.commit()
+            result.written += merged.rowcount
+        except Exception as e:
+            db.rollback()
+            if strict:
+                raise
+            logger.error(f"Bulk write of {len(batch)} rows to {table.name} failed: {e}")
+            result.failed += len(batch)
+
+    return _finish(table, result, started)
+
+
+async def bulk_write_async(db: AsyncSession,
+                           table: BulkTable,
+                           rows: Iterable[Dict[str, Any]],
+                           batch_size: Optional[int] = None,
+                           strict: bool = False) -> BulkWriteResult:
+    """
+    Write rows to a hypertable with binary COPY, one transaction per batch.
+
+    Args:
+        db: Async (asyncpg) session
+        table: Target table description
+        rows: Row dictionaries keyed by column name; points as EWKB or WKT
+        batch_size: Rows per batch (default BULK_WRITE_BATCH_SIZE)
+        strict: Re-raise a failed batch instead of logging it and moving on
+
+    Returns:
+        BulkWriteResult with written, duplicate and failed row counts
+    """
+    result = BulkWriteResult()
+    started = time.perf_counter()
+
+    for batch in _batches(rows, batch_size or BULK_WRITE_BATCH_SIZE):
+        result.rows += len(batch)
+        result.batches += 1
+        try:
+            # Runs through the session first so COPY lands in its transaction
+            await db.execute(text(table.create_staging_sql()))
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.staging_table,
+                records=[table.record(row) for row in batch],
+                columns=list(table.columns)
+            )
+            merged = await db.execute(text(table.merge_sql()))
+            await db.commit()
+            result.written += merged.rowcount
+        except Exception as e:
+            await db.rollback()
+            if strict:
+                raise
+            logger.error(f"Bulk write of {len(batch)} rows to {table.name} failed: {e}")
+            result.failed += len(batch)
+
+    return _finish(table, result, started)
@@ -5,16 +5,48 @@ Provides caching functionality for frequently accessed data.
 
 import os
 import json
+import time
+import uuid
+import asyncio
 import logging
-from typing import Any, Optional, Union
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
 import redis.asyncio as redis
 from datetime import datetime, timedelta, timezone
 
+from src.api.cache_keys import (
+    canonical_bounds, canonical_location, normalize_token, time_bucket, DATA_CADENCE
+)
+
 logger = logging.getLogger(__name__)
 
 # Redis configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# Single-flight lock settings for coalescing concurrent cache misses
+SINGLE_FLIGHT_LOCK_TTL = int(os.getenv("CACHE_SINGLE_FLIGHT_LOCK_TTL", "30"))  # seconds
+SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv("CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT", "20"))  # seconds
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05  # seconds between cache checks while another worker computes
+
+# In-process L1 cache in front of Redis (0 entries disables it)
+L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "1024"))
+L1_TTL = float(os.getenv("CACHE_L1_TTL", "30"))  # seconds; bounds staleness if an invalidation is missed
+
+# Pub/sub channel broadcasting L1 invalidations to every API worker
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+INVALIDATE_ALL = "*"
+
+# Marks values stored with a soft expiry for stale-while-revalidate
+SWR_MARKER = "__swr__"
+
+# Release the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 # Global Redis connection
 redis_client: Optional[redis.Redis] = None
 
@@ -42,6 +74,10 @@ async def init_redis() -> None:
         # Test connection
         await redis_client.ping()
         
+        # Attach the shared manager and follow other workers' invalidations
+        cache_manager.client = redis_client
+        await cache_manager.start_invalidation_listener()
+        
         # Configure Redis for optimal performance
         try:
             # Set maxmemory policy to evict least recently used keys
@@ -59,11 +95,14 @@ async def init_redis() -> None:
     except Exception as e:
         logger.error(f"Failed to initialize Redis: {e}")
         redis_client = None
+        cache_manager.client = None
         raise
 
 async def close_redis() -> None:
     """Close Redis connection."""
     global redis_client
+    await cache_manager.stop_invalidation_listener()
+    cache_manager.client = None
     if redis_client:
         try:
             await redis_client.close()
@@ -83,21 +122,89 @@ async def health_check() -> bool:
         logger.error(f"Redis health check failed: {e}")
         return False
 
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+    
+    Values are kept deserialized and returned by reference, so callers must
+    not mutate them.
+    """
+    
+    def __init__(self, max_entries: int = L1_MAX_ENTRIES, ttl: float = L1_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return (found, value), dropping the entry if it has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for at most the L1 TTL, evicting the least recently used."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class CacheManager:
     """Redis cache manager with common caching operations."""
     
-    def __init__(self):
+    def __init__(self, l1_max_entries: int = L1_MAX_ENTRIES, l1_ttl: float = L1_TTL):
         self.client = redis_client
+        # Optional in-process tier in front of Redis, kept coherent via pub/sub
+        self.l1: Optional[LocalCache] = (
+            LocalCache(l1_max_entries, l1_ttl) if l1_max_entries > 0 and l1_ttl > 0 else None
+        )
+        self.tier_stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+        self._instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        # In-flight computations by cache key, shared by coroutines in this process
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = {"local": 0, "distributed": 0}
+        # Background refreshes of stale values, by cache key
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stale_served = 0
+        self.background_refreshes = 0
     
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+        """Get value from cache, trying the in-process tier before Redis."""
         if not self.client:
             return None
         
+        if self.l1 is not None:
+            found, value = self.l1.get(key)
+            self._record_tier("l1", found)
+            if found:
+                return value
+        
         try:
             value = await self.client.get(key)
+            self._record_tier("l2", bool(value))
             if value:
-                return json.loads(value)
+                value = json.loads(value)
+                if self.l1 is not None:
+                    self.l1.set(key, value)
+                return value
             return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
@@ -121,6 +228,11 @@ class CacheManager:
                 await self.client.setex(key, ttl, serialized_value)
             else:
                 await self.client.set(key, serialized_value)
+            if self.l1 is not None:
+                # Keep the JSON round trip so L1 returns what Redis would
+                self.l1.set(key, json.loads(serialized_value), ttl)
+            # Published even without an own L1, so writer-only processes invalidate readers
+            await self._publish_invalidation(key)
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
@@ -132,6 +244,9 @@ class CacheManager:
             return False
         
         try:
+            if self.l1 is not None:
+                self.l1.delete(key)
+            await self._publish_invalidation(key)
             result = await self.client.delete(key)
             return result > 0
         except Exception as e:
@@ -156,6 +271,8 @@ class CacheManager:
             return None
         
         try:
+            if self.l1 is not None:
+                self.l1.delete(key)
             result = await self.client.incrby(key, amount)
             return result
         except Exception as e:
@@ -182,14 +299,27 @@ class CacheManager:
             return {}
         
         try:
-            values = await self.client.mget(keys)
             result = {}
+            if self.l1 is not None:
+                for key in keys:
+                    found, value = self.l1.get(key)
+                    self._record_tier("l1", found)
+                    if found:
+                        result[key] = value
+                keys = [key for key in keys if key not in result]
+                if not keys:
+                    return result
+            
+            values = await self.client.mget(keys)
             for key, value in zip(keys, values):
+                self._record_tier("l2", bool(value))
                 if value:
                     try:
                         result[key] = json.loads(value)
                     except json.JSONDecodeError:
                         result[key] = value
+                    if self.l1 is not None:
+                        self.l1.set(key, result[key])
             return result
         except Exception as e:
             logger.error(f"Cache get_many error: {e}")
@@ -200,7 +330,7 @@ class CacheManager:
         mapping: dict[str, Any], 
         ttl: Optional[Union[int, timedelta]] = None
     ) -> bool:
-        """Set multiple values in cache."""
+        """Set multiple values in cache in one pipelined round trip."""
         if not self.client or not mapping:
             return False
         
@@ -211,21 +341,409 @@ class CacheManager:
                 for key, value in mapping.items()
             }
             
-            # Set all values
-            await self.client.mset(serialized_mapping)
+            if isinstance(ttl, timedelta):
+                ttl = int(ttl.total_seconds())
             
-            # Set TTL if specified
+            pipe = self.client.pipeline(transaction=False)
             if ttl:
-                if isinstance(ttl, timedelta):
-                    ttl = int(ttl.total_seconds())
-                for key in mapping.keys():
-                    await self.client.expire(key, ttl)
+                for key, value in serialized_mapping.items():
+                    pipe.setex(key, ttl, value)
+            else:
+                pipe.mset(serialized_mapping)
             
+            for key, value in serialized_mapping.items():
+                if self.l1 is not None:
+                    self.l1.set(key, json.loads(value), ttl)
+                pipe.publish(CACHE_INVALIDATION_CHANNEL, f"{self._instance_id}:{key}")
+            
+            await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Cache set_many error: {e}")
             return False
     
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[Union[int, timedelta]] = None,
+        stale_ttl: Optional[Union[int, timedelta]] = None,
+        cache_type: str = "default",
+        lock_ttl: int = SINGLE_FLIGHT_LOCK_TTL,
+        wait_timeout: float = SINGLE_FLIGHT_WAIT_TIMEOUT,
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Any:
+        """
+        Get value from cache, computing it at most once on a miss.
+        
+        Concurrent misses for the same key in this process await a single
+        computation. Across workers a short Redis lock elects one worker to
+        compute while the others poll the cache for its result. If the lock
+        holder does not publish within ``wait_timeout`` the waiter computes
+        the value itself, so a crashed worker never blocks requests.
+        
+        With ``stale_ttl`` the value is stored with a soft expiry at ``ttl``
+        and kept for a further ``stale_ttl``. Reads inside that stale window
+        return the old value immediately and schedule one background refresh.
+        The refresh outlives the request, so a ``compute`` bound to request
+        resources (such as its database session) needs a separate ``refresh``.
+        
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value on a miss
+            ttl: TTL for the computed value (soft expiry when ``stale_ttl`` is set)
+            stale_ttl: How long an expired value may still be served while refreshing
+            cache_type: Label used for the coalesced-request metrics
+            lock_ttl: Lifetime of the cross-worker lock in seconds
+            wait_timeout: Maximum time to wait for another worker's result
+            refresh: Coroutine function for background refreshes (defaults to ``compute``)
+            
+        Returns:
+            The cached or freshly computed value
+        """
+        entry = await self._read_entry(key)
+        if entry is not None:
+            value, is_stale = entry
+            if is_stale:
+                self.stale_served += 1
+                self._schedule_refresh(key, refresh or compute, ttl, stale_ttl, lock_ttl)
+            return value
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._record_coalesced(cache_type, "local")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading request was cancelled (e.g. client disconnect); retry
+                return await self.get_or_compute(
+                    key, compute, ttl, stale_ttl, cache_type, lock_ttl, wait_timeout, refresh
+                )
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute_single_flight(
+                key, compute, ttl, stale_ttl, cache_type, lock_ttl, wait_timeout
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def get_or_compute_many(
+        self,
+        keys: list[str],
+        compute_missing: Callable[[list[str]], Awaitable[dict[str, Any]]],
+        ttl: Optional[Union[int, timedelta]] = None,
+        stale_ttl: Optional[Union[int, timedelta]] = None
+    ) -> dict[str, Any]:
+        """
+        Batch counterpart of ``get_or_compute``.
+        
+        Reads all keys with one ``get_many``, computes every missing or stale
+        key with a single ``compute_missing`` call and writes the results back
+        with one pipelined ``set_many``. Entries use the same format as
+        ``get_or_compute``, so single and batch callers share them.
+        
+        Args:
+            keys: Cache keys
+            compute_missing: Coroutine function mapping the keys to compute to their values
+            ttl: TTL for computed values (soft expiry when ``stale_ttl`` is set)
+            stale_ttl: How long an expired value stays stored for ``get_or_compute`` callers
+            
+        Returns:
+            Dictionary of key -> value for every key that is cached or was computed
+        """
+        keys = list(dict.fromkeys(keys))
+        cached = await self.get_many(keys)
+        
+        result = {}
+        missing = []
+        for key in keys:
+            if key in cached:
+                value, is_stale = self._unwrap_entry(cached[key])
+                if not is_stale:
+                    result[key] = value
+                    continue
+            missing.append(key)
+        
+        if not missing:
+            return result
+        
+        computed = {
+            key: value for key, value in (await compute_missing(missing)).items()
+            if value is not None
+        }
+        result.update(computed)
+        await self.prime_many(computed, ttl=ttl, stale_ttl=stale_ttl)
+        return result
+    
+    async def prime_many(
+        self,
+        mapping: dict[str, Any],
+        ttl: Optional[Union[int, timedelta]] = None,
+        stale_ttl: Optional[Union[int, timedelta]] = None
+    ) -> bool:
+        """
+        Store precomputed values in the entry format read by ``get_or_compute``.
+        
+        Used by jobs that materialize results ahead of requests; the write is
+        one pipelined round trip and other workers drop their L1 copies.
+        """
+        if not mapping:
+            return False
+        
+        to_store = {}
+        entry_ttl = ttl
+        for key, value in mapping.items():
+            to_store[key], entry_ttl = self._wrap_entry(value, ttl, stale_ttl)
+        return await self.set_many(to_store, ttl=entry_ttl)
+    
+    async def _compute_single_flight(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[Union[int, timedelta]],
+        stale_ttl: Optional[Union[int, timedelta]],
+        cache_type: str,
+        lock_ttl: int,
+        wait_timeout: float
+    ) -> Any:
+        """Compute under the cross-worker lock, or wait for its holder's result."""
+        lock_key = f"lock:{key}"
+        token = await self._acquire_lock(lock_key, lock_ttl)
+        
+        if token is None and self.client:
+            # Another worker holds the lock: wait for it to publish the value
+            self._record_coalesced(cache_type, "distributed")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + wait_timeout
+            while loop.time() < deadline:
+                await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                entry = await self._read_entry(key)
+                if entry is not None:
+                    return entry[0]
+                if not await self.exists(lock_key):
+                    break
+            logger.warning(f"Single-flight wait for key {key} ended without a result, computing locally")
+        
+        try:
+            value = await compute()
+            await self._store_entry(key, value, ttl, stale_ttl)
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(lock_key, token)
+    
+    async def _read_entry(self, key: str) -> Optional[tuple[Any, bool]]:
+        """Read a value and whether it is past its soft expiry."""
+        cached_value = await self.get(key)
+        if cached_value is None:
+            return None
+        return self._unwrap_entry(cached_value)
+    
+    def _unwrap_entry(self, cached_value: Any) -> tuple[Any, bool]:
+        """Split a stored value into the payload and whether it is stale."""
+        if isinstance(cached_value, dict) and SWR_MARKER in cached_value:
+            is_stale = time.time() >= cached_value["fresh_until"]
+            return cached_value["value"], is_stale
+        return cached_value, False
+    
+    async def _store_entry(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[Union[int, timedelta]],
+        stale_ttl: Optional[Union[int, timedelta]]
+    ) -> None:
+        """Store a computed value, wrapped with its soft expiry when serving stale."""
+        if value is None:
+            return
+        entry, entry_ttl = self._wrap_entry(value, ttl, stale_ttl)
+        await self.set(key, entry, ttl=entry_ttl)
+    
+    def _wrap_entry(
+        self,
+        value: Any,
+        ttl: Optional[Union[int, timedelta]],
+        stale_ttl: Optional[Union[int, timedelta]]
+    ) -> tuple[Any, Optional[Union[int, timedelta]]]:
+        """Return the value to store and its Redis TTL."""
+        if not stale_ttl or not ttl:
+            return value, ttl
+        
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
+        if isinstance(stale_ttl, timedelta):
+            stale_ttl = int(stale_ttl.total_seconds())
+        entry = {SWR_MARKER: 1, "fresh_until": time.time() + ttl, "value": value}
+        return entry, ttl + stale_ttl
+    
+    def _schedule_refresh(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[Union[int, timedelta]],
+        stale_ttl: Optional[Union[int, timedelta]],
+        lock_ttl: int
+    ) -> None:
+        """Start one background refresh of a stale key unless one is running."""
+        if key in self._refreshing or key in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(key, compute, ttl, stale_ttl, lock_ttl))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+    
+    async def _refresh(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[Union[int, timedelta]],
+        stale_ttl: Optional[Union[int, timedelta]],
+        lock_ttl: int
+    ) -> None:
+        """Recompute a stale value; skipped when another worker is already refreshing it."""
+        lock_key = f"lock:{key}"
+        token = await self._acquire_lock(lock_key, lock_ttl)
+        if token is None and self.client:
+            return
+        
+        try:
+            value = await compute()
+            await self._store_entry(key, value, ttl, stale_ttl)
+            self.background_refreshes += 1
+        except Exception as e:
+            logger.error(f"Background refresh failed for key {key}: {e}")
+        finally:
+            if token is not None:
+                await self._release_lock(lock_key, token)
+    
+    async def _acquire_lock(self, lock_key: str, lock_ttl: int) -> Optional[str]:
+        """Try to take the cross-worker lock, returning its token on success."""
+        if not self.client:
+            return None
+        
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.client.set(lock_key, token, nx=True, ex=lock_ttl)
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Cache lock error for key {lock_key}: {e}")
+            return None
+    
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Release the cross-worker lock if this worker still owns it."""
+        try:
+            await self.client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.error(f"Cache unlock error for key {lock_key}: {e}")
+    
+    def _record_coalesced(self, cache_type: str, scope: str) -> None:
+        """Count a request that was served by another request's computation."""
+        self.coalesced_requests[scope] += 1
+        try:
+            from src.api.prometheus_metrics import get_metrics_collector
+            get_metrics_collector().record_cache_coalesced(cache_type, scope)
+        except Exception:
+            pass
+    
+    async def start_invalidation_listener(self) -> None:
+        """Subscribe to L1 invalidations published by other workers."""
+        if self.l1 is None or not self.client or self._listener_task is not None:
+            return
+        
+        try:
+            self._pubsub = self.client.pubsub()
+            await self._pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Could not subscribe to cache invalidations, L1 relies on TTL only: {e}")
+            self._pubsub = None
+            return
+        
+        self._listener_task = asyncio.create_task(self._listen_invalidations())
+    
+    async def stop_invalidation_listener(self) -> None:
+        """Stop following invalidations and drop the L1 contents."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(CACHE_INVALIDATION_CHANNEL)
+                await self._pubsub.close()
+            except Exception as e:
+                logger.error(f"Error closing cache invalidation subscription: {e}")
+            self._pubsub = None
+        
+        if self.l1 is not None:
+            self.l1.clear()
+    
+    async def invalidate_all(self) -> None:
+        """Drop every worker's L1 tier without touching Redis."""
+        if self.l1 is None:
+            return
+        self.l1.clear()
+        await self._publish_invalidation(INVALIDATE_ALL)
+    
+    async def _listen_invalidations(self) -> None:
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Messages may have been lost; entries still expire after the L1 TTL
+            logger.error(f"Cache invalidation listener stopped: {e}")
+            self.l1.clear()
+            self._listener_task = None
+    
+    def _apply_invalidation(self, message: str) -> None:
+        """Drop the key named in an invalidation message from another worker."""
+        sender, _, key = message.partition(":")
+        if sender == self._instance_id:
+            return
+        if key == INVALIDATE_ALL:
+            self.l1.clear()
+        else:
+            self.l1.delete(key)
+    
+    async def _publish_invalidation(self, key: str) -> None:
+        try:
+            await self.client.publish(CACHE_INVALIDATION_CHANNEL, f"{self._instance_id}:{key}")
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error for key {key}: {e}")
+    
+    def _record_tier(self, tier: str, hit: bool) -> None:
+        """Count an L1 or L2 lookup and report it to Prometheus."""
+        self.tier_stats[f"{tier}_{'hits' if hit else 'misses'}"] += 1
+        try:
+            from src.api.prometheus_metrics import get_metrics_collector
+            collector = get_metrics_collector()
+            if hit:
+                collector.record_cache_hit(tier)
+            else:
+                collector.record_cache_miss(tier)
+        except Exception:
+            pass
+    
     async def health_check(self) -> bool:
         """Check cache health."""
         if not self.client:
@@ -273,6 +791,17 @@ class CacheManager:
             logger.error(f"Cache info error: {e}")
             return {"error": str(e)}
     
+    def _tier_summary(self) -> dict:
+        """L1/L2 lookup counts and hit ratios for this worker."""
+        summary = {"l1_enabled": self.l1 is not None, "l1_entries": len(self.l1) if self.l1 else 0}
+        for tier in ("l1", "l2"):
+            hits = self.tier_stats[f"{tier}_hits"]
+            misses = self.tier_stats[f"{tier}_misses"]
+            summary[f"{tier}_hits"] = hits
+            summary[f"{tier}_misses"] = misses
+            summary[f"{tier}_hit_rate_percent"] = round(hits / (hits + misses) * 100, 2) if hits + misses else 0
+        return summary
+    
     async def get_cache_stats(self) -> dict:
         """Get detailed cache statistics for monitoring."""
         if not self.client:
@@ -330,6 +859,15 @@ class CacheManager:
                 "performance": perf_stats,
                 "connections": connection_stats,
                 "persistence": persistence_stats,
+                "tiers": self._tier_summary(),
+                "single_flight": {
+                    "coalesced_local": self.coalesced_requests["local"],
+                    "coalesced_distributed": self.coalesced_requests["distributed"],
+                    "in_flight": len(self._inflight),
+                    "stale_served": self.stale_served,
+                    "background_refreshes": self.background_refreshes,
+                    "refreshing": len(self._refreshing)
+                },
                 "server": {
                     "redis_version": info.get("redis_version", "unknown"),
                     "redis_mode": info.get("redis_mode", "unknown"),
@@ -349,19 +887,34 @@ cache_manager = CacheManager()
 # Cache key generators
 def make_forecast_key(location: str, forecast_type: str = "current") -> str:
     """Generate cache key for forecast data."""
-    return f"forecast:{forecast_type}:{location}"
+    return f"forecast:{forecast_type}:{canonical_location(location)}"
 
 def make_aqi_key(location: str) -> str:
     """Generate cache key for current AQI data."""
-    return f"aqi:current:{location}"
+    return f"aqi:current:{canonical_location(location)}"
 
-def make_attribution_key(location: str) -> str:
-    """Generate cache key for source attribution data."""
-    return f"attribution:{location}"
+def make_attribution_key(location: str, timestamp: Optional[datetime] = None) -> str:
+    """Generate cache key for source attribution data, bucketed by update hour."""
+    key = f"attribution:{canonical_location(location)}"
+    if timestamp is not None:
+        key = f"{key}:{time_bucket(timestamp, DATA_CADENCE['attribution'])}"
+    return key
 
-def make_spatial_key(bounds: str, resolution: float) -> str:
+def make_query_key(prefix: str, *parts: Any) -> str:
+    """Generate cache key for a filtered data query from normalised components."""
+    return ":".join([prefix, *(normalize_token(part) for part in parts)])
+
+def make_spatial_key(
+    bounds: dict[str, float],
+    resolution: float,
+    parameter: str = "pm25",
+    timestamp: Optional[datetime] = None
+) -> str:
     """Generate cache key for spatial predictions."""
-    return f"spatial:{bounds}:{resolution}"
+    key = f"spatial:{canonical_bounds(bounds)}:{float(resolution):g}:{normalize_token(parameter)}"
+    if timestamp is not None:
+        key = f"{key}:{time_bucket(timestamp, DATA_CADENCE['forecast'])}"
+    return key
 
 # Cache TTL constants (in seconds) - OPTIMIZED FOR PERFORMANCE
 CACHE_TTL = {
@@ -374,4 +927,13 @@ CACHE_TTL = {
     "city_config": 86400,    # 24 hours (static data)
     "user_profile": 3600,    # 1 hour
     "api_response": 300,     # 5 minutes (general API responses)
+    "city_stats": 900,       # 15 minutes (daily city aggregates)
+}
+
+# How long an expired entry may still be served while it is refreshed in the background
+CACHE_STALE_TTL = {
+    "current_aqi": 300,      # 5 minutes
+    "forecast": 1800,        # 30 minutes
+    "attribution": 1800,     # 30 minutes
+    "city_stats": 3600,      # 1 hour
 }
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Canonical cache keys for the AQI Predictor API.
+Maps equivalent requests (differently spelled locations, nearby coordinates,
+timestamps within one data update) onto the same cache entry.
+"""
+
+import math
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from src.utils.location_parser import LocationInfo, LocationParser, parse_location
+
+logger = logging.getLogger(__name__)
+
+# Grid cell size used to snap free-form coordinates (~1.1 km at the equator)
+GRID_CELL_DEGREES = 0.01
+
+# Coordinates within this distance of a known city centre share the city entry
+CITY_SNAP_KM = 5.0
+
+# Precision used for bounding boxes in spatial keys (~11 m)
+BOUNDS_DECIMALS = 4
+
+# Update cadence of each data family (in seconds); timestamps are bucketed to it
+DATA_CADENCE = {
+    "air_quality": 3600,     # CPCB / OpenAQ publish hourly averages
+    "weather": 3600,         # IMD / OpenWeatherMap hourly observations
+    "attribution": 3600,     # Attribution runs on hourly measurements
+    "forecast": 3600,        # Forecasts are refreshed hourly
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _city_ids() -> Dict[Tuple[float, float], str]:
+    """Map city centre coordinates to one canonical name, collapsing aliases."""
+    ids: Dict[Tuple[float, float], str] = {}
+    for name, coords in LocationParser.CITY_COORDINATES.items():
+        ids.setdefault(coords, name)
+    return ids
+
+
+_CITY_IDS = _city_ids()
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular distance, accurate enough for snapping within a few km."""
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return EARTH_RADIUS_KM * math.hypot(x, y)
+
+
+def nearest_city(latitude: float, longitude: float, max_km: float = CITY_SNAP_KM) -> Optional[str]:
+    """Canonical id of the closest known city centre within ``max_km``, if any."""
+    best_id, best_km = None, max_km
+    for (lat, lon), city_id in _CITY_IDS.items():
+        km = _distance_km(latitude, longitude, lat, lon)
+        if km <= best_km:
+            best_id, best_km = city_id, km
+    return best_id
+
+
+def grid_cell_id(latitude: float, longitude: float, cell_degrees: float = GRID_CELL_DEGREES) -> str:
+    """Id of the fixed lattice cell containing a coordinate."""
+    row = math.floor(latitude / cell_degrees)
+    col = math.floor(longitude / cell_degrees)
+    return f"cell:{cell_degrees:g}:{row}:{col}"
+
+
+def grid_cell_center(latitude: float, longitude: float,
+                     cell_degrees: float = GRID_CELL_DEGREES) -> Tuple[float, float]:
+    """Centre of the fixed lattice cell containing a coordinate."""
+    row = math.floor(latitude / cell_degrees)
+    col = math.floor(longitude / cell_degrees)
+    return round((row + 0.5) * cell_degrees, 6), round((col + 0.5) * cell_degrees, 6)
+
+
+def canonical_coordinates(latitude: float, longitude: float) -> str:
+    """Snap a coordinate to a city id when close to one, otherwise to a grid cell."""
+    city_id = nearest_city(latitude, longitude)
+    if city_id:
+        return city_id
+    return grid_cell_id(latitude, longitude)
+
+
+def canonical_point(latitude: Optional[float], longitude: Optional[float]) -> str:
+    """Grid cell of an optional query point, used by radius searches."""
+    if latitude is None or longitude is None:
+        return "*"
+    return grid_cell_id(latitude, longitude)
+
+
+def canonical_location(location: str) -> str:
+    """
+    Canonical id for a location string.
+
+    City names, their aliases and addresses naming a city resolve to the
+    city id; coordinates near a city centre resolve to that city and any
+    other coordinates to their grid cell. Unparseable input falls back to
+    the normalised string so it still gets a stable key.
+    """
+    try:
+        location_info = parse_location(location)
+    except ValueError:
+        return f"raw:{normalize_token(location)}"
+
+    city_id = _location_city_id(location_info)
+    if city_id:
+        return city_id
+    return grid_cell_id(location_info.latitude, location_info.longitude)
+
+
+def _location_city_id(location_info: LocationInfo) -> Optional[str]:
+    """City id a parsed location's key resolves to, or None for a grid cell."""
+    if location_info.source != "coordinates" and location_info.city:
+        city_key = location_info.city.lower()
+        coords = LocationParser.CITY_COORDINATES.get(city_key)
+        return _CITY_IDS.get(coords, city_key)
+    return nearest_city(location_info.latitude, location_info.longitude)
+
+
+def canonical_location_info(location_info: LocationInfo) -> LocationInfo:
+    """
+    The location a parsed location's canonical key stands for.
+
+    The city (centre and name) for city keys, the cell centre for grid cell
+    keys. Responses cached under a key are computed for this location, so
+    they do not depend on which request in the bucket missed first.
+    """
+    city_id = _location_city_id(location_info)
+    if city_id:
+        try:
+            return parse_location(city_id)
+        except ValueError:
+            return location_info
+
+    latitude, longitude = grid_cell_center(location_info.latitude, location_info.longitude)
+    return LocationInfo(
+        latitude=latitude,
+        longitude=longitude,
+        name=f"{latitude:.4f}, {longitude:.4f}",
+        source="coordinates"
+    )
+
+
+def normalize_token(value: Optional[object]) -> str:
+    """Normalise a free-text key component (case, whitespace, missing values)."""
+    if value is None:
+        return "*"
+    return " ".join(str(value).split()).lower()
+
+
+def time_bucket(timestamp: Optional[datetime] = None, cadence_seconds: int = 3600) -> str:
+    """
+    Floor a timestamp to the start of its update interval.
+
+    Naive timestamps are taken as UTC, matching ``datetime.utcnow()`` used
+    throughout the API.
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    elif timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+    epoch = int(timestamp.timestamp())
+    bucket = datetime.fromtimestamp(epoch - epoch % cadence_seconds, tz=timezone.utc)
+    return bucket.strftime("%Y%m%dT%H%M")
+
+
+def canonical_bounds(bounds: Dict[str, float]) -> str:
+    """Stable text form of a bounding box in north,south,east,west order."""
+    return ",".join(
+        f"{round(float(bounds[side]), BOUNDS_DECIMALS):.{BOUNDS_DECIMALS}f}"
+        for side in ("north", "south", "east", "west")
+    )
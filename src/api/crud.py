@@ -3,19 +3,26 @@ CRUD operations for AQI Predictor database entities.
 Provides create, read, update, delete operations for all models.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import logging
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, and_, or_, func, text
+from sqlalchemy import (
+    select, update, delete, and_, or_, func, text, values, column, true, Integer, Float
+)
 from sqlalchemy.orm import selectinload
 from geoalchemy2 import WKTElement
-from geoalchemy2.functions import ST_DWithin, ST_GeomFromText, ST_AsText
+from geoalchemy2.functions import ST_DWithin, ST_GeomFromText, ST_AsText, ST_X, ST_Y
 
 from src.api.models import (
     AirQualityMeasurement, WeatherData, Prediction, MonitoringStation,
     User, AlertSubscription, SourceAttribution, DataQualityFlag, ModelMetadata
 )
+from src.api.bulk_writer import AIR_QUALITY_MEASUREMENTS, PREDICTIONS, bulk_write_async
+
+logger = logging.getLogger(__name__)
 
 
 class AirQualityMeasurementCRUD:
@@ -139,13 +146,19 @@ class AirQualityMeasurementCRUD:
     @staticmethod
     async def bulk_create(
         db: AsyncSession,
-        measurements: List[Dict[str, Any]]
+        measurements: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
     ) -> int:
-        """Bulk insert measurements."""
-        stmt = insert(AirQualityMeasurement).values(measurements)
-        result = await db.execute(stmt)
-        await db.commit()
-        return result.rowcount
+        """
+        Bulk insert measurements.
+        
+        Rows are written with COPY in batches of ``batch_size``, one
+        transaction per batch; rows already stored are skipped.
+        """
+        result = await bulk_write_async(
+            db, AIR_QUALITY_MEASUREMENTS, measurements, batch_size, strict=True
+        )
+        return result.written
 
 
 class WeatherDataCRUD:
@@ -421,13 +434,129 @@ class PredictionCRUD:
     @staticmethod
     async def bulk_create(
         db: AsyncSession,
-        predictions: List[Dict[str, Any]]
+        predictions: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
     ) -> int:
-        """Bulk insert predictions."""
-        stmt = insert(Prediction).values(predictions)
-        result = await db.execute(stmt)
-        await db.commit()
-        return result.rowcount
+        """
+        Bulk insert predictions.
+        
+        Rows with the same time, location, forecast hour and parameter replace
+        the stored ones, so re-running a materialization is idempotent. Rows
+        are written with COPY in batches of ``batch_size``, one transaction
+        per batch.
+        """
+        if not predictions:
+            return 0
+        
+        result = await bulk_write_async(db, PREDICTIONS, predictions, batch_size, strict=True)
+        return result.written
+    
+    @staticmethod
+    async def get_latest_run(
+        db: AsyncSession,
+        latitude: float,
+        longitude: float,
+        parameter: str = "pm25",
+        since: Optional[datetime] = None,
+        tolerance_degrees: float = 0.005
+    ) -> List[Prediction]:
+        """
+        Get the most recent materialized forecast run at a point.
+        
+        Returns every forecast hour of the newest run stored within
+        ``tolerance_degrees`` of the point (closest point first), or an empty
+        list when no run was materialized there since ``since``.
+        """
+        runs = await PredictionCRUD.get_latest_runs(
+            db, [(latitude, longitude)], parameter, since, tolerance_degrees
+        )
+        return runs[0]
+    
+    @staticmethod
+    async def get_latest_runs(
+        db: AsyncSession,
+        points: List[Tuple[float, float]],
+        parameter: str = "pm25",
+        since: Optional[datetime] = None,
+        tolerance_degrees: float = 0.005
+    ) -> List[List[Prediction]]:
+        """
+        Get the most recent materialized forecast run at each of several points.
+        
+        All points are resolved with one query, see ``latest_runs_statement``.
+        
+        Args:
+            db: Database session
+            points: (latitude, longitude) pairs
+            parameter: Predicted parameter
+            since: Ignore runs older than this
+            tolerance_degrees: How far from a point a stored run may be
+            
+        Returns:
+            One list per point, in input order, with every forecast hour of its
+            newest run, or an empty list where there is none
+        """
+        runs: List[List[Prediction]] = [[] for _ in points]
+        if not points:
+            return runs
+        
+        result = await db.execute(
+            latest_runs_statement(points, parameter, since, tolerance_degrees)
+        )
+        for index, prediction in result.all():
+            runs[index].append(prediction)
+        return runs
+
+
+def latest_runs_statement(
+    points: List[Tuple[float, float]],
+    parameter: str = "pm25",
+    since: Optional[datetime] = None,
+    tolerance_degrees: float = 0.005
+):
+    """
+    Select the newest materialized run at each point in one query.
+    
+    The points are a VALUES list; a LATERAL subquery picks, per point, the
+    newest run stored within ``tolerance_degrees`` (closest first), and the
+    run's forecast hours are joined back to it.
+    
+    Args:
+        points: (latitude, longitude) pairs
+        parameter: Predicted parameter
+        since: Ignore runs older than this
+        tolerance_degrees: How far from a point a stored run may be
+        
+    Returns:
+        Select of (point index, Prediction) rows ordered by point and forecast hour
+    """
+    requested = values(
+        column("idx", Integer), column("lat", Float), column("lon", Float),
+        name="requested_points"
+    ).data([(i, lat, lon) for i, (lat, lon) in enumerate(points)])
+    point = func.ST_SetSRID(func.ST_MakePoint(requested.c.lon, requested.c.lat), 4326)
+    
+    latest = select(Prediction.time, Prediction.location).where(
+        ST_DWithin(Prediction.location, point, tolerance_degrees),
+        Prediction.parameter == parameter
+    )
+    if since:
+        latest = latest.where(Prediction.time >= since)
+    latest = latest.order_by(
+        Prediction.time.desc(), func.ST_Distance(Prediction.location, point).asc()
+    ).limit(1).correlate(requested).lateral("latest_run")
+    
+    return (
+        select(requested.c.idx, Prediction)
+        .select_from(requested)
+        .join(latest, true())
+        .join(Prediction, and_(
+            Prediction.time == latest.c.time,
+            Prediction.location == latest.c.location,
+            Prediction.parameter == parameter
+        ))
+        .order_by(requested.c.idx, Prediction.forecast_hour.asc())
+    )
 
 
 class UserCRUD:
@@ -494,6 +623,20 @@ async def get_latest_air_quality_data(
     """
     latitude, longitude = coordinates
     
+    # Serve from the rolling-window engine when nearby stations are tracked
+    engine = await sync_rolling_aqi_engine(db)
+    rolling = engine.get_location_aqi(latitude, longitude, radius_km)
+    if rolling:
+        result = {
+            'coordinates': coordinates,
+            # Newest reading of the stations behind this result
+            'timestamp': datetime.fromisoformat(rolling['as_of']),
+            'aqi': rolling['aqi'],
+            'aqi_method': rolling['method']
+        }
+        result.update(rolling['pollutant_values'])
+        return result
+    
     # Get latest measurements for all parameters
     measurements = await AirQualityMeasurementCRUD.get_by_location(
         db, latitude, longitude, radius_km, limit=50
@@ -536,6 +679,103 @@ async def get_latest_air_quality_data(
     return result
 
 
+# Re-read rows ingested shortly before the last sync; their transactions may
+# have committed after it. The engine ignores readings it already holds.
+ROLLING_AQI_SYNC_OVERLAP = timedelta(minutes=5)
+
+
+def rolling_aqi_sync_statement(engine, now: datetime, limit: int = 50000):
+    """
+    Select measurements the rolling AQI engine has not synced yet.
+    
+    Rows are tailed by ingestion time (created_at) rather than observation
+    time, so a station reporting late is still picked up. The first sync
+    loads the engine's longest averaging window. Every sync is also bounded
+    to that window by observation time, so TimescaleDB only scans recent
+    chunks; older rows could not enter a window anyway.
+    
+    Args:
+        engine: RollingAQIEngine being synced
+        now: Time of the sync
+        limit: Maximum rows per sync; the next sync continues from the last one
+        
+    Returns:
+        Select of (time, station_id, parameter, value, lat, lon, created_at) rows
+    """
+    stmt = select(
+        AirQualityMeasurement.time,
+        AirQualityMeasurement.station_id,
+        AirQualityMeasurement.parameter,
+        AirQualityMeasurement.value,
+        ST_Y(AirQualityMeasurement.location),
+        ST_X(AirQualityMeasurement.location),
+        AirQualityMeasurement.created_at
+    )
+    stmt = stmt.where(
+        AirQualityMeasurement.time >= now - timedelta(hours=max(engine.windows.values()))
+    )
+    if engine.synced_through is not None:
+        stmt = stmt.where(
+            AirQualityMeasurement.created_at > engine.synced_through - ROLLING_AQI_SYNC_OVERLAP
+        )
+    return stmt.order_by(AirQualityMeasurement.created_at.asc()).limit(limit)
+
+
+async def sync_rolling_aqi_engine(
+    db: AsyncSession,
+    engine=None,
+    min_interval_seconds: int = 60
+):
+    """
+    Fold measurements stored since the engine's last sync into the rolling AQI engine.
+    
+    Only rows ingested since the last sync are read, so the hypertable is
+    tailed incrementally instead of re-averaged on every call.
+    
+    Args:
+        db: Database session
+        engine: RollingAQIEngine to update (defaults to the process-wide engine)
+        min_interval_seconds: Skip the sync if the last one is more recent than this
+        
+    Returns:
+        The synced RollingAQIEngine
+    """
+    from src.utils.rolling_aqi import get_rolling_aqi_engine
+    
+    engine = engine or get_rolling_aqi_engine()
+    now = datetime.now(timezone.utc)
+    if not engine.sync_due(now, min_interval_seconds):
+        return engine
+    
+    rows = []
+    try:
+        rows = (await db.execute(rolling_aqi_sync_statement(engine, now))).all()
+    except Exception as e:
+        logger.warning(f"Rolling AQI engine sync failed: {e}")
+        await db.rollback()
+    engine.apply_sync(rows, now)
+    return engine
+
+
+def sync_rolling_aqi_engine_blocking(db, engine=None, min_interval_seconds: int = 60):
+    """Synchronous-session variant of sync_rolling_aqi_engine, for Celery tasks."""
+    from src.utils.rolling_aqi import get_rolling_aqi_engine
+    
+    engine = engine or get_rolling_aqi_engine()
+    now = datetime.now(timezone.utc)
+    if not engine.sync_due(now, min_interval_seconds):
+        return engine
+    
+    rows = []
+    try:
+        rows = db.execute(rolling_aqi_sync_statement(engine, now)).all()
+    except Exception as e:
+        logger.warning(f"Rolling AQI engine sync failed: {e}")
+        db.rollback()
+    engine.apply_sync(rows, now)
+    return engine
+
+
 async def get_historical_air_quality_data(
     db: AsyncSession,
     coordinates: Tuple[float, float],
@@ -592,22 +832,32 @@ async def get_historical_air_quality_data(
             'quality_flag': measurement.quality_flag
         }
     
-    # Convert to list and calculate AQI for each time point
+    # Calculate PM2.5 AQI for every time point in one vectorized pass
+    from src.utils.aqi_calculator import AQICalculator
+    time_points = list(time_groups.values())
+    pm25_values = np.array([
+        time_data['measurements'].get('pm25', {}).get('value') for time_data in time_points
+    ], dtype=np.float64)
+    aqi_values = AQICalculator().calculate_aqi_batch({'pm25': pm25_values}).aqi
+    
+    # Standard averaging-period AQI (24h PM, 8h CO/O3), streamed oldest-first in one pass
+    from src.utils.rolling_aqi import RollingAQIEngine
+    rolling_engine = RollingAQIEngine()
+    rolling_aqi = {}
+    for time_data in sorted(time_points, key=lambda x: x['timestamp']):
+        for param, measurement in time_data['measurements'].items():
+            rolling_engine.add_measurement('area', param, measurement['value'], time_data['timestamp'])
+        rolling = rolling_engine.get_station_aqi('area', now=time_data['timestamp'], method='rolling')
+        rolling_aqi[id(time_data)] = rolling['aqi'] if rolling else None
+    
     historical_data = []
-    for time_data in time_groups.values():
-        # Calculate AQI if PM2.5 is available
-        aqi_value = 0
-        if 'pm25' in time_data['measurements'] and time_data['measurements']['pm25']['value'] is not None:
-            from src.utils.aqi_calculator import AQICalculator
-            calculator = AQICalculator()
-            aqi_result = calculator.calculate_aqi({'pm25': time_data['measurements']['pm25']['value']})
-            aqi_value = aqi_result[0]
-        
+    for time_data, aqi_value in zip(time_points, aqi_values):
         # Prepare data point
         data_point = {
             'timestamp': time_data['timestamp'],
             'coordinates': coordinates,
-            'aqi': aqi_value
+            'aqi': int(aqi_value),
+            'rolling_aqi': rolling_aqi[id(time_data)]
         }
         
         # Add pollutant values
@@ -0,0 +1,149 @@
+"""
+Binary encodings for spatial grid responses.
+
+Grids are shipped as named columns (numpy arrays) plus a small JSON-able
+header, so a 10k-cell grid is a few compact arrays instead of 10k nested
+JSON objects. Supported encodings are numpy ``npz``, Apache Arrow IPC
+stream and MessagePack; Arrow and MessagePack are optional dependencies.
+"""
+
+import io
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+from fastapi import Response
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from src.utils.aqi_calculator import CATEGORY_CODES, CATEGORY_LABELS, CATEGORY_COLORS
+
+logger = logging.getLogger(__name__)
+
+GRID_MEDIA_TYPES = {
+    "npz": "application/x-npz",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "msgpack": "application/x-msgpack",
+}
+
+# Query pattern for the `format` parameter of spatial endpoints
+GRID_FORMAT_PATTERN = "^(json|npz|arrow|msgpack)$"
+
+# Legend for decoding uint8 category codes on the client
+CATEGORY_LEGEND = {
+    "codes": list(CATEGORY_CODES),
+    "labels": list(CATEGORY_LABELS),
+    "colors": list(CATEGORY_COLORS),
+}
+
+
+def negotiate_grid_format(format: Optional[str], accept: Optional[str]) -> str:
+    """
+    Resolve the response encoding from the format parameter or Accept header
+
+    Args:
+        format: Explicit ``format`` query parameter, if given
+        accept: Request Accept header
+
+    Returns:
+        One of 'json', 'npz', 'arrow' or 'msgpack'
+    """
+    if format:
+        return format
+
+    if accept:
+        for media_range in accept.split(","):
+            media_type = media_range.split(";")[0].strip().lower()
+            for name, grid_media_type in GRID_MEDIA_TYPES.items():
+                if media_type == grid_media_type:
+                    return name
+
+    return "json"
+
+
+def grid_format_available(format: str) -> bool:
+    """Check whether the encoder for a format is installed"""
+    if format == "arrow":
+        return ARROW_AVAILABLE
+    if format == "msgpack":
+        return MSGPACK_AVAILABLE
+    return True
+
+
+def encode_grid(cells: Dict[str, np.ndarray], axes: Dict[str, np.ndarray],
+                header: Dict[str, Any], format: str) -> bytes:
+    """
+    Encode grid columns in a binary format
+
+    Args:
+        cells: Named per-cell arrays of equal length, row-major over the axes
+        axes: Grid axis arrays ('latitudes' per row, 'longitudes' per column)
+        header: JSON-serializable grid description (bounds, origin, steps, ...)
+        format: 'npz', 'arrow' or 'msgpack'
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        ValueError: If the format is unknown or its encoder is not installed
+    """
+    header = json.loads(json.dumps(dict(header, category_legend=CATEGORY_LEGEND), default=str))
+
+    if format == "npz":
+        buffer = io.BytesIO()
+        np.savez(buffer, header=np.array(json.dumps(header)), **axes, **cells)
+        return buffer.getvalue()
+
+    if format == "arrow":
+        if not ARROW_AVAILABLE:
+            raise ValueError("Arrow encoding requires pyarrow")
+        # Axes are short, so they ride in the schema metadata with the header
+        table = pa.table({name: pa.array(array) for name, array in cells.items()})
+        table = table.replace_schema_metadata({
+            b"header": json.dumps(header).encode(),
+            b"axes": json.dumps({name: array.tolist() for name, array in axes.items()}).encode(),
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if format == "msgpack":
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("MessagePack encoding requires msgpack")
+        return msgpack.packb({
+            "header": header,
+            "axes": {name: _pack_array(array) for name, array in axes.items()},
+            "cells": {name: _pack_array(array) for name, array in cells.items()},
+        }, use_bin_type=True)
+
+    raise ValueError(f"Unknown grid format: {format}")
+
+
+def grid_response(cells: Dict[str, np.ndarray], axes: Dict[str, np.ndarray],
+                  header: Dict[str, Any], format: str) -> Response:
+    """Encode a grid and wrap it in a response with the format's media type"""
+    return Response(
+        content=encode_grid(cells, axes, header, format),
+        media_type=GRID_MEDIA_TYPES[format]
+    )
+
+
+def _pack_array(array: np.ndarray) -> Dict[str, Any]:
+    return {
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "data": np.ascontiguousarray(array).tobytes()
+    }
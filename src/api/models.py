@@ -63,6 +63,7 @@ class AirQualityMeasurement(Base):
         Index("idx_aq_station_time", "station_id", "time"),
         Index("idx_aq_location", "location", postgresql_using="gist"),
         Index("idx_aq_parameter", "parameter"),
+        Index("idx_aq_created_at", "created_at"),
     )
 
 
@@ -120,6 +120,13 @@ data_processing_duration_seconds = Histogram(
     registry=registry
 )
 
+ingestion_http_events_total = Counter(
+    'aqi_ingestion_http_events_total',
+    'Ingestion HTTP transport events (connections created/reused, DNS cache hits/misses, retries)',
+    ['event', 'host'],
+    registry=registry
+)
+
 # Database Metrics
 db_connections_active = Gauge(
     'aqi_db_connections_active',
@@ -156,6 +163,13 @@ cache_misses_total = Counter(
     registry=registry
 )
 
+cache_coalesced_requests_total = Counter(
+    'aqi_cache_coalesced_requests_total',
+    'Cache misses served by another request\'s computation',
+    ['cache_type', 'scope'],
+    registry=registry
+)
+
 cache_size_bytes = Gauge(
     'aqi_cache_size_bytes',
     'Cache size in bytes',
@@ -377,6 +391,17 @@ class PrometheusMetricsCollector:
         """
         data_ingestion_errors_total.labels(source=source, error_type=error_type).inc()
     
+    def record_data_processing(self, source: str, operation: str, duration: float):
+        """
+        Record data processing duration.
+        
+        Args:
+            source: Data source
+            operation: Processing step (e.g. fetch, store)
+            duration: Duration in seconds
+        """
+        data_processing_duration_seconds.labels(source=source, operation=operation).observe(duration)
+    
     def record_data_quality_issue(self, issue_type: str):
         """
         Record data quality issue.
@@ -386,6 +411,17 @@ class PrometheusMetricsCollector:
         """
         data_quality_issues_total.labels(issue_type=issue_type).inc()
     
+    def record_http_client_event(self, event: str, host: str):
+        """
+        Record an ingestion HTTP transport event.
+        
+        Args:
+            event: connections_created, connections_reused, dns_cache_hits,
+                dns_cache_misses or retries
+            host: Upstream host
+        """
+        ingestion_http_events_total.labels(event=event, host=host).inc()
+    
     def record_cache_hit(self, cache_type: str):
         """Record cache hit."""
         cache_hits_total.labels(cache_type=cache_type).inc()
@@ -394,6 +430,10 @@ class PrometheusMetricsCollector:
         """Record cache miss."""
         cache_misses_total.labels(cache_type=cache_type).inc()
     
+    def record_cache_coalesced(self, cache_type: str, scope: str):
+        """Record a cache miss coalesced onto an in-flight computation."""
+        cache_coalesced_requests_total.labels(cache_type=cache_type, scope=scope).inc()
+    
     def record_alert_sent(self, alert_type: str, channel: str):
         """Record alert sent."""
         alerts_sent_total.labels(alert_type=alert_type, channel=channel).inc()
@@ -10,8 +10,8 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
-from src.api.database import get_db, AsyncSession
-from src.api.cache import cache_manager, CACHE_TTL
+from src.api.database import get_db, AsyncSession, AsyncSessionLocal
+from src.api.cache import cache_manager, make_attribution_key, CACHE_TTL, CACHE_STALE_TTL
 from src.api.schemas import LocationInfo, SourceAttributionInfo
 from src.utils.location_parser import parse_location
 from src.models.source_attribution import get_source_attribution_model
@@ -49,40 +49,9 @@ class ScenarioResponse(BaseModel):
     intervention_details: List[Dict[str, Any]]
 
 
-@router.get("/{location}")
-async def get_source_attribution(
-    location: str,
-    timestamp: Optional[datetime] = Query(None, description="Timestamp for attribution analysis"),
-    db: AsyncSession = Depends(get_db)
-) -> AttributionResponse:
-    """
-    Get source attribution analysis for a location.
-    
-    Args:
-        location: Location identifier (city name, coordinates, or address)
-        timestamp: Optional timestamp for historical attribution
-        
-    Returns:
-        Source attribution breakdown with explanations
-    """
-    try:
-        # Parse location
-        location_info = parse_location(location)
-        if not location_info:
-            raise HTTPException(status_code=400, detail=f"Invalid location: {location}")
-        
-        # Use current time if no timestamp provided
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-        
-        # Check cache first
-        cache_key = f"attribution:{location}:{timestamp.isoformat()}"
-        cached_data = await cache_manager.get(cache_key)
-        
-        if cached_data:
-            logger.info(f"Returning cached attribution for {location}")
-            return AttributionResponse(**cached_data)
-        
+async def _compute_attribution(location_info, timestamp: datetime) -> Dict[str, Any]:
+    """Run source attribution for a location, using a session of its own."""
+    async with AsyncSessionLocal() as db:
         # Get attribution model
         attribution_model = get_source_attribution_model()
         
@@ -111,8 +80,43 @@ async def get_source_attribution(
             "aqi_value": aq_data.get('aqi', 0)
         }
         
-        # Cache the result
-        await cache_manager.set(cache_key, response_data, ttl=CACHE_TTL["attribution"])
+        return response_data
+
+
+@router.get("/{location}")
+async def get_source_attribution(
+    location: str,
+    timestamp: Optional[datetime] = Query(None, description="Timestamp for attribution analysis"),
+    db: AsyncSession = Depends(get_db)
+) -> AttributionResponse:
+    """
+    Get source attribution analysis for a location.
+    
+    Args:
+        location: Location identifier (city name, coordinates, or address)
+        timestamp: Optional timestamp for historical attribution
+        
+    Returns:
+        Source attribution breakdown with explanations
+    """
+    try:
+        # Parse location
+        location_info = parse_location(location)
+        if not location_info:
+            raise HTTPException(status_code=400, detail=f"Invalid location: {location}")
+        
+        # Use current time if no timestamp provided
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        
+        cache_key = make_attribution_key(location, timestamp)
+        response_data = await cache_manager.get_or_compute(
+            cache_key,
+            lambda: _compute_attribution(location_info, timestamp),
+            ttl=CACHE_TTL["attribution"],
+            stale_ttl=CACHE_STALE_TTL["attribution"],
+            cache_type="attribution"
+        )
         
         return AttributionResponse(**response_data)
         
@@ -3,14 +3,17 @@ Cities API Router - Multi-city support endpoints
 Provides city detection, configuration, and comparative analysis
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from dataclasses import asdict
+from typing import Any, Callable, List, Optional
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-from src.api.database import get_db
+from src.api.cache import cache_manager, make_query_key, CACHE_TTL, CACHE_STALE_TTL
+from src.api.database import get_db, SyncSessionLocal
 from src.utils.city_detector import CityDetector, CityInfo
 from src.utils.city_comparator import CityComparator, ComparativeAnalysis
 
@@ -19,6 +22,32 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/cities", tags=["cities"])
 
 
+def _active_cities() -> List[dict]:
+    """Load the active city configurations as plain dicts for caching."""
+    with SyncSessionLocal() as session:
+        return [asdict(city) for city in CityDetector(session).get_all_active_cities()]
+
+
+async def _cached_city_stats(cache_key: str, query: Callable[[CityComparator], Any]) -> Any:
+    """
+    Serve a city aggregate from cache, serving stale values while refreshing.
+    
+    The query runs in a worker thread with its own session so a background
+    refresh does not depend on the request that triggered it.
+    """
+    def run_query() -> Any:
+        with SyncSessionLocal() as session:
+            return query(CityComparator(session))
+    
+    return await cache_manager.get_or_compute(
+        cache_key,
+        lambda: asyncio.to_thread(run_query),
+        ttl=CACHE_TTL["city_stats"],
+        stale_ttl=CACHE_STALE_TTL["city_stats"],
+        cache_type="city_stats"
+    )
+
+
 # Pydantic models for request/response
 class CityInfoResponse(BaseModel):
     """City information response"""
@@ -113,22 +142,26 @@ async def get_all_cities(
     Returns list of all active cities with their configurations
     """
     try:
-        detector = CityDetector(db)
-        cities = detector.get_all_active_cities()
+        cities = await cache_manager.get_or_compute(
+            make_query_key("cities", "active"),
+            lambda: asyncio.to_thread(_active_cities),
+            ttl=CACHE_TTL["city_config"],
+            cache_type="city_config"
+        )
         
         return [
             CityInfoResponse(
-                city_code=city.city_code,
-                city_name=city.city_name,
-                state=city.state,
-                country=city.country,
-                latitude=city.latitude,
-                longitude=city.longitude,
-                is_active=city.is_active,
-                priority=city.priority,
-                ml_model_config=city.model_config,
-                data_sources=city.data_sources,
-                alert_thresholds=city.alert_thresholds
+                city_code=city["city_code"],
+                city_name=city["city_name"],
+                state=city["state"],
+                country=city["country"],
+                latitude=city["latitude"],
+                longitude=city["longitude"],
+                is_active=city["is_active"],
+                priority=city["priority"],
+                ml_model_config=city["model_config"],
+                data_sources=city["data_sources"],
+                alert_thresholds=city["alert_thresholds"]
             )
             for city in cities
         ]
@@ -259,8 +292,10 @@ async def get_city_trends(
         days: Number of days of history (default 30)
     """
     try:
-        comparator = CityComparator(db)
-        trends = comparator.get_city_trends(city_code, days)
+        trends = await _cached_city_stats(
+            make_query_key("city_trends", city_code, days),
+            lambda comparator: comparator.get_city_trends(city_code, days)
+        )
         
         return [
             CityTrendResponse(**trend)
@@ -332,8 +367,10 @@ async def get_city_rankings(
         limit: Maximum number of cities to return (default 10)
     """
     try:
-        comparator = CityComparator(db)
-        rankings = comparator.get_rankings(metric=metric, days=days, limit=limit)
+        rankings = await _cached_city_stats(
+            make_query_key("city_rankings", metric, days, limit),
+            lambda comparator: comparator.get_rankings(metric=metric, days=days, limit=limit)
+        )
         
         return [
             CityRankingResponse(**ranking)
@@ -356,8 +393,10 @@ async def get_best_worst_cities(
         days: Number of days to average (default 7)
     """
     try:
-        comparator = CityComparator(db)
-        result = comparator.get_best_worst_cities(days=days)
+        result = await _cached_city_stats(
+            make_query_key("city_best_worst", days),
+            lambda comparator: comparator.get_best_worst_cities(days=days)
+        )
         
         return {
             "best_city": result['best'],
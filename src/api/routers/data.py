@@ -10,8 +10,9 @@ from uuid import UUID
 import logging
 
 from src.api.database import get_db, AsyncSession
-from src.api.crud import air_quality_crud, weather_crud, station_crud
-from src.api.cache import cache_manager, CACHE_TTL
+from src.api.crud import air_quality_crud, weather_crud, station_crud, sync_rolling_aqi_engine
+from src.api.cache import cache_manager, make_query_key, CACHE_TTL
+from src.api.cache_keys import canonical_point
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ async def get_latest_air_quality(
     """
     try:
         # Build cache key
-        cache_key = f"air_quality:latest:{station_id}:{parameter}:{city}:{limit}"
+        cache_key = make_query_key("air_quality:latest", station_id, parameter, city, limit)
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
@@ -253,6 +254,67 @@ async def get_air_quality_by_location(
         )
 
 
+@router.get("/air-quality/rolling")
+async def get_rolling_air_quality(
+    station_id: Optional[str] = Query(None, description="Station ID"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Latitude"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180, description="Longitude"),
+    radius_km: float = Query(5.0, ge=0.1, le=100, description="Search radius in kilometers"),
+    method: str = Query("nowcast", pattern="^(nowcast|rolling)$", description="Averaging method"),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get rolling-window AQI (24h PM, 8h CO/O3 averages or NowCast).
+    
+    Values come from the incremental rolling AQI engine rather than
+    re-averaging raw measurements on every request.
+    
+    Args:
+        station_id: Station to report on
+        latitude: Latitude coordinate (used with longitude when no station is given)
+        longitude: Longitude coordinate
+        radius_km: Search radius for location queries
+        method: 'nowcast' or 'rolling'
+        
+    Returns:
+        Rolling AQI with averaged pollutant concentrations
+    """
+    if not station_id and (latitude is None or longitude is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either station_id or both latitude and longitude"
+        )
+    
+    try:
+        engine = await sync_rolling_aqi_engine(db)
+        
+        if station_id:
+            rolling = engine.get_station_aqi(station_id, method=method)
+        else:
+            rolling = engine.get_location_aqi(latitude, longitude, radius_km, method=method)
+        
+        if not rolling:
+            raise HTTPException(
+                status_code=404,
+                detail="No recent measurements available for rolling AQI"
+            )
+        
+        return {
+            **rolling,
+            "averaging_windows_hours": engine.windows,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving rolling air quality data: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to retrieve rolling air quality data"
+        )
+
+
 @router.get("/weather/latest")
 async def get_latest_weather(
     latitude: Optional[float] = Query(None, ge=-90, le=90, description="Latitude"),
@@ -277,7 +339,9 @@ async def get_latest_weather(
     """
     try:
         # Build cache key
-        cache_key = f"weather:latest:{latitude}:{longitude}:{station_id}:{radius_km}:{limit}"
+        cache_key = make_query_key(
+            "weather:latest", canonical_point(latitude, longitude), station_id, f"{radius_km:g}", limit
+        )
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
@@ -371,7 +435,7 @@ async def get_imd_weather_stations(
     """
     try:
         # Build cache key
-        cache_key = f"imd_stations:{city}:{state}"
+        cache_key = make_query_key("imd_stations", city, state)
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
@@ -432,7 +496,7 @@ async def get_imd_station_status(
     """
     try:
         # Build cache key
-        cache_key = f"imd_station_status:{station_id}"
+        cache_key = make_query_key("imd_station_status", station_id)
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
@@ -491,7 +555,7 @@ async def get_imd_weather_forecast(
     """
     try:
         # Build cache key
-        cache_key = f"imd_forecast:{station_id}:{latitude}:{longitude}:{hours}"
+        cache_key = make_query_key("imd_forecast", station_id, canonical_point(latitude, longitude), hours)
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
@@ -590,7 +654,9 @@ async def get_monitoring_stations(
     """
     try:
         # Build cache key
-        cache_key = f"stations:{city}:{state}:{active_only}:{latitude}:{longitude}:{radius_km}:{limit}"
+        cache_key = make_query_key(
+            "stations", city, state, active_only, canonical_point(latitude, longitude), f"{radius_km:g}", limit
+        )
         cached_data = await cache_manager.get(cache_key)
         
         if cached_data:
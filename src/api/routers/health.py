@@ -11,6 +11,7 @@ import os
 
 from src.api.database import health_check as db_health_check, db_manager
 from src.api.cache import cache_manager
+from src.utils.variogram_cache import get_variogram_cache
 
 logger = logging.getLogger(__name__)
 
@@ -180,6 +181,8 @@ async def cache_stats() -> Dict[str, Any]:
                 detail=f"Failed to get cache statistics: {stats['error']}"
             )
         
+        stats["variogram_cache"] = get_variogram_cache().get_stats()
+        
         return stats
         
     except HTTPException:
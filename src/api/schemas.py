@@ -200,6 +200,13 @@ class SpatialForecastRequest(BaseModel):
     resolution: float = Field(1.0, gt=0, le=10)  # km resolution
     timestamp: Optional[datetime] = None
 
+BATCH_FORECAST_MAX_LOCATIONS = 250
+
+class BatchForecastRequest(BaseModel):
+    """Schema for forecasting many locations in one call."""
+    locations: List[str] = Field(..., min_items=1, max_items=BATCH_FORECAST_MAX_LOCATIONS)
+    forecast_type: str = Field("current", pattern="^(current|24h)$")
+
 class SpatialMetadata(BaseModel):
     """Schema for spatial prediction metadata."""
     resolution_km: float
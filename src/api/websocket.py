@@ -150,22 +150,11 @@ class ConnectionManager:
                 # Fetch and broadcast updates for each location
                 for location in locations:
                     try:
-                        # Import here to avoid circular dependency
-                        from src.api.routers.forecast import get_current_forecast
                         from src.api.database import get_db
                         
-                        # Get current AQI data
                         async for db in get_db():
                             try:
-                                current_data = await get_current_forecast(location, db)
-                                
-                                # Add update metadata
-                                update_message = {
-                                    "type": "aqi_update",
-                                    "location": location,
-                                    "timestamp": datetime.utcnow().isoformat(),
-                                    "data": current_data
-                                }
+                                update_message = await _build_update_message(location, db)
                                 
                                 # Broadcast to all subscribers
                                 await self.broadcast_to_location(location, update_message)
@@ -187,6 +176,44 @@ class ConnectionManager:
 manager = ConnectionManager(update_interval=300)  # 5 minutes
 
 
+async def _build_update_message(location: str, db: AsyncSession) -> Dict:
+    """
+    Build an aqi_update message for a location.
+    
+    Adds the rolling-window (NowCast) AQI from nearby stations when the
+    rolling AQI engine tracks any, so clients see standard averaged values
+    without re-querying raw measurements.
+    
+    Args:
+        location: Normalized location identifier
+        db: Database session
+        
+    Returns:
+        Update message dictionary
+    """
+    # Import here to avoid circular dependency
+    from src.api.routers.forecast import get_current_forecast
+    from src.api.crud import sync_rolling_aqi_engine
+    
+    current_data = await get_current_forecast(location, db)
+    
+    try:
+        location_info = parse_location(location)
+        engine = await sync_rolling_aqi_engine(db)
+        rolling_aqi = engine.get_location_aqi(location_info.latitude, location_info.longitude)
+        if rolling_aqi:
+            current_data = {**current_data, "rolling_aqi": rolling_aqi}
+    except Exception as e:
+        logger.warning(f"Rolling AQI unavailable for {location}: {e}")
+    
+    return {
+        "type": "aqi_update",
+        "location": location,
+        "timestamp": datetime.utcnow().isoformat(),
+        "data": current_data
+    }
+
+
 @router.websocket("/ws/aqi/{location}")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -238,18 +265,10 @@ async def websocket_endpoint(
     
     # Send initial data
     try:
-        from src.api.routers.forecast import get_current_forecast
-        
         async for db in get_db():
             try:
-                current_data = await get_current_forecast(location, db)
                 await manager.send_personal_message(
-                    {
-                        "type": "aqi_update",
-                        "location": normalized_location,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "data": current_data
-                    },
+                    await _build_update_message(normalized_location, db),
                     websocket
                 )
             finally:
@@ -281,14 +300,8 @@ async def websocket_endpoint(
                     
                     async for db in get_db():
                         try:
-                            current_data = await get_current_forecast(location, db)
                             await manager.send_personal_message(
-                                {
-                                    "type": "aqi_update",
-                                    "location": normalized_location,
-                                    "timestamp": datetime.utcnow().isoformat(),
-                                    "data": current_data
-                                },
+                                await _build_update_message(normalized_location, db),
                                 websocket
                             )
                         finally:
@@ -0,0 +1,276 @@
+"""
+Shared pooled HTTP transport for data ingestion clients.
+
+Every DataIngestionClient borrows its aiohttp session from one process-wide
+HTTPTransport instead of opening its own, so keep-alive connections, the DNS
+cache and TLS sessions survive across clients and ingestion runs.
+
+Features:
+- Tuned TCPConnector pool with per-host connection limits and DNS caching
+- Retry with full-jitter exponential backoff for transient failures
+- Connection reuse and DNS cache statistics exported as Prometheus metrics
+- A long-lived per-process event loop for Celery tasks (run_in_worker_loop)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: rate limiting and transient upstream errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class TransportConfig:
+    """Connection pool and retry settings, overridable via environment."""
+    limit: int = int(os.getenv("INGESTION_HTTP_POOL_SIZE", "100"))
+    limit_per_host: int = int(os.getenv("INGESTION_HTTP_POOL_PER_HOST", "10"))
+    dns_cache_ttl: int = int(os.getenv("INGESTION_HTTP_DNS_TTL", "300"))
+    keepalive_timeout: float = float(os.getenv("INGESTION_HTTP_KEEPALIVE", "60"))
+    request_timeout: float = float(os.getenv("INGESTION_HTTP_TIMEOUT", "30"))
+    max_retries: int = int(os.getenv("INGESTION_HTTP_MAX_RETRIES", "3"))
+    backoff_base: float = float(os.getenv("INGESTION_HTTP_BACKOFF_BASE", "0.5"))
+    backoff_max: float = float(os.getenv("INGESTION_HTTP_BACKOFF_MAX", "10"))
+
+
+class _LoopPool:
+    """Session and borrower count for one event loop."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self.borrowers = 0
+
+
+class HTTPTransport:
+    """
+    Process-wide pool of aiohttp sessions, one per event loop.
+
+    Clients ``acquire`` a session on entry and ``release`` it on exit. The
+    session stays open while any client holds it, and indefinitely on loops
+    marked persistent (see ``run_in_worker_loop``), so later runs reuse the
+    warm connections.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        self.config = config or TransportConfig()
+        self._pools: Dict[asyncio.AbstractEventLoop, _LoopPool] = {}
+        self._persistent_loops = weakref.WeakSet()
+        self._pid = os.getpid()
+        self.stats: Counter = Counter()
+        # Imported here because _record runs inside connection hooks on the event loop
+        self._metrics = self._load_metrics_collector()
+
+    @staticmethod
+    def _load_metrics_collector():
+        try:
+            from src.api.prometheus_metrics import get_metrics_collector
+            return get_metrics_collector()
+        except Exception:
+            return None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.config.limit,
+            limit_per_host=self.config.limit_per_host,
+            ttl_dns_cache=self.config.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.config.keepalive_timeout
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+            trace_configs=[self._trace_config()]
+        )
+
+    def _pool(self) -> _LoopPool:
+        if self._pid != os.getpid():
+            # Sockets inherited across a fork belong to the parent
+            self._pools = {}
+            self._pid = os.getpid()
+
+        loop = asyncio.get_running_loop()
+        # Forget pools whose loop has gone away; their sockets went with it
+        for stale in [l for l in self._pools if l.is_closed()]:
+            del self._pools[stale]
+
+        pool = self._pools.get(loop)
+        if pool is None or pool.session.closed:
+            pool = self._pools[loop] = _LoopPool(self._create_session())
+            self.stats["sessions_created"] += 1
+        return pool
+
+    async def acquire(self) -> aiohttp.ClientSession:
+        """Borrow the shared session for the running loop."""
+        pool = self._pool()
+        pool.borrowers += 1
+        return pool.session
+
+    async def release(self):
+        """Return a borrowed session; closes it once unused on a non-persistent loop."""
+        pool = self._pools.get(asyncio.get_running_loop())
+        if pool is None:
+            return
+        pool.borrowers = max(0, pool.borrowers - 1)
+        loop = asyncio.get_running_loop()
+        if pool.borrowers == 0 and loop not in self._persistent_loops:
+            await self._close_pool(loop)
+
+    @asynccontextmanager
+    async def borrowed(self):
+        """Hold the shared session open across several clients' ``async with`` blocks."""
+        session = await self.acquire()
+        try:
+            yield session
+        finally:
+            await self.release()
+
+    def keep_open(self, loop: asyncio.AbstractEventLoop):
+        """Keep the session on ``loop`` open between borrowers."""
+        self._persistent_loops.add(loop)
+
+    async def _close_pool(self, loop: asyncio.AbstractEventLoop):
+        pool = self._pools.pop(loop, None)
+        if pool and not pool.session.closed:
+            await pool.session.close()
+
+    async def close(self):
+        """Close the session for the running loop."""
+        await self._close_pool(asyncio.get_running_loop())
+
+    async def request_json(self, session: aiohttp.ClientSession, method: str, url: str,
+                           **kwargs) -> Dict[str, Any]:
+        """
+        Make a request and decode its JSON body, retrying transient failures.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        ``max_retries`` times with full-jitter exponential backoff; other
+        errors are raised immediately.
+        """
+        host = urlparse(url).netloc
+        attempt = 0
+
+        while True:
+            try:
+                self.stats["requests"] += 1
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRYABLE_STATUSES and attempt < self.config.max_retries:
+                        raise _RetryableStatus(response.status)
+                    response.raise_for_status()
+                    return await response.json()
+            except (_RetryableStatus, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.config.backoff_max,
+                                              self.config.backoff_base * 2 ** attempt))
+                attempt += 1
+                self._record("retries", host)
+                logger.warning(f"Retrying {host} in {delay:.2f}s (attempt {attempt}) after: {e!r}")
+                await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection reuse and DNS cache statistics for this process."""
+        created = self.stats["connections_created"]
+        reused = self.stats["connections_reused"]
+        dns_hits = self.stats["dns_cache_hits"]
+        dns_misses = self.stats["dns_cache_misses"]
+        return {
+            **self.stats,
+            "connection_reuse_ratio": reused / (created + reused) if created + reused else 0.0,
+            "dns_cache_hit_ratio": dns_hits / (dns_hits + dns_misses) if dns_hits + dns_misses else 0.0,
+            "open_sessions": sum(1 for p in self._pools.values() if not p.session.closed)
+        }
+
+    def _record(self, event: str, host: str):
+        """Count a transport event and report it to Prometheus."""
+        self.stats[event] += 1
+        if self._metrics is None:
+            return
+        try:
+            self._metrics.record_http_client_event(event, host)
+        except Exception:
+            pass
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Hooks that count new vs reused connections and DNS cache hits."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self._record("connections_created", context.host)
+
+        async def on_connection_reuseconn(session, context, params):
+            self._record("connections_reused", context.host)
+
+        async def on_dns_cache_hit(session, context, params):
+            self._record("dns_cache_hits", params.host)
+
+        async def on_dns_cache_miss(session, context, params):
+            self._record("dns_cache_misses", params.host)
+
+        async def on_request_start(session, context, params):
+            context.host = params.url.host
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+
+class _RetryableStatus(Exception):
+    """Response status that should be retried."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+# Global transport instance
+_transport: Optional[HTTPTransport] = None
+
+
+def get_http_transport() -> HTTPTransport:
+    """Get the process-wide ingestion HTTP transport."""
+    global _transport
+    if _transport is None:
+        _transport = HTTPTransport()
+    return _transport
+
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_pid: Optional[int] = None
+
+
+def run_in_worker_loop(coro):
+    """
+    Run a coroutine on this process's long-lived ingestion event loop.
+
+    Celery tasks used to create and close a loop per run, which also
+    discarded every pooled connection. The worker loop is kept open (and
+    recreated after a fork) so the shared session stays warm between runs.
+    """
+    global _worker_loop, _worker_loop_pid
+
+    if _worker_loop is None or _worker_loop.is_closed() or _worker_loop_pid != os.getpid():
+        _worker_loop = asyncio.new_event_loop()
+        _worker_loop_pid = os.getpid()
+    # Marked on every call so a transport installed after the loop was created also keeps it
+    get_http_transport().keep_open(_worker_loop)
+
+    if _worker_loop.is_running():
+        # Re-entrant call (e.g. from a thread pool worker): use a throwaway loop
+        return asyncio.run(coro)
+
+    asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
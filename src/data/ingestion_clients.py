@@ -6,13 +6,15 @@ Provides standardized interfaces for CPCB, IMD, OpenAQ, and Google Maps APIs.
 import logging
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import json
 import os
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
+
+from .http_transport import get_http_transport
 
 logger = logging.getLogger(__name__)
 
@@ -47,21 +49,47 @@ class WeatherPoint:
     metadata: Optional[Dict[str, Any]] = None
 
 
+class HostRateLimiter:
+    """Spaces out request starts to at most ``rate`` per second for each host."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+    
+    async def acquire(self, host: str):
+        """Wait until the next request slot for ``host`` is free and reserve it."""
+        if not self.interval:
+            return
+        
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
 class DataIngestionClient(ABC):
-    """Abstract base class for data ingestion clients."""
+    """
+    Abstract base class for data ingestion clients.
+    
+    Clients borrow the process-wide pooled session from ``HTTPTransport`` for
+    the duration of their ``async with`` block rather than opening their own.
+    """
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key
         self.base_url = base_url
         self.session: Optional[aiohttp.ClientSession] = None
+        self.rate_limiter: Optional[HostRateLimiter] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_http_transport().acquire()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
-            await self.session.close()
+            self.session = None
+            await get_http_transport().release()
     
     @abstractmethod
     async def fetch_data(self, **kwargs) -> List[DataPoint]:
@@ -73,10 +101,13 @@ class DataIngestionClient(ABC):
         if not self.session:
             raise RuntimeError("Client session not initialized. Use async context manager.")
         
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(urlparse(url).netloc)
+        
         try:
-            async with self.session.get(url, params=params, headers=headers) as response:
-                response.raise_for_status()
-                return await response.json()
+            return await get_http_transport().request_json(
+                self.session, "GET", url, params=params, headers=headers
+            )
         except aiohttp.ClientError as e:
             logger.error(f"HTTP request failed for {url}: {e}")
             raise
@@ -94,6 +125,13 @@ class CPCBClient(DataIngestionClient):
             api_key=api_key or os.getenv("CPCB_API_KEY"),
             base_url="https://api.waqi.info"
         )
+        # Concurrency controls for fetching many stations at once
+        self.max_concurrency = int(os.getenv("CPCB_MAX_CONCURRENCY", "5"))
+        self.station_timeout = float(os.getenv("CPCB_STATION_TIMEOUT", "20"))
+        self.batch_deadline = float(os.getenv("CPCB_BATCH_DEADLINE", "120"))
+        self.rate_limiter = HostRateLimiter(float(os.getenv("CPCB_REQUESTS_PER_SECOND", "5")))
+        self._waqi_key_check: Optional[asyncio.Future] = None
+        
         # Real CPCB monitoring stations in Delhi and other major cities
         self.station_mapping = {
             # Delhi stations
@@ -131,6 +169,11 @@ class CPCBClient(DataIngestionClient):
             "WB003": {"name": "Fort William", "lat": 22.5697, "lon": 88.3378, "city": "Kolkata", "state": "West Bengal"},
         }
     
+    @property
+    def default_stations(self) -> List[str]:
+        """Stations fetched when none are specified (Delhi)."""
+        return [sid for sid in self.station_mapping.keys() if sid.startswith("DL")]
+    
     async def fetch_data(self, 
                         stations: Optional[List[str]] = None,
                         start_time: Optional[datetime] = None,
@@ -143,6 +186,11 @@ class CPCBClient(DataIngestionClient):
         2. Falls back to simulated realistic data based on historical patterns
         3. Uses actual station locations and parameters
         
+        Stations are fetched concurrently, at most ``max_concurrency`` at a
+        time. Each station's real-data attempt is bounded by
+        ``station_timeout`` and the whole batch by ``batch_deadline``;
+        stations that run out of time fall back to simulated data.
+        
         Args:
             stations: List of station IDs to fetch data for
             start_time: Start time for data retrieval
@@ -152,23 +200,29 @@ class CPCBClient(DataIngestionClient):
             List of standardized DataPoint objects
         """
         if not stations:
-            # Default to Delhi stations if none specified
-            stations = [sid for sid in self.station_mapping.keys() if sid.startswith("DL")]
+            stations = self.default_stations
         
         if not start_time:
             start_time = datetime.utcnow() - timedelta(hours=1)
         if not end_time:
             end_time = datetime.utcnow()
         
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        deadline = asyncio.get_running_loop().time() + self.batch_deadline
+        
+        results = await asyncio.gather(
+            *(self._fetch_station_data(station_id, start_time, end_time, semaphore, deadline)
+              for station_id in stations),
+            return_exceptions=True
+        )
+        
         data_points = []
         
-        for station_id in stations:
-            try:
-                station_data = await self._fetch_station_data(station_id, start_time, end_time)
-                data_points.extend(station_data)
-            except Exception as e:
-                logger.error(f"Failed to fetch CPCB data for station {station_id}: {e}")
+        for station_id, station_data in zip(stations, results):
+            if isinstance(station_data, Exception):
+                logger.error(f"Failed to fetch CPCB data for station {station_id}: {station_data}")
                 continue
+            data_points.extend(station_data)
         
         logger.info(f"Fetched {len(data_points)} data points from CPCB")
         return data_points
@@ -176,7 +230,9 @@ class CPCBClient(DataIngestionClient):
     async def _fetch_station_data(self, 
                                  station_id: str, 
                                  start_time: datetime, 
-                                 end_time: datetime) -> List[DataPoint]:
+                                 end_time: datetime,
+                                 semaphore: Optional[asyncio.Semaphore] = None,
+                                 deadline: Optional[float] = None) -> List[DataPoint]:
         """Fetch data for a specific CPCB station."""
         station_info = self.station_mapping.get(station_id)
         if not station_info:
@@ -185,15 +241,36 @@ class CPCBClient(DataIngestionClient):
         
         try:
             # Attempt to fetch real data from CPCB portal
-            real_data = await self._fetch_from_cpcb_portal(station_id, station_info)
+            real_data = await self._fetch_real_station_data(station_id, station_info, semaphore, deadline)
             if real_data:
                 return real_data
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching real CPCB data for {station_id}")
         except Exception as e:
             logger.warning(f"Failed to fetch real CPCB data for {station_id}: {e}")
         
         # Fallback to realistic simulated data based on station location and time
         return await self._generate_realistic_data(station_id, station_info, start_time)
     
+    async def _fetch_real_station_data(self,
+                                       station_id: str,
+                                       station_info: Dict[str, Any],
+                                       semaphore: Optional[asyncio.Semaphore],
+                                       deadline: Optional[float]) -> Optional[List[DataPoint]]:
+        """Real-data attempt for one station within its concurrency slot and time budget."""
+        semaphore = semaphore or asyncio.Semaphore(1)
+        
+        async with semaphore:
+            timeout = self.station_timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - asyncio.get_running_loop().time())
+            if timeout <= 0:
+                raise asyncio.TimeoutError()
+            
+            return await asyncio.wait_for(
+                self._fetch_from_cpcb_portal(station_id, station_info), timeout
+            )
+    
     async def _fetch_from_cpcb_portal(self, station_id: str, station_info: Dict[str, Any]) -> List[DataPoint]:
         """
         Attempt to fetch real data from CPCB via available APIs.
@@ -295,6 +372,17 @@ class CPCBClient(DataIngestionClient):
             return None
     
     async def _validate_waqi_api_key(self) -> bool:
+        """
+        Validate the WAQI API key once per client.
+        
+        Concurrent station fetches share the same check; it is shielded so a
+        station that times out does not cancel it for the others.
+        """
+        if self._waqi_key_check is None:
+            self._waqi_key_check = asyncio.ensure_future(self._check_waqi_api_key())
+        return await asyncio.shield(self._waqi_key_check)
+    
+    async def _check_waqi_api_key(self) -> bool:
         """Validate WAQI API key by making a test request."""
         try:
             # Test with a simple city search
@@ -2172,16 +2260,69 @@ class GoogleMapsClient(DataIngestionClient):
         return []
 
 
+# Per-source deadline (seconds) within one orchestrated ingestion run
+SOURCE_DEADLINES = {
+    "cpcb": float(os.getenv("INGESTION_DEADLINE_CPCB", "120")),
+    "openaq": float(os.getenv("INGESTION_DEADLINE_OPENAQ", "90")),
+    "imd": float(os.getenv("INGESTION_DEADLINE_IMD", "90")),
+    "google_maps": float(os.getenv("INGESTION_DEADLINE_GOOGLE_MAPS", "60")),
+    "tropomi": float(os.getenv("INGESTION_DEADLINE_TROPOMI", "300")),
+    "viirs": float(os.getenv("INGESTION_DEADLINE_VIIRS", "300"))
+}
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in an orchestrated ingestion run."""
+    source: str
+    kind: str  # "air_quality", "weather", "traffic" or "satellite"
+    points: List[Any]
+    latency_seconds: float
+    status: str = "ok"  # "ok", "timeout" or "failed"
+    error: Optional[str] = None
+    
+    def summary(self) -> Dict[str, Any]:
+        """Per-source latency and outcome for run reports."""
+        return {
+            "kind": self.kind,
+            "status": self.status,
+            "latency_seconds": round(self.latency_seconds, 3),
+            "points": len(self.points),
+            "error": self.error
+        }
+
+
+SourceCallback = Callable[[SourceResult], Awaitable[None]]
+
+
 class DataIngestionOrchestrator:
-    """Orchestrates data ingestion from multiple sources."""
+    """
+    Orchestrates data ingestion from multiple sources.
     
-    def __init__(self):
+    Every source runs as its own task under its own deadline, so a run takes
+    as long as its slowest source and one failing or hanging source does not
+    hold up or drop the others. Callers can pass ``on_source_complete`` to
+    handle (e.g. store) each source's results as soon as that source finishes.
+    """
+    
+    def __init__(self, deadlines: Optional[Dict[str, float]] = None):
         self.clients = {}
         # Satellite clients are managed separately due to different data structures
         self.satellite_clients = {
             "tropomi": None,  # Will be imported when needed
             "viirs": None     # Will be imported when needed
         }
+        self.deadlines = {**SOURCE_DEADLINES, **(deadlines or {})}
+        self.metrics = self._load_metrics_collector()
+    
+    @staticmethod
+    def _load_metrics_collector():
+        """Prometheus collector, imported up front so a run never imports it on the event loop."""
+        try:
+            from src.api.prometheus_metrics import get_metrics_collector
+            return get_metrics_collector()
+        except Exception:
+            return None
     
     async def initialize_clients(self):
         """Initialize all data ingestion clients."""
@@ -2204,18 +2345,40 @@ class DataIngestionOrchestrator:
     async def ingest_all_sources(self, 
                                locations: List[Tuple[float, float]] = None,
                                start_time: Optional[datetime] = None,
-                               end_time: Optional[datetime] = None) -> Dict[str, List]:
+                               end_time: Optional[datetime] = None,
+                               on_source_complete: Optional[SourceCallback] = None) -> Dict[str, Any]:
         """
-        Ingest data from all available ground-based sources.
+        Ingest data from all available ground-based sources concurrently.
         
         Args:
             locations: List of (lat, lon) coordinates
             start_time: Start time for data retrieval
             end_time: End time for data retrieval
+            on_source_complete: Awaited with each source's SourceResult as it finishes
             
         Returns:
-            Dictionary with data from all sources
+            Dictionary with data from all sources and per-source stats under "source_stats"
         """
+        # One pooled session serves every source in this run
+        async with get_http_transport().borrowed():
+            source_results = await self._run_sources(
+                self._ground_sources(locations, start_time, end_time), on_source_complete
+            )
+        
+        results = self._collect_results(source_results)
+        
+        logger.info(f"Ground-based ingestion completed: {len(results['air_quality'])} AQ points, "
+                   f"{len(results['weather'])} weather points, "
+                   f"{len(results['traffic'])} traffic points "
+                   f"({self._format_latencies(source_results)})")
+        
+        return results
+    
+    def _ground_sources(self,
+                        locations: Optional[List[Tuple[float, float]]],
+                        start_time: Optional[datetime],
+                        end_time: Optional[datetime]) -> List[Tuple[str, str, Callable[[], Awaitable[List]]]]:
+        """(source, kind, fetch) for CPCB, OpenAQ, IMD and Google Maps."""
         if not locations:
             # Default Delhi area locations
             locations = [
@@ -2225,34 +2388,110 @@ class DataIngestionOrchestrator:
                 (28.5706, 77.0688),  # South Delhi
             ]
         
-        results = {
-            "air_quality": [],
-            "weather": [],
-            "traffic": []
-        }
+        return [
+            ("cpcb", "air_quality", lambda: self._fetch_cpcb(start_time, end_time)),
+            ("openaq", "air_quality", lambda: self._fetch_openaq(start_time, end_time)),
+            ("imd", "weather", lambda: self._fetch_imd(locations, start_time, end_time)),
+            ("google_maps", "traffic", lambda: self._fetch_traffic(locations))
+        ]
+    
+    async def _run_sources(self,
+                           sources: List[Tuple[str, str, Callable[[], Awaitable[List]]]],
+                           on_source_complete: Optional[SourceCallback]) -> List[SourceResult]:
+        """Run every source as a concurrent task; results keep the order of ``sources``."""
+        return await asyncio.gather(*(
+            self._run_source(source, kind, fetch, on_source_complete)
+            for source, kind, fetch in sources
+        ))
+    
+    async def _run_source(self,
+                          source: str,
+                          kind: str,
+                          fetch: Callable[[], Awaitable[List]],
+                          on_source_complete: Optional[SourceCallback]) -> SourceResult:
+        """Fetch one source under its deadline; failures are recorded, never raised."""
+        loop = asyncio.get_running_loop()
+        deadline = self.deadlines.get(source)
+        started = loop.time()
         
-        # Ingest air quality data
         try:
-            async with self.clients["cpcb"] as cpcb_client:
-                cpcb_data = await cpcb_client.fetch_data(
-                    start_time=start_time, 
-                    end_time=end_time
-                )
-                results["air_quality"].extend(cpcb_data)
+            points = await asyncio.wait_for(fetch(), timeout=deadline)
+            result = SourceResult(source, kind, list(points or []), loop.time() - started)
+        except asyncio.TimeoutError:
+            logger.error(f"{source} ingestion exceeded its {deadline}s deadline")
+            result = SourceResult(source, kind, [], loop.time() - started,
+                                  status="timeout", error=f"deadline of {deadline}s exceeded")
         except Exception as e:
-            logger.error(f"CPCB ingestion failed: {e}")
+            logger.error(f"{source} ingestion failed: {e}")
+            result = SourceResult(source, kind, [], loop.time() - started,
+                                  status="failed", error=str(e))
         
+        self._record_source_metrics(result)
+        
+        if on_source_complete:
+            try:
+                await on_source_complete(result)
+            except Exception as e:
+                logger.error(f"Handling {source} results failed: {e}")
+        
+        return result
+    
+    def _record_source_metrics(self, result: SourceResult):
+        """Report a source's fetch latency and outcome to Prometheus."""
+        if self.metrics is None:
+            return
         try:
-            async with self.clients["openaq"] as openaq_client:
-                openaq_data = await openaq_client.fetch_data(
-                    start_time=start_time,
-                    end_time=end_time
-                )
-                results["air_quality"].extend(openaq_data)
-        except Exception as e:
-            logger.error(f"OpenAQ ingestion failed: {e}")
+            self.metrics.record_data_processing(result.source, "fetch", result.latency_seconds)
+            if result.status != "ok":
+                self.metrics.record_data_ingestion_error(result.source, result.status)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _collect_results(source_results: List[SourceResult]) -> Dict[str, Any]:
+        """Merge per-source results into the air_quality/weather/traffic/satellite layout."""
+        results = {
+            "air_quality": [],
+            "weather": [],
+            "traffic": [],
+            "source_stats": {}
+        }
         
-        # Ingest weather data
+        for result in source_results:
+            if result.kind == "satellite":
+                results.setdefault("satellite", {})[result.source] = result.points
+            else:
+                results[result.kind].extend(result.points)
+            results["source_stats"][result.source] = result.summary()
+        
+        return results
+    
+    @staticmethod
+    def _format_latencies(source_results: List[SourceResult]) -> str:
+        return ", ".join(
+            f"{r.source} {r.latency_seconds:.2f}s" + ("" if r.status == "ok" else f" {r.status}")
+            for r in source_results
+        )
+    
+    async def _fetch_cpcb(self, start_time: Optional[datetime], end_time: Optional[datetime]) -> List[DataPoint]:
+        async with self.clients["cpcb"] as cpcb_client:
+            return await cpcb_client.fetch_data(
+                start_time=start_time, 
+                end_time=end_time
+            )
+    
+    async def _fetch_openaq(self, start_time: Optional[datetime], end_time: Optional[datetime]) -> List[DataPoint]:
+        async with self.clients["openaq"] as openaq_client:
+            return await openaq_client.fetch_data(
+                start_time=start_time,
+                end_time=end_time
+            )
+    
+    async def _fetch_imd(self,
+                         locations: List[Tuple[float, float]],
+                         start_time: Optional[datetime],
+                         end_time: Optional[datetime]) -> List[WeatherPoint]:
+        """IMD observations plus 24h forecast, falling back to OpenWeatherMap."""
         try:
             async with self.clients["imd"] as imd_client:
                 # Use IMD stations for weather data
@@ -2261,7 +2500,6 @@ class DataIngestionOrchestrator:
                     start_time=start_time,
                     end_time=end_time
                 )
-                results["weather"].extend(weather_data)
                 
                 # Also fetch forecast data for better ML model input
                 forecast_data = await imd_client.fetch_forecast_data(
@@ -2271,106 +2509,108 @@ class DataIngestionOrchestrator:
                 # Add forecast data with a different source identifier
                 for forecast_point in forecast_data:
                     forecast_point.source = "imd_forecast"
-                    results["weather"].append(forecast_point)
-                    
+                
+                return list(weather_data) + list(forecast_data)
+                
         except Exception as e:
             logger.error(f"IMD weather ingestion failed: {e}")
             
-            # Fallback to OpenWeatherMap if IMD fails
-            try:
-                from ..data.weather_client import get_weather_client
-                weather_client = get_weather_client()
-                
-                # Get weather for major cities as fallback
-                cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata"]
-                for city in cities:
-                    try:
-                        weather_features = weather_client.get_weather_features(city)
-                        city_info = {"Delhi": (28.6139, 77.2090), "Mumbai": (19.0760, 72.8777),
-                                   "Bangalore": (12.9716, 77.5946), "Chennai": (13.0827, 80.2707),
-                                   "Kolkata": (22.5726, 88.3639)}.get(city, (28.6139, 77.2090))
-                        
-                        fallback_weather = WeatherPoint(
-                            timestamp=datetime.utcnow(),
-                            location=city_info,
-                            temperature=weather_features.get("temperature"),
-                            humidity=weather_features.get("humidity"),
-                            wind_speed=weather_features.get("wind_speed"),
-                            wind_direction=0.0,  # Not available in weather_features
-                            pressure=weather_features.get("pressure"),
-                            precipitation=0.0,  # Not available in weather_features
-                            visibility=weather_features.get("visibility"),
-                            source="openweather_fallback",
-                            metadata={"city": city, "note": "Fallback weather data from OpenWeatherMap"}
-                        )
-                        results["weather"].append(fallback_weather)
-                    except Exception as city_error:
-                        logger.error(f"Failed to get fallback weather for {city}: {city_error}")
-                        
-            except Exception as fallback_error:
-                logger.error(f"Weather fallback also failed: {fallback_error}")
-        
-        # Ingest traffic data
+            # Fallback to OpenWeatherMap if IMD fails; the weather client is
+            # synchronous, so keep it off the loop the other sources share
+            return await asyncio.to_thread(self._fetch_openweather_fallback)
+    
+    @staticmethod
+    def _fetch_openweather_fallback() -> List[WeatherPoint]:
+        """Current weather for major cities from OpenWeatherMap."""
+        fallback = []
         try:
-            async with self.clients["google_maps"] as maps_client:
-                traffic_data = await maps_client.fetch_traffic_data(locations=locations)
-                results["traffic"].extend(traffic_data)
-        except Exception as e:
-            logger.error(f"Google Maps traffic ingestion failed: {e}")
-        
-        logger.info(f"Ground-based ingestion completed: {len(results['air_quality'])} AQ points, "
-                   f"{len(results['weather'])} weather points, "
-                   f"{len(results['traffic'])} traffic points")
+            from ..data.weather_client import get_weather_client
+            weather_client = get_weather_client()
+            
+            # Get weather for major cities as fallback
+            cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata"]
+            for city in cities:
+                try:
+                    weather_features = weather_client.get_weather_features(city)
+                    city_info = {"Delhi": (28.6139, 77.2090), "Mumbai": (19.0760, 72.8777),
+                               "Bangalore": (12.9716, 77.5946), "Chennai": (13.0827, 80.2707),
+                               "Kolkata": (22.5726, 88.3639)}.get(city, (28.6139, 77.2090))
+                    
+                    fallback_weather = WeatherPoint(
+                        timestamp=datetime.utcnow(),
+                        location=city_info,
+                        temperature=weather_features.get("temperature"),
+                        humidity=weather_features.get("humidity"),
+                        wind_speed=weather_features.get("wind_speed"),
+                        wind_direction=0.0,  # Not available in weather_features
+                        pressure=weather_features.get("pressure"),
+                        precipitation=0.0,  # Not available in weather_features
+                        visibility=weather_features.get("visibility"),
+                        source="openweather_fallback",
+                        metadata={"city": city, "note": "Fallback weather data from OpenWeatherMap"}
+                    )
+                    fallback.append(fallback_weather)
+                except Exception as city_error:
+                    logger.error(f"Failed to get fallback weather for {city}: {city_error}")
+                    
+        except Exception as fallback_error:
+            logger.error(f"Weather fallback also failed: {fallback_error}")
         
-        return results
+        return fallback
+    
+    async def _fetch_traffic(self, locations: List[Tuple[float, float]]) -> List[TrafficPoint]:
+        async with self.clients["google_maps"] as maps_client:
+            return await maps_client.fetch_traffic_data(locations=locations)
     
     async def ingest_all_sources_with_satellite(self, 
                                               locations: List[Tuple[float, float]] = None,
                                               bbox: Dict[str, float] = None,
                                               start_time: Optional[datetime] = None,
-                                              end_time: Optional[datetime] = None) -> Dict[str, List]:
+                                              end_time: Optional[datetime] = None,
+                                              on_source_complete: Optional[SourceCallback] = None) -> Dict[str, Any]:
         """
-        Ingest data from all sources including satellite data.
+        Ingest data from all sources including satellite data, all concurrently.
         
         Args:
             locations: List of (lat, lon) coordinates for ground-based sources
             bbox: Bounding box for satellite data retrieval
             start_time: Start time for data retrieval
             end_time: End time for data retrieval
+            on_source_complete: Awaited with each source's SourceResult as it finishes
             
         Returns:
-            Dictionary with data from all sources including satellite
+            Dictionary with data from all sources including satellite, plus "source_stats"
         """
-        # Get ground-based data
-        ground_results = await self.ingest_all_sources(locations, start_time, end_time)
-        
-        # Get satellite data if clients are available
-        satellite_results = {
-            "tropomi": [],
-            "viirs": []
-        }
+        sources = self._ground_sources(locations, start_time, end_time)
         
+        # Add satellite sources if clients are available
         if self.satellite_clients["tropomi"] and self.satellite_clients["viirs"]:
             try:
                 from .satellite_client import SatelliteDataOrchestrator
                 satellite_orchestrator = SatelliteDataOrchestrator()
-                satellite_data = await satellite_orchestrator.ingest_all_satellite_sources(
-                    bbox=bbox,
-                    start_time=start_time,
-                    end_time=end_time
-                )
-                satellite_results.update(satellite_data)
+                sources += [
+                    ("tropomi", "satellite",
+                     lambda: satellite_orchestrator.fetch_tropomi(bbox, start_time, end_time)),
+                    ("viirs", "satellite",
+                     lambda: satellite_orchestrator.fetch_viirs(bbox, start_time, end_time))
+                ]
             except Exception as e:
                 logger.error(f"Satellite data ingestion failed: {e}")
         
-        # Combine results
-        combined_results = {
-            **ground_results,
-            "satellite": satellite_results
+        async with get_http_transport().borrowed():
+            source_results = await self._run_sources(sources, on_source_complete)
+        
+        combined_results = self._collect_results(source_results)
+        satellite_results = {
+            "tropomi": [],
+            "viirs": [],
+            **combined_results.pop("satellite", {})
         }
+        combined_results["satellite"] = satellite_results
         
-        logger.info(f"Combined ingestion completed: {len(ground_results['air_quality'])} ground AQ points, "
-                   f"{len(satellite_results.get('tropomi', []))} TROPOMI points, "
-                   f"{len(satellite_results.get('viirs', []))} VIIRS points")
+        logger.info(f"Combined ingestion completed: {len(combined_results['air_quality'])} ground AQ points, "
+                   f"{len(satellite_results['tropomi'])} TROPOMI points, "
+                   f"{len(satellite_results['viirs'])} VIIRS points "
+                   f"({self._format_latencies(source_results)})")
         
         return combined_results
\ No newline at end of file
@@ -849,7 +849,7 @@ class SatelliteDataOrchestrator:
                                          start_time: Optional[datetime] = None,
                                          end_time: Optional[datetime] = None) -> Dict[str, List[SatelliteDataPoint]]:
         """
-        Ingest data from all satellite sources.
+        Ingest data from all satellite sources concurrently.
         
         Args:
             bbox: Bounding box for data retrieval
@@ -859,6 +859,61 @@ class SatelliteDataOrchestrator:
         Returns:
             Dictionary with satellite data from all sources
         """
+        results = {
+            "tropomi": [],
+            "viirs": []
+        }
+        
+        fetched = await asyncio.gather(
+            self.fetch_tropomi(bbox, start_time, end_time),
+            self.fetch_viirs(bbox, start_time, end_time),
+            return_exceptions=True
+        )
+        
+        for source, data in zip(("tropomi", "viirs"), fetched):
+            if isinstance(data, Exception):
+                logger.error(f"{source.upper()} ingestion failed: {data}")
+            else:
+                results[source].extend(data)
+        
+        logger.info(f"Satellite ingestion completed: {len(results['tropomi'])} TROPOMI points, "
+                   f"{len(results['viirs'])} VIIRS points")
+        
+        return results
+    
+    async def fetch_tropomi(self,
+                            bbox: Optional[Dict[str, float]] = None,
+                            start_time: Optional[datetime] = None,
+                            end_time: Optional[datetime] = None) -> List[SatelliteDataPoint]:
+        """Fetch TROPOMI trace gas data (NO2, SO2, CO)."""
+        bbox, start_time, end_time = self._resolve_window(bbox, start_time, end_time)
+        async with self.clients["tropomi"] as tropomi_client:
+            return await tropomi_client.fetch_satellite_data(
+                parameters=["no2", "so2", "co"],
+                bbox=bbox,
+                start_time=start_time,
+                end_time=end_time
+            )
+    
+    async def fetch_viirs(self,
+                          bbox: Optional[Dict[str, float]] = None,
+                          start_time: Optional[datetime] = None,
+                          end_time: Optional[datetime] = None) -> List[SatelliteDataPoint]:
+        """Fetch VIIRS aerosol optical depth and fire radiative power data."""
+        bbox, start_time, end_time = self._resolve_window(bbox, start_time, end_time)
+        async with self.clients["viirs"] as viirs_client:
+            return await viirs_client.fetch_satellite_data(
+                parameters=["aerosol_optical_depth", "fire_radiative_power"],
+                bbox=bbox,
+                start_time=start_time,
+                end_time=end_time
+            )
+    
+    @staticmethod
+    def _resolve_window(bbox: Optional[Dict[str, float]],
+                        start_time: Optional[datetime],
+                        end_time: Optional[datetime]) -> Tuple[Dict[str, float], datetime, datetime]:
+        """Fill in the default India bounding box and last-day time window."""
         if not bbox:
             # Default to India bounding box
             bbox = {
@@ -873,38 +928,4 @@ class SatelliteDataOrchestrator:
         if not end_time:
             end_time = datetime.utcnow()
         
-        results = {
-            "tropomi": [],
-            "viirs": []
-        }
-        
-        # Ingest TROPOMI data
-        try:
-            async with self.clients["tropomi"] as tropomi_client:
-                tropomi_data = await tropomi_client.fetch_satellite_data(
-                    parameters=["no2", "so2", "co"],
-                    bbox=bbox,
-                    start_time=start_time,
-                    end_time=end_time
-                )
-                results["tropomi"].extend(tropomi_data)
-        except Exception as e:
-            logger.error(f"TROPOMI ingestion failed: {e}")
-        
-        # Ingest VIIRS data
-        try:
-            async with self.clients["viirs"] as viirs_client:
-                viirs_data = await viirs_client.fetch_satellite_data(
-                    parameters=["aerosol_optical_depth", "fire_radiative_power"],
-                    bbox=bbox,
-                    start_time=start_time,
-                    end_time=end_time
-                )
-                results["viirs"].extend(viirs_data)
-        except Exception as e:
-            logger.error(f"VIIRS ingestion failed: {e}")
-        
-        logger.info(f"Satellite ingestion completed: {len(results['tropomi'])} TROPOMI points, "
-                   f"{len(results['viirs'])} VIIRS points")
-        
-        return results
\ No newline at end of file
+        return bbox, start_time, end_time
\ No newline at end of file
@@ -0,0 +1,272 @@
+"""
+Incremental ingestion state: per-station high-watermarks and a dedup filter.
+
+Beat runs overlap (CPCB runs every 15 minutes over a one-hour window), so
+without state every run re-fetched and re-inserted observations that were
+already stored. The WatermarkStore remembers, per source and station, the
+newest observation timestamp that was stored; runs skip stations that have
+nothing new yet. The DedupFilter drops repeated (time, station_id, parameter)
+observations before they reach the validator or the database.
+
+Watermarks only gate fetches. They are per station while observations are
+per parameter, so filtering points by them would drop a parameter that
+arrives after another parameter of the same station; repeats are left to
+the DedupFilter and the bulk writer's ON CONFLICT DO NOTHING.
+
+Watermarks live in one Redis hash per source, shared by API and Celery
+workers, with an in-process copy that keeps working while Redis is down.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_RETRY_SECONDS = 60  # Back-off after Redis is unreachable
+
+# How often a station publishes a new reading; stations whose watermark is
+# younger than this are not fetched again
+SOURCE_UPDATE_INTERVALS = {
+    "cpcb": timedelta(minutes=float(os.getenv("INGESTION_UPDATE_INTERVAL_CPCB", "60"))),
+    "openaq": timedelta(minutes=float(os.getenv("INGESTION_UPDATE_INTERVAL_OPENAQ", "60")))
+}
+
+# Observation keys remembered by the dedup filter
+DEFAULT_DEDUP_MAX_KEYS = int(os.getenv("INGESTION_DEDUP_MAX_KEYS", "200000"))
+
+# Raise a station's watermark only, never lower it, even with concurrent workers
+_ADVANCE_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local current = redis.call('HGET', KEYS[1], ARGV[i])
+    if not current or tonumber(current) < tonumber(ARGV[i + 1]) then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+return 1
+"""
+
+
+def _epoch(timestamp: datetime) -> float:
+    """Seconds since the epoch; naive timestamps are UTC, as ingestion clients produce them."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def station_key(point) -> str:
+    """Station identifier a point is stored under."""
+    return point.station_id or f"unknown_{point.source}"
+
+
+def observation_key(point) -> Tuple[float, str, str]:
+    """(time, station_id, parameter) identity of an observation."""
+    return _epoch(point.timestamp), station_key(point), point.parameter
+
+
+class WatermarkStore:
+    """
+    Per-source, per-station high-watermarks backed by Redis
+    """
+
+    def __init__(self, redis_url: Optional[str] = None,
+                 use_redis: bool = True,
+                 key_prefix: str = "ingestion:watermark:"):
+        """
+        Initialize watermark store
+
+        Args:
+            redis_url: Redis connection URL. Defaults to REDIS_URL env var.
+            use_redis: Whether to share watermarks through Redis
+            key_prefix: Prefix for the per-source Redis hashes
+        """
+        self.redis_url = redis_url or REDIS_URL
+        self.use_redis = use_redis
+        self.key_prefix = key_prefix
+
+        self._local: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._redis_client = None
+        self._redis_retry_at = 0.0
+
+    def get_many(self, source: str, station_ids: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """
+        Watermarks for several stations of one source
+
+        Args:
+            source: Data source name, e.g. "cpcb"
+            station_ids: Station identifiers
+
+        Returns:
+            Station ID -> newest stored observation time (naive UTC), or None
+        """
+        station_ids = list(station_ids)
+        epochs = self._read(source, station_ids)
+        return {
+            station_id: (datetime.utcfromtimestamp(epochs[station_id])
+                         if station_id in epochs else None)
+            for station_id in station_ids
+        }
+
+    def due_stations(self, source: str, station_ids: Iterable[str],
+                     interval: Optional[timedelta] = None,
+                     now: Optional[datetime] = None) -> List[str]:
+        """
+        Stations that may have published a reading since their watermark
+
+        Args:
+            source: Data source name
+            station_ids: Candidate station identifiers
+            interval: Station update interval (defaults to SOURCE_UPDATE_INTERVALS)
+            now: Current time (defaults to UTC now)
+
+        Returns:
+            Station IDs without a watermark or whose watermark is at least
+            ``interval`` old, in input order
+        """
+        station_ids = list(station_ids)
+        interval = interval or SOURCE_UPDATE_INTERVALS.get(source, timedelta(0))
+        cutoff = _epoch(now or datetime.utcnow()) - interval.total_seconds()
+        epochs = self._read(source, station_ids)
+        return [sid for sid in station_ids if sid not in epochs or epochs[sid] <= cutoff]
+
+    def advance(self, source: str, points: Iterable):
+        """Raise each station's watermark to its newest stored point."""
+        newest: Dict[str, float] = {}
+        for point in points:
+            station_id = station_key(point)
+            newest[station_id] = max(newest.get(station_id, float("-inf")), _epoch(point.timestamp))
+        if not newest:
+            return
+
+        with self._lock:
+            local = self._local.setdefault(source, {})
+            for station_id, epoch in newest.items():
+                if epoch > local.get(station_id, float("-inf")):
+                    local[station_id] = epoch
+
+        client = self._get_redis()
+        if client is None:
+            return
+
+        try:
+            args = [value for item in newest.items() for value in item]
+            client.eval(_ADVANCE_SCRIPT, 1, f"{self.key_prefix}{source}", *args)
+        except Exception as e:
+            logger.debug(f"Watermark Redis update failed: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _read(self, source: str, station_ids: Iterable[str]) -> Dict[str, float]:
+        """Watermark epochs from Redis and the local copy, whichever is newer."""
+        station_ids = list(station_ids)
+        with self._lock:
+            local = self._local.get(source, {})
+            epochs = {sid: local[sid] for sid in station_ids if sid in local}
+
+        client = self._get_redis()
+        if client is None or not station_ids:
+            return epochs
+
+        try:
+            values = client.hmget(f"{self.key_prefix}{source}", station_ids)
+        except Exception as e:
+            logger.debug(f"Watermark Redis read failed: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return epochs
+
+        for station_id, value in zip(station_ids, values):
+            if value is not None:
+                epochs[station_id] = max(float(value), epochs.get(station_id, float("-inf")))
+        return epochs
+
+    def _get_redis(self):
+        """Get the Redis client, or None while Redis is disabled or backing off"""
+        if not self.use_redis or time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self._redis_client is None:
+            try:
+                from redis import Redis
+                self._redis_client = Redis.from_url(
+                    self.redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5
+                )
+            except Exception as e:
+                logger.warning(f"Watermark store Redis unavailable: {e}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                return None
+
+        return self._redis_client
+
+
+class DedupFilter:
+    """
+    Bounded in-process set of recently stored (time, station_id, parameter) keys
+    """
+
+    def __init__(self, max_keys: int = DEFAULT_DEDUP_MAX_KEYS):
+        """
+        Initialize dedup filter
+
+        Args:
+            max_keys: Number of observation keys remembered; oldest are forgotten first
+        """
+        self.max_keys = max_keys
+        # Insertion-ordered dict used as an ordered set
+        self._seen: Dict[Tuple[float, str, str], None] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, points: List) -> List:
+        """Points not yet seen, with repeats inside ``points`` dropped as well."""
+        unique = []
+        batch_keys = set()
+        with self._lock:
+            for point in points:
+                key = observation_key(point)
+                if key in self._seen or key in batch_keys:
+                    continue
+                batch_keys.add(key)
+                unique.append(point)
+            self.dropped += len(points) - len(unique)
+        return unique
+
+    def add(self, points: Iterable):
+        """Remember stored points so later repeats are dropped."""
+        with self._lock:
+            for point in points:
+                key = observation_key(point)
+                self._seen.pop(key, None)
+                self._seen[key] = None
+            while len(self._seen) > self.max_keys:
+                del self._seen[next(iter(self._seen))]
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+# Global instances shared by all ingestion tasks in the process
+_watermark_store: Optional[WatermarkStore] = None
+_dedup_filter: Optional[DedupFilter] = None
+
+
+def get_watermark_store() -> WatermarkStore:
+    """Get the process-wide watermark store"""
+    global _watermark_store
+    if _watermark_store is None:
+        _watermark_store = WatermarkStore()
+    return _watermark_store
+
+
+def get_dedup_filter() -> DedupFilter:
+    """Get the process-wide observation dedup filter"""
+    global _dedup_filter
+    if _dedup_filter is None:
+        _dedup_filter = DedupFilter()
+    return _dedup_filter
@@ -1,5 +1,16 @@
 # ML Models
-from .forecaster import AQIForecaster
-from .source_attribution import SourceAttributor
+# Loaded on first access so importing a submodule does not pull in xgboost or shap
+import importlib
+
+_EXPORTS = {
+    'AQIForecaster': '.forecaster',
+    'SourceAttributor': '.source_attribution',
+}
 
 __all__ = ['AQIForecaster', 'SourceAttributor']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,18 +5,27 @@ Ensemble Prediction System combining XGBoost, LSTM, and GNN models
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, TYPE_CHECKING
 import logging
 import json
 import os
 from dataclasses import dataclass, asdict
-import mlflow
 
-from .forecaster import AQIForecaster, get_forecaster
-from .lstm_forecaster import LSTMForecaster, get_lstm_forecaster
-from .gnn_spatial import SpatialGNN, Station
+from .inference_runtime import INFERENCE_RUNTIME, RUNTIME_MODEL_DIR, load_runtime_models
 from .mlflow_manager import get_mlflow_manager
 from ..utils.aqi_calculator import AQICalculator
+from ..utils.lazy_imports import lazy_import
+
+mlflow = lazy_import("mlflow")
+
+if TYPE_CHECKING:
+    from .gnn_spatial import Station
+
+
+# Multi-step forecasting strategies supported by forecast_sequence. The
+# members are one-step models without a horizon input, so recursive is the
+# default; direct trades that accuracy for one model call per horizon batch.
+FORECAST_MODES = ("recursive", "direct")
 
 
 @dataclass
@@ -56,34 +65,38 @@ class EnsembleForecaster:
     - Fallback mechanisms for model failures
     """
     
-    def __init__(self, stations: List[Station] = None, 
-                 model_dir: str = "models/ensemble"):
+    def __init__(self, stations: List["Station"] = None, 
+                 model_dir: str = "models/ensemble",
+                 runtime: str = INFERENCE_RUNTIME,
+                 runtime_model_dir: str = RUNTIME_MODEL_DIR):
         """
         Initialize ensemble forecaster
         
         Args:
             stations: List of monitoring stations for GNN
             model_dir: Directory to save/load models and metadata
+            runtime: "onnx" to serve the exported models with onnxruntime,
+                "native" to load the training frameworks
+            runtime_model_dir: Directory holding the exported ONNX models
         """
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
         
-        # Initialize individual models
-        self.xgboost_model = get_forecaster()
+        self.runtime = runtime
+        runtime_models = load_runtime_models(runtime_model_dir) if runtime == "onnx" else {}
         
-        # Initialize LSTM model if available
-        try:
-            self.lstm_model = get_lstm_forecaster()
-        except ImportError:
-            logging.warning("LSTM model not available, using XGBoost only")
-            self.lstm_model = None
+        # Exported models are served as-is; anything not exported is loaded natively
+        self.xgboost_model = runtime_models.get('xgboost') or self._load_xgboost()
         
-        # Initialize GNN model if available and stations provided
-        try:
-            self.gnn_model = SpatialGNN(stations) if stations else None
-        except ImportError:
-            logging.warning("GNN model not available")
-            self.gnn_model = None
+        if 'lstm' in runtime_models:
+            self.lstm_model = runtime_models['lstm']
+        else:
+            self.lstm_model = self._load_lstm()
+        
+        if 'gnn' in runtime_models:
+            self.gnn_model = runtime_models['gnn']
+        else:
+            self.gnn_model = self._load_gnn(stations) if stations else None
         
         # Model weights (dynamic, updated based on performance)
         self.weights = {
@@ -110,6 +123,32 @@ class EnsembleForecaster:
         # Load existing performance data
         self._load_performance_history()
     
+    @staticmethod
+    def _load_xgboost():
+        """Native XGBoost forecaster"""
+        from .forecaster import get_forecaster
+        return get_forecaster()
+    
+    @staticmethod
+    def _load_lstm():
+        """Native LSTM forecaster, or None without TensorFlow"""
+        try:
+            from .lstm_forecaster import get_lstm_forecaster
+            return get_lstm_forecaster()
+        except ImportError:
+            logging.warning("LSTM model not available, using XGBoost only")
+            return None
+    
+    @staticmethod
+    def _load_gnn(stations: List["Station"]):
+        """Native GNN, or None without PyTorch Geometric"""
+        try:
+            from .gnn_spatial import SpatialGNN
+            return SpatialGNN(stations)
+        except ImportError:
+            logging.warning("GNN model not available")
+            return None
+    
     def predict(self, features: pd.DataFrame, 
                 station_data: Optional[Dict[str, np.ndarray]] = None,
                 return_individual: bool = False) -> EnsemblePrediction:
@@ -208,6 +247,113 @@ class EnsembleForecaster:
             uncertainty=round(ensemble_uncertainty, 2)
         )
     
+    def predict_batch(self, features: pd.DataFrame,
+                      station_data: Optional[Dict[str, np.ndarray]] = None,
+                      return_individual: bool = False) -> List[EnsemblePrediction]:
+        """
+        Generate ensemble predictions for many independent rows at once
+        
+        Each member model runs once on the whole frame instead of once per
+        row; weighting, confidence intervals and AQI conversion are vectorized.
+        
+        Args:
+            features: Feature DataFrame with one row per location
+            station_data: Station data for GNN (if available)
+            return_individual: Whether to return individual model predictions
+            
+        Returns:
+            List of EnsemblePrediction objects in row order
+        """
+        n_rows = len(features)
+        individual_predictions: Dict[str, np.ndarray] = {}
+        individual_uncertainties: Dict[str, np.ndarray] = {}
+        available_models = []
+        
+        # Get XGBoost predictions
+        try:
+            xgb_result = self.xgboost_model.predict(features.copy(), return_confidence=True)
+            predictions = np.asarray(xgb_result.get('predictions', []), dtype=np.float64)
+            if len(predictions) == n_rows:
+                individual_predictions['xgboost'] = predictions
+                if 'lower_bound' in xgb_result and 'upper_bound' in xgb_result:
+                    individual_uncertainties['xgboost'] = (
+                        np.asarray(xgb_result['upper_bound']) - np.asarray(xgb_result['lower_bound'])
+                    ) / 2
+                available_models.append('xgboost')
+        except Exception as e:
+            logging.warning(f"XGBoost batch prediction failed: {e}")
+        
+        # Get LSTM predictions
+        try:
+            if self.lstm_model.is_trained:
+                lstm_result = self.lstm_model.predict_batch(features.copy(), return_confidence=True)
+                predictions = np.asarray(lstm_result.get('predictions', []), dtype=np.float64)
+                if len(predictions) == n_rows:
+                    individual_predictions['lstm'] = predictions
+                    if 'lower_bound' in lstm_result and 'upper_bound' in lstm_result:
+                        individual_uncertainties['lstm'] = (
+                            np.asarray(lstm_result['upper_bound']) - np.asarray(lstm_result['lower_bound'])
+                        ) / 2
+                    available_models.append('lstm')
+        except Exception as e:
+            logging.warning(f"LSTM batch prediction failed: {e}")
+        
+        # Get GNN prediction (station-level, shared by every row as in predict)
+        try:
+            if self.gnn_model and self.gnn_model.is_trained and station_data:
+                gnn_predictions = self.gnn_model.predict_spatial(station_data)
+                if gnn_predictions:
+                    values = list(gnn_predictions.values())
+                    individual_predictions['gnn'] = np.full(n_rows, float(np.mean(values)))
+                    individual_uncertainties['gnn'] = np.full(
+                        n_rows, float(np.std(values)) if len(values) > 1 else 10.0
+                    )
+                    available_models.append('gnn')
+        except Exception as e:
+            logging.warning(f"GNN prediction failed: {e}")
+        
+        if len(available_models) < self.min_models_required:
+            raise ValueError(f"Not enough models available for ensemble prediction. "
+                           f"Available: {available_models}, Required: {self.min_models_required}")
+        
+        # _calculate_ensemble is elementwise, so it works on whole arrays
+        ensemble_pred, ensemble_uncertainty = self._calculate_ensemble(
+            individual_predictions, individual_uncertainties, available_models
+        )
+        ensemble_pred = np.broadcast_to(np.asarray(ensemble_pred, dtype=np.float64), (n_rows,))
+        ensemble_uncertainty = np.broadcast_to(np.asarray(ensemble_uncertainty, dtype=np.float64), (n_rows,))
+        
+        confidence_multiplier = 1.28 if self.confidence_level == 0.8 else 1.96  # 80% or 95%
+        lower_bound = np.maximum(0, ensemble_pred - confidence_multiplier * ensemble_uncertainty)
+        upper_bound = ensemble_pred + confidence_multiplier * ensemble_uncertainty
+        
+        aqi = self.aqi_calc.calculate_sub_index_array(ensemble_pred, 'pm25')
+        categories = self.aqi_calc.get_categories(aqi)
+        
+        max_uncertainty = 50.0  # Maximum expected uncertainty
+        confidence = np.maximum(0.1, 1.0 - np.minimum(ensemble_uncertainty / max_uncertainty, 1.0))
+        
+        current_weights = {model: self.weights[model] for model in available_models}
+        timestamp = datetime.now()
+        
+        return [
+            EnsemblePrediction(
+                timestamp=timestamp,
+                pm25=round(float(ensemble_pred[i]), 1),
+                pm25_lower=round(float(lower_bound[i]), 1),
+                pm25_upper=round(float(upper_bound[i]), 1),
+                aqi=float(aqi[i]),
+                category=str(categories[i]),
+                confidence=round(float(confidence[i]), 3),
+                model_weights=current_weights,
+                individual_predictions={
+                    model: float(values[i]) for model, values in individual_predictions.items()
+                } if return_individual else {},
+                uncertainty=round(float(ensemble_uncertainty[i]), 2)
+            )
+            for i in range(n_rows)
+        ]
+    
     def _calculate_ensemble(self, predictions: Dict[str, float], 
                            uncertainties: Dict[str, float],
                            available_models: List[str]) -> Tuple[float, float]:
@@ -261,19 +407,51 @@ class EnsembleForecaster:
     def forecast_sequence(self, initial_features: pd.DataFrame,
                          weather_forecast: List[Dict],
                          station_data: Optional[Dict[str, np.ndarray]] = None,
-                         hours: int = 24) -> List[EnsemblePrediction]:
+                         hours: int = 24,
+                         mode: str = "recursive") -> List[EnsemblePrediction]:
         """
         Generate multi-step ensemble forecast
         
+        ``recursive`` mode predicts hour by hour, feeding each prediction back
+        as ``pm25_lag1``. In ``direct`` mode the features for every horizon are
+        built at once and each model runs once on the whole horizon batch;
+        every horizon then keeps the initial ``pm25_lag1``, which the one-step
+        members were not trained for.
+        
         Args:
             initial_features: Initial feature data
             weather_forecast: Weather forecast data
             station_data: Station data for GNN
             hours: Number of hours to forecast
+            mode: ``recursive`` or ``direct``
             
         Returns:
             List of EnsemblePrediction objects
         """
+        if mode == "recursive":
+            return self._forecast_recursive(initial_features, weather_forecast, station_data, hours)
+        if mode != "direct":
+            raise ValueError(f"Unknown forecast mode: {mode}. Expected one of {FORECAST_MODES}")
+        
+        now = datetime.now()
+        forecast_times = [now + timedelta(hours=h) for h in range(1, hours + 1)]
+        
+        try:
+            horizon_features = self._horizon_features(initial_features, weather_forecast, forecast_times)
+            forecasts = self.predict_batch(horizon_features, station_data, return_individual=True)
+        except Exception as e:
+            logging.error(f"Direct ensemble forecast failed: {e}")
+            return [self._fallback_prediction(forecast_time) for forecast_time in forecast_times]
+        
+        for prediction, forecast_time in zip(forecasts, forecast_times):
+            prediction.timestamp = forecast_time
+        return forecasts
+    
+    def _forecast_recursive(self, initial_features: pd.DataFrame,
+                            weather_forecast: List[Dict],
+                            station_data: Optional[Dict[str, np.ndarray]],
+                            hours: int) -> List[EnsemblePrediction]:
+        """Hour-by-hour forecast feeding each prediction into the next step"""
         forecasts = []
         current_features = initial_features.copy()
         
@@ -306,20 +484,148 @@ class EnsembleForecaster:
                 
             except Exception as e:
                 logging.error(f"Ensemble forecast failed at hour {h}: {e}")
-                # Create fallback prediction
-                fallback_pred = EnsemblePrediction(
-                    timestamp=forecast_time,
-                    pm25=100.0,  # Default moderate pollution
-                    pm25_lower=80.0,
-                    pm25_upper=120.0,
-                    aqi=101,
-                    category='moderate',
-                    confidence=0.1,
-                    model_weights={},
-                    individual_predictions={},
-                    uncertainty=20.0
-                )
-                forecasts.append(fallback_pred)
+                forecasts.append(self._fallback_prediction(forecast_time))
+        
+        return forecasts
+    
+    def _horizon_features(self, initial_features: pd.DataFrame,
+                          weather_forecast: List[Dict],
+                          forecast_times: List[datetime]) -> pd.DataFrame:
+        """
+        Feature matrix with one row per forecast horizon
+        
+        The last observed row is repeated for every horizon, then weather and
+        calendar features are set for all horizons at once. Horizons past the
+        end of the weather forecast keep its last hour, as in recursive mode.
+        """
+        hours = len(forecast_times)
+        features = initial_features.iloc[[-1] * hours].reset_index(drop=True)
+        
+        weather = pd.DataFrame(weather_forecast[:hours]).reindex(range(hours)).ffill()
+        for key in weather.columns:
+            if key in features.columns:
+                features[key] = weather[key].fillna(features[key]).to_numpy()
+        
+        times = pd.DatetimeIndex(forecast_times)
+        hour = times.hour.to_numpy()
+        day_of_week = times.dayofweek.to_numpy()
+        calendar = {
+            'timestamp': times,
+            'hour': hour,
+            'day_of_week': day_of_week,
+            'is_weekend': (day_of_week >= 5).astype(int),
+            'is_rush_hour': (((8 <= hour) & (hour <= 10)) | ((17 <= hour) & (hour <= 20))).astype(int),
+            'hour_sin': np.sin(2 * np.pi * hour / 24),
+            'hour_cos': np.cos(2 * np.pi * hour / 24)
+        }
+        for key, values in calendar.items():
+            if key in features.columns:
+                features[key] = values
+        
+        return features
+    
+    def _fallback_prediction(self, timestamp: datetime) -> EnsemblePrediction:
+        """Default moderate prediction used when the ensemble fails"""
+        return EnsemblePrediction(
+            timestamp=timestamp,
+            pm25=100.0,  # Default moderate pollution
+            pm25_lower=80.0,
+            pm25_upper=120.0,
+            aqi=101,
+            category='moderate',
+            confidence=0.1,
+            model_weights={},
+            individual_predictions={},
+            uncertainty=20.0
+        )
+    
+    def forecast_sequence_batch(self, initial_features: pd.DataFrame,
+                                weather_forecasts: List[List[Dict]],
+                                station_data: Optional[Dict[str, np.ndarray]] = None,
+                                hours: int = 24,
+                                mode: str = "recursive") -> List[List[EnsemblePrediction]]:
+        """
+        Generate multi-step ensemble forecasts for many locations at once
+        
+        Batched counterpart of ``forecast_sequence``. ``recursive`` mode runs
+        one ``predict_batch`` per hour for all locations; in ``direct`` mode
+        the horizons of all locations form one batch, so each model runs once
+        per call.
+        
+        Args:
+            initial_features: Initial feature data, one row per location
+            weather_forecasts: Weather forecast data for each location
+            station_data: Station data for GNN
+            hours: Number of hours to forecast
+            mode: ``recursive`` or ``direct``
+            
+        Returns:
+            One list of EnsemblePrediction objects per location
+        """
+        if mode == "recursive":
+            return self._forecast_recursive_batch(initial_features, weather_forecasts, station_data, hours)
+        if mode != "direct":
+            raise ValueError(f"Unknown forecast mode: {mode}. Expected one of {FORECAST_MODES}")
+        
+        now = datetime.now()
+        forecast_times = [now + timedelta(hours=h) for h in range(1, hours + 1)]
+        initial_features = initial_features.reset_index(drop=True)
+        
+        try:
+            horizon_features = pd.concat([
+                self._horizon_features(initial_features.iloc[[i]], weather_forecast, forecast_times)
+                for i, weather_forecast in enumerate(weather_forecasts)
+            ], ignore_index=True)
+            predictions = self.predict_batch(horizon_features, station_data, return_individual=True)
+        except Exception as e:
+            logging.error(f"Direct batch ensemble forecast failed: {e}")
+            return [
+                [self._fallback_prediction(forecast_time) for forecast_time in forecast_times]
+                for _ in range(len(initial_features))
+            ]
+        
+        for i, prediction in enumerate(predictions):
+            prediction.timestamp = forecast_times[i % hours]
+        return [predictions[i:i + hours] for i in range(0, len(predictions), hours)]
+    
+    def _forecast_recursive_batch(self, initial_features: pd.DataFrame,
+                                  weather_forecasts: List[List[Dict]],
+                                  station_data: Optional[Dict[str, np.ndarray]],
+                                  hours: int) -> List[List[EnsemblePrediction]]:
+        """Hour-by-hour forecast for many locations, one predict_batch per hour"""
+        current_features = initial_features.reset_index(drop=True).copy()
+        n_rows = len(current_features)
+        forecasts: List[List[EnsemblePrediction]] = [[] for _ in range(n_rows)]
+        
+        for h in range(1, hours + 1):
+            forecast_time = datetime.now() + timedelta(hours=h)
+            
+            # Update weather features for every location with a forecast for this hour
+            for key in current_features.columns:
+                if not all(h <= len(wf) and key in wf[h-1] for wf in weather_forecasts):
+                    continue
+                current_features[key] = [wf[h-1][key] for wf in weather_forecasts]
+            
+            # Update time-based features
+            if 'hour' in current_features.columns:
+                current_features['hour'] = forecast_time.hour
+            if 'day_of_week' in current_features.columns:
+                current_features['day_of_week'] = forecast_time.weekday()
+            
+            try:
+                predictions = self.predict_batch(current_features, station_data, return_individual=True)
+                for location_forecasts, prediction in zip(forecasts, predictions):
+                    prediction.timestamp = forecast_time
+                    location_forecasts.append(prediction)
+                
+                # Update features with predictions for next iteration
+                if 'pm25_lag1' in current_features.columns:
+                    current_features['pm25_lag1'] = [p.pm25 for p in predictions]
+                
+            except Exception as e:
+                logging.error(f"Batch ensemble forecast failed at hour {h}: {e}")
+                for location_forecasts in forecasts:
+                    location_forecasts.append(self._fallback_prediction(forecast_time))
         
         return forecasts
     
@@ -472,6 +778,7 @@ class EnsembleForecaster:
         """
         status = {
             'ensemble_weights': self.weights.copy(),
+            'runtime': self.runtime,
             'models': {}
         }
         
@@ -572,7 +879,7 @@ class EnsembleForecaster:
 # Singleton instance
 _ensemble_forecaster_instance = None
 
-def get_ensemble_forecaster(stations: List[Station] = None) -> EnsembleForecaster:
+def get_ensemble_forecaster(stations: List["Station"] = None) -> EnsembleForecaster:
     """Get or create ensemble forecaster instance"""
     global _ensemble_forecaster_instance
     if _ensemble_forecaster_instance is None:
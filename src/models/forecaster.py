@@ -8,16 +8,16 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import os
 
+from ..utils.lazy_imports import lazy_import
+
 # Try to import XGBoost, fall back to simpler model if not available
 try:
-    import xgboost as xgb
+    xgb = lazy_import("xgboost")
     XGBOOST_AVAILABLE = True
 except ImportError:
     XGBOOST_AVAILABLE = False
     print("XGBoost not available, using simplified forecast model")
 
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
 import pickle
 
 
@@ -32,6 +32,9 @@ class AQIForecaster:
     """
     
     def __init__(self, model_path: str = None):
+        # sklearn is imported here rather than at module level to keep API startup fast
+        from sklearn.preprocessing import StandardScaler
+        
         self.model_path = model_path
         self.model = None
         self.scaler = StandardScaler()
@@ -64,6 +67,7 @@ class AQIForecaster:
                 n_jobs=-1
             )
         else:
+            from sklearn.ensemble import GradientBoostingRegressor
             return GradientBoostingRegressor(
                 n_estimators=self.params['n_estimators'],
                 max_depth=self.params['max_depth'],
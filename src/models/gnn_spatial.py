@@ -11,30 +11,19 @@ import pickle
 import logging
 from dataclasses import dataclass
 
+from ..utils.lazy_imports import lazy_import, module_available
+
+# PyTorch and PyTorch Geometric are imported when a model is first used
 try:
-    import torch
-    import torch.nn as nn
-    import torch.nn.functional as F
-    from torch_geometric.nn import GCNConv, GATConv, global_mean_pool
-    from torch_geometric.data import Data, Batch
-    from torch_geometric.utils import to_networkx
-    import torch_geometric
+    torch = lazy_import("torch")
+    nn = lazy_import("torch.nn")
+    F = lazy_import("torch.nn.functional")
+    if not module_available("torch_geometric"):
+        raise ImportError("No module named 'torch_geometric'")
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
     logging.warning("PyTorch Geometric not available, GNN model will not work")
-    # Create dummy classes for type hints when PyTorch is not available
-    class Data:
-        pass
-    class nn:
-        class Module:
-            pass
-        class ModuleList:
-            pass
-        class Dropout:
-            pass
-        class BatchNorm1d:
-            pass
 
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
@@ -42,6 +31,7 @@ from scipy.spatial.distance import pdist, squareform
 from scipy.stats import pearsonr
 
 from .mlflow_manager import get_mlflow_manager
+from ..utils.spatial_interpolation import idw_interpolate
 
 
 @dataclass
@@ -187,7 +177,7 @@ class SpatialGNN:
         
         logging.info(f"Updated spatial graph with correlation, {len(edge_indices[0])} edges")
     
-    def _build_gnn_model(self, input_dim: int) -> nn.Module:
+    def _build_gnn_model(self, input_dim: int) -> "nn.Module":
         """
         Build Graph Neural Network model
         
@@ -197,6 +187,8 @@ class SpatialGNN:
         Returns:
             PyTorch GNN model
         """
+        from torch_geometric.nn import GCNConv
+        
         class SpatialGNNModel(nn.Module):
             def __init__(self, input_dim, hidden_dim, num_layers):
                 super().__init__()
@@ -395,8 +387,10 @@ class SpatialGNN:
         min_length = min(len(data['features']) for data in train_data.values())
         return list(range(min_length))
     
-    def _create_graph_data(self, train_data: Dict, timestamp_idx: int) -> Optional[Data]:
+    def _create_graph_data(self, train_data: Dict, timestamp_idx: int) -> Optional["Data"]:
         """Create PyTorch Geometric Data object for a specific timestamp"""
+        from torch_geometric.data import Data
+        
         node_features = []
         node_targets = []
         valid_stations = []
@@ -535,34 +529,12 @@ class SpatialGNN:
         station_coords = np.array(station_coords)
         station_values = np.array(station_values)
         
-        # Interpolate to grid points
-        interpolated = []
-        
-        for grid_lat, grid_lon in grid_points:
-            if method == 'idw':
-                # Inverse distance weighting
-                distances = np.sqrt(
-                    (station_coords[:, 0] - grid_lat) ** 2 + 
-                    (station_coords[:, 1] - grid_lon) ** 2
-                )
-                
-                # Avoid division by zero
-                distances = np.maximum(distances, 1e-10)
-                
-                # Calculate weights (inverse distance squared)
-                weights = 1.0 / (distances ** 2)
-                weights /= np.sum(weights)
-                
-                # Weighted average
-                interpolated_value = np.sum(weights * station_values)
-                interpolated.append(float(interpolated_value))
-            else:
-                # Simple nearest neighbor
-                nearest_idx = np.argmin(
-                    (station_coords[:, 0] - grid_lat) ** 2 + 
-                    (station_coords[:, 1] - grid_lon) ** 2
-                )
-                interpolated.append(float(station_values[nearest_idx]))
+        # Interpolate to grid points; nearest neighbour is IDW over one station
+        predictions, _ = idw_interpolate(
+            station_coords, station_values, np.asarray(grid_points, dtype=float),
+            power=2.0, n_neighbors=None if method == 'idw' else 1
+        )
+        interpolated = predictions.tolist()
         
         return interpolated
     
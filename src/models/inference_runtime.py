@@ -0,0 +1,347 @@
+"""
+Lightweight CPU inference runtime for the ensemble member models
+
+At training time the XGBoost, LSTM and GNN models are exported to ONNX
+together with a JSON sidecar holding their preprocessing (feature order,
+scaler statistics, station graph). Serving loads the exported graphs with
+onnxruntime and does the preprocessing in numpy, so API workers do not
+import TensorFlow, PyTorch Geometric or XGBoost.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.lazy_imports import lazy_import
+
+try:
+    ort = lazy_import("onnxruntime")
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Directory the exported models are written to and served from
+RUNTIME_MODEL_DIR = os.getenv("MODEL_RUNTIME_DIR", "models/onnx")
+
+# "onnx" serves the exported models; "native" loads the training frameworks
+INFERENCE_RUNTIME = os.getenv("MODEL_INFERENCE_RUNTIME", "native")
+
+ONNX_OPSET = 17
+
+# Scaled-unit residual spread used when training metrics do not provide one
+DEFAULT_LSTM_RESIDUAL_STD = 0.1
+
+
+def export_model(model_type: str, model, output_dir: str = RUNTIME_MODEL_DIR,
+                 metrics: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    """
+    Export a trained model to ONNX with its preprocessing sidecar
+
+    Args:
+        model_type: Type of model (xgboost, lstm, gnn)
+        model: Trained model wrapper (AQIForecaster, LSTMForecaster, SpatialGNN)
+            or bare estimator
+        output_dir: Directory to write ``{model_type}.onnx`` and ``{model_type}.json``
+        metrics: Training metrics, used for the LSTM's residual uncertainty
+
+    Returns:
+        Dictionary with the written ``onnx`` and ``sidecar`` paths
+    """
+    exporters = {
+        "xgboost": _export_xgboost,
+        "lstm": _export_lstm,
+        "gnn": _export_gnn,
+    }
+    if model_type not in exporters:
+        raise ValueError(f"No ONNX exporter for model type: {model_type}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, f"{model_type}.onnx")
+    sidecar_path = os.path.join(output_dir, f"{model_type}.json")
+
+    sidecar = exporters[model_type](model, onnx_path, metrics or {})
+    sidecar["model_type"] = model_type
+    with open(sidecar_path, "w") as f:
+        json.dump(sidecar, f)
+
+    logger.info(f"Exported {model_type} model to {onnx_path}")
+    return {"onnx": onnx_path, "sidecar": sidecar_path}
+
+
+def _scaler_params(scaler) -> Optional[Dict[str, List[float]]]:
+    """Mean and scale of a fitted StandardScaler, or None if not fitted"""
+    if scaler is None or not hasattr(scaler, "mean_"):
+        return None
+    return {"mean": scaler.mean_.tolist(), "scale": scaler.scale_.tolist()}
+
+
+def _export_xgboost(model, onnx_path: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    """Convert the gradient-boosted regressor (XGBoost or sklearn fallback)"""
+    estimator = getattr(model, "model", model)
+    scaler = getattr(model, "scaler", None)
+    n_features = int(getattr(estimator, "n_features_in_"))
+
+    if type(estimator).__module__.startswith("xgboost"):
+        from onnxmltools import convert_xgboost
+        from onnxmltools.convert.common.data_types import FloatTensorType
+        onnx_model = convert_xgboost(
+            estimator, initial_types=[("input", FloatTensorType([None, n_features]))],
+            target_opset=ONNX_OPSET
+        )
+    else:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+        onnx_model = convert_sklearn(
+            estimator, initial_types=[("input", FloatTensorType([None, n_features]))],
+            target_opset=ONNX_OPSET
+        )
+
+    with open(onnx_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+
+    return {
+        "feature_names": getattr(model, "feature_names", None),
+        "scaler": _scaler_params(scaler)
+    }
+
+
+def _export_lstm(model, onnx_path: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    """Convert the Keras LSTM; dropout is folded away in the inference graph"""
+    import tensorflow as tf
+    import tf2onnx
+
+    keras_model = getattr(model, "model", model)
+    sequence_length, n_features = keras_model.input_shape[1:]
+    tf2onnx.convert.from_keras(
+        keras_model,
+        input_signature=[tf.TensorSpec((None, sequence_length, n_features), tf.float32, name="input")],
+        opset=ONNX_OPSET,
+        output_path=onnx_path
+    )
+
+    target_scaler = getattr(model, "target_scaler", None)
+    # val_loss is the validation MSE in scaled target units
+    residual_std = float(np.sqrt(metrics["val_loss"])) if "val_loss" in metrics else DEFAULT_LSTM_RESIDUAL_STD
+
+    return {
+        "feature_names": getattr(model, "feature_names", None),
+        "sequence_length": int(sequence_length),
+        "n_features": int(n_features),
+        "scaler": _scaler_params(getattr(model, "scaler", None)),
+        "target_scaler": {
+            "min": target_scaler.min_.tolist(),
+            "scale": target_scaler.scale_.tolist()
+        } if target_scaler is not None and hasattr(target_scaler, "min_") else None,
+        "residual_std": residual_std
+    }
+
+
+def _export_gnn(model, onnx_path: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    """Convert the graph network with dynamic node and edge counts"""
+    import torch
+
+    module = getattr(model, "model", model).cpu().eval()
+    n_features = len(model.feature_names)
+    n_nodes = max(len(model.station_ids), 2)
+    example = (
+        torch.zeros((n_nodes, n_features), dtype=torch.float32),
+        torch.tensor([[0, 1], [1, 0]], dtype=torch.long),
+        torch.ones(2, dtype=torch.float32)
+    )
+    torch.onnx.export(
+        module, example, onnx_path,
+        input_names=["x", "edge_index", "edge_weight"],
+        output_names=["prediction"],
+        dynamic_axes={
+            "x": {0: "nodes"},
+            "edge_index": {1: "edges"},
+            "edge_weight": {0: "edges"},
+            "prediction": {0: "nodes"}
+        },
+        opset_version=ONNX_OPSET
+    )
+
+    return {
+        "feature_names": list(model.feature_names),
+        "station_ids": list(model.station_ids),
+        "edge_index": model.edge_index.tolist() if model.edge_index is not None else [[], []],
+        "edge_weights": model.edge_weights.tolist() if model.edge_weights is not None else [],
+        "scaler": _scaler_params(model.scaler)
+    }
+
+
+class _OnnxModel:
+    """ONNX graph plus the preprocessing recorded in its sidecar"""
+
+    def __init__(self, onnx_path: str, sidecar: Dict[str, Any]):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("MODEL_RUNTIME_THREADS", "1"))
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.feature_names = sidecar.get("feature_names")
+        self.is_trained = True
+
+        scaler = sidecar.get("scaler")
+        self._mean = np.asarray(scaler["mean"], dtype=np.float32) if scaler else None
+        self._scale = np.asarray(scaler["scale"], dtype=np.float32) if scaler else None
+
+    def _features(self, X: pd.DataFrame) -> np.ndarray:
+        """Align columns with the training features and standardize them"""
+        if self.feature_names:
+            X = X.reindex(columns=self.feature_names, fill_value=0)
+        values = np.asarray(X, dtype=np.float32)
+        if self._mean is not None:
+            values = (values - self._mean) / self._scale
+        return values
+
+    def _run(self, *inputs: np.ndarray) -> np.ndarray:
+        outputs = self.session.run(None, dict(zip(self.input_names, inputs)))
+        return np.asarray(outputs[0], dtype=np.float64).reshape(-1)
+
+
+class OnnxRegressor(_OnnxModel):
+    """Serving counterpart of ``AQIForecaster`` backed by its ONNX export"""
+
+    def predict(self, X: pd.DataFrame, return_confidence: bool = True) -> Dict[str, Any]:
+        predictions = self._run(self._features(X))
+
+        result = {
+            'predictions': predictions,
+            'timestamps': X['timestamp'].values if 'timestamp' in X.columns else None
+        }
+
+        if return_confidence:
+            # Same interval as AQIForecaster.predict
+            std = np.std(predictions) * 0.2 + 10  # Base uncertainty
+            result['lower_bound'] = predictions - 1.28 * std  # 80% CI
+            result['upper_bound'] = predictions + 1.28 * std
+
+        return result
+
+
+class OnnxLSTM(_OnnxModel):
+    """
+    Serving counterpart of ``LSTMForecaster`` backed by its ONNX export
+
+    The exported graph runs without dropout, so intervals come from the
+    validation residual spread instead of Monte Carlo sampling.
+    """
+
+    def __init__(self, onnx_path: str, sidecar: Dict[str, Any]):
+        super().__init__(onnx_path, sidecar)
+        self.sequence_length = sidecar["sequence_length"]
+        self.residual_std = sidecar.get("residual_std", DEFAULT_LSTM_RESIDUAL_STD)
+        target_scaler = sidecar.get("target_scaler")
+        self._target_min = target_scaler["min"][0] if target_scaler else 0.0
+        self._target_scale = target_scaler["scale"][0] if target_scaler else 1.0
+
+    def predict(self, X: pd.DataFrame, return_confidence: bool = True, **kwargs) -> Dict[str, Any]:
+        values = self._features(X)[-self.sequence_length:]
+        X_seq = np.zeros((1, self.sequence_length, values.shape[1]), dtype=np.float32)
+        X_seq[0, -len(values):] = values
+        result = self._predict_sequences(X_seq, X, return_confidence)
+        if return_confidence:
+            result['uncertainty'] = float(self.residual_std)
+        return result
+
+    def predict_batch(self, X: pd.DataFrame, return_confidence: bool = True, **kwargs) -> Dict[str, Any]:
+        values = self._features(X)
+        X_seq = np.zeros((len(values), self.sequence_length, values.shape[1]), dtype=np.float32)
+        X_seq[:, -1, :] = values
+        return self._predict_sequences(X_seq, X, return_confidence)
+
+    def _predict_sequences(self, X_seq: np.ndarray, X: pd.DataFrame,
+                           return_confidence: bool) -> Dict[str, Any]:
+        pred_scaled = self._run(X_seq)
+        result = {
+            'predictions': self._unscale(pred_scaled),
+            'timestamps': X.index.values if hasattr(X, 'index') else None
+        }
+
+        if return_confidence:
+            result['lower_bound'] = np.maximum(0, self._unscale(pred_scaled - 1.28 * self.residual_std))
+            result['upper_bound'] = self._unscale(pred_scaled + 1.28 * self.residual_std)
+            result['uncertainty'] = np.full(len(pred_scaled), self.residual_std)
+
+        return result
+
+    def _unscale(self, values: np.ndarray) -> np.ndarray:
+        """Inverse of the MinMaxScaler fitted on the target"""
+        return (values - self._target_min) / self._target_scale
+
+
+class OnnxGNN(_OnnxModel):
+    """Serving counterpart of ``SpatialGNN.predict_spatial`` backed by its ONNX export"""
+
+    def __init__(self, onnx_path: str, sidecar: Dict[str, Any]):
+        super().__init__(onnx_path, sidecar)
+        self.station_ids = sidecar["station_ids"]
+        self.stations = self.station_ids
+        self.edge_index = np.asarray(sidecar["edge_index"], dtype=np.int64).reshape(2, -1)
+        self.edge_weights = np.asarray(sidecar["edge_weights"], dtype=np.float32)
+
+    def predict_spatial(self, station_data: Dict[str, np.ndarray]) -> Dict[str, float]:
+        valid = [
+            i for i, station_id in enumerate(self.station_ids)
+            if station_id in station_data and len(station_data[station_id]) == len(self.feature_names)
+        ]
+        if not valid:
+            return {}
+
+        x = np.stack([np.asarray(station_data[self.station_ids[i]], dtype=np.float32) for i in valid])
+        if self._mean is not None:
+            x = (x - self._mean) / self._scale
+
+        # Keep edges between stations present in this request, renumbered
+        position = np.full(len(self.station_ids), -1, dtype=np.int64)
+        position[valid] = np.arange(len(valid))
+        src, dst = position[self.edge_index[0]], position[self.edge_index[1]]
+        keep = (src >= 0) & (dst >= 0)
+        edge_index = np.vstack([src[keep], dst[keep]])
+
+        predictions = self._run(x.astype(np.float32), edge_index, self.edge_weights[keep])
+        return {self.station_ids[i]: float(p) for i, p in zip(valid, predictions)}
+
+
+_RUNTIME_CLASSES = {
+    "xgboost": OnnxRegressor,
+    "lstm": OnnxLSTM,
+    "gnn": OnnxGNN,
+}
+
+
+def load_runtime_models(model_dir: str = RUNTIME_MODEL_DIR) -> Dict[str, Any]:
+    """
+    Load every exported model found in a directory
+
+    Returns:
+        Dictionary of model type -> runtime model; types without an export
+        (or that fail to load) are left out
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        logger.warning("onnxruntime not available, exported models cannot be served")
+        return {}
+
+    models = {}
+    for model_type, runtime_class in _RUNTIME_CLASSES.items():
+        onnx_path = os.path.join(model_dir, f"{model_type}.onnx")
+        sidecar_path = os.path.join(model_dir, f"{model_type}.json")
+        if not (os.path.exists(onnx_path) and os.path.exists(sidecar_path)):
+            continue
+
+        try:
+            with open(sidecar_path) as f:
+                models[model_type] = runtime_class(onnx_path, json.load(f))
+        except Exception as e:
+            logger.warning(f"Failed to load exported {model_type} model: {e}")
+
+    logger.info(f"Loaded exported models: {sorted(models)}")
+    return models
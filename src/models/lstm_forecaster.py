@@ -11,20 +11,15 @@ import pickle
 import logging
 
 from .mlflow_manager import get_mlflow_manager
+from ..utils.lazy_imports import lazy_import
 
+# TensorFlow is imported when a model is first built or loaded
 try:
-    import tensorflow as tf
-    from tensorflow.keras.models import Sequential, Model
-    from tensorflow.keras.layers import LSTM, Dense, Dropout, Input
-    from tensorflow.keras.optimizers import Adam
-    from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+    tf = lazy_import("tensorflow")
     TENSORFLOW_AVAILABLE = True
 except ImportError:
     TENSORFLOW_AVAILABLE = False
     logging.warning("TensorFlow not available, LSTM model will not work")
-    # Create dummy classes for type hints when TensorFlow is not available
-    class Model:
-        pass
 
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
@@ -67,6 +62,11 @@ class LSTMForecaster:
         self.dropout_rate = 0.2
         self.learning_rate = 0.001
         
+        # Monte Carlo dropout: default sample count and the most tiled
+        # sequences sent through the network in one forward pass
+        self.mc_samples = 100
+        self.mc_max_batch = 4096
+        
         # Training parameters
         self.batch_size = 32
         self.epochs = 100
@@ -77,13 +77,17 @@ class LSTMForecaster:
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
     
-    def _build_lstm_model(self) -> Model:
+    def _build_lstm_model(self) -> "tf.keras.Model":
         """
         Build LSTM neural network architecture
         
         Returns:
             Compiled Keras model
         """
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Dropout, Input
+        from tensorflow.keras.optimizers import Adam
+        
         model = Sequential([
             Input(shape=(self.sequence_length, self.features)),
             
@@ -165,6 +169,8 @@ class LSTMForecaster:
         self.model = self._build_lstm_model()
         
         # Prepare callbacks
+        from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+        
         callbacks = [
             EarlyStopping(
                 monitor='val_loss',
@@ -256,81 +262,164 @@ class LSTMForecaster:
     
     def predict(self, X: pd.DataFrame, 
                 return_confidence: bool = True,
-                n_samples: int = 100) -> Dict[str, Any]:
+                n_samples: Optional[int] = None) -> Dict[str, Any]:
         """
         Make predictions with uncertainty estimation
         
         Args:
             X: Feature DataFrame
             return_confidence: Whether to return confidence intervals
-            n_samples: Number of Monte Carlo samples for uncertainty
+            n_samples: Number of Monte Carlo samples for uncertainty (default ``mc_samples``)
             
         Returns:
             Dictionary with predictions and confidence intervals
         """
-        if not self.is_trained or self.model is None:
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Ensure correct feature order and dimensions
-        if self.feature_names:
-            missing = set(self.feature_names) - set(X.columns)
-            for col in missing:
-                X[col] = 0
-            X = X[self.feature_names]
-        
-        # Check if feature dimensions match
-        if X.shape[1] != self.features:
-            raise ValueError(f"Feature dimension mismatch: expected {self.features}, got {X.shape[1]}. "
-                           f"Expected features: {self.feature_names}")
-        
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
         # Prepare sequences (use last sequence_length points)
-        if len(X_scaled) < self.sequence_length:
-            # Pad with zeros if not enough data
-            padding = np.zeros((self.sequence_length - len(X_scaled), X_scaled.shape[1]))
-            X_scaled = np.vstack([padding, X_scaled])
-        
-        # Take the last sequence_length points
-        X_seq = X_scaled[-self.sequence_length:].reshape(1, self.sequence_length, -1)
+        X_seq = self._build_sequence(self._scale_features(X))[np.newaxis]
         
         if return_confidence:
             # Monte Carlo Dropout for uncertainty estimation
-            predictions = []
-            for _ in range(n_samples):
-                # Enable dropout during inference
-                pred = self.model(X_seq, training=True)
-                predictions.append(pred.numpy().flatten()[0])
-            
-            predictions = np.array(predictions)
-            
-            # Calculate statistics
-            mean_pred = np.mean(predictions)
-            std_pred = np.std(predictions)
-            
-            # Unscale predictions
-            mean_unscaled = self.target_scaler.inverse_transform([[mean_pred]])[0][0]
-            lower_bound = self.target_scaler.inverse_transform([[mean_pred - 1.28 * std_pred]])[0][0]
-            upper_bound = self.target_scaler.inverse_transform([[mean_pred + 1.28 * std_pred]])[0][0]
+            mean_pred, std_pred = self._mc_dropout(X_seq, n_samples)
             
             return {
-                'predictions': np.array([mean_unscaled]),
-                'lower_bound': np.array([max(0, lower_bound)]),
-                'upper_bound': np.array([upper_bound]),
-                'uncertainty': float(std_pred),
+                'predictions': self._unscale(mean_pred),
+                'lower_bound': np.maximum(0, self._unscale(mean_pred - 1.28 * std_pred)),
+                'upper_bound': self._unscale(mean_pred + 1.28 * std_pred),
+                'uncertainty': float(std_pred[0]),
                 'timestamps': X.index.values if hasattr(X, 'index') else None
             }
         else:
             # Single prediction
             pred_scaled = self.model.predict(X_seq, verbose=0)
-            pred_unscaled = self.target_scaler.inverse_transform(pred_scaled)
             
             return {
-                'predictions': pred_unscaled.flatten(),
+                'predictions': self._unscale(pred_scaled),
                 'timestamps': X.index.values if hasattr(X, 'index') else None
             }
     
+    def predict_locations(self, histories: List[pd.DataFrame],
+                          return_confidence: bool = True,
+                          n_samples: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Predict the next hour for several locations at once
+        
+        Each history is prepared as in ``predict`` (last ``sequence_length``
+        rows, zero-padded) and all sequences share the Monte Carlo passes.
+        
+        Args:
+            histories: Feature history DataFrame per location
+            return_confidence: Whether to return confidence intervals
+            n_samples: Number of Monte Carlo samples for uncertainty (default ``mc_samples``)
+            
+        Returns:
+            Dictionary with one prediction and confidence interval per location
+        """
+        X_seq = np.stack([
+            self._build_sequence(self._scale_features(history)) for history in histories
+        ])
+        return self._predict_sequences(X_seq, return_confidence, n_samples)
+    
+    def predict_batch(self, X: pd.DataFrame,
+                      return_confidence: bool = True,
+                      n_samples: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Make independent single-step predictions for every row
+        
+        Each row is treated as its own zero-padded input sequence, exactly as
+        ``predict`` treats a one-row frame, so a batch of locations shares the
+        Monte Carlo passes.
+        
+        Args:
+            X: Feature DataFrame with one row per location
+            return_confidence: Whether to return confidence intervals
+            n_samples: Number of Monte Carlo samples for uncertainty (default ``mc_samples``)
+            
+        Returns:
+            Dictionary with per-row predictions and confidence intervals
+        """
+        X_scaled = self._scale_features(X)
+        
+        X_seq = np.zeros((len(X_scaled), self.sequence_length, X_scaled.shape[1]))
+        X_seq[:, -1, :] = X_scaled
+        
+        result = self._predict_sequences(X_seq, return_confidence, n_samples)
+        result['timestamps'] = X.index.values if hasattr(X, 'index') else None
+        return result
+    
+    def _predict_sequences(self, X_seq: np.ndarray, return_confidence: bool,
+                           n_samples: Optional[int]) -> Dict[str, Any]:
+        """Predictions for a (batch, sequence_length, features) array of scaled sequences"""
+        if return_confidence:
+            mean_pred, std_pred = self._mc_dropout(X_seq, n_samples)
+            
+            return {
+                'predictions': self._unscale(mean_pred),
+                'lower_bound': np.maximum(0, self._unscale(mean_pred - 1.28 * std_pred)),
+                'upper_bound': self._unscale(mean_pred + 1.28 * std_pred),
+                'uncertainty': std_pred
+            }
+        else:
+            pred_scaled = self.model.predict(X_seq, verbose=0)
+            
+            return {'predictions': self._unscale(pred_scaled)}
+    
+    def _mc_dropout(self, X_seq: np.ndarray,
+                    n_samples: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Monte Carlo dropout mean and standard deviation per sequence (scaled)
+        
+        Every sequence is tiled ``n_samples`` times and the copies go through
+        the network together with dropout enabled. Dropout masks are drawn per
+        batch element, so each copy is an independent sample, as with one
+        forward pass per sample. Sequences are tiled a group at a time, in
+        float32, so a pass holds at most ``mc_max_batch`` rows (or one
+        sequence's samples when ``n_samples`` is larger).
+        """
+        n_samples = n_samples or self.mc_samples
+        X_seq = np.asarray(X_seq, dtype=np.float32)
+        group = max(1, self.mc_max_batch // n_samples)
+        
+        means, stds = [], []
+        for start in range(0, len(X_seq), group):
+            tiled = np.repeat(X_seq[start:start + group], n_samples, axis=0)
+            samples = self.model(tiled, training=True).numpy().reshape(-1, n_samples)
+            means.append(samples.mean(axis=1))
+            stds.append(samples.std(axis=1))
+        
+        return np.concatenate(means), np.concatenate(stds)
+    
+    def _build_sequence(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Last sequence_length scaled rows, zero-padded at the start when shorter"""
+        if len(X_scaled) < self.sequence_length:
+            # Pad with zeros if not enough data
+            padding = np.zeros((self.sequence_length - len(X_scaled), X_scaled.shape[1]))
+            X_scaled = np.vstack([padding, X_scaled])
+        
+        return X_scaled[-self.sequence_length:]
+    
+    def _unscale(self, values: np.ndarray) -> np.ndarray:
+        """Map scaled targets back to concentrations"""
+        return self.target_scaler.inverse_transform(np.asarray(values).reshape(-1, 1)).ravel()
+    
+    def _scale_features(self, X: pd.DataFrame) -> np.ndarray:
+        """Align features with the training columns and scale them"""
+        if not self.is_trained or self.model is None:
+            raise ValueError("Model must be trained before making predictions")
+        
+        # Ensure correct feature order and dimensions
+        if self.feature_names:
+            missing = set(self.feature_names) - set(X.columns)
+            for col in missing:
+                X[col] = 0
+            X = X[self.feature_names]
+        
+        # Check if feature dimensions match
+        if X.shape[1] != self.features:
+            raise ValueError(f"Feature dimension mismatch: expected {self.features}, got {X.shape[1]}. "
+                           f"Expected features: {self.feature_names}")
+        
+        return self.scaler.transform(X)
+    
     def predict_sequence(self, initial_data: pd.DataFrame, 
                         hours: int = 24) -> List[Dict[str, Any]]:
         """
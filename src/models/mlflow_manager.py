@@ -10,15 +10,17 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 
-import mlflow
-import mlflow.sklearn
-import mlflow.tensorflow
-import mlflow.pytorch
-from mlflow.tracking import MlflowClient
-from mlflow.entities import ViewType
 import numpy as np
 import pandas as pd
 
+from .inference_runtime import export_model
+from ..utils.lazy_imports import lazy_import
+
+# mlflow and its model flavors load on first use, not at worker startup
+mlflow = lazy_import("mlflow")
+mlflow_tracking = lazy_import("mlflow.tracking")
+mlflow_entities = lazy_import("mlflow.entities")
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +56,7 @@ class MLflowManager:
             db_path = os.path.join(mlflow_dir, "mlflow.db")
             mlflow.set_tracking_uri(f"sqlite:///{db_path}")
         
-        self.client = MlflowClient()
+        self.client = mlflow_tracking.MlflowClient()
         self.experiment_name = experiment_name
         
         # Create or get experiment
@@ -71,7 +73,7 @@ class MLflowManager:
         
         logger.info(f"MLflow manager initialized with experiment: {experiment_name}")
     
-    def start_run(self, run_name: str = None, tags: Dict[str, str] = None) -> mlflow.ActiveRun:
+    def start_run(self, run_name: str = None, tags: Dict[str, str] = None) -> "mlflow.ActiveRun":
         """
         Start a new MLflow run
         
@@ -179,6 +181,9 @@ class MLflowManager:
                     mlflow.log_artifact("stations.json")
                     os.remove("stations.json")
             
+            # Export to the lightweight serving runtime
+            self._log_runtime_export(model_type, model, metrics)
+            
             # Log additional artifacts
             if artifacts:
                 for artifact_name, artifact_path in artifacts.items():
@@ -202,6 +207,18 @@ class MLflowManager:
             
             return run_id
     
+    def _log_runtime_export(self, model_type: str, model, metrics: Dict[str, float]):
+        """Export the model to ONNX for CPU serving and log it under ``onnx/``"""
+        try:
+            exported = export_model(model_type, model, metrics=metrics)
+        except Exception as e:
+            # Serving falls back to the native model, so training still succeeds
+            logger.warning(f"ONNX export of {model_type} model failed: {e}")
+            return
+        
+        for path in exported.values():
+            mlflow.log_artifact(path, "onnx")
+    
     def load_model(self, model_name: str, version: str = "latest", 
                    stage: str = None) -> Any:
         """
@@ -495,7 +512,7 @@ class MLflowManager:
         """
         try:
             experiments = self.client.search_experiments(
-                view_type=ViewType.ACTIVE_ONLY,
+                view_type=mlflow_entities.ViewType.ACTIVE_ONLY,
                 filter_string=filter_string
             )
             
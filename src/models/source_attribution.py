@@ -9,8 +9,10 @@ from datetime import datetime
 import logging
 from dataclasses import dataclass
 
+from ..utils.lazy_imports import lazy_import
+
 try:
-    import shap
+    shap = lazy_import("shap")
     from sklearn.ensemble import RandomForestRegressor
     from sklearn.model_selection import train_test_split
     from sklearn.preprocessing import StandardScaler
@@ -9,15 +9,15 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from celery import Task
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_
 from geoalchemy2.functions import ST_DWithin, ST_GeomFromText
 
 from src.tasks.celery_app import celery_app
 from src.api.database import get_db_session
-from src.api.models import AlertSubscription, AlertHistory, AirQualityMeasurement, SourceAttribution, User
+from src.api.crud import sync_rolling_aqi_engine_blocking
+from src.api.models import AlertSubscription, AlertHistory, SourceAttribution, User
 from src.api.notifications import notification_service
 from src.api.delivery_tracker import delivery_tracker
-from src.utils.aqi_calculator import calculate_aqi
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +149,9 @@ async def _should_skip_alert_due_to_rate_limit(db: Session, subscription: AlertS
 async def _get_current_aqi_for_location(db: Session, subscription: AlertSubscription) -> Optional[Dict[str, Any]]:
     """
     Get current AQI data for a subscription location.
+    
+    Reads NowCast AQI from the rolling-window engine, which is kept current by
+    tailing only measurements stored since its last sync.
     """
     try:
         # Extract coordinates from subscription location
@@ -156,48 +159,11 @@ async def _get_current_aqi_for_location(db: Session, subscription: AlertSubscrip
         if "POINT(" not in location_wkt:
             return None
         
-        # Get recent measurements within 5km of the subscription location
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        
-        measurements = db.query(AirQualityMeasurement).filter(
-            and_(
-                AirQualityMeasurement.time >= one_hour_ago,
-                ST_DWithin(
-                    AirQualityMeasurement.location,
-                    subscription.location,
-                    0.05  # 5km in degrees (approximate)
-                )
-            )
-        ).order_by(AirQualityMeasurement.time.desc()).limit(50).all()
-        
-        if not measurements:
-            return None
-        
-        # Group measurements by parameter and calculate average
-        parameter_values = {}
-        for measurement in measurements:
-            if measurement.parameter not in parameter_values:
-                parameter_values[measurement.parameter] = []
-            parameter_values[measurement.parameter].append(measurement.value)
-        
-        # Calculate average values
-        avg_values = {}
-        for parameter, values in parameter_values.items():
-            if values:
-                avg_values[parameter] = sum(values) / len(values)
+        lon_str, lat_str = location_wkt.split("POINT(", 1)[1].rstrip(")").split()[:2]
+        latitude, longitude = float(lat_str), float(lon_str)
         
-        # Calculate AQI
-        if avg_values:
-            aqi, dominant_pollutant, category = calculate_aqi(avg_values)
-            return {
-                "aqi": aqi,
-                "category": category,
-                "dominant_pollutant": dominant_pollutant,
-                "pollutant_values": avg_values,
-                "measurement_count": len(measurements)
-            }
-        
-        return None
+        engine = sync_rolling_aqi_engine_blocking(db)
+        return engine.get_location_aqi(latitude, longitude, radius_km=5.0)
         
     except Exception as e:
         logger.error(f"Error getting current AQI for subscription {subscription.id}: {e}")
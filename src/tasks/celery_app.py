@@ -115,6 +115,14 @@ celery_app.conf.update(
             "task": "src.tasks.predictions.generate_spatial_predictions",
             "schedule": crontab(minute=30),  # Every hour at 30 minutes
         },
+        "generate-tile-pyramids": {
+            "task": "src.tasks.predictions.generate_tile_pyramids",
+            "schedule": crontab(minute=5),  # Every hour, after ingestion lands
+        },
+        "generate-forecast-cubes": {
+            "task": "src.tasks.predictions.generate_forecast_cubes",
+            "schedule": crontab(minute=10),  # Every hour, after the tile pyramids
+        },
         
         # Model training tasks
         "retrain-models": {
@@ -3,8 +3,8 @@ Data ingestion tasks for collecting air quality and weather data.
 Handles data from CPCB, OpenAQ, weather services, and other sources.
 """
 
-import logging
 import asyncio
+import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from celery import Task
@@ -13,15 +13,21 @@ from sqlalchemy.orm import Session
 from src.tasks.celery_app import celery_app
 from src.data.ingestion_clients import (
     DataIngestionOrchestrator, CPCBClient, IMDClient, 
-    OpenAQClient, GoogleMapsClient, DataPoint, WeatherPoint
+    OpenAQClient, GoogleMapsClient, DataPoint, WeatherPoint, SourceResult
 )
 from src.data.satellite_client import (
     SatelliteDataOrchestrator, TROPOMIClient, VIIRSClient, SatelliteDataPoint
 )
-from src.api.database import get_db
-from src.api.models import AirQualityMeasurement, WeatherData, MonitoringStation
+from src.data.http_transport import run_in_worker_loop
+from src.data.watermarks import get_dedup_filter, get_watermark_store
+from src.api.database import get_db, get_db_session
+from src.api.bulk_writer import (
+    AIR_QUALITY_MEASUREMENTS, WEATHER_DATA, BulkWriteResult, bulk_write, encode_point
+)
+from src.api.models import MonitoringStation
 from src.data.quality_validator import DataQualityValidator
-from geoalchemy2 import WKTElement
+from src.utils.rolling_aqi import get_rolling_aqi_engine
+from src.utils.tile_pyramid import PYRAMID_PARAMETERS
 
 logger = logging.getLogger(__name__)
 
@@ -63,15 +69,9 @@ def ingest_cpcb_data(self, stations: List[str] = None,
         end_dt = datetime.fromisoformat(end_time) if end_time else datetime.utcnow()
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_cpcb_data(stations, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_cpcb_data(stations, start_dt, end_dt)
+        )
         
         logger.info(f"CPCB data ingestion completed: {result}")
         return result
@@ -84,39 +84,38 @@ def ingest_cpcb_data(self, stations: List[str] = None,
 
 async def _async_ingest_cpcb_data(stations: List[str], start_time: datetime, end_time: datetime) -> Dict[str, Any]:
     """Async helper for CPCB data ingestion."""
-    ingested_count = 0
-    failed_count = 0
-    estimated_count = 0
-    
     async with CPCBClient() as client:
+        requested = stations or client.default_stations
+        # Only fetch stations that may have published since their last stored reading
+        due = get_watermark_store().due_stations("cpcb", requested)
         data_points = await client.fetch_data(
-            stations=stations,
+            stations=due,
             start_time=start_time,
             end_time=end_time
-        )
+        ) if due else []
+    
+    fetched_count = len(data_points)
+    data_points = _new_observations(data_points)
         
-        # Store data points in database
-        db = next(get_db())
-        try:
-            for data_point in data_points:
-                try:
-                    await _store_air_quality_measurement(db, data_point)
-                    ingested_count += 1
-                    
-                    # Track if data is estimated vs real-time
-                    if data_point.quality_flag == "estimated":
-                        estimated_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Failed to store CPCB data point: {e}")
-                    failed_count += 1
-        finally:
-            db.close()
+    # Store data points in database
+    with get_db_session() as db:
+        stored = _store_air_quality_points(db, data_points)
+    _commit_observations("cpcb", data_points, stored)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
+    
+    # Track if data is estimated vs real-time
+    estimated_count = sum(1 for data_point in data_points if data_point.quality_flag == "estimated")
+    
+    _dispatch_tile_updates(data_points)
     
     return {
         "task": "ingest_cpcb_data",
         "timestamp": datetime.utcnow().isoformat(),
-        "stations_processed": len(stations) if stations else 0,
+        "stations_processed": len(due),
+        "stations_skipped": len(requested) - len(due),
+        "duplicates_dropped": fetched_count - len(data_points),
         "ingested_count": ingested_count,
         "failed_count": failed_count,
         "estimated_count": estimated_count,
@@ -159,15 +158,9 @@ def ingest_weather_data(self, locations: List[Dict[str, float]] = None,
             location_tuples = [(loc["lat"], loc["lon"]) for loc in locations]
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_weather_data(location_tuples, station_ids, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_weather_data(location_tuples, station_ids, start_dt, end_dt)
+        )
         
         logger.info(f"IMD weather data ingestion completed: {result}")
         return result
@@ -180,12 +173,6 @@ def ingest_weather_data(self, locations: List[Dict[str, float]] = None,
 async def _async_ingest_weather_data(locations: List[tuple], station_ids: List[str], 
                                    start_time: datetime, end_time: datetime) -> Dict[str, Any]:
     """Async helper for IMD weather data ingestion."""
-    ingested_count = 0
-    failed_count = 0
-    forecast_count = 0
-    real_time_count = 0
-    simulated_count = 0
-    
     # Default to major IMD stations if no specific locations or stations provided
     if not locations and not station_ids:
         station_ids = ["DL_SAFDARJUNG", "MH_COLABA", "KA_HAL", "TN_MEENAMBAKKAM", "WB_DUMDUM"]
@@ -206,36 +193,18 @@ async def _async_ingest_weather_data(locations: List[tuple], station_ids: List[s
             hours=24  # 24-hour forecast
         )
         
-        # Store weather points in database
-        db = next(get_db())
-        try:
-            # Store current weather data
-            for weather_point in weather_points:
-                try:
-                    await _store_weather_data(db, weather_point)
-                    ingested_count += 1
-                    
-                    # Track data quality
-                    if weather_point.source == "imd_openweather":
-                        real_time_count += 1
-                    elif weather_point.source == "imd_simulated":
-                        simulated_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Failed to store weather point: {e}")
-                    failed_count += 1
-            
-            # Store forecast data
-            for forecast_point in forecast_points:
-                try:
-                    await _store_weather_data(db, forecast_point)
-                    forecast_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to store forecast point: {e}")
-                    failed_count += 1
-                    
-        finally:
-            db.close()
+    # Store current weather and forecast data in database
+    with get_db_session() as db:
+        stored_weather = _store_weather_points(db, weather_points)
+        stored_forecast = _store_weather_points(db, forecast_points)
+    
+    ingested_count = stored_weather.rows - stored_weather.failed
+    forecast_count = stored_forecast.rows - stored_forecast.failed
+    failed_count = stored_weather.failed + stored_forecast.failed
+    
+    # Track data quality
+    real_time_count = sum(1 for point in weather_points if point.source == "imd_openweather")
+    simulated_count = sum(1 for point in weather_points if point.source == "imd_simulated")
     
     total_processed = ingested_count + forecast_count
     
@@ -277,15 +246,9 @@ def ingest_openaq_data(self, cities: List[str] = None,
         end_dt = datetime.fromisoformat(end_time) if end_time else datetime.utcnow()
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_openaq_data(cities, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_openaq_data(cities, start_dt, end_dt)
+        )
         
         logger.info(f"OpenAQ data ingestion completed: {result}")
         return result
@@ -297,9 +260,6 @@ def ingest_openaq_data(self, cities: List[str] = None,
 
 async def _async_ingest_openaq_data(cities: List[str], start_time: datetime, end_time: datetime) -> Dict[str, Any]:
     """Async helper for OpenAQ data ingestion."""
-    ingested_count = 0
-    failed_count = 0
-    
     if not cities:
         cities = ["Delhi", "Mumbai", "Bangalore", "Chennai"]
     
@@ -309,24 +269,26 @@ async def _async_ingest_openaq_data(cities: List[str], start_time: datetime, end
             start_time=start_time,
             end_time=end_time
         )
+    
+    # OpenAQ resolves locations inside the client, so only repeats are filtered after the fetch
+    fetched_count = len(data_points)
+    data_points = _new_observations(data_points)
         
-        # Store data points in database
-        db = next(get_db())
-        try:
-            for data_point in data_points:
-                try:
-                    await _store_air_quality_measurement(db, data_point)
-                    ingested_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to store data point: {e}")
-                    failed_count += 1
-        finally:
-            db.close()
+    # Store data points in database
+    with get_db_session() as db:
+        stored = _store_air_quality_points(db, data_points)
+    _commit_observations("openaq", data_points, stored)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
+    
+    _dispatch_tile_updates(data_points)
     
     return {
         "task": "ingest_openaq_data",
         "timestamp": datetime.utcnow().isoformat(),
         "cities_processed": len(cities),
+        "duplicates_dropped": fetched_count - len(data_points),
         "ingested_count": ingested_count,
         "failed_count": failed_count,
         "success_rate": ingested_count / (ingested_count + failed_count) if (ingested_count + failed_count) > 0 else 0
@@ -353,15 +315,9 @@ def ingest_traffic_data(self, locations: List[Dict[str, float]] = None) -> Dict[
             location_tuples = [(loc["lat"], loc["lon"]) for loc in locations]
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_traffic_data(location_tuples)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_traffic_data(location_tuples)
+        )
         
         logger.info(f"Traffic data ingestion completed: {result}")
         return result
@@ -429,15 +385,9 @@ def ingest_all_sources(self, locations: List[Dict[str, float]] = None,
             location_tuples = [(loc["lat"], loc["lon"]) for loc in locations]
         
         # Run async orchestrated ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_all_sources(location_tuples, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_all_sources(location_tuples, start_dt, end_dt)
+        )
         
         logger.info(f"Comprehensive data ingestion completed: {result}")
         return result
@@ -452,43 +402,24 @@ async def _async_ingest_all_sources(locations: List[tuple], start_time: datetime
     orchestrator = DataIngestionOrchestrator()
     await orchestrator.initialize_clients()
     
-    # Ingest from all sources
-    results = await orchestrator.ingest_all_sources(
-        locations=locations,
-        start_time=start_time,
-        end_time=end_time
-    )
-    
-    # Store all data in database
-    db = next(get_db())
     ingestion_stats = {
         "air_quality_stored": 0,
         "weather_stored": 0,
         "air_quality_failed": 0,
-        "weather_failed": 0
+        "weather_failed": 0,
+        "air_quality_duplicates": 0
     }
     
-    try:
-        # Store air quality data
-        for data_point in results["air_quality"]:
-            try:
-                await _store_air_quality_measurement(db, data_point)
-                ingestion_stats["air_quality_stored"] += 1
-            except Exception as e:
-                logger.error(f"Failed to store air quality data: {e}")
-                ingestion_stats["air_quality_failed"] += 1
-        
-        # Store weather data
-        for weather_point in results["weather"]:
-            try:
-                await _store_weather_data(db, weather_point)
-                ingestion_stats["weather_stored"] += 1
-            except Exception as e:
-                logger.error(f"Failed to store weather data: {e}")
-                ingestion_stats["weather_failed"] += 1
+    with get_db_session() as db:
+        # Ingest from all sources concurrently, storing each source's data as it arrives
+        results = await orchestrator.ingest_all_sources(
+            locations=locations,
+            start_time=start_time,
+            end_time=end_time,
+            on_source_complete=_source_storer(db, ingestion_stats)
+        )
     
-    finally:
-        db.close()
+    _dispatch_tile_updates(results["air_quality"])
     
     return {
         "task": "ingest_all_sources",
@@ -497,44 +428,132 @@ async def _async_ingest_all_sources(locations: List[tuple], start_time: datetime
         "air_quality_points": len(results["air_quality"]),
         "weather_points": len(results["weather"]),
         "traffic_points": len(results["traffic"]),
-        "storage_stats": ingestion_stats
+        "storage_stats": ingestion_stats,
+        "source_stats": results["source_stats"]
+    }
+
+
+def _source_storer(db: Session, ingestion_stats: Dict[str, int]):
+    """Build an on_source_complete callback that stores a source's points as soon as it finishes."""
+    storers = {
+        "air_quality": _store_air_quality_points,
+        "weather": _store_weather_points,
+        "satellite": _store_satellite_points
+    }
+    # The session is shared by every source, so writes take turns
+    lock = asyncio.Lock()
+    
+    async def store(result: SourceResult):
+        if result.kind not in storers or not result.points:
+            return  # Traffic data is not persisted
+        
+        points = result.points
+        if result.kind == "air_quality":
+            points = _new_observations(points)
+            ingestion_stats["air_quality_duplicates"] += len(result.points) - len(points)
+        
+        async with lock:
+            # COPY runs in a worker thread so sources still in flight keep making progress
+            stored = await asyncio.to_thread(storers[result.kind], db, points)
+        
+        if result.kind == "air_quality":
+            _commit_observations(result.source, points, stored)
+        
+        ingestion_stats[f"{result.kind}_stored"] += stored.rows - stored.failed
+        ingestion_stats[f"{result.kind}_failed"] += stored.failed
+        
+        logger.info(f"Stored {result.source} results: {stored.rows - stored.failed}/{stored.rows} points "
+                   f"fetched in {result.latency_seconds:.2f}s ({result.status})")
+    
+    return store
+
+
+def _new_observations(data_points: List[DataPoint]) -> List[DataPoint]:
+    """Drop (time, station, parameter) readings already stored or repeated within the batch."""
+    return get_dedup_filter().filter(data_points)
+
+
+def _commit_observations(source: str, data_points: List[DataPoint], stored: BulkWriteResult):
+    """Advance watermarks and remember stored points; a failed batch leaves them for the next run to retry."""
+    if stored.failed or not data_points:
+        return
+    get_watermark_store().advance(source, data_points)
+    get_dedup_filter().add(data_points)
+
+
+def _air_quality_row(data_point: DataPoint) -> Dict[str, Any]:
+    """air_quality_measurements row for a ground-based DataPoint."""
+    return {
+        "time": data_point.timestamp,
+        "station_id": data_point.station_id or f"unknown_{data_point.source}",
+        "parameter": data_point.parameter,
+        "value": data_point.value,
+        "unit": data_point.unit,
+        "quality_flag": data_point.quality_flag,
+        "source": data_point.source,
+        "location": encode_point(*data_point.location)
+    }
+
+
+def _store_air_quality_points(db: Session, data_points: List[DataPoint]) -> BulkWriteResult:
+    """Store air quality measurements in database with the bulk COPY path."""
+    stored = bulk_write(db, AIR_QUALITY_MEASUREMENTS, [_air_quality_row(p) for p in data_points])
+    
+    # Keep the rolling-window AQI engine current without re-reading the hypertable
+    get_rolling_aqi_engine().update_many(data_points)
+    
+    return stored
+
+
+def _dispatch_tile_updates(data_points: List[DataPoint]):
+    """Send the latest reading per station to the tile pyramid update task."""
+    latest: Dict[str, Dict[str, DataPoint]] = {}
+    for data_point in data_points:
+        if (data_point.parameter not in PYRAMID_PARAMETERS or not data_point.station_id
+                or data_point.quality_flag == "invalid"):
+            continue
+        station_points = latest.setdefault(data_point.parameter, {})
+        current = station_points.get(data_point.station_id)
+        if current is None or data_point.timestamp >= current.timestamp:
+            station_points[data_point.station_id] = data_point
+    
+    for parameter, station_points in latest.items():
+        station_values = {
+            station_id: {
+                "lat": point.location[0],
+                "lon": point.location[1],
+                "value": point.value
+            }
+            for station_id, point in station_points.items()
+        }
+        try:
+            celery_app.send_task(
+                "src.tasks.predictions.update_tile_pyramids",
+                args=[parameter, station_values]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to dispatch tile pyramid update for {parameter}: {e}")
+
+
+def _weather_row(weather_point: WeatherPoint) -> Dict[str, Any]:
+    """weather_data row for a WeatherPoint."""
+    return {
+        "time": weather_point.timestamp,
+        "location": encode_point(*weather_point.location),
+        "temperature": weather_point.temperature,
+        "humidity": weather_point.humidity,
+        "wind_speed": weather_point.wind_speed,
+        "wind_direction": weather_point.wind_direction,
+        "pressure": weather_point.pressure,
+        "precipitation": weather_point.precipitation,
+        "visibility": weather_point.visibility,
+        "source": weather_point.source
     }
 
 
-async def _store_air_quality_measurement(db: Session, data_point: DataPoint):
-    """Store air quality measurement in database."""
-    measurement = AirQualityMeasurement(
-        time=data_point.timestamp,
-        station_id=data_point.station_id or f"unknown_{data_point.source}",
-        parameter=data_point.parameter,
-        value=data_point.value,
-        unit=data_point.unit,
-        quality_flag=data_point.quality_flag,
-        source=data_point.source,
-        location=WKTElement(f"POINT({data_point.location[1]} {data_point.location[0]})", srid=4326)
-    )
-    
-    db.add(measurement)
-    db.commit()
-
-
-async def _store_weather_data(db: Session, weather_point: WeatherPoint):
-    """Store weather data in database."""
-    weather_data = WeatherData(
-        time=weather_point.timestamp,
-        location=WKTElement(f"POINT({weather_point.location[1]} {weather_point.location[0]})", srid=4326),
-        temperature=weather_point.temperature,
-        humidity=weather_point.humidity,
-        wind_speed=weather_point.wind_speed,
-        wind_direction=weather_point.wind_direction,
-        pressure=weather_point.pressure,
-        precipitation=weather_point.precipitation,
-        visibility=weather_point.visibility,
-        source=weather_point.source
-    )
-    
-    db.add(weather_data)
-    db.commit()
+def _store_weather_points(db: Session, weather_points: List[WeatherPoint]) -> BulkWriteResult:
+    """Store weather data in database with the bulk COPY path."""
+    return bulk_write(db, WEATHER_DATA, [_weather_row(p) for p in weather_points])
 
 
 @celery_app.task(base=CallbackTask)
@@ -751,15 +770,9 @@ def get_cpcb_stations(city: str = None, state: str = None) -> Dict[str, Any]:
         logger.info(f"Fetching CPCB stations for city={city}, state={state}")
         
         # Run async station fetch
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_get_cpcb_stations(city, state)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_get_cpcb_stations(city, state)
+        )
         
         logger.info(f"CPCB stations fetch completed: {len(result['stations'])} stations found")
         return result
@@ -814,15 +827,9 @@ def check_cpcb_station_status(station_id: str) -> Dict[str, Any]:
         logger.info(f"Checking CPCB station status for {station_id}")
         
         # Run async status check
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_check_cpcb_station_status(station_id)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_check_cpcb_station_status(station_id)
+        )
         
         logger.info(f"CPCB station status check completed for {station_id}")
         return result
@@ -861,15 +868,9 @@ def get_imd_stations(city: str = None, state: str = None) -> Dict[str, Any]:
         logger.info(f"Fetching IMD weather stations for city={city}, state={state}")
         
         # Run async station fetch
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_get_imd_stations(city, state)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_get_imd_stations(city, state)
+        )
         
         logger.info(f"IMD stations fetch completed: {len(result['stations'])} stations found")
         return result
@@ -925,15 +926,9 @@ def check_imd_station_status(station_id: str) -> Dict[str, Any]:
         logger.info(f"Checking IMD weather station status for {station_id}")
         
         # Run async status check
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_check_imd_station_status(station_id)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_check_imd_station_status(station_id)
+        )
         
         logger.info(f"IMD station status check completed for {station_id}")
         return result
@@ -997,15 +992,9 @@ def ingest_satellite_data(self,
             }
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_satellite_data(sources, parameters, bbox, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_satellite_data(sources, parameters, bbox, start_dt, end_dt)
+        )
         
         logger.info(f"Satellite data ingestion completed: {result}")
         return result
@@ -1022,12 +1011,8 @@ async def _async_ingest_satellite_data(sources: List[str],
                                      start_time: datetime, 
                                      end_time: datetime) -> Dict[str, Any]:
     """Async helper for satellite data ingestion."""
-    ingested_count = 0
-    failed_count = 0
     tropomi_count = 0
     viirs_count = 0
-    real_time_count = 0
-    estimated_count = 0
     
     # Default sources and parameters
     if not sources:
@@ -1075,25 +1060,16 @@ async def _async_ingest_satellite_data(sources: List[str],
             source_results["viirs"] = []
     
     # Store all satellite data in database
-    db = next(get_db())
-    try:
-        for source, satellite_points in source_results.items():
-            for sat_point in satellite_points:
-                try:
-                    await _store_satellite_measurement(db, sat_point)
-                    ingested_count += 1
-                    
-                    # Track data quality
-                    if sat_point.quality_flag == "real_time":
-                        real_time_count += 1
-                    elif sat_point.quality_flag == "estimated":
-                        estimated_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Failed to store satellite data point: {e}")
-                    failed_count += 1
-    finally:
-        db.close()
+    satellite_points = [point for points in source_results.values() for point in points]
+    with get_db_session() as db:
+        stored = _store_satellite_points(db, satellite_points)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
+    
+    # Track data quality
+    real_time_count = sum(1 for point in satellite_points if point.quality_flag == "real_time")
+    estimated_count = sum(1 for point in satellite_points if point.quality_flag == "estimated")
     
     return {
         "task": "ingest_satellite_data",
@@ -1152,15 +1128,9 @@ def ingest_tropomi_data(self,
             }
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_tropomi_data(parameters, bbox, start_dt, end_dt, max_cloud_fraction)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_tropomi_data(parameters, bbox, start_dt, end_dt, max_cloud_fraction)
+        )
         
         logger.info(f"TROPOMI data ingestion completed: {result}")
         return result
@@ -1176,8 +1146,6 @@ async def _async_ingest_tropomi_data(parameters: List[str],
                                    end_time: datetime,
                                    max_cloud_fraction: float) -> Dict[str, Any]:
     """Async helper for TROPOMI data ingestion."""
-    ingested_count = 0
-    failed_count = 0
     real_time_count = 0
     estimated_count = 0
     parameter_counts = {}
@@ -1191,29 +1159,23 @@ async def _async_ingest_tropomi_data(parameters: List[str],
             max_cloud_fraction=max_cloud_fraction
         )
         
-        # Store satellite data in database
-        db = next(get_db())
-        try:
-            for sat_point in satellite_points:
-                try:
-                    await _store_satellite_measurement(db, sat_point)
-                    ingested_count += 1
-                    
-                    # Track parameter counts
-                    param = sat_point.parameter
-                    parameter_counts[param] = parameter_counts.get(param, 0) + 1
-                    
-                    # Track data quality
-                    if sat_point.quality_flag == "real_time":
-                        real_time_count += 1
-                    elif sat_point.quality_flag == "estimated":
-                        estimated_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Failed to store TROPOMI data point: {e}")
-                    failed_count += 1
-        finally:
-            db.close()
+    # Store satellite data in database
+    with get_db_session() as db:
+        stored = _store_satellite_points(db, satellite_points)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
+    
+    for sat_point in satellite_points:
+        # Track parameter counts
+        param = sat_point.parameter
+        parameter_counts[param] = parameter_counts.get(param, 0) + 1
+        
+        # Track data quality
+        if sat_point.quality_flag == "real_time":
+            real_time_count += 1
+        elif sat_point.quality_flag == "estimated":
+            estimated_count += 1
     
     return {
         "task": "ingest_tropomi_data",
@@ -1270,15 +1232,9 @@ def ingest_viirs_data(self,
             }
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_viirs_data(parameters, bbox, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_viirs_data(parameters, bbox, start_dt, end_dt)
+        )
         
         logger.info(f"VIIRS data ingestion completed: {result}")
         return result
@@ -1293,8 +1249,6 @@ async def _async_ingest_viirs_data(parameters: List[str],
                                  start_time: datetime,
                                  end_time: datetime) -> Dict[str, Any]:
     """Async helper for VIIRS data ingestion."""
-    ingested_count = 0
-    failed_count = 0
     real_time_count = 0
     estimated_count = 0
     parameter_counts = {}
@@ -1308,33 +1262,27 @@ async def _async_ingest_viirs_data(parameters: List[str],
             end_time=end_time
         )
         
-        # Store satellite data in database
-        db = next(get_db())
-        try:
-            for sat_point in satellite_points:
-                try:
-                    await _store_satellite_measurement(db, sat_point)
-                    ingested_count += 1
-                    
-                    # Track parameter counts
-                    param = sat_point.parameter
-                    parameter_counts[param] = parameter_counts.get(param, 0) + 1
-                    
-                    # Count fire detections
-                    if param == "fire_radiative_power" and sat_point.value > 0:
-                        fire_detections += 1
-                    
-                    # Track data quality
-                    if sat_point.quality_flag == "real_time":
-                        real_time_count += 1
-                    elif sat_point.quality_flag == "estimated":
-                        estimated_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Failed to store VIIRS data point: {e}")
-                    failed_count += 1
-        finally:
-            db.close()
+    # Store satellite data in database
+    with get_db_session() as db:
+        stored = _store_satellite_points(db, satellite_points)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
+    
+    for sat_point in satellite_points:
+        # Track parameter counts
+        param = sat_point.parameter
+        parameter_counts[param] = parameter_counts.get(param, 0) + 1
+        
+        # Count fire detections
+        if param == "fire_radiative_power" and sat_point.value > 0:
+            fire_detections += 1
+        
+        # Track data quality
+        if sat_point.quality_flag == "real_time":
+            real_time_count += 1
+        elif sat_point.quality_flag == "estimated":
+            estimated_count += 1
     
     return {
         "task": "ingest_viirs_data",
@@ -1352,23 +1300,24 @@ async def _async_ingest_viirs_data(parameters: List[str],
     }
 
 
-async def _store_satellite_measurement(db: Session, sat_point: SatelliteDataPoint):
-    """Store satellite measurement in database."""
-    # Convert SatelliteDataPoint to AirQualityMeasurement for storage
-    # This allows satellite data to be stored alongside ground-based measurements
-    measurement = AirQualityMeasurement(
-        time=sat_point.timestamp,
-        station_id=f"{sat_point.satellite}_{sat_point.parameter}",
-        parameter=sat_point.parameter,
-        value=sat_point.value,
-        unit=sat_point.unit,
-        quality_flag=sat_point.quality_flag,
-        source=sat_point.source,
-        location=WKTElement(f"POINT({sat_point.location[1]} {sat_point.location[0]})", srid=4326)
-    )
-    
-    db.add(measurement)
-    db.commit()
+def _satellite_row(sat_point: SatelliteDataPoint) -> Dict[str, Any]:
+    """air_quality_measurements row for a satellite retrieval."""
+    # Satellite data is stored alongside ground-based measurements
+    return {
+        "time": sat_point.timestamp,
+        "station_id": f"{sat_point.satellite}_{sat_point.parameter}",
+        "parameter": sat_point.parameter,
+        "value": sat_point.value,
+        "unit": sat_point.unit,
+        "quality_flag": sat_point.quality_flag,
+        "source": sat_point.source,
+        "location": encode_point(*sat_point.location)
+    }
+
+
+def _store_satellite_points(db: Session, sat_points: List[SatelliteDataPoint]) -> BulkWriteResult:
+    """Store satellite measurements in database with the bulk COPY path."""
+    return bulk_write(db, AIR_QUALITY_MEASUREMENTS, [_satellite_row(p) for p in sat_points])
 
 
 @celery_app.task(base=CallbackTask, bind=True)
@@ -1411,15 +1360,9 @@ def ingest_all_sources_with_satellite(self,
             }
         
         # Run async orchestrated ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_all_sources_with_satellite(location_tuples, bbox, start_dt, end_dt)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_all_sources_with_satellite(location_tuples, bbox, start_dt, end_dt)
+        )
         
         logger.info(f"Comprehensive data ingestion with satellite completed: {result}")
         return result
@@ -1434,69 +1377,30 @@ async def _async_ingest_all_sources_with_satellite(locations: List[tuple],
                                                  start_time: datetime, 
                                                  end_time: datetime) -> Dict[str, Any]:
     """Async helper for comprehensive data ingestion including satellite sources."""
-    # Initialize orchestrators
-    ground_orchestrator = DataIngestionOrchestrator()
-    satellite_orchestrator = SatelliteDataOrchestrator()
-    
-    await ground_orchestrator.initialize_clients()
-    await satellite_orchestrator.initialize_clients()
-    
-    # Ingest from ground-based sources
-    ground_results = await ground_orchestrator.ingest_all_sources(
-        locations=locations,
-        start_time=start_time,
-        end_time=end_time
-    )
-    
-    # Ingest from satellite sources
-    satellite_results = await satellite_orchestrator.ingest_all_satellite_sources(
-        bbox=bbox,
-        start_time=start_time,
-        end_time=end_time
-    )
-    
-    # Store all data in database
-    db = next(get_db())
+    orchestrator = DataIngestionOrchestrator()
+    await orchestrator.initialize_clients()
+    
     ingestion_stats = {
         "air_quality_stored": 0,
         "weather_stored": 0,
         "satellite_stored": 0,
         "air_quality_failed": 0,
         "weather_failed": 0,
-        "satellite_failed": 0
+        "satellite_failed": 0,
+        "air_quality_duplicates": 0
     }
     
-    try:
-        # Store ground-based air quality data
-        for data_point in ground_results["air_quality"]:
-            try:
-                await _store_air_quality_measurement(db, data_point)
-                ingestion_stats["air_quality_stored"] += 1
-            except Exception as e:
-                logger.error(f"Failed to store air quality data: {e}")
-                ingestion_stats["air_quality_failed"] += 1
-        
-        # Store weather data
-        for weather_point in ground_results["weather"]:
-            try:
-                await _store_weather_data(db, weather_point)
-                ingestion_stats["weather_stored"] += 1
-            except Exception as e:
-                logger.error(f"Failed to store weather data: {e}")
-                ingestion_stats["weather_failed"] += 1
-        
-        # Store satellite data
-        for source, satellite_points in satellite_results.items():
-            for sat_point in satellite_points:
-                try:
-                    await _store_satellite_measurement(db, sat_point)
-                    ingestion_stats["satellite_stored"] += 1
-                except Exception as e:
-                    logger.error(f"Failed to store satellite data: {e}")
-                    ingestion_stats["satellite_failed"] += 1
-    
-    finally:
-        db.close()
+    with get_db_session() as db:
+        # Ground and satellite sources run concurrently; each is stored as it completes
+        results = await orchestrator.ingest_all_sources_with_satellite(
+            locations=locations,
+            bbox=bbox,
+            start_time=start_time,
+            end_time=end_time,
+            on_source_complete=_source_storer(db, ingestion_stats)
+        )
+    
+    satellite_results = results["satellite"]
     
     return {
         "task": "ingest_all_sources_with_satellite",
@@ -1504,16 +1408,17 @@ async def _async_ingest_all_sources_with_satellite(locations: List[tuple],
         "locations_processed": len(locations) if locations else 4,
         "bbox": bbox,
         "ground_based_results": {
-            "air_quality_points": len(ground_results["air_quality"]),
-            "weather_points": len(ground_results["weather"]),
-            "traffic_points": len(ground_results["traffic"])
+            "air_quality_points": len(results["air_quality"]),
+            "weather_points": len(results["weather"]),
+            "traffic_points": len(results["traffic"])
         },
         "satellite_results": {
             "tropomi_points": len(satellite_results.get("tropomi", [])),
             "viirs_points": len(satellite_results.get("viirs", []))
         },
         "storage_stats": ingestion_stats,
-        "total_satellite_points": sum(len(points) for points in satellite_results.values())
+        "total_satellite_points": sum(len(points) for points in satellite_results.values()),
+        "source_stats": results["source_stats"]
     }
 
 
@@ -1541,15 +1446,9 @@ def ingest_imd_forecast_data(self, station_ids: List[str] = None,
             location_tuples = [(loc["lat"], loc["lon"]) for loc in locations]
         
         # Run async ingestion
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                _async_ingest_imd_forecast_data(station_ids, location_tuples, hours)
-            )
-        finally:
-            loop.close()
+        result = run_in_worker_loop(
+            _async_ingest_imd_forecast_data(station_ids, location_tuples, hours)
+        )
         
         logger.info(f"IMD weather forecast ingestion completed: {result}")
         return result
@@ -1561,9 +1460,6 @@ def ingest_imd_forecast_data(self, station_ids: List[str] = None,
 
 async def _async_ingest_imd_forecast_data(station_ids: List[str], locations: List[tuple], hours: int) -> Dict[str, Any]:
     """Async helper for IMD forecast data ingestion."""
-    ingested_count = 0
-    failed_count = 0
-    
     # Default to major IMD stations if no specific locations or stations provided
     if not locations and not station_ids:
         station_ids = ["DL_SAFDARJUNG", "MH_COLABA", "KA_HAL", "TN_MEENAMBAKKAM", "WB_DUMDUM"]
@@ -1575,18 +1471,12 @@ async def _async_ingest_imd_forecast_data(station_ids: List[str], locations: Lis
             hours=hours
         )
         
-        # Store forecast points in database
-        db = next(get_db())
-        try:
-            for forecast_point in forecast_points:
-                try:
-                    await _store_weather_data(db, forecast_point)
-                    ingested_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to store forecast point: {e}")
-                    failed_count += 1
-        finally:
-            db.close()
+    # Store forecast points in database
+    with get_db_session() as db:
+        stored = _store_weather_points(db, forecast_points)
+    
+    ingested_count = stored.rows - stored.failed
+    failed_count = stored.failed
     
     return {
         "task": "ingest_imd_forecast_data",
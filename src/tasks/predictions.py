@@ -3,16 +3,20 @@ Prediction generation tasks for air quality forecasting.
 Handles hourly predictions, spatial grid predictions, and ensemble modeling.
 """
 
+import asyncio
 import logging
 import numpy as np
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+from datetime import datetime, timedelta, timezone
 from celery import Task
 
 from src.tasks.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Cities materialized when no city configuration is active
+DEFAULT_PREDICTION_CITIES = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad"]
+
 class CallbackTask(Task):
     """Base task class with callbacks for success/failure."""
     
@@ -25,10 +29,15 @@ class CallbackTask(Task):
 @celery_app.task(base=CallbackTask, bind=True, max_retries=2)
 def generate_hourly_predictions(self, locations: List[str] = None) -> Dict[str, Any]:
     """
-    Generate hourly air quality predictions for specified locations.
+    Materialize the hourly 24h forecasts for every active city and station.
+    
+    The ensemble runs once over all locations; every forecast hour is written
+    to the predictions hypertable and the current and 24h responses are
+    primed in the cache, so the forecast endpoints serve them without
+    running inference.
     
     Args:
-        locations: List of location identifiers. If None, generate for all active locations.
+        locations: List of location identifiers. If None, generate for all active cities and stations.
         
     Returns:
         Dictionary with prediction generation results.
@@ -36,31 +45,13 @@ def generate_hourly_predictions(self, locations: List[str] = None) -> Dict[str,
     try:
         logger.info("Starting hourly prediction generation")
         
-        # Mock implementation - will be replaced with actual ML model inference
-        predictions_generated = 0
-        failed_predictions = 0
-        
-        if not locations:
-            locations = ["Delhi", "Mumbai", "Bangalore", "Chennai"]
-        
-        for location in locations:
-            try:
-                # Mock prediction generation
-                logger.info(f"Generating predictions for {location}")
-                # Here would be actual ML model inference
-                predictions_generated += 24  # 24 hourly predictions per location
-            except Exception as e:
-                logger.error(f"Failed to generate predictions for {location}: {e}")
-                failed_predictions += 24
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
         
-        result = {
-            "task": "generate_hourly_predictions",
-            "timestamp": datetime.utcnow().isoformat(),
-            "locations_processed": len(locations),
-            "predictions_generated": predictions_generated,
-            "failed_predictions": failed_predictions,
-            "success_rate": predictions_generated / (predictions_generated + failed_predictions) if (predictions_generated + failed_predictions) > 0 else 0
-        }
+        try:
+            result = loop.run_until_complete(_materialize_hourly_predictions(locations))
+        finally:
+            loop.close()
         
         logger.info(f"Hourly prediction generation completed: {result}")
         return result
@@ -69,6 +60,130 @@ def generate_hourly_predictions(self, locations: List[str] = None) -> Dict[str,
         logger.error(f"Hourly prediction generation failed: {exc}")
         raise self.retry(exc=exc, countdown=120 * (2 ** self.request.retries))
 
+
+async def _materialize_hourly_predictions(locations: List[str] = None) -> Dict[str, Any]:
+    """Async helper for hourly prediction materialization."""
+    from src.api.crud import PredictionCRUD
+    from src.api.database import AsyncSessionLocal
+    from src.api.routers.forecast import build_materialized_predictions, materialized_forecast_payloads
+    
+    run_time = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    
+    async with AsyncSessionLocal() as db:
+        targets = await _prediction_targets(db, locations)
+        rows = build_materialized_predictions([info for _, info in targets], run_time)
+        predictions_written = await PredictionCRUD.bulk_create(
+            db, [row for location_rows in rows for row in location_rows]
+        )
+    
+    payloads = {
+        name: materialized_forecast_payloads(info, location_rows)
+        for (name, info), location_rows in zip(targets, rows)
+    }
+    cache_entries = await _prime_forecast_cache(payloads)
+    
+    return {
+        "task": "generate_hourly_predictions",
+        "timestamp": datetime.utcnow().isoformat(),
+        "run_time": run_time.isoformat(),
+        "locations_processed": len(targets),
+        "predictions_generated": predictions_written,
+        "model_versions": sorted({r[0]["model_version"] for r in rows if r}),
+        "cache_entries_primed": cache_entries
+    }
+
+
+async def _prediction_targets(db, locations: List[str] = None) -> List[Tuple[str, Any]]:
+    """
+    Locations to materialize as (identifier, LocationInfo), cities first.
+    
+    Cities use the parser's centre coordinates so lookups by city name find
+    their rows; stations sharing a cache key with an earlier target are skipped.
+    """
+    from sqlalchemy import select, func
+    from src.api.models import CityConfiguration, MonitoringStation
+    from src.utils.location_parser import LocationInfo, parse_location
+    from src.api.cache_keys import canonical_location
+    
+    targets = []
+    if locations:
+        for location in locations:
+            try:
+                targets.append((location, parse_location(location)))
+            except ValueError as e:
+                logger.warning(f"Skipping prediction location {location}: {e}")
+    else:
+        cities = (await db.execute(
+            select(
+                CityConfiguration.city_name,
+                CityConfiguration.state,
+                func.ST_Y(CityConfiguration.center_location),
+                func.ST_X(CityConfiguration.center_location)
+            ).where(CityConfiguration.is_active.is_(True))
+            .order_by(CityConfiguration.priority.desc())
+        )).all()
+        if not cities:
+            cities = [(city, None, None, None) for city in DEFAULT_PREDICTION_CITIES]
+        
+        for city_name, state, lat, lon in cities:
+            try:
+                targets.append((city_name, parse_location(city_name)))
+            except ValueError:
+                if lat is None:
+                    logger.warning(f"Skipping city without coordinates: {city_name}")
+                    continue
+                targets.append((city_name, LocationInfo(
+                    latitude=lat, longitude=lon, name=city_name, city=city_name,
+                    state=state, source="database"
+                )))
+        
+        stations = (await db.execute(
+            select(
+                MonitoringStation.name,
+                MonitoringStation.city,
+                MonitoringStation.state,
+                func.ST_Y(MonitoringStation.location),
+                func.ST_X(MonitoringStation.location)
+            ).where(MonitoringStation.is_active.is_(True))
+        )).all()
+        for name, city, state, lat, lon in stations:
+            targets.append((f"{lat},{lon}", LocationInfo(
+                latitude=lat, longitude=lon, name=name, city=city,
+                state=state, source="database"
+            )))
+    
+    # Targets sharing a forecast cache key share one materialized forecast
+    unique = {}
+    for name, info in targets:
+        unique.setdefault(canonical_location(name), (name, info))
+    return list(unique.values())
+
+
+async def _prime_forecast_cache(payloads: Dict[str, Dict[str, Dict[str, Any]]]) -> int:
+    """Write materialized responses under the forecast endpoints' cache keys."""
+    import redis.asyncio as redis
+    from src.api.cache import CacheManager, REDIS_URL, CACHE_TTL, CACHE_STALE_TTL, make_forecast_key
+    
+    client = redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+    writer = CacheManager(l1_max_entries=0)
+    writer.client = client
+    primed = 0
+    try:
+        for forecast_type, ttl_key in (("current", "current_aqi"), ("24h", "forecast")):
+            entries = {}
+            for name, responses in payloads.items():
+                # Stations near a city share its key; the city's own forecast wins
+                entries.setdefault(make_forecast_key(name, forecast_type), responses[forecast_type])
+            if await writer.prime_many(
+                entries, ttl=CACHE_TTL[ttl_key], stale_ttl=CACHE_STALE_TTL[ttl_key]
+            ):
+                primed += len(entries)
+    except Exception as e:
+        logger.warning(f"Failed to prime forecast cache: {e}")
+    finally:
+        await client.close()
+    return primed
+
 @celery_app.task(base=CallbackTask, bind=True, max_retries=2)
 def generate_spatial_predictions(self, bounds: Dict[str, float] = None, resolution: float = 1.0) -> Dict[str, Any]:
     """
@@ -217,6 +332,276 @@ def generate_spatial_predictions(self, bounds: Dict[str, float] = None, resoluti
         logger.error(f"Spatial prediction generation failed: {exc}")
         raise self.retry(exc=exc, countdown=180 * (2 ** self.request.retries))
 
+@celery_app.task(base=CallbackTask, bind=True, max_retries=2)
+def generate_tile_pyramids(self, cities: List[str] = None, parameter: str = "pm25") -> Dict[str, Any]:
+    """
+    Precompute the hourly XYZ tile pyramid for each city.
+    
+    Station values are the last hour's mean per station; each city's surface is
+    interpolated once per zoom level and cut into tiles served by
+    /forecast/tiles/{z}/{x}/{y} and used to assemble /forecast/spatial grids.
+    
+    Args:
+        cities: City names with default bounds. If None, build all supported cities.
+        parameter: Pollutant parameter to interpolate.
+        
+    Returns:
+        Dictionary with pyramid build results.
+    """
+    try:
+        from src.api.database import get_db_session
+        from src.utils.spatial_interpolation import get_city_bounds
+        from src.utils.tile_pyramid import get_tile_pyramid_builder, get_tile_store
+        
+        logger.info("Starting tile pyramid generation")
+        
+        if not cities:
+            cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad"]
+        
+        now = datetime.utcnow()
+        builder = get_tile_pyramid_builder()
+        built = []
+        skipped = []
+        
+        with get_db_session() as db:
+            for city in cities:
+                bounds = get_city_bounds(city)
+                if not bounds:
+                    skipped.append({"city": city, "reason": "no default bounds"})
+                    continue
+                
+                station_data = _latest_station_values(db, parameter, bounds, now - timedelta(hours=1))
+                
+                try:
+                    built.append(builder.build(city.lower(), station_data, bounds, parameter, now))
+                except ValueError as e:
+                    logger.warning(f"Skipping tile pyramid for {city}: {e}")
+                    skipped.append({"city": city, "reason": str(e)})
+        
+        pruned = get_tile_store().prune(parameter)
+        
+        result = {
+            "task": "generate_tile_pyramids",
+            "timestamp": now.isoformat(),
+            "parameter": parameter,
+            "cities_built": len(built),
+            "tiles_written": sum(b["tiles_written"] for b in built),
+            "hours_pruned": pruned,
+            "built": built,
+            "skipped": skipped
+        }
+        
+        logger.info(f"Tile pyramid generation completed: {result['cities_built']} cities, {result['tiles_written']} tiles")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Tile pyramid generation failed: {exc}")
+        raise self.retry(exc=exc, countdown=180 * (2 ** self.request.retries))
+
+@celery_app.task(base=CallbackTask, bind=True, max_retries=2)
+def generate_forecast_cubes(self, cities: List[str] = None, parameter: str = "pm25",
+                            resolution_km: float = 1.0) -> Dict[str, Any]:
+    """
+    Precompute the 24-hour space-time forecast cube for each city grid.
+    
+    Each station's forecast series is produced once, then all horizons are
+    interpolated together as one product of the city's grid x station weight
+    matrix with the station forecasts, and stored as a single array served by
+    /forecast/spatial/cube/{city}.
+    
+    Args:
+        cities: City names with default bounds. If None, build all supported cities.
+        parameter: Pollutant parameter to forecast.
+        resolution_km: Grid resolution in kilometers.
+        
+    Returns:
+        Dictionary with cube build results.
+    """
+    try:
+        from src.api.database import get_db_session
+        from src.utils.spatial_interpolation import get_city_bounds
+        from src.utils.forecast_cube import (
+            build_forecast_cube, get_forecast_cube_store, FORECAST_HORIZON_HOURS
+        )
+        
+        logger.info("Starting forecast cube generation")
+        
+        if not cities:
+            cities = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad"]
+        
+        now = datetime.utcnow()
+        store = get_forecast_cube_store()
+        built = []
+        skipped = []
+        
+        with get_db_session() as db:
+            for city in cities:
+                bounds = get_city_bounds(city)
+                if not bounds:
+                    skipped.append({"city": city, "reason": "no default bounds"})
+                    continue
+                
+                station_data = _latest_station_values(db, parameter, bounds, now - timedelta(hours=1))
+                station_ids = list(station_data)
+                coords = np.array([[station_data[s]["lat"], station_data[s]["lon"]] for s in station_ids])
+                forecasts = _forecast_station_series(station_data, parameter, now, FORECAST_HORIZON_HOURS)
+                
+                try:
+                    cube = build_forecast_cube(
+                        city.lower(), station_ids, coords, forecasts, bounds,
+                        resolution_km, parameter, now
+                    )
+                except ValueError as e:
+                    logger.warning(f"Skipping forecast cube for {city}: {e}")
+                    skipped.append({"city": city, "reason": str(e)})
+                    continue
+                
+                store.put(cube)
+                built.append({
+                    "city": city,
+                    "shape": list(cube.values.shape),
+                    "n_stations": len(station_ids)
+                })
+        
+        pruned = store.prune(parameter)
+        
+        result = {
+            "task": "generate_forecast_cubes",
+            "timestamp": now.isoformat(),
+            "parameter": parameter,
+            "resolution_km": resolution_km,
+            "cities_built": len(built),
+            "cubes_pruned": pruned,
+            "built": built,
+            "skipped": skipped
+        }
+        
+        logger.info(f"Forecast cube generation completed: {result['cities_built']} cities")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Forecast cube generation failed: {exc}")
+        raise self.retry(exc=exc, countdown=180 * (2 ** self.request.retries))
+
+
+def _latest_station_values(db, parameter: str, bounds: Dict[str, float],
+                           since: datetime) -> Dict[str, Dict[str, float]]:
+    """Mean value and location per station inside the bounds since a time."""
+    from sqlalchemy import func
+    from src.api.models import AirQualityMeasurement
+    
+    rows = db.query(
+        AirQualityMeasurement.station_id,
+        func.avg(AirQualityMeasurement.value),
+        func.avg(func.ST_Y(AirQualityMeasurement.location)),
+        func.avg(func.ST_X(AirQualityMeasurement.location))
+    ).filter(
+        AirQualityMeasurement.parameter == parameter,
+        AirQualityMeasurement.time >= since,
+        AirQualityMeasurement.value.isnot(None),
+        func.ST_Y(AirQualityMeasurement.location).between(bounds["south"], bounds["north"]),
+        func.ST_X(AirQualityMeasurement.location).between(bounds["west"], bounds["east"])
+    ).group_by(AirQualityMeasurement.station_id).all()
+    
+    return {
+        station_id: {"lat": lat, "lon": lon, parameter: value}
+        for station_id, value, lat, lon in rows
+    }
+
+
+def _forecast_station_series(station_data: Dict[str, Dict[str, float]], parameter: str,
+                             base_time: datetime, hours: int = 24) -> np.ndarray:
+    """
+    Forecast series for each station, shape (n_stations, hours).
+    
+    PM2.5 uses the ensemble forecaster seeded with the station's latest value;
+    other parameters, and stations the ensemble fails for, follow a diurnal
+    profile around the latest value.
+    """
+    import pandas as pd
+    
+    forecast_hours = np.arange(1, hours + 1)
+    diurnal = 1 + 0.3 * np.sin(2 * np.pi * (forecast_hours - 8) / 24)
+    weather_forecast = [
+        {
+            'temperature': 25 + 5 * np.sin(2 * np.pi * h / 24),
+            'humidity': 60 + 20 * np.sin(2 * np.pi * (h + 6) / 24),
+            'wind_speed': 3.0,
+            'pressure': 1013.0
+        }
+        for h in range(hours)
+    ]
+    
+    ensemble_forecaster = None
+    if parameter == "pm25":
+        try:
+            from src.models.ensemble_forecaster import get_ensemble_forecaster
+            ensemble_forecaster = get_ensemble_forecaster()
+        except Exception as e:
+            logger.warning(f"Ensemble forecaster unavailable, using diurnal profile: {e}")
+    
+    series = np.empty((len(station_data), hours))
+    for i, data in enumerate(station_data.values()):
+        latest = float(data[parameter])
+        series[i] = latest * diurnal
+        if ensemble_forecaster is None:
+            continue
+        
+        initial_features = pd.DataFrame([{
+            'timestamp': base_time,
+            'hour': base_time.hour,
+            'day_of_week': base_time.weekday(),
+            'is_weekend': 1 if base_time.weekday() >= 5 else 0,
+            'is_rush_hour': 1 if (8 <= base_time.hour <= 10 or 17 <= base_time.hour <= 20) else 0,
+            'hour_sin': np.sin(2 * np.pi * base_time.hour / 24),
+            'hour_cos': np.cos(2 * np.pi * base_time.hour / 24),
+            'latitude': data['lat'],
+            'longitude': data['lon'],
+            'temperature': weather_forecast[0]['temperature'],
+            'humidity': weather_forecast[0]['humidity'],
+            'wind_speed': weather_forecast[0]['wind_speed'],
+            'pressure': weather_forecast[0]['pressure'],
+            'pm25_lag1': latest
+        }])
+        try:
+            predictions = ensemble_forecaster.forecast_sequence(initial_features, weather_forecast, hours=hours)
+            series[i, :len(predictions)] = [p.pm25 for p in predictions]
+        except Exception as e:
+            logger.warning(f"Ensemble forecast failed for station, using diurnal profile: {e}")
+    
+    return np.maximum(series, 0)
+
+
+@celery_app.task(base=CallbackTask, bind=True, max_retries=2)
+def update_tile_pyramids(self, parameter: str, station_values: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """
+    Apply newly ingested station readings to the latest tile pyramids.
+    
+    Known stations are folded in as rank-1 updates of the stored grid x station
+    weights; regions whose station set changed are rebuilt in full.
+    
+    Args:
+        parameter: Pollutant parameter of the readings.
+        station_values: Dictionary with station_id -> {"lat", "lon", "value"}.
+        
+    Returns:
+        Dictionary with update results.
+    """
+    try:
+        from src.utils.tile_pyramid import get_tile_pyramid_builder
+        
+        summary = get_tile_pyramid_builder().apply_updates(parameter, station_values)
+        
+        if summary["stale"]:
+            logger.info(f"Station set changed for {summary['stale']}, rebuilding tile pyramids")
+            generate_tile_pyramids.delay(cities=summary["stale"], parameter=parameter)
+        
+        return dict(summary, task="update_tile_pyramids", timestamp=datetime.utcnow().isoformat())
+        
+    except Exception as exc:
+        logger.error(f"Tile pyramid update failed: {exc}")
+        raise self.retry(exc=exc, countdown=30 * (2 ** self.request.retries))
+
 @celery_app.task(base=CallbackTask)
 def update_ensemble_weights(model_performance: Dict[str, float]) -> Dict[str, Any]:
     """
@@ -1,10 +1,158 @@
 """
 AQI (Air Quality Index) calculation utilities.
 Implements standard AQI calculation formulas for various pollutants.
+
+Scalar helpers (``calculate_sub_index``, ``calculate_aqi``) and the vectorized
+array API (``calculate_sub_index_array``, ``calculate_aqi_batch``) share a
+single immutable breakpoint table, so every path yields identical values.
 """
 
-import math
-from typing import Dict, Tuple, Optional
+import bisect
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+# AQI breakpoints for different pollutants
+# Format: ((concentration_low, concentration_high, aqi_low, aqi_high), ...)
+AQI_BREAKPOINTS: Mapping[str, Tuple[Tuple[float, float, int, int], ...]] = MappingProxyType({
+    'pm25': (
+        (0.0, 12.0, 0, 50),
+        (12.1, 35.4, 51, 100),
+        (35.5, 55.4, 101, 150),
+        (55.5, 150.4, 151, 200),
+        (150.5, 250.4, 201, 300),
+        (250.5, 350.4, 301, 400),
+        (350.5, 500.4, 401, 500)
+    ),
+    'pm10': (
+        (0, 54, 0, 50),
+        (55, 154, 51, 100),
+        (155, 254, 101, 150),
+        (255, 354, 151, 200),
+        (355, 424, 201, 300),
+        (425, 504, 301, 400),
+        (505, 604, 401, 500)
+    ),
+    'o3': (
+        (0, 54, 0, 50),
+        (55, 70, 51, 100),
+        (71, 85, 101, 150),
+        (86, 105, 151, 200),
+        (106, 200, 201, 300)
+    ),
+    'no2': (
+        (0, 53, 0, 50),
+        (54, 100, 51, 100),
+        (101, 360, 101, 150),
+        (361, 649, 151, 200),
+        (650, 1249, 201, 300),
+        (1250, 1649, 301, 400),
+        (1650, 2049, 401, 500)
+    ),
+    'so2': (
+        (0, 35, 0, 50),
+        (36, 75, 51, 100),
+        (76, 185, 101, 150),
+        (186, 304, 151, 200),
+        (305, 604, 201, 300),
+        (605, 804, 301, 400),
+        (805, 1004, 401, 500)
+    ),
+    'co': (
+        (0.0, 4.4, 0, 50),
+        (4.5, 9.4, 51, 100),
+        (9.5, 12.4, 101, 150),
+        (12.5, 15.4, 151, 200),
+        (15.5, 30.4, 201, 300),
+        (30.5, 40.4, 301, 400),
+        (40.5, 50.4, 401, 500)
+    ),
+})
+
+# Pollutant order used for dominant-pollutant indices returned by the batch API
+POLLUTANT_ORDER: Tuple[str, ...] = tuple(AQI_BREAKPOINTS)
+
+# Sub-index assigned to concentrations above the highest breakpoint
+MAX_SUB_INDEX = 500
+
+# Category codes are indices into these tuples
+CATEGORY_CODES: Tuple[str, ...] = (
+    'good', 'moderate', 'unhealthy_sensitive', 'unhealthy', 'very_unhealthy', 'hazardous'
+)
+CATEGORY_LABELS: Tuple[str, ...] = (
+    'Good', 'Moderate', 'Unhealthy for Sensitive Groups', 'Unhealthy', 'Very Unhealthy', 'Hazardous'
+)
+CATEGORY_COLORS: Tuple[str, ...] = (
+    '#4ADE80',  # Green
+    '#FBBF24',  # Yellow
+    '#FB923C',  # Orange
+    '#EF4444',  # Red
+    '#A855F7',  # Purple
+    '#7C2D12'   # Maroon
+)
+
+# Inclusive upper AQI bound of every category except the last
+_CATEGORY_UPPER_BOUNDS = (50, 100, 150, 200, 300)
+
+
+def _readonly(values: Sequence[float]) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class _CompiledBreakpoints:
+    """Column-oriented view of one pollutant's breakpoint table"""
+    conc_low: np.ndarray
+    conc_high: np.ndarray
+    aqi_low: np.ndarray
+    slope: np.ndarray
+
+    @classmethod
+    def compile(cls, breakpoints: Sequence[Tuple[float, float, int, int]]) -> '_CompiledBreakpoints':
+        conc_low, conc_high, aqi_low, aqi_high = (np.asarray(col, dtype=np.float64) for col in zip(*breakpoints))
+        return cls(
+            conc_low=_readonly(conc_low),
+            conc_high=_readonly(conc_high),
+            aqi_low=_readonly(aqi_low),
+            slope=_readonly((aqi_high - aqi_low) / (conc_high - conc_low))
+        )
+
+
+_COMPILED_BREAKPOINTS: Mapping[str, _CompiledBreakpoints] = MappingProxyType({
+    pollutant: _CompiledBreakpoints.compile(breakpoints)
+    for pollutant, breakpoints in AQI_BREAKPOINTS.items()
+})
+_SCALAR_UPPER_BOUNDS: Mapping[str, Tuple[float, ...]] = MappingProxyType({
+    pollutant: tuple(conc_high for _, conc_high, _, _ in breakpoints)
+    for pollutant, breakpoints in AQI_BREAKPOINTS.items()
+})
+_CATEGORY_BOUNDS_ARRAY = _readonly(_CATEGORY_UPPER_BOUNDS)
+_CATEGORY_CODE_ARRAY = np.array(CATEGORY_CODES, dtype=object)
+_CATEGORY_LABEL_ARRAY = np.array(CATEGORY_LABELS, dtype=object)
+_CATEGORY_COLOR_ARRAY = np.array(CATEGORY_COLORS, dtype=object)
+
+
+@dataclass
+class AQIBatchResult:
+    """Vectorized AQI result for a batch of observations"""
+    aqi: np.ndarray  # int64 overall AQI per observation
+    dominant_index: np.ndarray  # int64 index into ``pollutants``, -1 when no data
+    category_codes: np.ndarray  # uint8 index into CATEGORY_CODES
+    pollutants: Tuple[str, ...]
+
+    def dominant_pollutants(self) -> np.ndarray:
+        """Map dominant pollutant indices to names ("unknown" when no data)"""
+        names = np.array(self.pollutants + ('unknown',), dtype=object)
+        return names[self.dominant_index]
+
+    def categories(self) -> np.ndarray:
+        """Map category codes to category strings"""
+        return _CATEGORY_CODE_ARRAY[self.category_codes]
 
 
 class AQICalculator:
@@ -14,72 +162,13 @@ class AQICalculator:
     
     def __init__(self):
         """Initialize AQI Calculator with standard breakpoints."""
-        self.pm25_breakpoints = [
-            (0.0, 12.0, 0, 50),
-            (12.1, 35.4, 51, 100),
-            (35.5, 55.4, 101, 150),
-            (55.5, 150.4, 151, 200),
-            (150.5, 250.4, 201, 300),
-            (250.5, 350.4, 301, 400),
-            (350.5, 500.4, 401, 500)
-        ]
-        
-        self.pm10_breakpoints = [
-            (0, 54, 0, 50),
-            (55, 154, 51, 100),
-            (155, 254, 101, 150),
-            (255, 354, 151, 200),
-            (355, 424, 201, 300),
-            (425, 504, 301, 400),
-            (505, 604, 401, 500)
-        ]
-        
-        self.o3_breakpoints = [
-            (0, 54, 0, 50),
-            (55, 70, 51, 100),
-            (71, 85, 101, 150),
-            (86, 105, 151, 200),
-            (106, 200, 201, 300)
-        ]
-        
-        self.no2_breakpoints = [
-            (0, 53, 0, 50),
-            (54, 100, 51, 100),
-            (101, 360, 101, 150),
-            (361, 649, 151, 200),
-            (650, 1249, 201, 300),
-            (1250, 1649, 301, 400),
-            (1650, 2049, 401, 500)
-        ]
-        
-        self.so2_breakpoints = [
-            (0, 35, 0, 50),
-            (36, 75, 51, 100),
-            (76, 185, 101, 150),
-            (186, 304, 151, 200),
-            (305, 604, 201, 300),
-            (605, 804, 301, 400),
-            (805, 1004, 401, 500)
-        ]
-        
-        self.co_breakpoints = [
-            (0.0, 4.4, 0, 50),
-            (4.5, 9.4, 51, 100),
-            (9.5, 12.4, 101, 150),
-            (12.5, 15.4, 151, 200),
-            (15.5, 30.4, 201, 300),
-            (30.5, 40.4, 301, 400),
-            (40.5, 50.4, 401, 500)
-        ]
-        
-        self.breakpoint_map = {
-            'pm25': self.pm25_breakpoints,
-            'pm10': self.pm10_breakpoints,
-            'o3': self.o3_breakpoints,
-            'no2': self.no2_breakpoints,
-            'so2': self.so2_breakpoints,
-            'co': self.co_breakpoints
-        }
+        self.breakpoint_map = AQI_BREAKPOINTS
+        self.pm25_breakpoints = AQI_BREAKPOINTS['pm25']
+        self.pm10_breakpoints = AQI_BREAKPOINTS['pm10']
+        self.o3_breakpoints = AQI_BREAKPOINTS['o3']
+        self.no2_breakpoints = AQI_BREAKPOINTS['no2']
+        self.so2_breakpoints = AQI_BREAKPOINTS['so2']
+        self.co_breakpoints = AQI_BREAKPOINTS['co']
     
     def calculate_sub_index(self, concentration: float, pollutant: str) -> float:
         """
@@ -95,11 +184,105 @@ class AQICalculator:
         if concentration < 0:
             return 0
         
-        if pollutant not in self.breakpoint_map:
+        if pollutant not in _COMPILED_BREAKPOINTS:
             raise ValueError(f"Unknown pollutant: {pollutant}")
         
-        breakpoints = self.breakpoint_map[pollutant]
-        return self._calculate_pollutant_aqi(concentration, breakpoints) or 0
+        return self._calculate_pollutant_aqi(concentration, pollutant)
+    
+    def calculate_sub_index_array(self, concentrations: np.ndarray, pollutant: str) -> np.ndarray:
+        """
+        Calculate sub-indices for an array of concentrations of one pollutant.
+        
+        Args:
+            concentrations: Array of pollutant concentrations (any shape)
+            pollutant: Pollutant type (pm25, pm10, etc.)
+        
+        Returns:
+            Float array of sub-index values with the same shape; NaN inputs stay NaN
+            and negative concentrations map to 0
+        """
+        table = _COMPILED_BREAKPOINTS.get(pollutant)
+        if table is None:
+            raise ValueError(f"Unknown pollutant: {pollutant}")
+        
+        conc = np.asarray(concentrations, dtype=np.float64)
+        # First segment whose upper bound covers the concentration; values that
+        # fall between two segments snap to the lower bound of the next one
+        idx = np.searchsorted(table.conc_high, conc, side='left')
+        seg = np.minimum(idx, len(table.conc_high) - 1)
+        clipped = np.maximum(conc, table.conc_low[seg])
+        sub_index = table.aqi_low[seg] + table.slope[seg] * (clipped - table.conc_low[seg])
+        
+        sub_index = np.where(idx >= len(table.conc_high), float(MAX_SUB_INDEX), sub_index)
+        sub_index = np.where(conc < 0, 0.0, sub_index)
+        return np.where(np.isnan(conc), np.nan, sub_index)
+    
+    def calculate_aqi_batch(self, pollutant_values: Mapping[str, np.ndarray]) -> AQIBatchResult:
+        """
+        Calculate AQI for a batch of observations.
+        
+        Args:
+            pollutant_values: Dictionary of pollutant -> array of concentrations.
+                              All arrays must broadcast to a common shape; NaN marks
+                              a missing reading. Unknown pollutants are ignored.
+        
+        Returns:
+            AQIBatchResult with AQI, dominant pollutant index and category code arrays
+        """
+        pollutants = tuple(p for p in pollutant_values if p in _COMPILED_BREAKPOINTS)
+        if not pollutants:
+            shape = np.broadcast_shapes(*(np.shape(v) for v in pollutant_values.values())) if pollutant_values else (0,)
+            return AQIBatchResult(
+                aqi=np.zeros(shape, dtype=np.int64),
+                dominant_index=np.full(shape, -1, dtype=np.int64),
+                category_codes=np.zeros(shape, dtype=np.uint8),
+                pollutants=pollutants
+            )
+        
+        arrays = np.broadcast_arrays(*(
+            np.asarray(pollutant_values[p], dtype=np.float64) for p in pollutants
+        ))
+        sub_indices = np.stack([
+            self.calculate_sub_index_array(values, pollutant)
+            for pollutant, values in zip(pollutants, arrays)
+        ])
+        
+        has_data = ~np.all(np.isnan(sub_indices), axis=0)
+        filled = np.where(np.isnan(sub_indices), -np.inf, sub_indices)
+        dominant_index = np.where(has_data, np.argmax(filled, axis=0), -1)
+        max_aqi = np.where(has_data, np.max(filled, axis=0), 0.0)
+        aqi = max_aqi.astype(np.int64)
+        
+        return AQIBatchResult(
+            aqi=aqi,
+            dominant_index=dominant_index.astype(np.int64),
+            category_codes=self.get_category_codes(max_aqi),
+            pollutants=pollutants
+        )
+    
+    def get_category_codes(self, aqi: np.ndarray) -> np.ndarray:
+        """
+        Get AQI category codes (indices into CATEGORY_CODES) for an array of AQI values.
+        
+        Args:
+            aqi: Array of AQI values
+        
+        Returns:
+            uint8 array of category codes
+        """
+        return np.searchsorted(_CATEGORY_BOUNDS_ARRAY, np.asarray(aqi, dtype=np.float64), side='left').astype(np.uint8)
+    
+    def get_categories(self, aqi: np.ndarray) -> np.ndarray:
+        """Vectorized ``get_category``: array of category strings"""
+        return _CATEGORY_CODE_ARRAY[self.get_category_codes(aqi)]
+    
+    def get_category_labels(self, aqi: np.ndarray) -> np.ndarray:
+        """Vectorized ``get_category_label``: array of human-readable labels"""
+        return _CATEGORY_LABEL_ARRAY[self.get_category_codes(aqi)]
+    
+    def get_colors(self, aqi: np.ndarray) -> np.ndarray:
+        """Vectorized ``get_color``: array of hex color codes"""
+        return _CATEGORY_COLOR_ARRAY[self.get_category_codes(aqi)]
     
     def calculate_aqi(self, pollutant_values: Dict[str, float]) -> Tuple[int, str, str]:
         """
@@ -145,19 +328,9 @@ class AQICalculator:
         Returns:
             AQI category string
         """
-        if aqi <= 50:
-            return "good"
-        elif aqi <= 100:
-            return "moderate"
-        elif aqi <= 150:
-            return "unhealthy_sensitive"
-        elif aqi <= 200:
-            return "unhealthy"
-        elif aqi <= 300:
-            return "very_unhealthy"
-        else:
-            return "hazardous"
+        return CATEGORY_CODES[_category_index(aqi)]
     
+
     def get_color(self, aqi: int) -> str:
         """
         Get color code for AQI value.
@@ -168,19 +341,9 @@ class AQICalculator:
         Returns:
             Hex color code
         """
-        if aqi <= 50:
-            return "#4ADE80"  # Green
-        elif aqi <= 100:
-            return "#FBBF24"  # Yellow
-        elif aqi <= 150:
-            return "#FB923C"  # Orange
-        elif aqi <= 200:
-            return "#EF4444"  # Red
-        elif aqi <= 300:
-            return "#A855F7"  # Purple
-        else:
-            return "#7C2D12"  # Maroon
+        return CATEGORY_COLORS[_category_index(aqi)]
     
+
     def get_category_label(self, aqi: int) -> str:
         """
         Get human-readable category label for AQI value.
@@ -191,19 +354,9 @@ class AQICalculator:
         Returns:
             Category label string
         """
-        if aqi <= 50:
-            return "Good"
-        elif aqi <= 100:
-            return "Moderate"
-        elif aqi <= 150:
-            return "Unhealthy for Sensitive Groups"
-        elif aqi <= 200:
-            return "Unhealthy"
-        elif aqi <= 300:
-            return "Very Unhealthy"
-        else:
-            return "Hazardous"
+        return CATEGORY_LABELS[_category_index(aqi)]
     
+
     def get_category_description(self, aqi: int) -> str:
         """
         Get detailed description for AQI category.
@@ -250,260 +403,33 @@ class AQICalculator:
         else:
             return "Everyone should avoid outdoor exertion."
     
-    def _calculate_pollutant_aqi(self, concentration: float, breakpoints: list) -> Optional[float]:
+    def _calculate_pollutant_aqi(self, concentration: float, pollutant: str) -> float:
         """
         Calculate AQI for a single pollutant using linear interpolation.
         
+        Scalar counterpart of ``calculate_sub_index_array``; both walk the
+        shared breakpoint table with the same segment selection rules.
+        
         Args:
-            concentration: Pollutant concentration
-            breakpoints: List of (conc_low, conc_high, aqi_low, aqi_high) tuples
+            concentration: Non-negative pollutant concentration
+            pollutant: Pollutant type (pm25, pm10, etc.)
         
         Returns:
-            AQI value or None if concentration is out of range
+            AQI value
         """
-        if concentration < 0:
-            return None
-        
-        # Find the appropriate breakpoint
-        for conc_low, conc_high, aqi_low, aqi_high in breakpoints:
-            if conc_low <= concentration <= conc_high:
-                # Linear interpolation
-                aqi = ((aqi_high - aqi_low) / (conc_high - conc_low)) * (concentration - conc_low) + aqi_low
-                return aqi
-        
-        # If concentration exceeds all breakpoints, use the highest category
-        if concentration > breakpoints[-1][1]:
-            return 500  # Hazardous
-        
-        return None
-
-
-def calculate_aqi(pollutant_values: Dict[str, float]) -> Tuple[int, str, str]:
-    """
-    Calculate AQI from pollutant concentrations.
-    
-    Args:
-        pollutant_values: Dictionary of pollutant concentrations
-                         Keys: pm25, pm10, o3, no2, so2, co
-                         Values: concentrations in µg/m³ (ppm for CO)
-    
-    Returns:
-        Tuple of (AQI value, dominant pollutant, category)
-    """
-    # AQI breakpoints for different pollutants
-    # Format: [(concentration_low, concentration_high, aqi_low, aqi_high), ...]
-    
-    pm25_breakpoints = [
-        (0.0, 12.0, 0, 50),
-        (12.1, 35.4, 51, 100),
-        (35.5, 55.4, 101, 150),
-        (55.5, 150.4, 151, 200),
-        (150.5, 250.4, 201, 300),
-        (250.5, 350.4, 301, 400),
-        (350.5, 500.4, 401, 500)
-    ]
-    
-    pm10_breakpoints = [
-        (0, 54, 0, 50),
-        (55, 154, 51, 100),
-        (155, 254, 101, 150),
-        (255, 354, 151, 200),
-        (355, 424, 201, 300),
-        (425, 504, 301, 400),
-        (505, 604, 401, 500)
-    ]
-    
-    o3_breakpoints = [
-        (0, 54, 0, 50),
-        (55, 70, 51, 100),
-        (71, 85, 101, 150),
-        (86, 105, 151, 200),
-        (106, 200, 201, 300)
-    ]
-    
-    no2_breakpoints = [
-        (0, 53, 0, 50),
-        (54, 100, 51, 100),
-        (101, 360, 101, 150),
-        (361, 649, 151, 200),
-        (650, 1249, 201, 300),
-        (1250, 1649, 301, 400),
-        (1650, 2049, 401, 500)
-    ]
-    
-    so2_breakpoints = [
-        (0, 35, 0, 50),
-        (36, 75, 51, 100),
-        (76, 185, 101, 150),
-        (186, 304, 151, 200),
-        (305, 604, 201, 300),
-        (605, 804, 301, 400),
-        (805, 1004, 401, 500)
-    ]
-    
-    co_breakpoints = [
-        (0.0, 4.4, 0, 50),
-        (4.5, 9.4, 51, 100),
-        (9.5, 12.4, 101, 150),
-        (12.5, 15.4, 151, 200),
-        (15.5, 30.4, 201, 300),
-        (30.5, 40.4, 301, 400),
-        (40.5, 50.4, 401, 500)
-    ]
-    
-    breakpoint_map = {
-        'pm25': pm25_breakpoints,
-        'pm10': pm10_breakpoints,
-        'o3': o3_breakpoints,
-        'no2': no2_breakpoints,
-        'so2': so2_breakpoints,
-        'co': co_breakpoints
-    }
-    
-    pollutant_aqis = {}
-    
-    # Calculate AQI for each pollutant
-    for pollutant, concentration in pollutant_values.items():
-        if pollutant in breakpoint_map and concentration is not None:
-            aqi = _calculate_pollutant_aqi(concentration, breakpoint_map[pollutant])
-            if aqi is not None:
-                pollutant_aqis[pollutant] = aqi
-    
-    if not pollutant_aqis:
-        return 0, "unknown", "no_data"
-    
-    # Find the maximum AQI (dominant pollutant)
-    max_aqi = max(pollutant_aqis.values())
-    dominant_pollutant = max(pollutant_aqis, key=pollutant_aqis.get)
-    
-    # Determine AQI category
-    category = _get_aqi_category(max_aqi)
-    
-    return int(max_aqi), dominant_pollutant, category
-
-
-def _calculate_pollutant_aqi(concentration: float, breakpoints: list) -> Optional[float]:
-    """
-    Calculate AQI for a single pollutant using linear interpolation.
-    
-    Args:
-        concentration: Pollutant concentration
-        breakpoints: List of (conc_low, conc_high, aqi_low, aqi_high) tuples
-    
-    Returns:
-        AQI value or None if concentration is out of range
-    """
-    if concentration < 0:
-        return None
-    
-    # Find the appropriate breakpoint
-    for conc_low, conc_high, aqi_low, aqi_high in breakpoints:
-        if conc_low <= concentration <= conc_high:
-            # Linear interpolation
-            aqi = ((aqi_high - aqi_low) / (conc_high - conc_low)) * (concentration - conc_low) + aqi_low
-            return aqi
-    
-    # If concentration exceeds all breakpoints, use the highest category
-    if concentration > breakpoints[-1][1]:
-        return 500  # Hazardous
-    
-    return None
+        breakpoints = AQI_BREAKPOINTS[pollutant]
+        idx = bisect.bisect_left(_SCALAR_UPPER_BOUNDS[pollutant], concentration)
+        if idx >= len(breakpoints):
+            return MAX_SUB_INDEX  # Hazardous
+        
+        conc_low, conc_high, aqi_low, aqi_high = breakpoints[idx]
+        concentration = max(concentration, conc_low)
+        return ((aqi_high - aqi_low) / (conc_high - conc_low)) * (concentration - conc_low) + aqi_low
 
 
-def _get_aqi_category(aqi: float) -> str:
-    """
-    Get AQI category based on AQI value.
-    
-    Args:
-        aqi: AQI value
-    
-    Returns:
-        AQI category string
-    """
-    if aqi <= 50:
-        return "good"
-    elif aqi <= 100:
-        return "moderate"
-    elif aqi <= 150:
-        return "unhealthy_sensitive"
-    elif aqi <= 200:
-        return "unhealthy"
-    elif aqi <= 300:
-        return "very_unhealthy"
-    else:
-        return "hazardous"
-
-
-def get_aqi_color(aqi: int) -> str:
-    """
-    Get color code for AQI value.
-    
-    Args:
-        aqi: AQI value
-    
-    Returns:
-        Hex color code
-    """
-    if aqi <= 50:
-        return "#00E400"  # Green
-    elif aqi <= 100:
-        return "#FFFF00"  # Yellow
-    elif aqi <= 150:
-        return "#FF7E00"  # Orange
-    elif aqi <= 200:
-        return "#FF0000"  # Red
-    elif aqi <= 300:
-        return "#8F3F97"  # Purple
-    else:
-        return "#7E0023"  # Maroon
-
-
-def get_aqi_description(aqi: int) -> Dict[str, str]:
-    """
-    Get detailed description for AQI value.
-    
-    Args:
-        aqi: AQI value
-    
-    Returns:
-        Dictionary with category, description, and health_advice
-    """
-    if aqi <= 50:
-        return {
-            "category": "Good",
-            "description": "Air quality is satisfactory, and air pollution poses little or no risk.",
-            "health_advice": "Enjoy outdoor activities."
-        }
-    elif aqi <= 100:
-        return {
-            "category": "Moderate",
-            "description": "Air quality is acceptable. However, there may be a risk for some people, particularly those who are unusually sensitive to air pollution.",
-            "health_advice": "Unusually sensitive people should consider limiting prolonged outdoor exertion."
-        }
-    elif aqi <= 150:
-        return {
-            "category": "Unhealthy for Sensitive Groups",
-            "description": "Members of sensitive groups may experience health effects. The general public is less likely to be affected.",
-            "health_advice": "Sensitive groups should limit prolonged outdoor exertion."
-        }
-    elif aqi <= 200:
-        return {
-            "category": "Unhealthy",
-            "description": "Some members of the general public may experience health effects; members of sensitive groups may experience more serious health effects.",
-            "health_advice": "Everyone should limit prolonged outdoor exertion."
-        }
-    elif aqi <= 300:
-        return {
-            "category": "Very Unhealthy",
-            "description": "Health alert: The risk of health effects is increased for everyone.",
-            "health_advice": "Everyone should limit outdoor exertion."
-        }
-    else:
-        return {
-            "category": "Hazardous",
-            "description": "Health warning of emergency conditions: everyone is more likely to be affected.",
-            "health_advice": "Everyone should avoid outdoor exertion."
-        }
+def _category_index(aqi: float) -> int:
+    """Index into CATEGORY_CODES/LABELS/COLORS for a scalar AQI value"""
+    return bisect.bisect_left(_CATEGORY_UPPER_BOUNDS, aqi)
 
 
 # Backward compatibility functions
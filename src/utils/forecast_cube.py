@@ -0,0 +1,278 @@
+"""
+Space-time forecast cube for city grids.
+
+Every forecast hour of a city grid is interpolated from the same station
+layout, so the grid x station weights are solved once and the whole cube is
+a single matrix product of the weights with the stations' forecast series.
+Cubes are stored as one compressed float32 array per city, parameter,
+resolution and issue hour so a dashboard can animate the day from a single
+response.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from .spatial_interpolation import SpatialInterpolator
+from .tile_pyramid import KEEP_HOURS, hour_key
+
+logger = logging.getLogger(__name__)
+
+FORECAST_HORIZON_HOURS = 24
+
+FORECAST_CUBE_DIR = os.getenv("FORECAST_CUBE_DIR", os.path.join("data", "forecast_cubes"))
+
+
+@dataclass
+class ForecastCube:
+    """Interpolated forecast for every horizon of a city grid"""
+    city: str
+    parameter: str
+    bounds: Dict[str, float]
+    resolution_km: float
+    issued_at: datetime
+    latitudes: np.ndarray  # (n_lat,) north to south as generated
+    longitudes: np.ndarray  # (n_lon,)
+    values: np.ndarray  # (n_hours, n_lat, n_lon) float32
+    confidence: np.ndarray  # (n_lat, n_lon) float32, spatial confidence
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_hours(self) -> int:
+        return self.values.shape[0]
+
+    def forecast_times(self) -> List[datetime]:
+        """Valid time of each horizon, starting one hour after issue"""
+        return [self.issued_at + timedelta(hours=h) for h in range(1, self.n_hours + 1)]
+
+    def header(self) -> Dict[str, Any]:
+        """JSON-serializable description of the cube"""
+        return {
+            'city': self.city,
+            'parameter': self.parameter,
+            'bounds': self.bounds,
+            'resolution_km': self.resolution_km,
+            'issued_at': self.issued_at.isoformat(),
+            'forecast_times': [t.isoformat() for t in self.forecast_times()],
+            'shape': list(self.values.shape),
+            'metadata': self.metadata
+        }
+
+
+def build_forecast_cube(city: str, station_ids: List[str], coords: np.ndarray,
+                        station_forecasts: np.ndarray, bounds: Dict[str, float],
+                        resolution_km: float = 1.0, parameter: str = 'pm25',
+                        issued_at: Optional[datetime] = None,
+                        interpolator: Optional[SpatialInterpolator] = None) -> ForecastCube:
+    """
+    Interpolate all forecast horizons of a city grid in one pass
+
+    Args:
+        city: City name
+        station_ids: Station identifiers, one per row of coords
+        coords: Array of shape (n_stations, 2) with lat/lon coordinates
+        station_forecasts: Array of shape (n_stations, n_hours) with each
+            station's forecast series
+        bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+        resolution_km: Grid resolution in kilometers
+        parameter: Parameter being forecast
+        issued_at: Forecast issue time (defaults to now, UTC)
+        interpolator: Interpolator to use (defaults to an exponential kriging one)
+
+    Returns:
+        ForecastCube with values of shape (n_hours, n_lat, n_lon)
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    station_forecasts = np.asarray(station_forecasts, dtype=float).reshape(len(coords), -1)
+    if len(coords) < 2:
+        raise ValueError(f"Need at least 2 stations with {parameter} forecasts for interpolation")
+
+    issued_at = issued_at or datetime.utcnow()
+    interpolator = interpolator or SpatialInterpolator()
+
+    latitudes, longitudes = interpolator.grid_axes(bounds, resolution_km)
+    lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing='ij')
+    predict_coords = np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
+
+    # The weights depend on the layout only; fit the variogram on the first horizon
+    grid_weights = interpolator.build_grid_weights(
+        station_ids, coords, station_forecasts[:, 0], predict_coords, parameter, issued_at
+    )
+
+    # (n_cells, n_stations) @ (n_stations, n_hours) -> every horizon at once
+    cube = grid_weights.weights @ station_forecasts
+    values = np.maximum(cube.T, 0).reshape(-1, len(latitudes), len(longitudes)).astype(np.float32)
+
+    value_std = np.std(station_forecasts[:, 0])
+    variances = np.maximum(grid_weights.variances, 0)
+    if value_std > 0:
+        confidence = np.maximum(0.1, 1.0 - np.minimum(1.0, np.sqrt(variances) / value_std))
+    else:
+        confidence = np.ones_like(variances)
+
+    return ForecastCube(
+        city=city,
+        parameter=parameter,
+        bounds=dict(bounds),
+        resolution_km=resolution_km,
+        issued_at=issued_at.replace(minute=0, second=0, microsecond=0),
+        latitudes=latitudes,
+        longitudes=longitudes,
+        values=values,
+        confidence=confidence.reshape(len(latitudes), len(longitudes)).astype(np.float32),
+        metadata={
+            'n_stations': len(station_ids),
+            'interpolation_method': grid_weights.method,
+            'variogram_model': interpolator.variogram_model
+        }
+    )
+
+
+class ForecastCubeStore:
+    """
+    Disk-backed store of forecast cubes with an in-process LRU
+
+    Cubes are stored as
+    ``{root}/{parameter}/{city}/{resolution}km/{hour}.npz``.
+    """
+
+    def __init__(self, root: Optional[str] = None, memory_cubes: int = 32):
+        """
+        Initialize forecast cube store
+
+        Args:
+            root: Storage directory. Defaults to FORECAST_CUBE_DIR env var.
+            memory_cubes: Number of cubes kept in process memory
+        """
+        self.root = root or FORECAST_CUBE_DIR
+        self._memory = LRUCache(maxsize=memory_cubes)
+        self._lock = threading.Lock()
+
+    def _city_dir(self, parameter: str, city: str, resolution_km: float) -> str:
+        return os.path.join(self.root, parameter, city.lower(), f"{resolution_km:g}km")
+
+    def _cube_path(self, parameter: str, city: str, resolution_km: float, hour: str) -> str:
+        return os.path.join(self._city_dir(parameter, city, resolution_km), f"{hour}.npz")
+
+    def put(self, cube: ForecastCube):
+        """Store a cube under its issue hour"""
+        hour = hour_key(cube.issued_at)
+        path = self._cube_path(cube.parameter, cube.city, cube.resolution_km, hour)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename so readers never see a partial cube
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                header=np.array(json.dumps(cube.header(), default=str)),
+                latitudes=cube.latitudes,
+                longitudes=cube.longitudes,
+                values=cube.values.astype(np.float32),
+                confidence=cube.confidence.astype(np.float32)
+            )
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._memory[path] = (os.stat(path).st_mtime_ns, cube)
+
+    def get(self, city: str, parameter: str, resolution_km: float, hour: str) -> Optional[ForecastCube]:
+        """Get the cube issued in an hour, or None if it was not computed"""
+        path = self._cube_path(parameter, city, resolution_km, hour)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(path)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1]
+
+        try:
+            with np.load(path) as arrays:
+                header = json.loads(str(arrays['header']))
+                cube = ForecastCube(
+                    city=header['city'],
+                    parameter=header['parameter'],
+                    bounds=header['bounds'],
+                    resolution_km=header['resolution_km'],
+                    issued_at=datetime.fromisoformat(header['issued_at']),
+                    latitudes=arrays['latitudes'],
+                    longitudes=arrays['longitudes'],
+                    values=arrays['values'],
+                    confidence=arrays['confidence'],
+                    metadata=header.get('metadata', {})
+                )
+        except (FileNotFoundError, ValueError, OSError, KeyError):
+            return None
+
+        with self._lock:
+            self._memory[path] = (mtime_ns, cube)
+        return cube
+
+    def latest(self, city: str, parameter: str = 'pm25', resolution_km: float = 1.0,
+               now: Optional[datetime] = None) -> Optional[ForecastCube]:
+        """
+        Get the newest cube, preferring the current hour
+
+        Args:
+            city: City name
+            parameter: Pollutant parameter
+            resolution_km: Grid resolution in kilometers
+            now: Reference time (defaults to now, UTC)
+
+        Returns:
+            ForecastCube or None if no recent cube exists
+        """
+        now = now or datetime.utcnow()
+        for hours_back in range(KEEP_HOURS):
+            cube = self.get(city, parameter, resolution_km, hour_key(now - timedelta(hours=hours_back)))
+            if cube is not None:
+                return cube
+        return None
+
+    def prune(self, parameter: str, keep_hours: int = KEEP_HOURS, now: Optional[datetime] = None) -> int:
+        """
+        Delete cubes issued more than keep_hours ago
+
+        Returns:
+            Number of cube files removed
+        """
+        parameter_dir = os.path.join(self.root, parameter)
+        if not os.path.isdir(parameter_dir):
+            return 0
+
+        now = now or datetime.utcnow()
+        keep = {f"{hour_key(now - timedelta(hours=h))}.npz" for h in range(keep_hours)}
+        removed = 0
+        for dirpath, _, filenames in os.walk(parameter_dir):
+            for filename in filenames:
+                if filename.endswith('.npz') and filename not in keep:
+                    os.remove(os.path.join(dirpath, filename))
+                    removed += 1
+
+        with self._lock:
+            for path in [p for p in self._memory.keys() if not os.path.exists(p)]:
+                del self._memory[path]
+
+        return removed
+
+
+# Global store instance
+_forecast_cube_store: Optional[ForecastCubeStore] = None
+
+
+def get_forecast_cube_store() -> ForecastCubeStore:
+    """Get the process-wide forecast cube store"""
+    global _forecast_cube_store
+    if _forecast_cube_store is None:
+        _forecast_cube_store = ForecastCubeStore()
+    return _forecast_cube_store
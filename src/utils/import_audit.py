@@ -0,0 +1,175 @@
+"""
+Import-time audit for API and worker entry points
+
+Imports a module in a fresh interpreter with ``python -X importtime`` and
+reports the slowest imports and which heavy ML/SDK frameworks were pulled in.
+
+    python -m src.utils.import_audit src.api.main src.tasks.celery_app --budget 3
+
+exits non-zero when an entry point exceeds the budget or loads a heavy
+framework, so it can gate CI on cold-start regressions.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+# Frameworks that must only load on first use, never at startup
+HEAVY_MODULES = (
+    "tensorflow",
+    "torch",
+    "torch_geometric",
+    "shap",
+    "mlflow",
+    "xgboost",
+    "onnxruntime",
+    "dgl",
+)
+
+# Default cold-start budget per entry point (seconds)
+DEFAULT_IMPORT_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportTiming:
+    """Timing of one module from ``-X importtime`` (microseconds)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """Result of importing one entry point in a fresh interpreter"""
+    module: str
+    timings: List[ImportTiming] = field(default_factory=list)
+    loaded_modules: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def total_seconds(self) -> float:
+        """Cumulative import time of the entry point itself"""
+        for timing in self.timings:
+            if timing.module == self.module:
+                return timing.cumulative_us / 1e6
+        return sum(t.self_us for t in self.timings) / 1e6
+
+    @property
+    def heavy_loaded(self) -> List[str]:
+        """Heavy frameworks present in ``sys.modules`` after the import"""
+        loaded = set(self.loaded_modules)
+        return [name for name in HEAVY_MODULES if name in loaded]
+
+    def slowest(self, top: int = 15) -> List[ImportTiming]:
+        """Top-level packages ordered by cumulative import time"""
+        top_level: Dict[str, ImportTiming] = {}
+        for timing in self.timings:
+            package = timing.module.partition(".")[0]
+            current = top_level.get(package)
+            if current is None or timing.cumulative_us > current.cumulative_us:
+                top_level[package] = timing
+        return sorted(top_level.values(), key=lambda t: t.cumulative_us, reverse=True)[:top]
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parse the ``import time:`` lines written by ``-X importtime``"""
+    timings = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(
+                module=module,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=len(indent) // 2
+            ))
+    return timings
+
+
+def profile_import(module: str, python: str = sys.executable,
+                   cwd: str = PROJECT_ROOT, timeout: float = 300) -> ImportProfile:
+    """
+    Import ``module`` in a fresh interpreter and record its import profile
+
+    Args:
+        module: Dotted module name of the entry point
+        python: Interpreter to run
+        cwd: Working directory (the project root, so ``src`` is importable)
+        timeout: Seconds before the import is abandoned
+
+    Returns:
+        ImportProfile; ``error`` is set if the import itself failed
+    """
+    code = (
+        f"import {module}\n"
+        "import sys, json\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [cwd, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout
+    )
+
+    profile = ImportProfile(module=module, timings=parse_importtime(result.stderr))
+    if result.returncode != 0:
+        errors = [l for l in result.stderr.splitlines() if not l.startswith("import time:")]
+        profile.error = errors[-1] if errors else f"exit code {result.returncode}"
+    else:
+        profile.loaded_modules = json.loads(result.stdout.strip().splitlines()[-1])
+    return profile
+
+
+def format_profile(profile: ImportProfile, top: int = 15) -> str:
+    """Human-readable report of one import profile"""
+    lines = [f"{profile.module}: {profile.total_seconds:.3f}s"]
+    if profile.error:
+        lines.append(f"  import failed: {profile.error}")
+    if profile.heavy_loaded:
+        lines.append(f"  heavy frameworks loaded: {', '.join(profile.heavy_loaded)}")
+    for timing in profile.slowest(top):
+        lines.append(f"  {timing.cumulative_us / 1e6:8.3f}s  {timing.module}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit cold-start import time of entry points")
+    parser.add_argument("modules", nargs="+", help="Entry point modules to import")
+    parser.add_argument("--budget", type=float, default=DEFAULT_IMPORT_BUDGET,
+                        help="Maximum import time per module in seconds")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest packages to show")
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help="Do not fail when heavy frameworks are imported at startup")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        profile = profile_import(module)
+        print(format_profile(profile, args.top))
+
+        if profile.error:
+            failed = True
+        elif profile.total_seconds > args.budget:
+            print(f"  FAIL: over budget of {args.budget:.3f}s")
+            failed = True
+        elif profile.heavy_loaded and not args.allow_heavy:
+            print("  FAIL: heavy frameworks must be imported lazily")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Deferred imports for heavy ML and SDK dependencies
+
+``lazy_import`` returns a stand-in module that imports the real one on first
+attribute access, so TensorFlow, torch, mlflow and friends load only when a
+code path actually uses them rather than when an API or Celery worker boots.
+
+Usage keeps the repo's optional-dependency idiom::
+
+    try:
+        tf = lazy_import("tensorflow")
+        TENSORFLOW_AVAILABLE = True
+    except ImportError:
+        TENSORFLOW_AVAILABLE = False
+
+Availability is decided from the package's import spec without executing it;
+an install that is present but broken raises on first use instead.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that forwards attribute access to the imported module"""
+
+    def _load(self) -> types.ModuleType:
+        return importlib.import_module(self.__name__)
+
+    def __getattr__(self, attr: str):
+        # Not cached on the proxy, so patches applied to the real module are seen
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__name__ in sys.modules else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def module_available(name: str) -> bool:
+    """Whether the top-level package of ``name`` is installed, without importing it"""
+    top_level = name.partition(".")[0]
+    if top_level in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(top_level) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Module that is imported on first attribute access
+
+    Args:
+        name: Dotted module name, e.g. ``"mlflow"`` or ``"torch.nn.functional"``
+
+    Returns:
+        The module itself if already imported, otherwise a ``LazyModule``
+
+    Raises:
+        ModuleNotFoundError: If the top-level package is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if not module_available(name):
+        raise ModuleNotFoundError(f"No module named '{name.partition('.')[0]}'", name=name)
+    return LazyModule(name)
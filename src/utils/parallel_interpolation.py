@@ -0,0 +1,276 @@
+"""
+Tile-partitioned parallel interpolation for large bounding boxes.
+
+A state- or country-sized grid at 1 km is millions of cells, far past what
+one interpolation call on the API event loop can handle. The grid is split
+into row blocks of bounded size and interpolated in a process pool; station
+coordinates and values are placed in shared memory once per request so the
+blocks only carry their own axes. Blocks come back in grid order and can be
+streamed to the client as they finish.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .spatial_interpolation import SpatialInterpolator, idw_interpolate
+
+logger = logging.getLogger(__name__)
+
+# Grid cells interpolated per block; bounds the kriging right-hand sides
+# held by a worker to (n_stations + 1) * BLOCK_CELLS floats
+BLOCK_CELLS = 16384
+
+# Above this many stations the dense kriging system is replaced by local IDW
+KRIGING_MAX_STATIONS = 500
+IDW_NEIGHBORS = 16
+
+# Largest grid accepted for streamed interpolation (all of India at ~1 km)
+LARGE_GRID_MAX_POINTS = 12_000_000
+
+SPATIAL_WORKERS = int(os.getenv("SPATIAL_WORKERS", "0")) or os.cpu_count() or 1
+
+
+@dataclass
+class GridBlock:
+    """Interpolated row block of a large grid"""
+    row_start: int
+    latitudes: np.ndarray  # (n_rows,)
+    values: np.ndarray  # (n_rows, n_lon) float32
+    confidence: np.ndarray  # (n_rows, n_lon) float32
+
+
+class SharedStationArrays:
+    """
+    Station coordinates and values in shared memory for pool workers
+
+    Stored as one float64 array of shape (n_stations, 3) with lat, lon, value
+    columns. Use as a context manager; the segment is unlinked on exit.
+    """
+
+    def __init__(self, coords: np.ndarray, values: np.ndarray):
+        data = np.column_stack([
+            np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+            np.asarray(values, dtype=np.float64)
+        ])
+        self.shape = data.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        array = np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+        array[:] = data
+        del array
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self):
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SharedStationArrays":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _interpolate_block(shm_name: str, shape: Tuple[int, int], latitudes: np.ndarray,
+                       longitudes: np.ndarray, variogram_params: Optional[Dict[str, Any]],
+                       variogram_model: str, value_std: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Interpolate one row block in a pool worker from the shared station arrays"""
+    # Pool workers share the parent's resource tracker, so attaching here
+    # does not hand ownership of the segment to the worker
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        stations = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        coords = stations[:, :2].copy()
+        values = stations[:, 2].copy()
+        del stations
+    finally:
+        shm.close()
+
+    lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing='ij')
+    predict_coords = np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
+
+    if variogram_params is not None:
+        interpolator = SpatialInterpolator(variogram_model=variogram_model)
+        interpolator.variogram_params = variogram_params
+        predictions, variances = interpolator.ordinary_kriging(coords, values, predict_coords)
+    else:
+        predictions, variances = idw_interpolate(coords, values, predict_coords, n_neighbors=IDW_NEIGHBORS)
+
+    predictions = np.maximum(predictions, 0)
+    if value_std > 0:
+        confidence = np.maximum(0.1, 1.0 - np.minimum(1.0, np.sqrt(np.maximum(variances, 0)) / value_std))
+    else:
+        confidence = np.ones_like(variances)
+
+    block_shape = lat_grid.shape
+    return (
+        predictions.reshape(block_shape).astype(np.float32),
+        confidence.reshape(block_shape).astype(np.float32)
+    )
+
+
+class ParallelGridInterpolator:
+    """
+    Interpolate large grids block by block in a process pool
+    """
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 block_cells: int = BLOCK_CELLS,
+                 variogram_model: str = 'exponential'):
+        """
+        Initialize parallel interpolator
+
+        Args:
+            executor: Executor running the blocks (defaults to the shared process pool)
+            block_cells: Target number of grid cells per block
+            variogram_model: Variogram model used for kriging
+        """
+        self.executor = executor or get_interpolation_pool()
+        self.block_cells = block_cells
+        self.variogram_model = variogram_model
+
+    def plan(self, bounds: Dict[str, float],
+             resolution_km: float) -> Tuple[np.ndarray, np.ndarray, List[slice]]:
+        """
+        Split the grid for the bounds into row blocks
+
+        Returns:
+            Tuple of (latitudes, longitudes, row slices)
+        """
+        latitudes, longitudes = SpatialInterpolator().grid_axes(bounds, resolution_km)
+        rows_per_block = max(1, self.block_cells // max(1, len(longitudes)))
+        row_blocks = [
+            slice(start, min(start + rows_per_block, len(latitudes)))
+            for start in range(0, len(latitudes), rows_per_block)
+        ]
+        return latitudes, longitudes, row_blocks
+
+    def iter_blocks(self, station_data: Dict[str, Dict], bounds: Dict[str, float],
+                    resolution_km: float = 1.0, parameter: str = 'pm25',
+                    timestamp: Optional[datetime] = None) -> Iterator[GridBlock]:
+        """
+        Interpolate the grid for the bounds, yielding row blocks in grid order
+
+        Args:
+            station_data: Dictionary with station_id -> {'lat': float, 'lon': float, parameter: float}
+            bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+            resolution_km: Grid resolution in kilometers
+            parameter: Parameter to interpolate
+            timestamp: Time of the station data, selects the variogram cache bucket
+
+        Yields:
+            GridBlock per row block, north to south
+        """
+        latitudes, longitudes, row_blocks = self.plan(bounds, resolution_km)
+        block_args = self._prepare(station_data, parameter, timestamp)
+
+        with SharedStationArrays(block_args['coords'], block_args['values']) as shared:
+            for rows, future in self._submit_windowed(shared, latitudes, longitudes, row_blocks, block_args):
+                values, confidence = future.result()
+                yield GridBlock(rows.start, latitudes[rows], values, confidence)
+
+    async def aiter_blocks(self, station_data: Dict[str, Dict], bounds: Dict[str, float],
+                           resolution_km: float = 1.0, parameter: str = 'pm25',
+                           timestamp: Optional[datetime] = None) -> AsyncIterator[GridBlock]:
+        """Async variant of iter_blocks that keeps the event loop free while blocks run"""
+        latitudes, longitudes, row_blocks = self.plan(bounds, resolution_km)
+        loop = asyncio.get_running_loop()
+        # Variogram fitting may touch Redis, keep it off the loop too
+        block_args = await loop.run_in_executor(None, self._prepare, station_data, parameter, timestamp)
+
+        with SharedStationArrays(block_args['coords'], block_args['values']) as shared:
+            for rows, future in self._submit_windowed(shared, latitudes, longitudes, row_blocks, block_args):
+                values, confidence = await asyncio.wrap_future(future)
+                yield GridBlock(rows.start, latitudes[rows], values, confidence)
+
+    def _prepare(self, station_data: Dict[str, Dict], parameter: str,
+                 timestamp: Optional[datetime]) -> Dict[str, Any]:
+        """Collect station arrays and fit the variogram once for all blocks"""
+        station_ids = [
+            station_id for station_id, data in station_data.items()
+            if 'lat' in data and 'lon' in data and data.get(parameter) is not None
+        ]
+        if len(station_ids) < 2:
+            raise ValueError(f"Need at least 2 stations with {parameter} data for interpolation")
+
+        coords = np.array([[station_data[s]['lat'], station_data[s]['lon']] for s in station_ids])
+        values = np.array([station_data[s][parameter] for s in station_ids], dtype=float)
+
+        variogram_params = None
+        if 3 <= len(station_ids) <= KRIGING_MAX_STATIONS:
+            interpolator = SpatialInterpolator(variogram_model=self.variogram_model)
+            variogram_params = interpolator.fit_variogram_cached(
+                coords, values, parameter, timestamp, station_ids
+            )
+
+        return {
+            'coords': coords,
+            'values': values,
+            'variogram_params': variogram_params,
+            'value_std': float(np.std(values))
+        }
+
+    def _submit_windowed(self, shared: SharedStationArrays, latitudes: np.ndarray,
+                         longitudes: np.ndarray, row_blocks: List[slice],
+                         block_args: Dict[str, Any]):
+        """
+        Submit blocks keeping a bounded number in flight
+
+        Yields (rows, future) in grid order; finished blocks wait for the
+        consumer instead of piling up in memory.
+        """
+        window = 2 * getattr(self.executor, '_max_workers', SPATIAL_WORKERS)
+        pending = deque()
+        blocks = iter(row_blocks)
+
+        def submit_next() -> bool:
+            rows = next(blocks, None)
+            if rows is None:
+                return False
+            pending.append((rows, self.executor.submit(
+                _interpolate_block, shared.name, shared.shape, latitudes[rows], longitudes,
+                block_args['variogram_params'], self.variogram_model, block_args['value_std']
+            )))
+            return True
+
+        try:
+            while len(pending) < window and submit_next():
+                pass
+            while pending:
+                yield pending.popleft()
+                submit_next()
+        finally:
+            # Consumer went away (e.g. client disconnected); drop queued blocks
+            for _, future in pending:
+                future.cancel()
+
+
+# Global process pool shared by all large-area requests
+_interpolation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_interpolation_pool() -> ProcessPoolExecutor:
+    """Get the process-wide interpolation pool"""
+    global _interpolation_pool
+    if _interpolation_pool is None:
+        # Spawn rather than fork: the API process runs threads and an event loop
+        _interpolation_pool = ProcessPoolExecutor(
+            max_workers=SPATIAL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _interpolation_pool
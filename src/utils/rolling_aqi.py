@@ -0,0 +1,553 @@
+"""
+Streaming rolling-window AQI and NowCast computation.
+
+AQI standards average particulate matter over 24 hours and CO/O3 over 8 hours.
+Instead of re-averaging raw rows from the hypertable on every request, the
+engine keeps one ring buffer of hourly bins per (station, pollutant) with a
+running sum and count, so each incoming measurement is folded in in O(1).
+"""
+
+import logging
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .aqi_calculator import AQICalculator, AQI_BREAKPOINTS
+
+logger = logging.getLogger(__name__)
+
+# Averaging period per pollutant (hours), following CPCB / US EPA conventions
+AVERAGING_WINDOWS_HOURS: Dict[str, int] = {
+    'pm25': 24,
+    'pm10': 24,
+    'no2': 24,
+    'so2': 24,
+    'co': 8,
+    'o3': 8
+}
+
+# NowCast looks back at most this many hourly averages
+NOWCAST_MAX_HOURS = 12
+
+# Minimum NowCast weight factor; particulates use the EPA floor of 0.5
+NOWCAST_MIN_WEIGHT: Dict[str, float] = {
+    'pm25': 0.5,
+    'pm10': 0.5
+}
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Normalize a timestamp to timezone-aware UTC (naive timestamps are UTC)."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def _hour_index(timestamp: datetime) -> int:
+    """Absolute UTC hour number for a timestamp."""
+    return int(_as_utc(timestamp).timestamp() // 3600)
+
+
+class RollingWindow:
+    """
+    Ring buffer of hourly bins with a running sum over the averaging window.
+    
+    The buffer always covers the hours ``[latest_hour - window_hours + 1, latest_hour]``.
+    Advancing the window resets at most ``window_hours`` slots, so updates are
+    amortized O(1).
+    """
+    
+    __slots__ = (
+        'window_hours', '_hours', '_sums', '_counts', '_seen', '_total', '_count',
+        'latest_hour', 'last_value', 'last_timestamp'
+    )
+    
+    def __init__(self, window_hours: int):
+        if window_hours < 1:
+            raise ValueError("window_hours must be at least 1")
+        self.window_hours = window_hours
+        self._hours: List[Optional[int]] = [None] * window_hours
+        self._sums = [0.0] * window_hours
+        self._counts = [0] * window_hours
+        # Timestamps added per slot, so a reading folded in twice is counted once
+        self._seen: List[set] = [set() for _ in range(window_hours)]
+        self._total = 0.0
+        self._count = 0
+        self.latest_hour: Optional[int] = None
+        self.last_value: Optional[float] = None
+        self.last_timestamp: Optional[datetime] = None
+    
+    def _reset_slot(self, hour: int) -> None:
+        slot = hour % self.window_hours
+        self._total -= self._sums[slot]
+        self._count -= self._counts[slot]
+        self._hours[slot] = hour
+        self._sums[slot] = 0.0
+        self._counts[slot] = 0
+        self._seen[slot].clear()
+        if self._count == 0:
+            # Avoid floating point drift once the window is empty
+            self._total = 0.0
+    
+    def advance(self, hour: int) -> None:
+        """Slide the window so that it ends at ``hour``, expiring older bins."""
+        if self.latest_hour is not None and hour <= self.latest_hour:
+            return
+        
+        first_hour = hour - self.window_hours + 1
+        if self.latest_hour is not None:
+            first_hour = max(first_hour, self.latest_hour + 1)
+        
+        for h in range(first_hour, hour + 1):
+            self._reset_slot(h)
+        self.latest_hour = hour
+    
+    def add(self, timestamp: datetime, value: float) -> bool:
+        """
+        Add an observation to the window.
+        
+        Args:
+            timestamp: Observation time
+            value: Observed concentration
+        
+        Returns:
+            False if the observation is older than the window or was already
+            added, and was dropped
+        """
+        hour = _hour_index(timestamp)
+        if self.latest_hour is not None and hour <= self.latest_hour - self.window_hours:
+            return False
+        
+        self.advance(hour)
+        slot = hour % self.window_hours
+        if timestamp in self._seen[slot]:
+            return False
+        self._seen[slot].add(timestamp)
+        self._sums[slot] += value
+        self._counts[slot] += 1
+        self._total += value
+        self._count += 1
+        
+        if self.last_timestamp is None or timestamp >= self.last_timestamp:
+            self.last_timestamp = timestamp
+            self.last_value = value
+        return True
+    
+    @property
+    def count(self) -> int:
+        """Number of observations inside the window."""
+        return self._count
+    
+    def mean(self) -> Optional[float]:
+        """Running mean over the averaging window (None if empty)."""
+        if self._count == 0:
+            return None
+        return self._total / self._count
+    
+    def hourly_means(self, hours: Optional[int] = None) -> List[Optional[float]]:
+        """
+        Hourly averages, most recent hour first.
+        
+        Args:
+            hours: Number of hours to return (defaults to the full window)
+        
+        Returns:
+            List of hourly means, None for hours without data
+        """
+        if self.latest_hour is None:
+            return []
+        
+        hours = min(hours or self.window_hours, self.window_hours)
+        means = []
+        for h in range(self.latest_hour, self.latest_hour - hours, -1):
+            slot = h % self.window_hours
+            if self._hours[slot] == h and self._counts[slot]:
+                means.append(self._sums[slot] / self._counts[slot])
+            else:
+                means.append(None)
+        return means
+    
+    def nowcast(self, hours: int = NOWCAST_MAX_HOURS, min_weight: float = 0.0) -> Optional[float]:
+        """
+        NowCast weighted average of the most recent hourly means.
+        
+        Weights decay geometrically with age using the factor
+        ``max(min / max, min_weight)`` over the available hourly means.
+        At least two of the three most recent hours must have data.
+        
+        Args:
+            hours: Number of hourly means to consider
+            min_weight: Lower bound for the weight factor
+        
+        Returns:
+            NowCast concentration or None if there is not enough recent data
+        """
+        means = self.hourly_means(hours)
+        if sum(1 for m in means[:3] if m is not None) < 2:
+            return None
+        
+        available = [m for m in means if m is not None]
+        c_max = max(available)
+        c_min = min(available)
+        weight = max(c_min / c_max, min_weight) if c_max > 0 else 1.0
+        
+        numerator = 0.0
+        denominator = 0.0
+        for age, value in enumerate(means):
+            if value is None:
+                continue
+            factor = weight ** age
+            numerator += factor * value
+            denominator += factor
+        return numerator / denominator if denominator else None
+
+
+class RollingAQIEngine:
+    """
+    Incremental per-station rolling-window AQI engine.
+    
+    Keeps one RollingWindow per (station_id, pollutant) plus each station's
+    coordinates, and serves rolling averages, NowCast values and AQI for
+    stations or for all stations around a location.
+    """
+    
+    def __init__(self, windows: Optional[Dict[str, int]] = None):
+        """
+        Initialize rolling AQI engine
+        
+        Args:
+            windows: Optional override of averaging windows (hours) per pollutant
+        """
+        self.windows = dict(AVERAGING_WINDOWS_HOURS)
+        if windows:
+            self.windows.update(windows)
+        
+        self.aqi_calc = AQICalculator()
+        self._buffers: Dict[str, Dict[str, RollingWindow]] = {}
+        self._stations: Dict[str, Optional[Tuple[float, float]]] = {}
+        self._lock = threading.RLock()
+        self.latest_timestamp: Optional[datetime] = None
+        self.last_synced_at: Optional[datetime] = None
+        # Newest ingestion time (created_at) of the stored rows synced so far
+        self.synced_through: Optional[datetime] = None
+    
+    def __len__(self) -> int:
+        return len(self._stations)
+    
+    def add_measurement(self, station_id: str, parameter: str, value: Optional[float],
+                        timestamp: datetime, location: Optional[Tuple[float, float]] = None) -> bool:
+        """
+        Fold a single measurement into the station's rolling windows.
+        
+        Args:
+            station_id: Monitoring station identifier
+            parameter: Pollutant name (pm25, pm10, no2, so2, co, o3)
+            value: Concentration; None or negative values are ignored
+            timestamp: Measurement time
+            location: Optional (lat, lon) of the station
+        
+        Returns:
+            True if the measurement was accepted
+        """
+        parameter = parameter.lower() if parameter else parameter
+        if parameter not in AQI_BREAKPOINTS or value is None:
+            return False
+        
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+        if value < 0 or math.isnan(value):
+            return False
+        
+        timestamp = _as_utc(timestamp)
+        with self._lock:
+            if location is not None:
+                self._stations[station_id] = (float(location[0]), float(location[1]))
+            else:
+                self._stations.setdefault(station_id, None)
+            
+            station_buffers = self._buffers.setdefault(station_id, {})
+            buffer = station_buffers.get(parameter)
+            if buffer is None:
+                buffer = RollingWindow(self.windows.get(parameter, 24))
+                station_buffers[parameter] = buffer
+            
+            accepted = buffer.add(timestamp, value)
+            if accepted and (self.latest_timestamp is None or timestamp > self.latest_timestamp):
+                self.latest_timestamp = timestamp
+            return accepted
+    
+    def update(self, data_point) -> bool:
+        """
+        Fold an ingestion ``DataPoint`` into the engine.
+        
+        Args:
+            data_point: DataPoint from an ingestion client
+        
+        Returns:
+            True if the data point was accepted
+        """
+        if data_point.quality_flag == "invalid":
+            return False
+        station_id = data_point.station_id or f"unknown_{data_point.source}"
+        return self.add_measurement(
+            station_id, data_point.parameter, data_point.value,
+            data_point.timestamp, data_point.location
+        )
+    
+    def update_many(self, data_points: Iterable) -> int:
+        """Fold a batch of DataPoints into the engine; returns accepted count."""
+        return sum(1 for data_point in data_points if self.update(data_point))
+    
+    def ingest_rows(self, rows: Iterable[Tuple]) -> int:
+        """
+        Fold stored measurement rows into the engine.
+        
+        Args:
+            rows: Iterable of (time, station_id, parameter, value, latitude, longitude)
+                  tuples; coordinates may be None
+        
+        Returns:
+            Number of accepted rows
+        """
+        accepted = 0
+        for time, station_id, parameter, value, latitude, longitude in rows:
+            location = (latitude, longitude) if latitude is not None and longitude is not None else None
+            if self.add_measurement(station_id, parameter, value, time, location):
+                accepted += 1
+        return accepted
+    
+    def sync_due(self, now: datetime, min_interval_seconds: int = 60) -> bool:
+        """Whether the last database sync is older than ``min_interval_seconds``."""
+        return self.last_synced_at is None or (now - self.last_synced_at).total_seconds() >= min_interval_seconds
+    
+    def apply_sync(self, rows: Iterable[Tuple], now: datetime) -> int:
+        """
+        Fold rows read by a database sync into the engine.
+        
+        Args:
+            rows: (time, station_id, parameter, value, latitude, longitude, created_at) tuples
+            now: Time of the sync
+        
+        Returns:
+            Number of accepted rows
+        """
+        rows = list(rows)
+        accepted = self.ingest_rows(row[:6] for row in rows)
+        with self._lock:
+            for row in rows:
+                created_at = _as_utc(row[6])
+                if self.synced_through is None or created_at > self.synced_through:
+                    self.synced_through = created_at
+            self.last_synced_at = now
+        return accepted
+    
+    def _station_windows(self, station_id: str, now: datetime) -> Dict[str, RollingWindow]:
+        """A station's windows with data, slid forward to ``now`` so silent stations expire."""
+        now_hour = _hour_index(now)
+        windows = {}
+        for parameter, buffer in self._buffers.get(station_id, {}).items():
+            buffer.advance(now_hour)
+            if buffer.count:
+                windows[parameter] = buffer
+        return windows
+    
+    def _station_as_of(self, station_id: str, now: datetime) -> Optional[datetime]:
+        """Newest reading still inside one of the station's windows."""
+        timestamps = [
+            buffer.last_timestamp for buffer in self._station_windows(station_id, now).values()
+            if buffer.last_timestamp is not None
+        ]
+        return max(timestamps) if timestamps else None
+    
+    def get_station_averages(self, station_id: str, now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Rolling-window averages for a station.
+        
+        Args:
+            station_id: Monitoring station identifier
+            now: Evaluation time; windows are slid forward to it (defaults to current UTC time)
+        
+        Returns:
+            Dictionary of pollutant -> averaged concentration
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            return {
+                parameter: buffer.mean()
+                for parameter, buffer in self._station_windows(station_id, now).items()
+            }
+    
+    def get_station_nowcast(self, station_id: str, now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        NowCast concentrations for a station.
+        
+        Args:
+            station_id: Monitoring station identifier
+            now: Evaluation time (defaults to current UTC time)
+        
+        Returns:
+            Dictionary of pollutant -> NowCast concentration (pollutants without
+            enough recent data are omitted)
+        """
+        now = now or datetime.now(timezone.utc)
+        result = {}
+        with self._lock:
+            for parameter, buffer in self._station_windows(station_id, now).items():
+                value = buffer.nowcast(
+                    hours=min(NOWCAST_MAX_HOURS, buffer.window_hours),
+                    min_weight=NOWCAST_MIN_WEIGHT.get(parameter, 0.0)
+                )
+                if value is not None:
+                    result[parameter] = value
+        return result
+    
+    def _pollutant_values(self, station_id: str, now: datetime, method: str) -> Dict[str, float]:
+        if method == 'nowcast':
+            values = self.get_station_nowcast(station_id, now)
+            # Fall back to the rolling mean for pollutants NowCast cannot cover yet
+            for parameter, mean in self.get_station_averages(station_id, now).items():
+                values.setdefault(parameter, mean)
+            return values
+        if method == 'rolling':
+            return self.get_station_averages(station_id, now)
+        raise ValueError(f"Unknown averaging method: {method}")
+    
+    def _build_result(self, pollutant_values: Dict[str, float], measurement_count: int,
+                      method: str, as_of: Optional[datetime], **extra: Any) -> Optional[Dict[str, Any]]:
+        if not pollutant_values:
+            return None
+        aqi, dominant_pollutant, category = self.aqi_calc.calculate_aqi(pollutant_values)
+        result = {
+            "aqi": aqi,
+            "category": category,
+            "dominant_pollutant": dominant_pollutant,
+            "pollutant_values": pollutant_values,
+            "measurement_count": measurement_count,
+            "method": method,
+            "as_of": as_of.isoformat() if as_of else None
+        }
+        result.update(extra)
+        return result
+    
+    def get_station_aqi(self, station_id: str, now: Optional[datetime] = None,
+                        method: str = 'nowcast') -> Optional[Dict[str, Any]]:
+        """
+        AQI for a station from its rolling windows.
+        
+        Args:
+            station_id: Monitoring station identifier
+            now: Evaluation time (defaults to current UTC time)
+            method: 'nowcast' or 'rolling' (plain window averages)
+        
+        Returns:
+            Dictionary with aqi, category, dominant_pollutant, pollutant_values and
+            the newest contributing reading time (as_of), or None if the station
+            has no data in its windows
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            values = self._pollutant_values(station_id, now, method)
+            count = sum(buffer.count for buffer in self._station_windows(station_id, now).values())
+            as_of = self._station_as_of(station_id, now)
+        return self._build_result(values, count, method, as_of, station_id=station_id)
+    
+    def stations_near(self, latitude: float, longitude: float, radius_km: float) -> List[str]:
+        """
+        Stations with known coordinates within ``radius_km`` of a point.
+        
+        Args:
+            latitude: Latitude of the point
+            longitude: Longitude of the point
+            radius_km: Search radius in kilometers
+        
+        Returns:
+            List of station IDs, nearest first
+        """
+        with self._lock:
+            located = [(sid, loc) for sid, loc in self._stations.items() if loc is not None]
+        if not located:
+            return []
+        
+        coords = np.radians(np.array([loc for _, loc in located], dtype=np.float64))
+        lat0, lon0 = np.radians(latitude), np.radians(longitude)
+        dlat = coords[:, 0] - lat0
+        dlon = coords[:, 1] - lon0
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat0) * np.cos(coords[:, 0]) * np.sin(dlon / 2) ** 2
+        distances = 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        
+        order = np.argsort(distances)
+        return [located[i][0] for i in order if distances[i] <= radius_km]
+    
+    def get_location_aqi(self, latitude: float, longitude: float, radius_km: float = 5.0,
+                         now: Optional[datetime] = None, method: str = 'nowcast') -> Optional[Dict[str, Any]]:
+        """
+        AQI around a location, averaging the rolling values of nearby stations.
+        
+        Args:
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+            radius_km: Radius in kilometers for station selection
+            now: Evaluation time (defaults to current UTC time)
+            method: 'nowcast' or 'rolling'
+        
+        Returns:
+            Dictionary with aqi, category, dominant_pollutant, pollutant_values,
+            the contributing stations and their newest reading time (as_of), or
+            None if no nearby station has data
+        """
+        now = now or datetime.now(timezone.utc)
+        station_ids = self.stations_near(latitude, longitude, radius_km)
+        if not station_ids:
+            return None
+        
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        measurement_count = 0
+        contributing = []
+        as_of = None
+        with self._lock:
+            for station_id in station_ids:
+                values = self._pollutant_values(station_id, now, method)
+                if not values:
+                    continue
+                contributing.append(station_id)
+                measurement_count += sum(
+                    buffer.count for buffer in self._station_windows(station_id, now).values()
+                )
+                station_as_of = self._station_as_of(station_id, now)
+                if station_as_of and (as_of is None or station_as_of > as_of):
+                    as_of = station_as_of
+                for parameter, value in values.items():
+                    sums[parameter] = sums.get(parameter, 0.0) + value
+                    counts[parameter] = counts.get(parameter, 0) + 1
+        
+        pollutant_values = {parameter: sums[parameter] / counts[parameter] for parameter in sums}
+        return self._build_result(pollutant_values, measurement_count, method, as_of, stations=contributing)
+    
+    def clear(self) -> None:
+        """Drop all buffered state."""
+        with self._lock:
+            self._buffers.clear()
+            self._stations.clear()
+            self.latest_timestamp = None
+            self.last_synced_at = None
+            self.synced_through = None
+
+
+# Global engine instance
+_rolling_aqi_engine: Optional[RollingAQIEngine] = None
+
+
+def get_rolling_aqi_engine() -> RollingAQIEngine:
+    """Get the process-wide rolling AQI engine instance."""
+    global _rolling_aqi_engine
+    if _rolling_aqi_engine is None:
+        _rolling_aqi_engine = RollingAQIEngine()
+    return _rolling_aqi_engine
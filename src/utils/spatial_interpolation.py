@@ -9,11 +9,19 @@ from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
-from scipy.linalg import solve
+import warnings
+from scipy.linalg import lu_factor, lu_solve, LinAlgWarning
+
+from .variogram_cache import VariogramCache, get_variogram_cache
 
 logger = logging.getLogger(__name__)
 
+# Prediction points handled per KD-tree query; bounds IDW memory to
+# chunk_size * n_neighbors distances regardless of grid size
+IDW_CHUNK_SIZE = 4096
+
 
 @dataclass
 class GridPoint:
@@ -28,12 +36,262 @@ class GridPoint:
 
 @dataclass
 class SpatialGrid:
-    """Represents a spatial prediction grid"""
+    """
+    Represents a spatial prediction grid in columnar form
+    
+    Cells form a regular lat/lon lattice described by its south-west origin
+    and steps; the per-cell arrays are flattened row-major with latitude as
+    the outer axis (the order of ``SpatialInterpolator.generate_grid``).
+    """
     bounds: Dict[str, float]  # north, south, east, west
     resolution_km: float
-    grid_points: List[GridPoint]
     generated_at: datetime
     metadata: Dict[str, Any]
+    lat_origin: float
+    lon_origin: float
+    lat_step: float
+    lon_step: float
+    n_lat: int
+    n_lon: int
+    values: np.ndarray  # float32
+    confidence: np.ndarray  # float32
+    aqi: np.ndarray  # float32
+    category_codes: np.ndarray  # uint8 indices into CATEGORY_CODES
+    
+    @property
+    def n_points(self) -> int:
+        return self.n_lat * self.n_lon
+    
+    @property
+    def latitudes(self) -> np.ndarray:
+        """Latitude of each grid row"""
+        return self.lat_origin + np.arange(self.n_lat) * self.lat_step
+    
+    @property
+    def longitudes(self) -> np.ndarray:
+        """Longitude of each grid column"""
+        return self.lon_origin + np.arange(self.n_lon) * self.lon_step
+    
+    def coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat (latitude, longitude) arrays aligned with the value arrays"""
+        lat_grid, lon_grid = np.meshgrid(self.latitudes, self.longitudes, indexing='ij')
+        return lat_grid.ravel(), lon_grid.ravel()
+    
+    def categories(self) -> np.ndarray:
+        """Category strings for every cell"""
+        from .aqi_calculator import CATEGORY_CODES
+        return np.array(CATEGORY_CODES, dtype=object)[self.category_codes]
+    
+    @property
+    def grid_points(self) -> List[GridPoint]:
+        """Per-cell view of the grid (builds one object per cell)"""
+        latitudes, longitudes = self.coordinates()
+        categories = self.categories()
+        return [
+            GridPoint(
+                latitude=float(latitudes[i]),
+                longitude=float(longitudes[i]),
+                predicted_value=round(float(self.values[i]), 1),
+                confidence=round(float(self.confidence[i]), 3),
+                aqi=float(self.aqi[i]),
+                category=categories[i]
+            )
+            for i in range(self.n_points)
+        ]
+
+
+def idw_interpolate(known_coords: np.ndarray, known_values: np.ndarray,
+                    predict_coords: np.ndarray, power: float = 2.0,
+                    n_neighbors: Optional[int] = None, radius: Optional[float] = None,
+                    chunk_size: int = IDW_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized inverse distance weighting over a KD-tree
+    
+    Args:
+        known_coords: Array of shape (n_known, 2) with known coordinates
+        known_values: Array of known values
+        predict_coords: Array of shape (n_predict, 2) with prediction coordinates
+        power: Power parameter for distance weighting
+        n_neighbors: Number of nearest stations used per point (all if None)
+        radius: Only stations within this distance contribute (unbounded if None)
+        chunk_size: Prediction points queried per batch
+        
+    Returns:
+        Tuple of (predictions, variances). Points that coincide with a known
+        point take its value with zero variance; points with no station
+        inside the radius are NaN.
+    """
+    known_coords = np.asarray(known_coords, dtype=float).reshape(-1, 2)
+    known_values = np.asarray(known_values, dtype=float)
+    predict_coords = np.asarray(predict_coords, dtype=float).reshape(-1, 2)
+    
+    n_predict = len(predict_coords)
+    predictions = np.full(n_predict, np.nan)
+    variances = np.full(n_predict, np.nan)
+    
+    value_variance = np.var(known_values) if len(known_values) else np.nan
+    # Index n_known marks a missing neighbour; pad so it gathers a zero
+    padded_values = np.append(known_values, 0.0)
+    
+    for start, stop, weights, indices, exact in _idw_chunks(
+        known_coords, predict_coords, power, n_neighbors, radius, chunk_size
+    ):
+        has_data = weights.any(axis=1)
+        
+        chunk_predictions = np.einsum('ij,ij->i', weights, padded_values[indices])
+        chunk_variances = value_variance * (1 - weights.max(axis=1))
+        chunk_variances[exact] = 0.0
+        
+        predictions[start:stop] = np.where(has_data, chunk_predictions, np.nan)
+        variances[start:stop] = np.where(has_data, chunk_variances, np.nan)
+    
+    return predictions, variances
+
+
+def idw_weight_matrix(known_coords: np.ndarray, predict_coords: np.ndarray,
+                      power: float = 2.0, n_neighbors: Optional[int] = None,
+                      radius: Optional[float] = None,
+                      chunk_size: int = IDW_CHUNK_SIZE) -> np.ndarray:
+    """
+    Dense grid x station weight matrix of the IDW kernel
+    
+    Args:
+        known_coords: Array of shape (n_known, 2) with known coordinates
+        predict_coords: Array of shape (n_predict, 2) with prediction coordinates
+        power: Power parameter for distance weighting
+        n_neighbors: Number of nearest stations used per point (all if None)
+        radius: Only stations within this distance contribute (unbounded if None)
+        chunk_size: Prediction points queried per batch
+        
+    Returns:
+        Array of shape (n_predict, n_known); rows sum to 1, or to 0 for points
+        with no station inside the radius
+    """
+    known_coords = np.asarray(known_coords, dtype=float).reshape(-1, 2)
+    predict_coords = np.asarray(predict_coords, dtype=float).reshape(-1, 2)
+    n_known = len(known_coords)
+    matrix = np.zeros((len(predict_coords), n_known))
+    
+    for start, stop, weights, indices, _ in _idw_chunks(
+        known_coords, predict_coords, power, n_neighbors, radius, chunk_size
+    ):
+        rows = np.broadcast_to(np.arange(start, stop)[:, None], indices.shape)
+        valid = indices < n_known
+        matrix[rows[valid], indices[valid]] = weights[valid]
+    
+    return matrix
+
+
+def _idw_chunks(known_coords: np.ndarray, predict_coords: np.ndarray, power: float,
+                n_neighbors: Optional[int], radius: Optional[float], chunk_size: int):
+    """
+    Yield normalized IDW neighbour weights per chunk of prediction points
+    
+    Yields:
+        Tuples of (start, stop, weights, indices, exact) where weights and
+        indices have shape (stop - start, k); missing neighbours have index
+        n_known and weight 0, and exact marks points on top of a station
+    """
+    n_known = len(known_coords)
+    n_predict = len(predict_coords)
+    if n_known == 0 or n_predict == 0:
+        return
+    
+    k = n_known if n_neighbors is None else max(1, min(int(n_neighbors), n_known))
+    upper_bound = np.inf if radius is None else float(radius)
+    tree = cKDTree(known_coords)
+    step = max(1, int(chunk_size))
+    
+    for start in range(0, n_predict, step):
+        stop = min(start + step, n_predict)
+        distances, indices = tree.query(
+            predict_coords[start:stop], k=k, distance_upper_bound=upper_bound
+        )
+        distances = distances.reshape(stop - start, k)
+        indices = indices.reshape(stop - start, k)
+        
+        # Neighbours come back sorted, so a coincident station is in column 0
+        exact = distances[:, 0] == 0
+        found = np.isfinite(distances)
+        with np.errstate(divide='ignore'):
+            weights = np.where(found, 1.0 / distances ** power, 0.0)
+        weights[exact] = 0.0
+        weights[exact, 0] = 1.0
+        
+        totals = weights.sum(axis=1)
+        has_data = totals > 0
+        weights[has_data] /= totals[has_data, None]
+        
+        yield start, stop, weights, indices, exact
+
+
+@dataclass
+class GridWeights:
+    """
+    Cached grid x station weight matrix of a linear interpolator
+    
+    Kriging and IDW predictions are linear in the station values once the
+    weights are known, so a new value for one station moves the whole field
+    by a rank-1 delta, ``predictions += weights[:, j] * delta``. The matrix
+    only needs rebuilding when the station set changes.
+    """
+    station_ids: List[str]
+    weights: np.ndarray  # (n_predict, n_stations)
+    values: np.ndarray  # (n_stations,)
+    variance_factors: np.ndarray  # (n_predict,)
+    method: str
+    # IDW variances scale with the spread of the station values
+    scale_variance_by_values: bool = False
+    predictions: Optional[np.ndarray] = None
+    
+    def __post_init__(self):
+        self.values = np.asarray(self.values, dtype=float).copy()
+        self._index = {station_id: j for j, station_id in enumerate(self.station_ids)}
+        if self.predictions is None:
+            self.refresh()
+    
+    @property
+    def variances(self) -> np.ndarray:
+        if self.scale_variance_by_values:
+            return np.var(self.values) * self.variance_factors
+        return self.variance_factors
+    
+    def missing_stations(self, station_ids) -> List[str]:
+        """Get the stations the weights were not built for"""
+        return [station_id for station_id in station_ids if station_id not in self._index]
+    
+    def update(self, station_id: str, value: float) -> bool:
+        """
+        Apply a new value for one station as a rank-1 update
+        
+        Returns:
+            False if the station is not part of the weight matrix
+        """
+        j = self._index.get(station_id)
+        if j is None:
+            return False
+        
+        delta = float(value) - self.values[j]
+        if delta:
+            self.predictions += self.weights[:, j] * delta
+            self.values[j] = float(value)
+        return True
+    
+    def update_many(self, station_values: Dict[str, float]) -> List[str]:
+        """
+        Apply new values for several stations
+        
+        Returns:
+            Station ids that are not part of the weight matrix
+        """
+        return [
+            station_id for station_id, value in station_values.items()
+            if not self.update(station_id, value)
+        ]
+    
+    def refresh(self):
+        """Recompute predictions from scratch (drops accumulated rounding)"""
+        self.predictions = self.weights @ self.values
 
 
 class SpatialInterpolator:
@@ -41,15 +299,18 @@ class SpatialInterpolator:
     Spatial interpolation using kriging methods for AQI predictions
     """
     
-    def __init__(self, variogram_model: str = 'exponential'):
+    def __init__(self, variogram_model: str = 'exponential',
+                 variogram_cache: Optional[VariogramCache] = None):
         """
         Initialize spatial interpolator
         
         Args:
             variogram_model: Type of variogram model ('exponential', 'gaussian', 'spherical')
+            variogram_cache: Cache for fitted variograms (defaults to the process-wide cache)
         """
         self.variogram_model = variogram_model
         self.variogram_params = None
+        self.variogram_cache = variogram_cache or get_variogram_cache()
         
     def generate_grid(self, bounds: Dict[str, float], resolution_km: float) -> List[Tuple[float, float]]:
         """
@@ -62,14 +323,23 @@ class SpatialInterpolator:
         Returns:
             List of (latitude, longitude) tuples
         """
-        # Convert km to degrees (approximate)
-        # 1 degree latitude ≈ 111 km
-        # 1 degree longitude ≈ 111 km * cos(latitude)
-        lat_step = resolution_km / 111.0
+        lats, lons = self.grid_axes(bounds, resolution_km)
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
         
-        # Use average latitude for longitude conversion
-        avg_lat = (bounds['north'] + bounds['south']) / 2
-        lon_step = resolution_km / (111.0 * np.cos(np.radians(avg_lat)))
+        return list(zip(lat_grid.ravel().tolist(), lon_grid.ravel().tolist()))
+    
+    def grid_axes(self, bounds: Dict[str, float], resolution_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the row latitudes and column longitudes of the grid within bounds
+        
+        Args:
+            bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+            resolution_km: Grid resolution in kilometers
+            
+        Returns:
+            Tuple of (latitudes, longitudes) arrays
+        """
+        lat_step, lon_step = self.grid_steps(bounds, resolution_km)
         
         # Generate grid points, ensuring they stay within bounds
         lats = np.arange(bounds['south'], bounds['north'] + lat_step/2, lat_step)
@@ -79,15 +349,29 @@ class SpatialInterpolator:
         lats = lats[lats <= bounds['north']]
         lons = lons[lons <= bounds['east']]
         
-        grid_points = []
-        for lat in lats:
-            for lon in lons:
-                # Double-check bounds to handle floating point precision issues
-                if (bounds['south'] <= lat <= bounds['north'] and 
-                    bounds['west'] <= lon <= bounds['east']):
-                    grid_points.append((lat, lon))
+        return lats, lons
+    
+    def grid_steps(self, bounds: Dict[str, float], resolution_km: float) -> Tuple[float, float]:
+        """
+        Convert a resolution in kilometers to latitude and longitude steps
         
-        return grid_points
+        Args:
+            bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+            resolution_km: Grid resolution in kilometers
+            
+        Returns:
+            Tuple of (lat_step, lon_step) in degrees
+        """
+        # Convert km to degrees (approximate)
+        # 1 degree latitude ≈ 111 km
+        # 1 degree longitude ≈ 111 km * cos(latitude)
+        lat_step = resolution_km / 111.0
+        
+        # Use average latitude for longitude conversion
+        avg_lat = (bounds['north'] + bounds['south']) / 2
+        lon_step = resolution_km / (111.0 * np.cos(np.radians(avg_lat)))
+        
+        return lat_step, lon_step
     
     def fit_variogram(self, coordinates: np.ndarray, values: np.ndarray) -> Dict[str, float]:
         """
@@ -155,6 +439,36 @@ class SpatialInterpolator:
         
         return self.variogram_params
     
+    def fit_variogram_cached(self, coordinates: np.ndarray, values: np.ndarray,
+                             parameter: str = 'pm25', timestamp: Optional[datetime] = None,
+                             station_ids: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Fit variogram model, reusing a fit for the same stations and hour
+        
+        Args:
+            coordinates: Array of shape (n_points, 2) with lat/lon coordinates
+            values: Array of values at each coordinate
+            parameter: Parameter being interpolated
+            timestamp: Time of the data (defaults to current UTC time)
+            station_ids: Station identifiers used to key the cache
+            
+        Returns:
+            Dictionary with variogram parameters
+        """
+        key = VariogramCache.make_key(
+            coordinates, parameter, timestamp, station_ids, self.variogram_model
+        )
+        
+        cached = self.variogram_cache.get(key)
+        if cached is not None:
+            self.variogram_params = cached
+            return self.variogram_params
+        
+        params = self.fit_variogram(coordinates, values)
+        self.variogram_cache.set(key, params)
+        self.variogram_params = params
+        return self.variogram_params
+    
     def variogram_function(self, distances: np.ndarray) -> np.ndarray:
         """
         Calculate variogram values for given distances
@@ -199,7 +513,6 @@ class SpatialInterpolator:
             Tuple of (predictions, variances)
         """
         n_known = len(known_coords)
-        n_predict = len(predict_coords)
         
         if n_known < 3:
             # Not enough points for kriging, use inverse distance weighting
@@ -209,6 +522,38 @@ class SpatialInterpolator:
         if self.variogram_params is None:
             self.fit_variogram(known_coords, known_values)
         
+        try:
+            weights, variances = self.kriging_weights(known_coords, predict_coords)
+        except (np.linalg.LinAlgError, LinAlgWarning, ValueError):
+            # Singular kriging system, fall back to inverse distance weighting
+            logger.warning("Kriging matrix is singular, using inverse distance weighting")
+            return self._inverse_distance_weighting(known_coords, known_values, predict_coords)
+        
+        predictions = weights @ known_values
+        
+        return predictions, variances
+    
+    def kriging_weights(self, known_coords: np.ndarray,
+                        predict_coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Solve the ordinary kriging system for every prediction point
+        
+        The weights depend only on the geometry and the fitted variogram, so
+        they can be cached and applied to new station values.
+        
+        Args:
+            known_coords: Array of shape (n_known, 2) with known coordinates
+            predict_coords: Array of shape (n_predict, 2) with prediction coordinates
+            
+        Returns:
+            Tuple of (weights of shape (n_predict, n_known), variances)
+            
+        Raises:
+            LinAlgError, LinAlgWarning: If the kriging matrix is singular
+        """
+        n_known = len(known_coords)
+        n_predict = len(predict_coords)
+        
         # Calculate distance matrix between known points
         known_distances = cdist(known_coords, known_coords)
         
@@ -219,37 +564,66 @@ class SpatialInterpolator:
         K[n_known, :n_known] = 1  # Lagrange multiplier row
         K[n_known, n_known] = 0   # Corner element
         
-        predictions = np.zeros(n_predict)
-        variances = np.zeros(n_predict)
+        # Build all right-hand sides at once: one column per prediction point
+        pred_distances = cdist(predict_coords, known_coords)
+        rhs = np.ones((n_known + 1, n_predict))
+        rhs[:n_known, :] = self.variogram_function(pred_distances).T
         
-        for i, pred_coord in enumerate(predict_coords):
-            # Calculate distances from prediction point to known points
-            pred_distances = cdist([pred_coord], known_coords)[0]
-            
-            # Build right-hand side vector
-            rhs = np.zeros(n_known + 1)
-            rhs[:n_known] = self.variogram_function(pred_distances)
-            rhs[n_known] = 1
+        # Factorize the kriging matrix once and solve every grid point in one call
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', LinAlgWarning)
+            lu_piv = lu_factor(K, check_finite=False)
+        weights = lu_solve(lu_piv, rhs, check_finite=False)
+        
+        variances = np.einsum('ij,ij->j', weights, rhs)
+        
+        return weights[:n_known, :].T, variances
+    
+    def build_grid_weights(self, station_ids: List[str], known_coords: np.ndarray,
+                           known_values: np.ndarray, predict_coords: np.ndarray,
+                           parameter: str = 'pm25',
+                           timestamp: Optional[datetime] = None) -> GridWeights:
+        """
+        Build the grid x station weight matrix for incremental updates
+        
+        Args:
+            station_ids: Station identifiers, one per known coordinate
+            known_coords: Array of shape (n_known, 2) with known coordinates
+            known_values: Array of known values
+            predict_coords: Array of shape (n_predict, 2) with prediction coordinates
+            parameter: Parameter being interpolated
+            timestamp: Time of the station data, selects the variogram cache bucket
             
+        Returns:
+            GridWeights with predictions for the current values
+        """
+        known_coords = np.asarray(known_coords, dtype=float)
+        known_values = np.asarray(known_values, dtype=float)
+        
+        if len(known_coords) >= 3:
+            if self.variogram_params is None:
+                self.fit_variogram_cached(known_coords, known_values, parameter, timestamp, station_ids)
             try:
-                # Solve kriging system
-                weights = solve(K, rhs)
-                
-                # Calculate prediction
-                predictions[i] = np.dot(weights[:n_known], known_values)
-                
-                # Calculate kriging variance
-                variances[i] = np.dot(weights, rhs)
-                
-            except np.linalg.LinAlgError:
-                # Fallback to inverse distance weighting for this point
-                pred, var = self._inverse_distance_weighting(
-                    known_coords, known_values, [pred_coord]
+                weights, variances = self.kriging_weights(known_coords, predict_coords)
+                return GridWeights(
+                    station_ids=list(station_ids),
+                    weights=weights,
+                    values=known_values,
+                    variance_factors=variances,
+                    method='ordinary_kriging'
                 )
-                predictions[i] = pred[0]
-                variances[i] = var[0]
-        
-        return predictions, variances
+            except (np.linalg.LinAlgError, LinAlgWarning, ValueError):
+                logger.warning("Kriging matrix is singular, using inverse distance weighting")
+        
+        weights = idw_weight_matrix(known_coords, predict_coords)
+        return GridWeights(
+            station_ids=list(station_ids),
+            weights=weights,
+            values=known_values,
+            variance_factors=1 - weights.max(axis=1),
+            method='inverse_distance_weighting',
+            scale_variance_by_values=True
+        )
     
     def _inverse_distance_weighting(self, known_coords: np.ndarray, known_values: np.ndarray,
                                    predict_coords: np.ndarray, power: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
@@ -265,34 +639,11 @@ class SpatialInterpolator:
         Returns:
             Tuple of (predictions, variances)
         """
-        n_predict = len(predict_coords)
-        predictions = np.zeros(n_predict)
-        variances = np.zeros(n_predict)
-        
-        for i, pred_coord in enumerate(predict_coords):
-            distances = cdist([pred_coord], known_coords)[0]
-            
-            # Handle case where prediction point coincides with known point
-            if np.any(distances == 0):
-                idx = np.argmin(distances)
-                predictions[i] = known_values[idx]
-                variances[i] = 0
-                continue
-            
-            # Calculate weights
-            weights = 1 / (distances ** power)
-            weights /= np.sum(weights)
-            
-            # Calculate prediction
-            predictions[i] = np.dot(weights, known_values)
-            
-            # Estimate variance (simplified)
-            variances[i] = np.var(known_values) * (1 - np.max(weights))
-        
-        return predictions, variances
+        return idw_interpolate(known_coords, known_values, predict_coords, power=power)
     
     def interpolate_grid(self, station_data: Dict[str, Dict], bounds: Dict[str, float],
-                        resolution_km: float = 1.0, parameter: str = 'pm25') -> SpatialGrid:
+                        resolution_km: float = 1.0, parameter: str = 'pm25',
+                        timestamp: Optional[datetime] = None) -> SpatialGrid:
         """
         Interpolate values to a regular grid
         
@@ -301,6 +652,7 @@ class SpatialInterpolator:
             bounds: Dictionary with 'north', 'south', 'east', 'west' keys
             resolution_km: Grid resolution in kilometers
             parameter: Parameter being interpolated
+            timestamp: Time of the station data, selects the variogram cache bucket
             
         Returns:
             SpatialGrid object with interpolated values
@@ -310,11 +662,13 @@ class SpatialInterpolator:
         # Extract coordinates and values
         coords = []
         values = []
+        station_ids = []
         
         for station_id, data in station_data.items():
             if 'lat' in data and 'lon' in data and parameter in data:
                 coords.append([data['lat'], data['lon']])
                 values.append(data[parameter])
+                station_ids.append(station_id)
         
         if len(coords) < 2:
             raise ValueError(f"Need at least 2 stations with {parameter} data for interpolation")
@@ -323,41 +677,29 @@ class SpatialInterpolator:
         values = np.array(values)
         
         # Generate grid points
-        grid_coords = self.generate_grid(bounds, resolution_km)
-        grid_coords_array = np.array(grid_coords)
+        lats, lons = self.grid_axes(bounds, resolution_km)
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
+        grid_coords_array = np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
         
         # Perform interpolation
         try:
+            if self.variogram_params is None:
+                self.fit_variogram_cached(coords, values, parameter, timestamp, station_ids)
             predictions, variances = self.ordinary_kriging(coords, values, grid_coords_array)
         except Exception as e:
             logger.warning(f"Kriging failed, using inverse distance weighting: {e}")
             predictions, variances = self._inverse_distance_weighting(coords, values, grid_coords_array)
         
-        # Convert to AQI and create grid points
+        # Convert to AQI arrays
         aqi_calc = AQICalculator()
-        grid_points = []
-        
-        for i, (lat, lon) in enumerate(grid_coords):
-            pred_value = max(0, predictions[i])  # Ensure non-negative
-            confidence = max(0.1, 1.0 - min(1.0, np.sqrt(variances[i]) / np.std(values)))
-            
-            # Calculate AQI
-            aqi = aqi_calc.calculate_sub_index(pred_value, parameter)
-            category = aqi_calc.get_category(aqi)
-            
-            grid_points.append(GridPoint(
-                latitude=lat,
-                longitude=lon,
-                predicted_value=round(pred_value, 1),
-                confidence=round(confidence, 3),
-                aqi=aqi,
-                category=category
-            ))
+        pred_values = np.maximum(predictions, 0)  # Ensure non-negative
+        confidences = np.maximum(0.1, 1.0 - np.minimum(1.0, np.sqrt(variances) / np.std(values)))
+        aqi_values = aqi_calc.calculate_sub_index_array(pred_values, parameter)
+        lat_step, lon_step = self.grid_steps(bounds, resolution_km)
         
         return SpatialGrid(
             bounds=bounds,
             resolution_km=resolution_km,
-            grid_points=grid_points,
             generated_at=datetime.utcnow(),
             metadata={
                 'parameter': parameter,
@@ -365,7 +707,17 @@ class SpatialInterpolator:
                 'interpolation_method': 'ordinary_kriging' if self.variogram_params else 'inverse_distance_weighting',
                 'variogram_model': self.variogram_model,
                 'variogram_params': self.variogram_params
-            }
+            },
+            lat_origin=float(lats[0]),
+            lon_origin=float(lons[0]),
+            lat_step=float(lat_step),
+            lon_step=float(lon_step),
+            n_lat=len(lats),
+            n_lon=len(lons),
+            values=pred_values.astype(np.float32),
+            confidence=confidences.astype(np.float32),
+            aqi=aqi_values.astype(np.float32),
+            category_codes=aqi_calc.get_category_codes(aqi_values)
         )
     
     def validate_bounds(self, bounds: Dict[str, float]) -> bool:
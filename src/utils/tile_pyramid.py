@@ -0,0 +1,787 @@
+"""
+Slippy-map (XYZ) tile pyramid for spatial AQI layers.
+
+Interpolated pollutant surfaces are precomputed once per hour on the Web
+Mercator tile grid and stored as small float32 arrays, one file per tile.
+Map tiles are served straight from the store and arbitrary bounding boxes
+are assembled from the same tiles, so cache hits no longer depend on the
+exact coordinates a client asks for.
+"""
+
+import io
+import json
+import logging
+import math
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+
+from .aqi_calculator import AQICalculator, CATEGORY_COLORS
+from .spatial_interpolation import GridWeights, SpatialInterpolator
+
+try:
+    import fcntl
+except ImportError:  # Windows: hour locks only serialize within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Tile geometry
+TILE_CELLS = 32  # Interpolated cells per tile edge
+TILE_PIXELS = 256  # Rendered PNG tile edge
+DEFAULT_MIN_ZOOM = 8
+DEFAULT_MAX_ZOOM = 12
+
+# Tile storage
+TILE_CACHE_DIR = os.getenv("TILE_CACHE_DIR", os.path.join("data", "tiles"))
+HOUR_FORMAT = "%Y%m%d%H"
+KEEP_HOURS = 3
+
+# Parameters with hourly pyramids that ingestion keeps current
+PYRAMID_PARAMETERS = ("pm25",)
+
+# Opacity of rendered AQI overlay tiles
+TILE_ALPHA = 160
+
+# Mercator projection is undefined at the poles
+MAX_LATITUDE = 85.05112878
+
+
+def tile_bounds(z: int, x: int, y: int) -> Dict[str, float]:
+    """
+    Get the geographic bounds of an XYZ tile
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row (0 at the north edge)
+
+    Returns:
+        Dictionary with 'north', 'south', 'east', 'west' keys
+    """
+    n = 2 ** z
+    return {
+        'north': float(_tile_y_to_lat(y, n)),
+        'south': float(_tile_y_to_lat(y + 1, n)),
+        'east': (x + 1) / n * 360.0 - 180.0,
+        'west': x / n * 360.0 - 180.0
+    }
+
+
+def tile_range(bounds: Dict[str, float], z: int) -> Tuple[int, int, int, int]:
+    """
+    Get the tiles covering a bounding box at a zoom level
+
+    Args:
+        bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+        z: Zoom level
+
+    Returns:
+        Tuple of inclusive (x_min, x_max, y_min, y_max)
+    """
+    n = 2 ** z
+    x_min, y_min = _lat_lon_to_tile_fraction(bounds['north'], bounds['west'], n)
+    x_max, y_max = _lat_lon_to_tile_fraction(bounds['south'], bounds['east'], n)
+
+    def clamp(value: float) -> int:
+        return min(max(int(math.floor(value)), 0), n - 1)
+
+    # A bound exactly on a tile edge belongs to the tile before it
+    return (
+        clamp(x_min), clamp(math.ceil(x_max) - 1),
+        clamp(y_min), clamp(math.ceil(y_max) - 1)
+    )
+
+
+def cell_size_km(z: int, latitude: float) -> float:
+    """Approximate east-west size of one tile cell in kilometers"""
+    return 360.0 / (2 ** z) / TILE_CELLS * 111.32 * math.cos(math.radians(latitude))
+
+
+def choose_zoom(bounds: Dict[str, float], resolution_km: float,
+                min_zoom: int = DEFAULT_MIN_ZOOM,
+                max_zoom: int = DEFAULT_MAX_ZOOM) -> Optional[int]:
+    """
+    Choose the coarsest zoom whose cells are no coarser than the resolution
+
+    Zoom levels double the cell density, so cells up to sqrt(2) times the
+    requested resolution count as a match.
+
+    Args:
+        bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+        resolution_km: Requested grid resolution in kilometers
+        min_zoom: Lowest precomputed zoom level
+        max_zoom: Highest precomputed zoom level
+
+    Returns:
+        Zoom level, or None if the pyramid is not fine enough
+    """
+    latitude = (bounds['north'] + bounds['south']) / 2
+    for z in range(min_zoom, max_zoom + 1):
+        if cell_size_km(z, latitude) <= resolution_km * math.sqrt(2):
+            return z
+    return None
+
+
+def cell_centers(z: int, x_min: int, x_max: int, y_min: int, y_max: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the cell-center coordinates of a block of tiles
+
+    Args:
+        z: Zoom level
+        x_min, x_max, y_min, y_max: Inclusive tile range
+
+    Returns:
+        Tuple of (latitudes, longitudes) arrays with one entry per cell row
+        (north to south) and per cell column (west to east)
+    """
+    n = 2 ** z
+    rows = np.arange((y_max - y_min + 1) * TILE_CELLS)
+    cols = np.arange((x_max - x_min + 1) * TILE_CELLS)
+
+    latitudes = _tile_y_to_lat(y_min + (rows + 0.5) / TILE_CELLS, n)
+    longitudes = (x_min + (cols + 0.5) / TILE_CELLS) / n * 360.0 - 180.0
+    return latitudes, longitudes
+
+
+def _tile_y_to_lat(y, n: int) -> np.ndarray:
+    return np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y, dtype=float) / n))))
+
+
+def _lat_lon_to_tile_fraction(lat: float, lon: float, n: int) -> Tuple[float, float]:
+    lat = min(max(lat, -MAX_LATITUDE), MAX_LATITUDE)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n
+    return x, y
+
+
+def hour_key(timestamp: Optional[datetime] = None) -> str:
+    """Get the pyramid hour bucket for a timestamp (defaults to now, UTC)"""
+    return (timestamp or datetime.utcnow()).strftime(HOUR_FORMAT)
+
+
+@contextmanager
+def _atomic_write(path: str, mode: str = 'wb'):
+    """
+    Write through a uniquely named temp file renamed over ``path``
+
+    Readers never see a partial file, and concurrent writers of the same
+    path never share a temp file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                    prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        # mkstemp creates owner-only files; keep the cache readable by other workers
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TileStore:
+    """
+    Disk-backed tile store with an in-process LRU of recently served tiles
+
+    Tiles are float32 arrays of shape (2, TILE_CELLS, TILE_CELLS) holding the
+    interpolated value and confidence, stored as
+    ``{root}/{parameter}/{hour}/{z}/{x}/{y}.npy``. A manifest written after
+    the last tile marks an hour's pyramid as complete.
+    """
+
+    def __init__(self, root: Optional[str] = None, memory_tiles: int = 1024):
+        """
+        Initialize tile store
+
+        Args:
+            root: Storage directory. Defaults to TILE_CACHE_DIR env var.
+            memory_tiles: Number of tiles kept in process memory
+        """
+        self.root = root or TILE_CACHE_DIR
+        self._memory = LRUCache(maxsize=memory_tiles)
+        self._lock = threading.Lock()
+        # Re-entrant so a thread holding an hour's lock can merge its manifest
+        self._hour_lock = threading.RLock()
+        self._flocked: Set[Tuple[str, str]] = set()
+
+    def _hour_dir(self, parameter: str, hour: str) -> str:
+        return os.path.join(self.root, parameter, hour)
+
+    def _tile_path(self, parameter: str, hour: str, z: int, x: int, y: int) -> str:
+        return os.path.join(self._hour_dir(parameter, hour), str(z), str(x), f"{y}.npy")
+
+    def put(self, parameter: str, hour: str, z: int, x: int, y: int, tile: np.ndarray):
+        """Store one tile"""
+        path = self._tile_path(parameter, hour, z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename so readers never see a partial tile
+        with _atomic_write(path) as f:
+            np.save(f, tile.astype(np.float32))
+
+        with self._lock:
+            self._memory[(parameter, hour, z, x, y)] = (os.stat(path).st_mtime_ns, tile.astype(np.float32))
+
+    def get(self, parameter: str, hour: str, z: int, x: int, y: int) -> Optional[np.ndarray]:
+        """Get one tile, or None if it was not precomputed"""
+        key = (parameter, hour, z, x, y)
+        path = self._tile_path(parameter, hour, z, x, y)
+
+        # Tiles are rewritten in place by incremental updates from other
+        # processes, so memory entries are only valid for the file version
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1]
+
+        try:
+            tile = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        with self._lock:
+            self._memory[key] = (mtime_ns, tile)
+        return tile
+
+    @contextmanager
+    def hour_lock(self, parameter: str, hour: str):
+        """
+        Exclusive lock on an hour's pyramid, across threads and processes
+
+        Held around read-modify-writes of the hour's manifest and weight
+        layers. Re-entrant within a thread.
+        """
+        key = (parameter, hour)
+        with self._hour_lock:
+            if key in self._flocked:
+                yield
+                return
+
+            hour_dir = self._hour_dir(parameter, hour)
+            os.makedirs(hour_dir, exist_ok=True)
+            with open(os.path.join(hour_dir, "manifest.lock"), 'w') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._flocked.add(key)
+                try:
+                    yield
+                finally:
+                    self._flocked.discard(key)
+
+    def write_manifest(self, parameter: str, hour: str, manifest: Dict[str, Any]):
+        """Mark an hour's pyramid as complete"""
+        path = os.path.join(self._hour_dir(parameter, hour), "manifest.json")
+        # Hourly builds and incremental updates merge regions into the same
+        # manifest, so the read-modify-write holds the hour's lock
+        with self.hour_lock(parameter, hour):
+            existing = self.read_manifest(parameter, hour) or {'regions': {}}
+            existing['regions'].update(manifest.get('regions', {}))
+            existing.update({k: v for k, v in manifest.items() if k != 'regions'})
+
+            with _atomic_write(path, 'w') as f:
+                json.dump(existing, f)
+
+    def read_manifest(self, parameter: str, hour: str) -> Optional[Dict[str, Any]]:
+        """Get an hour's manifest, or None if the pyramid is incomplete"""
+        try:
+            with open(os.path.join(self._hour_dir(parameter, hour), "manifest.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _layer_dir(self, parameter: str, hour: str, region: str) -> str:
+        return os.path.join(self._hour_dir(parameter, hour), "weights", region)
+
+    def put_layer(self, parameter: str, hour: str, region: str, state: Dict[str, Any],
+                  zoom_arrays: Dict[int, Tuple[np.ndarray, np.ndarray]]):
+        """
+        Store a region's grid x station weights so any worker can update its tiles
+
+        Args:
+            parameter: Pollutant parameter
+            hour: Pyramid hour key
+            region: Region name
+            state: JSON-able layer state (station ids, current values, method, ...)
+            zoom_arrays: Zoom -> (weight matrix, variance factors)
+        """
+        layer_dir = self._layer_dir(parameter, hour, region)
+        os.makedirs(layer_dir, exist_ok=True)
+
+        for z, (weights, variance_factors) in zoom_arrays.items():
+            with _atomic_write(os.path.join(layer_dir, f"{z}.npz")) as f:
+                np.savez(f, weights=weights.astype(np.float32), variance_factors=variance_factors)
+
+        self.put_layer_state(parameter, hour, region, state)
+
+    def put_layer_state(self, parameter: str, hour: str, region: str, state: Dict[str, Any]):
+        """Store the small, frequently rewritten part of a weight layer"""
+        with _atomic_write(os.path.join(self._layer_dir(parameter, hour, region), "state.json"), 'w') as f:
+            json.dump(state, f)
+
+    def get_layer_state(self, parameter: str, hour: str, region: str) -> Optional[Dict[str, Any]]:
+        """Get a weight layer's state, or None if no weights were stored"""
+        try:
+            with open(os.path.join(self._layer_dir(parameter, hour, region), "state.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def get_layer_arrays(self, parameter: str, hour: str, region: str,
+                         zooms) -> Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]]:
+        """Get a weight layer's per-zoom (weights, variance factors), or None if incomplete"""
+        zoom_arrays = {}
+        for z in zooms:
+            try:
+                with np.load(os.path.join(self._layer_dir(parameter, hour, region), f"{z}.npz")) as arrays:
+                    zoom_arrays[int(z)] = (arrays['weights'], arrays['variance_factors'])
+            except (FileNotFoundError, ValueError, OSError, KeyError):
+                return None
+        return zoom_arrays
+
+    def resolve_hour(self, parameter: str, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Get the newest complete pyramid hour, preferring the current hour
+
+        Args:
+            parameter: Pollutant parameter
+            now: Reference time (defaults to now, UTC)
+
+        Returns:
+            Hour key or None if no recent pyramid exists
+        """
+        now = now or datetime.utcnow()
+        for hours_back in range(KEEP_HOURS):
+            hour = hour_key(now - timedelta(hours=hours_back))
+            if self.read_manifest(parameter, hour) is not None:
+                return hour
+        return None
+
+    def prune(self, parameter: str, keep_hours: int = KEEP_HOURS, now: Optional[datetime] = None) -> int:
+        """
+        Delete pyramids older than keep_hours
+
+        Returns:
+            Number of hour directories removed
+        """
+        parameter_dir = os.path.join(self.root, parameter)
+        if not os.path.isdir(parameter_dir):
+            return 0
+
+        now = now or datetime.utcnow()
+        keep = {hour_key(now - timedelta(hours=h)) for h in range(keep_hours)}
+        removed = 0
+        for hour in os.listdir(parameter_dir):
+            if hour not in keep:
+                shutil.rmtree(os.path.join(parameter_dir, hour), ignore_errors=True)
+                removed += 1
+
+        with self._lock:
+            for key in [k for k in self._memory.keys() if k[0] == parameter and k[1] not in keep]:
+                del self._memory[key]
+
+        return removed
+
+
+class TilePyramidBuilder:
+    """
+    Build the hourly tile pyramid for a region from station measurements
+
+    The grid x station weights of every zoom level are stored with the
+    pyramid, so new readings from known stations are folded into the tiles as
+    rank-1 updates until the station set changes and a full rebuild is due.
+    """
+
+    def __init__(self, store: Optional[TileStore] = None,
+                 min_zoom: int = DEFAULT_MIN_ZOOM, max_zoom: int = DEFAULT_MAX_ZOOM,
+                 variogram_model: str = 'exponential'):
+        """
+        Initialize pyramid builder
+
+        Args:
+            store: Tile store to write to (defaults to the process-wide store)
+            min_zoom: Lowest zoom level to precompute
+            max_zoom: Highest zoom level to precompute
+            variogram_model: Variogram model used for kriging
+        """
+        self.store = store or get_tile_store()
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.variogram_model = variogram_model
+
+        # (region, parameter) -> loaded weight layer, so repeated updates skip the disk
+        self._layers: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def build(self, region: str, station_data: Dict[str, Dict], bounds: Dict[str, float],
+              parameter: str = 'pm25', timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Interpolate and store every tile covering the bounds at every zoom
+
+        Args:
+            region: Region name recorded in the manifest
+            station_data: Dictionary with station_id -> {'lat': float, 'lon': float, parameter: float}
+            bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+            parameter: Parameter being interpolated
+            timestamp: Time of the station data (defaults to now, UTC)
+
+        Returns:
+            Build summary
+        """
+        station_ids = [
+            station_id for station_id, data in station_data.items()
+            if 'lat' in data and 'lon' in data and data.get(parameter) is not None
+        ]
+        if len(station_ids) < 2:
+            raise ValueError(f"Need at least 2 stations with {parameter} data for interpolation")
+
+        coords = np.array([[station_data[s]['lat'], station_data[s]['lon']] for s in station_ids])
+        values = np.array([station_data[s][parameter] for s in station_ids], dtype=float)
+        hour = hour_key(timestamp)
+
+        interpolator = SpatialInterpolator(variogram_model=self.variogram_model)
+        interpolator.fit_variogram_cached(coords, values, parameter, timestamp, station_ids)
+
+        tiles_written = 0
+        zoom_ranges = {}
+        zoom_weights = {}
+        for z in range(self.min_zoom, self.max_zoom + 1):
+            x_min, x_max, y_min, y_max = tile_range(bounds, z)
+            latitudes, longitudes = cell_centers(z, x_min, x_max, y_min, y_max)
+            lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing='ij')
+            predict_coords = np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
+
+            grid_weights = interpolator.build_grid_weights(
+                station_ids, coords, values, predict_coords, parameter, timestamp
+            )
+            zoom_ranges[str(z)] = [x_min, x_max, y_min, y_max]
+            zoom_weights[z] = grid_weights
+            tiles_written += self._write_tiles(parameter, hour, z, zoom_ranges[str(z)], grid_weights)
+
+        layer = {
+            'hour': hour,
+            'bounds': dict(bounds),
+            'zoom_ranges': zoom_ranges,
+            'built_at': datetime.utcnow().isoformat(),
+            'weights': zoom_weights
+        }
+        self.store.put_layer(parameter, hour, region, self._layer_state(layer), {
+            z: (grid_weights.weights, grid_weights.variance_factors)
+            for z, grid_weights in zoom_weights.items()
+        })
+        with self._lock:
+            self._layers[(region, parameter)] = layer
+
+        self._write_region_manifest(region, parameter, layer)
+
+        return {
+            'region': region,
+            'parameter': parameter,
+            'hour': hour,
+            'tiles_written': tiles_written,
+            'n_stations': len(station_ids)
+        }
+
+    def apply_updates(self, parameter: str, station_values: Dict[str, Dict[str, float]],
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Fold new station readings into the latest pyramid without re-solving
+
+        Args:
+            parameter: Parameter the readings are for
+            station_values: Dictionary with station_id -> {'lat': float, 'lon': float, 'value': float}
+            now: Reference time for picking the pyramid hour (defaults to now, UTC)
+
+        Returns:
+            Summary with the 'updated' regions, the 'stale' regions that need a
+            full build (station set changed or no stored weights) and the
+            number of tiles rewritten
+        """
+        summary = {'parameter': parameter, 'hour': None, 'updated': [], 'stale': [], 'tiles_written': 0}
+
+        hour = self.store.resolve_hour(parameter, now)
+        if hour is None:
+            return summary
+        summary['hour'] = hour
+
+        for region, info in self.store.read_manifest(parameter, hour)['regions'].items():
+            bounds = info['bounds']
+            region_values = {
+                station_id: float(reading['value'])
+                for station_id, reading in station_values.items()
+                if reading.get('value') is not None
+                and bounds['south'] <= reading['lat'] <= bounds['north']
+                and bounds['west'] <= reading['lon'] <= bounds['east']
+            }
+            if not region_values:
+                continue
+
+            # Workers update the same layer; its load, tile writes and state
+            # write are one read-modify-write under the hour's lock
+            with self.store.hour_lock(parameter, hour):
+                layer = self._load_layer(region, parameter, hour)
+                if layer is None or next(iter(layer['weights'].values())).missing_stations(region_values):
+                    summary['stale'].append(region)
+                    continue
+
+                for z, grid_weights in layer['weights'].items():
+                    grid_weights.update_many(region_values)
+                    summary['tiles_written'] += self._write_tiles(
+                        parameter, hour, z, layer['zoom_ranges'][str(z)], grid_weights
+                    )
+                self.store.put_layer_state(parameter, hour, region, self._layer_state(layer))
+                self._write_region_manifest(region, parameter, layer)
+            summary['updated'].append(region)
+
+        return summary
+
+    def _load_layer(self, region: str, parameter: str, hour: str) -> Optional[Dict[str, Any]]:
+        """Get a region's weight layer, syncing it with updates from other workers"""
+        state = self.store.get_layer_state(parameter, hour, region)
+        if state is None:
+            return None
+
+        with self._lock:
+            layer = self._layers.get((region, parameter))
+
+        if layer is None or layer['hour'] != hour or layer['built_at'] != state['built_at']:
+            zoom_arrays = self.store.get_layer_arrays(parameter, hour, region, state['zoom_ranges'])
+            if zoom_arrays is None:
+                return None
+
+            layer = {
+                'hour': hour,
+                'bounds': state['bounds'],
+                'zoom_ranges': state['zoom_ranges'],
+                'built_at': state['built_at'],
+                'weights': {
+                    z: GridWeights(
+                        station_ids=state['station_ids'],
+                        weights=weights,
+                        values=state['values'],
+                        variance_factors=variance_factors,
+                        method=state['method'],
+                        scale_variance_by_values=state['scale_variance_by_values']
+                    )
+                    for z, (weights, variance_factors) in zoom_arrays.items()
+                }
+            }
+            with self._lock:
+                self._layers[(region, parameter)] = layer
+            return layer
+
+        # Same build, but another worker may have applied newer values
+        values = np.asarray(state['values'], dtype=float)
+        for grid_weights in layer['weights'].values():
+            if not np.array_equal(grid_weights.values, values):
+                grid_weights.values = values.copy()
+                grid_weights.refresh()
+        return layer
+
+    @staticmethod
+    def _layer_state(layer: Dict[str, Any]) -> Dict[str, Any]:
+        grid_weights = next(iter(layer['weights'].values()))
+        return {
+            'bounds': layer['bounds'],
+            'zoom_ranges': layer['zoom_ranges'],
+            'built_at': layer['built_at'],
+            'station_ids': list(grid_weights.station_ids),
+            'values': grid_weights.values.tolist(),
+            'method': grid_weights.method,
+            'scale_variance_by_values': grid_weights.scale_variance_by_values
+        }
+
+    def _write_tiles(self, parameter: str, hour: str, z: int,
+                     tile_span, grid_weights: GridWeights) -> int:
+        """Cut one zoom level of predictions into tiles and store them"""
+        x_min, x_max, y_min, y_max = tile_span
+        shape = ((y_max - y_min + 1) * TILE_CELLS, (x_max - x_min + 1) * TILE_CELLS)
+
+        value_std = np.std(grid_weights.values)
+        variances = grid_weights.variances
+        predictions = np.maximum(grid_weights.predictions, 0).reshape(shape)
+        if value_std > 0:
+            confidences = np.maximum(0.1, 1.0 - np.minimum(1.0, np.sqrt(np.maximum(variances, 0)) / value_std))
+        else:
+            confidences = np.ones_like(variances)
+        confidences = confidences.reshape(shape)
+
+        tiles_written = 0
+        for y in range(y_min, y_max + 1):
+            rows = slice((y - y_min) * TILE_CELLS, (y - y_min + 1) * TILE_CELLS)
+            for x in range(x_min, x_max + 1):
+                cols = slice((x - x_min) * TILE_CELLS, (x - x_min + 1) * TILE_CELLS)
+                tile = np.stack([predictions[rows, cols], confidences[rows, cols]])
+                self.store.put(parameter, hour, z, x, y, tile)
+                tiles_written += 1
+
+        return tiles_written
+
+    def _write_region_manifest(self, region: str, parameter: str, layer: Dict[str, Any]):
+        grid_weights = next(iter(layer['weights'].values()))
+        self.store.write_manifest(parameter, layer['hour'], {
+            'parameter': parameter,
+            'min_zoom': self.min_zoom,
+            'max_zoom': self.max_zoom,
+            'tile_cells': TILE_CELLS,
+            'regions': {
+                region: {
+                    'bounds': layer['bounds'],
+                    'zoom_ranges': layer['zoom_ranges'],
+                    'n_stations': len(grid_weights.station_ids),
+                    'generated_at': layer['built_at'],
+                    'updated_at': datetime.utcnow().isoformat()
+                }
+            }
+        })
+
+
+def assemble_bounds(bounds: Dict[str, float], resolution_km: float, parameter: str = 'pm25',
+                    store: Optional[TileStore] = None,
+                    now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Assemble a bounding-box grid from precomputed tiles
+
+    Args:
+        bounds: Dictionary with 'north', 'south', 'east', 'west' keys
+        resolution_km: Requested grid resolution in kilometers
+        parameter: Pollutant parameter
+        store: Tile store to read from (defaults to the process-wide store)
+        now: Reference time (defaults to now, UTC)
+
+    Returns:
+        Dictionary with flat 'latitude', 'longitude', 'value' and 'confidence'
+        arrays for the cells inside the bounds (row-major, north to south),
+        the 'latitudes' and 'longitudes' grid axes, 'zoom' and 'hour', or
+        None if the pyramid does not cover the request
+    """
+    store = store or get_tile_store()
+    hour = store.resolve_hour(parameter, now)
+    if hour is None:
+        return None
+
+    manifest = store.read_manifest(parameter, hour)
+    z = choose_zoom(bounds, resolution_km, manifest['min_zoom'], manifest['max_zoom'])
+    if z is None:
+        return None
+
+    x_min, x_max, y_min, y_max = tile_range(bounds, z)
+    mosaic = np.empty((2, (y_max - y_min + 1) * TILE_CELLS, (x_max - x_min + 1) * TILE_CELLS), dtype=np.float32)
+    for y in range(y_min, y_max + 1):
+        for x in range(x_min, x_max + 1):
+            tile = store.get(parameter, hour, z, x, y)
+            if tile is None:
+                return None
+            mosaic[:, (y - y_min) * TILE_CELLS:(y - y_min + 1) * TILE_CELLS,
+                   (x - x_min) * TILE_CELLS:(x - x_min + 1) * TILE_CELLS] = tile
+
+    latitudes, longitudes = cell_centers(z, x_min, x_max, y_min, y_max)
+    row_mask = (latitudes >= bounds['south']) & (latitudes <= bounds['north'])
+    col_mask = (longitudes >= bounds['west']) & (longitudes <= bounds['east'])
+
+    lat_grid, lon_grid = np.meshgrid(latitudes[row_mask], longitudes[col_mask], indexing='ij')
+    cropped = mosaic[:, row_mask][:, :, col_mask]
+
+    return {
+        'latitudes': latitudes[row_mask],
+        'longitudes': longitudes[col_mask],
+        'latitude': lat_grid.ravel(),
+        'longitude': lon_grid.ravel(),
+        'value': cropped[0].ravel(),
+        'confidence': cropped[1].ravel(),
+        'zoom': z,
+        'hour': hour
+    }
+
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+# RGBA palette indexed by AQI category code
+_CATEGORY_RGBA = np.array(
+    [(*_hex_to_rgb(color), TILE_ALPHA) for color in CATEGORY_COLORS], dtype=np.uint8
+)
+
+
+def render_tile_png(tile: np.ndarray, parameter: str = 'pm25') -> bytes:
+    """
+    Render a tile as an AQI-category colored RGBA PNG
+
+    Args:
+        tile: Array of shape (2, TILE_CELLS, TILE_CELLS) from the tile store
+        parameter: Pollutant parameter of the tile values
+
+    Returns:
+        PNG bytes of a TILE_PIXELS x TILE_PIXELS image
+    """
+    aqi_calc = AQICalculator()
+    codes = aqi_calc.get_category_codes(aqi_calc.calculate_sub_index_array(tile[0], parameter))
+    rgba = _CATEGORY_RGBA[codes]
+
+    scale = TILE_PIXELS // TILE_CELLS
+    rgba = np.repeat(np.repeat(rgba, scale, axis=0), scale, axis=1)
+    return _encode_png(rgba)
+
+
+def _encode_png(rgba: np.ndarray) -> bytes:
+    """Minimal RGBA PNG encoder"""
+    height, width, _ = rgba.shape
+    # Filter type 0 (None) byte at the start of every scanline
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, -1)], axis=1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+def tile_to_npy(tile: np.ndarray) -> bytes:
+    """Serialize a tile as .npy bytes"""
+    buffer = io.BytesIO()
+    np.save(buffer, tile.astype(np.float32))
+    return buffer.getvalue()
+
+
+# Global tile store instance
+_tile_store: Optional[TileStore] = None
+
+
+def get_tile_store() -> TileStore:
+    """Get the process-wide tile store"""
+    global _tile_store
+    if _tile_store is None:
+        _tile_store = TileStore()
+    return _tile_store
+
+
+# Global builder; keeps the weight matrices of this worker's last builds
+_tile_pyramid_builder: Optional[TilePyramidBuilder] = None
+
+
+def get_tile_pyramid_builder() -> TilePyramidBuilder:
+    """Get the process-wide tile pyramid builder"""
+    global _tile_pyramid_builder
+    if _tile_pyramid_builder is None:
+        _tile_pyramid_builder = TilePyramidBuilder()
+    return _tile_pyramid_builder
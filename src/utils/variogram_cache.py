@@ -0,0 +1,253 @@
+"""
+Variogram parameter cache for spatial interpolation.
+
+Fitting a variogram is the only data-dependent setup step of kriging and the
+fitted parameters barely move within an hour for a fixed station network, so
+fits are cached under a key built from the station set, the parameter and an
+hourly time bucket. Entries live in a bounded in-process LRU with Redis as a
+shared second level, so API workers and Celery workers reuse each other's fits.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Default bounds for the cache
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_REDIS_TTL = 2 * 3600  # Two hourly buckets
+REDIS_RETRY_SECONDS = 60  # Back-off after Redis is unreachable
+
+# Coordinates are rounded before hashing so float noise doesn't split entries
+COORDINATE_DECIMALS = 5
+
+
+class VariogramCache:
+    """
+    Two-level (in-process LRU + Redis) cache of fitted variogram parameters
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 redis_url: Optional[str] = None,
+                 redis_ttl: int = DEFAULT_REDIS_TTL,
+                 use_redis: bool = True,
+                 key_prefix: str = "variogram:"):
+        """
+        Initialize variogram cache
+
+        Args:
+            max_entries: Maximum number of fits kept in process memory
+            redis_url: Redis connection URL. Defaults to REDIS_URL env var.
+            redis_ttl: Expiry of Redis entries in seconds
+            use_redis: Whether to use Redis as the second cache level
+            key_prefix: Prefix for Redis keys
+        """
+        self.max_entries = max_entries
+        self.redis_url = redis_url or REDIS_URL
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self.key_prefix = key_prefix
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_client = None
+        self._redis_retry_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(coordinates: np.ndarray, parameter: str,
+                 timestamp: Optional[datetime] = None,
+                 station_ids: Optional[Iterable[str]] = None,
+                 model: str = 'exponential') -> str:
+        """
+        Build the cache key for a station configuration and hour
+
+        Args:
+            coordinates: Array of shape (n_points, 2) with lat/lon coordinates
+            parameter: Parameter being interpolated
+            timestamp: Time of the data (defaults to current UTC time)
+            station_ids: Station identifiers, hashed along with their coordinates
+            model: Variogram model name
+
+        Returns:
+            Cache key string
+        """
+        rounded = np.round(np.asarray(coordinates, dtype=float), COORDINATE_DECIMALS).reshape(-1, 2)
+        members = [f"{lat:.{COORDINATE_DECIMALS}f},{lon:.{COORDINATE_DECIMALS}f}" for lat, lon in rounded]
+        if station_ids is not None:
+            members = [f"{station_id}@{member}" for station_id, member in zip(station_ids, members)]
+        members.sort()
+
+        station_hash = hashlib.sha1("|".join(members).encode()).hexdigest()[:16]
+        hour_bucket = (timestamp or datetime.utcnow()).strftime("%Y%m%d%H")
+
+        return f"{parameter}:{model}:{station_hash}:{hour_bucket}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached variogram parameters
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Variogram parameters or None on a miss
+        """
+        with self._lock:
+            params = self._entries.get(key)
+            if params is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if params is not None:
+            self._record_metric(hit=True)
+            return dict(params)
+
+        params = self._redis_get(key)
+        if params is not None:
+            self._store_local(key, params)
+            with self._lock:
+                self.hits += 1
+                self.redis_hits += 1
+            self._record_metric(hit=True)
+            return dict(params)
+
+        with self._lock:
+            self.misses += 1
+        self._record_metric(hit=False)
+        return None
+
+    def set(self, key: str, params: Dict[str, Any]):
+        """
+        Store variogram parameters in both cache levels
+
+        Args:
+            key: Cache key from make_key
+            params: Fitted variogram parameters
+        """
+        params = {
+            name: float(value) if isinstance(value, (int, float, np.number)) else value
+            for name, value in params.items()
+        }
+        self._store_local(key, params)
+        self._redis_set(key, params)
+
+    def clear(self):
+        """Drop all in-process entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.redis_hits = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss statistics
+
+        Returns:
+            Dictionary with hits, misses, hit rate and size
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "redis_hits": self.redis_hits,
+                "evictions": self.evictions,
+                "hit_rate_percent": round(self.hits / total * 100, 2) if total else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+    def _store_local(self, key: str, params: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = params
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_redis(self):
+        """Get the Redis client, or None while Redis is disabled or backing off"""
+        if not self.use_redis or time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self._redis_client is None:
+            try:
+                from redis import Redis
+                self._redis_client = Redis.from_url(
+                    self.redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5
+                )
+            except Exception as e:
+                logger.warning(f"Variogram cache Redis unavailable: {e}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                return None
+
+        return self._redis_client
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        client = self._get_redis()
+        if client is None:
+            return None
+
+        try:
+            value = client.get(f"{self.key_prefix}{key}")
+            return json.loads(value) if value else None
+        except Exception as e:
+            logger.debug(f"Variogram cache Redis get failed: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+
+    def _redis_set(self, key: str, params: Dict[str, Any]):
+        client = self._get_redis()
+        if client is None:
+            return
+
+        try:
+            client.setex(f"{self.key_prefix}{key}", self.redis_ttl, json.dumps(params))
+        except Exception as e:
+            logger.debug(f"Variogram cache Redis set failed: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _record_metric(self, hit: bool):
+        """Report the lookup to Prometheus when the API metrics are available"""
+        try:
+            from src.api.prometheus_metrics import get_metrics_collector
+            collector = get_metrics_collector()
+            if hit:
+                collector.record_cache_hit("variogram")
+            else:
+                collector.record_cache_miss("variogram")
+        except Exception:
+            pass
+
+
+# Global cache instance shared by all interpolators in the process
+_variogram_cache: Optional[VariogramCache] = None
+
+
+def get_variogram_cache() -> VariogramCache:
+    """Get the process-wide variogram cache"""
+    global _variogram_cache
+    if _variogram_cache is None:
+        _variogram_cache = VariogramCache()
+    return _variogram_cache
@@ -5,11 +5,12 @@ Tests for AQI Calculator
 import pytest
 import sys
 import os
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils.aqi_calculator import AQICalculator
+from src.utils.aqi_calculator import AQICalculator, AQI_BREAKPOINTS, CATEGORY_CODES
 
 
 class TestAQICalculator:
@@ -91,5 +92,74 @@ class TestAQICalculator:
         assert category == 'good'
 
 
+class TestVectorizedAQICalculator:
+    """Test cases for the array-based AQI API"""
+    
+    def test_sub_index_array_matches_scalar(self):
+        """Array sub-indices should match the scalar path for every pollutant"""
+        calc = AQICalculator()
+        rng = np.random.default_rng(42)
+        for pollutant in AQI_BREAKPOINTS:
+            # Include breakpoint edges, gaps between segments and out-of-range values
+            edges = [value for bp in AQI_BREAKPOINTS[pollutant] for value in bp[:2]]
+            concentrations = np.concatenate([
+                rng.uniform(-10, 2500, 500), edges, np.array(edges) + 0.05
+            ])
+            
+            result = calc.calculate_sub_index_array(concentrations, pollutant)
+            expected = [calc.calculate_sub_index(c, pollutant) for c in concentrations]
+            
+            np.testing.assert_allclose(result, expected)
+    
+    def test_sub_index_array_nan_and_negative(self):
+        """NaN stays NaN and negative concentrations map to zero"""
+        calc = AQICalculator()
+        result = calc.calculate_sub_index_array(np.array([np.nan, -5.0, 700.0]), 'pm25')
+        
+        assert np.isnan(result[0])
+        assert result[1] == 0
+        assert result[2] == 500
+    
+    def test_sub_index_array_unknown_pollutant(self):
+        """Unknown pollutants should raise like the scalar API"""
+        calc = AQICalculator()
+        with pytest.raises(ValueError):
+            calc.calculate_sub_index_array(np.array([1.0]), 'unknown')
+    
+    def test_calculate_aqi_batch_matches_scalar(self):
+        """Batch AQI, dominant pollutant and category should match calculate_aqi"""
+        calc = AQICalculator()
+        batch = {
+            'pm25': np.array([35.5, 10.0, np.nan, 250.0]),
+            'pm10': np.array([50.0, 200.0, np.nan, np.nan]),
+            'no2': np.array([30.0, 20.0, np.nan, 900.0])
+        }
+        result = calc.calculate_aqi_batch(batch)
+        
+        for i in range(4):
+            row = {p: float(v[i]) for p, v in batch.items() if not np.isnan(v[i])}
+            aqi, dominant, category = calc.calculate_aqi(row)
+            assert result.aqi[i] == aqi
+            assert result.dominant_pollutants()[i] == dominant
+            assert CATEGORY_CODES[result.category_codes[i]] == category
+        
+        assert result.dominant_index[2] == -1
+        assert result.category_codes.dtype == np.uint8
+    
+    def test_vectorized_lookups_match_scalar(self):
+        """Vectorized category, label and color lookups should match scalar ones"""
+        calc = AQICalculator()
+        aqi = np.array([0, 50, 50.5, 100, 101, 150, 199, 200, 250, 300, 301, 500])
+        
+        assert list(calc.get_categories(aqi)) == [calc.get_category(a) for a in aqi]
+        assert list(calc.get_category_labels(aqi)) == [calc.get_category_label(a) for a in aqi]
+        assert list(calc.get_colors(aqi)) == [calc.get_color(a) for a in aqi]
+    
+    def test_breakpoint_table_is_immutable(self):
+        """The shared breakpoint table cannot be modified"""
+        with pytest.raises(TypeError):
+            AQI_BREAKPOINTS['pm25'] = ()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
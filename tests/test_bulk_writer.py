@@ -0,0 +1,222 @@
+"""
+Tests for the COPY-based bulk write path for hypertables.
+"""
+
+import struct
+from datetime import datetime
+
+import pytest
+from geoalchemy2 import WKTElement
+
+from src.api.bulk_writer import (
+    AIR_QUALITY_MEASUREMENTS, PREDICTIONS, WEATHER_DATA,
+    bulk_write, bulk_write_async, encode_csv, encode_point, to_ewkb
+)
+
+
+def _measurement(station_id: str, value: float = 42.0):
+    return {
+        "time": datetime(2024, 1, 1, 12),
+        "station_id": station_id,
+        "parameter": "pm25",
+        "value": value,
+        "unit": "µg/m³",
+        "source": "cpcb",
+        "location": encode_point(28.6139, 77.2090)
+    }
+
+
+class _Result:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class FakeSession:
+    """Synchronous session stand-in recording COPY bodies and transactions."""
+
+    def __init__(self, fail_on_batch: int = None):
+        self.fail_on_batch = fail_on_batch
+        self.copies = []
+        self.commits = 0
+        self.rollbacks = 0
+        self._staged = 0
+
+    def execute(self, statement):
+        sql = str(statement)
+        if sql.startswith("INSERT") and len(self.copies) == self.fail_on_batch:
+            raise RuntimeError("duplicate key value violates unique constraint")
+        return _Result(self._staged if sql.startswith("INSERT") else 0)
+
+    def connection(self):
+        session = self
+
+        class _Cursor:
+            def copy_expert(self, sql, body):
+                lines = body.read().splitlines()
+                session.copies.append((sql, lines))
+                session._staged = len(lines)
+
+            def close(self):
+                pass
+
+        class _Connection:
+            connection = type("_DBAPIConnection", (), {"cursor": lambda self: _Cursor()})()
+
+        return _Connection()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeAsyncSession:
+    """AsyncSession stand-in exposing an asyncpg-like driver connection."""
+
+    def __init__(self):
+        self.copied = []
+        self.statements = []
+        self.commits = 0
+        session = self
+
+        class _Driver:
+            async def copy_records_to_table(self, table, records, columns):
+                session.copied.append((table, records, columns))
+
+        class _Raw:
+            driver_connection = _Driver()
+
+        class _Connection:
+            async def get_raw_connection(self):
+                return _Raw()
+
+        self._connection = _Connection()
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+        return _Result(len(self.copied[-1][1]) if self.copied else 0)
+
+    async def connection(self):
+        return self._connection
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class TestPointEncoding:
+    """Test cases for EWKB point encoding."""
+
+    def test_encode_point_is_ewkb_with_srid(self):
+        """Points are little-endian EWKB with the SRID flag and lon/lat order."""
+        order, geometry_type, srid, x, y = struct.unpack("<BIIdd", encode_point(28.6139, 77.2090))
+
+        assert (order, geometry_type, srid) == (1, 0x20000001, 4326)
+        assert (x, y) == (77.2090, 28.6139)
+
+    def test_wkt_points_are_converted(self):
+        """WKTElement and EWKT inputs produce the same bytes as encode_point."""
+        expected = encode_point(28.6139, 77.2090)
+
+        assert to_ewkb(WKTElement("POINT(77.2090 28.6139)", srid=4326)) == expected
+        assert to_ewkb("SRID=4326;POINT(77.2090 28.6139)") == expected
+        assert to_ewkb(expected) is expected
+        assert to_ewkb(None) is None
+
+    def test_non_points_are_rejected(self):
+        with pytest.raises(ValueError):
+            to_ewkb("POLYGON((0 0, 1 0, 1 1, 0 0))")
+
+
+class TestBulkTable:
+    """Test cases for staging and merge SQL."""
+
+    def test_measurements_skip_conflicts(self):
+        """Measurements merge with DO NOTHING and leave created_at to the server."""
+        sql = AIR_QUALITY_MEASUREMENTS.merge_sql()
+
+        assert "created_at" not in AIR_QUALITY_MEASUREMENTS.columns
+        assert "ST_GeomFromEWKB(location)" in sql
+        assert sql.endswith("ON CONFLICT (time, station_id, parameter) DO NOTHING")
+
+    def test_predictions_upsert_one_row_per_key(self):
+        """Predictions are upserted, keeping one staged row per primary key."""
+        sql = PREDICTIONS.merge_sql()
+
+        assert "SELECT DISTINCT ON (time, location, forecast_hour, parameter)" in sql
+        assert "predicted_value = EXCLUDED.predicted_value" in sql
+        assert "ON CONFLICT (time, location, forecast_hour, parameter) DO UPDATE" in sql
+
+    def test_staging_table_holds_points_as_ewkb(self):
+        sql = WEATHER_DATA.create_staging_sql()
+
+        assert sql.startswith("CREATE TEMP TABLE _bulk_weather_data ON COMMIT DROP")
+        assert "ST_AsEWKB(location) AS location" in sql
+        assert sql.endswith("WITH NO DATA")
+
+    def test_record_fills_model_defaults(self):
+        """Missing columns with a model default (quality_flag) get it."""
+        record = dict(zip(AIR_QUALITY_MEASUREMENTS.columns,
+                          AIR_QUALITY_MEASUREMENTS.record(_measurement("DL001"))))
+
+        assert record["quality_flag"] == "valid"
+        assert record["location"] == encode_point(28.6139, 77.2090)
+
+    def test_csv_encoding(self):
+        """NULLs are unquoted empty fields, text is quoted and bytes are hex bytea."""
+        body = encode_csv([(None, 'say "hi"', b"\x01\x02", 1.5, datetime(2024, 1, 1))]).read()
+
+        assert body == ',"say ""hi""",\\x0102,1.5,2024-01-01T00:00:00\n'
+
+
+class TestBulkWrite:
+    """Test cases for batched COPY writes."""
+
+    def test_rows_are_copied_in_batches(self):
+        """Each batch is one COPY and one commit."""
+        db = FakeSession()
+        rows = [_measurement(f"DL{i:03d}") for i in range(5)]
+
+        result = bulk_write(db, AIR_QUALITY_MEASUREMENTS, rows, batch_size=2)
+
+        assert [len(lines) for _, lines in db.copies] == [2, 2, 1]
+        assert db.commits == 3
+        assert (result.rows, result.written, result.failed, result.batches) == (5, 5, 0, 3)
+        assert db.copies[0][0].startswith("COPY _bulk_air_quality_measurements (time, station_id")
+
+    def test_failed_batch_is_rolled_back_and_counted(self):
+        """A failing batch does not stop the batches after it."""
+        db = FakeSession(fail_on_batch=1)
+        rows = [_measurement(f"DL{i:03d}") for i in range(4)]
+
+        result = bulk_write(db, AIR_QUALITY_MEASUREMENTS, rows, batch_size=2)
+
+        assert db.rollbacks == 1
+        assert (result.written, result.failed) == (2, 2)
+
+    def test_strict_mode_raises(self):
+        db = FakeSession(fail_on_batch=1)
+
+        with pytest.raises(RuntimeError):
+            bulk_write(db, AIR_QUALITY_MEASUREMENTS, [_measurement("DL001")], strict=True)
+        assert db.rollbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_async_path_uses_binary_copy(self):
+        """The asyncpg path copies records with EWKB points inside the session's transaction."""
+        db = FakeAsyncSession()
+        rows = [_measurement("DL001"), _measurement("DL002")]
+
+        result = await bulk_write_async(db, AIR_QUALITY_MEASUREMENTS, rows)
+
+        table, records, columns = db.copied[0]
+        assert table == "_bulk_air_quality_measurements"
+        assert columns == list(AIR_QUALITY_MEASUREMENTS.columns)
+        assert records[0][columns.index("location")] == encode_point(28.6139, 77.2090)
+        assert db.statements[0].startswith("CREATE TEMP TABLE")
+        assert db.statements[1].startswith("INSERT INTO air_quality_measurements")
+        assert db.commits == 1
+        assert result.written == 2
@@ -12,8 +12,11 @@ import json
 
 from src.api.cache import (
     CacheManager, cache_manager, init_redis, close_redis,
-    make_forecast_key, make_aqi_key, make_attribution_key, CACHE_TTL
+    make_forecast_key, make_aqi_key, make_attribution_key, make_spatial_key,
+    make_query_key, CACHE_TTL, CACHE_INVALIDATION_CHANNEL, LocalCache
 )
+from src.api.cache_keys import canonical_location, canonical_location_info, canonical_point, time_bucket
+from src.utils.location_parser import parse_location
 
 
 @pytest.mark.asyncio
@@ -34,6 +37,9 @@ class TestCacheManager:
         mock_client.expire = AsyncMock(return_value=True)
         mock_client.mget = AsyncMock(return_value=[])
         mock_client.mset = AsyncMock(return_value=True)
+        mock_client.pipe = MagicMock()
+        mock_client.pipe.execute = AsyncMock(return_value=[])
+        mock_client.pipeline = MagicMock(return_value=mock_client.pipe)
         mock_client.info = AsyncMock(return_value={
             "redis_version": "7.0.0",
             "used_memory_human": "1.5M",
@@ -190,7 +196,8 @@ class TestCacheManager:
             "key1": '{"data": 1}',
             "key2": '{"data": 2}'
         }
-        mock_redis_client.mset.assert_called_once_with(expected_mapping)
+        mock_redis_client.pipe.mset.assert_called_once_with(expected_mapping)
+        mock_redis_client.pipe.execute.assert_awaited_once()
     
     async def test_cache_set_many_with_ttl(self, cache_mgr, mock_redis_client):
         """Test cache set_many with TTL."""
@@ -200,7 +207,8 @@ class TestCacheManager:
         result = await cache_mgr.set_many(mapping, ttl=ttl)
         
         assert result is True
-        mock_redis_client.expire.assert_called_once_with("key1", ttl)
+        mock_redis_client.pipe.setex.assert_called_once_with("key1", ttl, '{"data": 1}')
+        mock_redis_client.pipe.execute.assert_awaited_once()
     
     async def test_cache_health_check_success(self, cache_mgr, mock_redis_client):
         """Test cache health check success."""
@@ -255,6 +263,103 @@ class TestCacheManager:
         assert await mgr.health_check() is False
 
 
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Test coalescing of concurrent cache misses."""
+    
+    async def test_concurrent_misses_share_one_computation(self):
+        """Concurrent misses in one process run the computation once."""
+        mgr = CacheManager()
+        mgr.client = None
+        calls = 0
+        
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"aqi": 150}
+        
+        results = await asyncio.gather(*[
+            mgr.get_or_compute("forecast:current:delhi", compute, ttl=60)
+            for _ in range(10)
+        ])
+        
+        assert calls == 1
+        assert all(r == {"aqi": 150} for r in results)
+        assert mgr.coalesced_requests["local"] == 9
+        assert mgr._inflight == {}
+    
+    async def test_computation_error_propagates_to_waiters(self):
+        """A failed computation raises for every coalesced caller and is not cached."""
+        mgr = CacheManager()
+        mgr.client = None
+        
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("model failure")
+        
+        results = await asyncio.gather(*[
+            mgr.get_or_compute("forecast:24h:delhi", compute)
+            for _ in range(3)
+        ], return_exceptions=True)
+        
+        assert all(isinstance(r, ValueError) for r in results)
+        assert mgr._inflight == {}
+    
+    async def test_lock_holder_computes_and_releases(self):
+        """The worker that takes the Redis lock caches the value and releases the lock."""
+        mgr = CacheManager()
+        mgr.client = AsyncMock()
+        mgr.client.get = AsyncMock(return_value=None)
+        mgr.client.set = AsyncMock(return_value=True)
+        mgr.client.setex = AsyncMock(return_value=True)
+        mgr.client.eval = AsyncMock(return_value=1)
+        
+        result = await mgr.get_or_compute(
+            "forecast:current:delhi", AsyncMock(return_value={"aqi": 90}), ttl=60
+        )
+        
+        assert result == {"aqi": 90}
+        lock_call = mgr.client.set.call_args
+        assert lock_call.args[0] == "lock:forecast:current:delhi"
+        assert lock_call.kwargs["nx"] is True
+        mgr.client.setex.assert_called_once_with(
+            "forecast:current:delhi", 60, json.dumps({"aqi": 90})
+        )
+        mgr.client.eval.assert_called_once()
+    
+    async def test_waits_for_other_worker_result(self):
+        """When another worker holds the lock the result is read from the cache."""
+        mgr = CacheManager()
+        mgr.client = AsyncMock()
+        mgr.client.get = AsyncMock(side_effect=[None, None, json.dumps({"aqi": 120})])
+        mgr.client.set = AsyncMock(return_value=False)
+        mgr.client.exists = AsyncMock(return_value=1)
+        compute = AsyncMock(return_value={"aqi": 0})
+        
+        result = await mgr.get_or_compute("forecast:current:delhi", compute)
+        
+        assert result == {"aqi": 120}
+        compute.assert_not_called()
+        assert mgr.coalesced_requests["distributed"] == 1
+    
+    async def test_computes_when_lock_holder_disappears(self):
+        """A waiter computes itself if the lock vanishes without a cached result."""
+        mgr = CacheManager()
+        mgr.client = AsyncMock()
+        mgr.client.get = AsyncMock(return_value=None)
+        mgr.client.set = AsyncMock(return_value=False)
+        mgr.client.setex = AsyncMock(return_value=True)
+        mgr.client.exists = AsyncMock(return_value=0)
+        compute = AsyncMock(return_value={"aqi": 75})
+        
+        result = await mgr.get_or_compute("forecast:24h:delhi", compute, ttl=60)
+        
+        assert result == {"aqi": 75}
+        compute.assert_called_once()
+        mgr.client.eval.assert_not_called()
+
+
 class TestCacheKeyGenerators:
     """Test cache key generation functions."""
     
@@ -279,6 +384,316 @@ class TestCacheKeyGenerators:
         assert key == "attribution:chennai"
 
 
+@pytest.mark.asyncio
+class TestStaleWhileRevalidate:
+    """Test serving stale values while refreshing in the background."""
+    
+    @pytest.fixture
+    def swr_client(self):
+        """In-memory stand-in for the Redis calls used by get_or_compute."""
+        store = {}
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=lambda key: store.get(key))
+        
+        async def setex(key, ttl, value):
+            store[key] = value
+            return True
+        
+        async def set_(key, value, nx=False, ex=None):
+            if nx and key in store:
+                return False
+            store[key] = value
+            return True
+        
+        client.setex = AsyncMock(side_effect=setex)
+        client.set = AsyncMock(side_effect=set_)
+        client.eval = AsyncMock(side_effect=lambda script, n, key, token: store.pop(key, None) and 1)
+        client.store = store
+        return client
+    
+    async def test_stores_soft_expiry_with_stale_window(self, swr_client):
+        """The entry lives for ttl + stale_ttl with a soft expiry at ttl."""
+        mgr = CacheManager()
+        mgr.client = swr_client
+        
+        result = await mgr.get_or_compute("k", AsyncMock(return_value={"aqi": 1}), 60, 300)
+        
+        assert result == {"aqi": 1}
+        key, ttl, _ = swr_client.setex.call_args.args
+        assert (key, ttl) == ("k", 360)
+        entry = json.loads(swr_client.store["k"])
+        assert entry["value"] == {"aqi": 1}
+        assert entry["fresh_until"] == pytest.approx(time.time() + 60, abs=5)
+    
+    async def test_fresh_value_is_not_recomputed(self, swr_client):
+        """Within the soft TTL the cached value is returned without refreshing."""
+        mgr = CacheManager()
+        mgr.client = swr_client
+        await mgr.get_or_compute("k", AsyncMock(return_value={"aqi": 1}), 60, 300)
+        compute = AsyncMock(return_value={"aqi": 2})
+        
+        assert await mgr.get_or_compute("k", compute, 60, 300) == {"aqi": 1}
+        compute.assert_not_called()
+        assert mgr._refreshing == {}
+    
+    async def test_stale_value_served_and_refreshed_once(self, swr_client):
+        """Stale reads return immediately and share one background refresh."""
+        mgr = CacheManager()
+        mgr.client = swr_client
+        swr_client.store["k"] = json.dumps(
+            {"__swr__": 1, "fresh_until": time.time() - 1, "value": {"aqi": 1}}
+        )
+        calls = 0
+        
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"aqi": 2}
+        
+        results = await asyncio.gather(*[
+            mgr.get_or_compute("k", compute, 60, 300) for _ in range(5)
+        ])
+        assert all(r == {"aqi": 1} for r in results)
+        assert mgr.stale_served == 5
+        
+        await asyncio.gather(*mgr._refreshing.values())
+        assert calls == 1
+        assert mgr.background_refreshes == 1
+        assert await mgr.get_or_compute("k", compute, 60, 300) == {"aqi": 2}
+        assert "lock:k" not in swr_client.store
+    
+    async def test_refresh_skipped_when_other_worker_holds_lock(self, swr_client):
+        """Only the worker holding the lock refreshes a stale key."""
+        mgr = CacheManager()
+        mgr.client = swr_client
+        swr_client.store["k"] = json.dumps(
+            {"__swr__": 1, "fresh_until": time.time() - 1, "value": {"aqi": 1}}
+        )
+        swr_client.store["lock:k"] = "other-worker"
+        compute = AsyncMock(return_value={"aqi": 2})
+        
+        assert await mgr.get_or_compute("k", compute, 60, 300) == {"aqi": 1}
+        await asyncio.gather(*mgr._refreshing.values())
+        compute.assert_not_called()
+
+
+class TestLocalCache:
+    """Test the in-process L1 tier."""
+    
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted beyond max_entries."""
+        l1 = LocalCache(max_entries=2, ttl=60)
+        l1.set("a", 1)
+        l1.set("b", 2)
+        l1.get("a")
+        l1.set("c", 3)
+        
+        assert l1.get("a") == (True, 1)
+        assert l1.get("b") == (False, None)
+        assert len(l1) == 2
+    
+    def test_entries_expire(self):
+        """Entries expire at the smaller of their own TTL and the L1 TTL."""
+        l1 = LocalCache(max_entries=10, ttl=60)
+        l1.set("a", 1, ttl=0)
+        assert l1.get("a") == (False, None)
+
+
+@pytest.mark.asyncio
+class TestTwoTierCache:
+    """Test the L1 tier in front of Redis and its invalidation."""
+    
+    @pytest.fixture
+    def mgr(self):
+        mgr = CacheManager(l1_max_entries=16, l1_ttl=60)
+        mgr.client = AsyncMock()
+        mgr.client.get = AsyncMock(return_value=json.dumps({"aqi": 150}))
+        return mgr
+    
+    async def test_second_read_served_from_l1(self, mgr):
+        """Only the first read goes to Redis."""
+        assert await mgr.get("aqi:current:delhi") == {"aqi": 150}
+        assert await mgr.get("aqi:current:delhi") == {"aqi": 150}
+        
+        mgr.client.get.assert_called_once()
+        assert mgr.tier_stats == {"l1_hits": 1, "l1_misses": 1, "l2_hits": 1, "l2_misses": 0}
+    
+    async def test_writes_update_l1_and_publish(self, mgr):
+        """A write refreshes the local copy and tells other workers to drop theirs."""
+        await mgr.get("aqi:current:delhi")
+        await mgr.set("aqi:current:delhi", {"aqi": 90}, ttl=60)
+        
+        assert await mgr.get("aqi:current:delhi") == {"aqi": 90}
+        channel, message = mgr.client.publish.call_args.args
+        assert channel == CACHE_INVALIDATION_CHANNEL
+        assert message.endswith(":aqi:current:delhi")
+        
+        await mgr.delete("aqi:current:delhi")
+        assert mgr.l1.get("aqi:current:delhi") == (False, None)
+    
+    async def test_invalidation_from_other_worker(self, mgr):
+        """Messages from other workers drop the key; our own are ignored."""
+        await mgr.get("aqi:current:delhi")
+        await mgr.get("aqi:current:mumbai")
+        
+        mgr._apply_invalidation(f"{mgr._instance_id}:aqi:current:delhi")
+        assert mgr.l1.get("aqi:current:delhi")[0]
+        
+        mgr._apply_invalidation("other-worker:aqi:current:delhi")
+        assert not mgr.l1.get("aqi:current:delhi")[0]
+        assert mgr.l1.get("aqi:current:mumbai")[0]
+        
+        mgr._apply_invalidation("other-worker:*")
+        assert len(mgr.l1) == 0
+    
+    async def test_get_many_mixes_tiers(self, mgr):
+        """get_many only asks Redis for keys missing from L1."""
+        await mgr.get("a")
+        mgr.client.mget = AsyncMock(return_value=[json.dumps(2)])
+        
+        assert await mgr.get_many(["a", "b"]) == {"a": {"aqi": 150}, "b": 2}
+        mgr.client.mget.assert_called_once_with(["b"])
+    
+    async def test_l1_disabled(self):
+        """A zero-sized L1 sends every read to Redis."""
+        mgr = CacheManager(l1_max_entries=0)
+        mgr.client = AsyncMock()
+        mgr.client.get = AsyncMock(return_value=json.dumps(1))
+        await mgr.get("a")
+        await mgr.get("a")
+        
+        assert mgr.l1 is None
+        assert mgr.client.get.call_count == 2
+        mgr.client.publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestBatchGetOrCompute:
+    """Test multi-key get_or_compute used by the batch forecast endpoint."""
+
+    @pytest.fixture
+    def mgr(self):
+        mgr = CacheManager(l1_max_entries=0)
+        mgr.client = AsyncMock()
+        mgr.client.pipe = MagicMock()
+        mgr.client.pipe.execute = AsyncMock(return_value=[])
+        mgr.client.pipeline = MagicMock(return_value=mgr.client.pipe)
+        return mgr
+
+    async def test_only_missing_keys_are_computed(self, mgr):
+        """Cached keys come from one mget; the rest are computed in one call."""
+        fresh = {"__swr__": 1, "fresh_until": time.time() + 60, "value": {"aqi": 1}}
+        mgr.client.mget = AsyncMock(return_value=[json.dumps(fresh), None])
+        compute = AsyncMock(return_value={"b": {"aqi": 2}})
+
+        result = await mgr.get_or_compute_many(["a", "b", "a"], compute, ttl=60, stale_ttl=300)
+
+        assert result == {"a": {"aqi": 1}, "b": {"aqi": 2}}
+        compute.assert_awaited_once_with(["b"])
+        mgr.client.mget.assert_called_once_with(["a", "b"])
+        key, ttl, value = mgr.client.pipe.setex.call_args.args
+        assert (key, ttl) == ("b", 360)
+        assert json.loads(value)["value"] == {"aqi": 2}
+        mgr.client.pipe.execute.assert_awaited_once()
+
+    async def test_stale_entries_are_recomputed(self, mgr):
+        """Entries past their soft expiry are recomputed with the missing ones."""
+        stale = {"__swr__": 1, "fresh_until": time.time() - 1, "value": {"aqi": 1}}
+        mgr.client.mget = AsyncMock(return_value=[json.dumps(stale)])
+        compute = AsyncMock(return_value={"a": {"aqi": 5}})
+
+        assert await mgr.get_or_compute_many(["a"], compute, ttl=60, stale_ttl=300) == {"a": {"aqi": 5}}
+        compute.assert_awaited_once_with(["a"])
+
+    async def test_all_cached_skips_compute_and_write(self, mgr):
+        """A fully cached batch costs one read and no writes."""
+        mgr.client.mget = AsyncMock(return_value=[json.dumps({"aqi": 1})])
+        compute = AsyncMock()
+
+        assert await mgr.get_or_compute_many(["a"], compute, ttl=60) == {"a": {"aqi": 1}}
+        compute.assert_not_called()
+        mgr.client.pipeline.assert_not_called()
+
+    async def test_primed_entries_are_served_without_compute(self, mgr):
+        """Values primed by a materialization job read back as fresh entries."""
+        assert await mgr.prime_many({"a": {"aqi": 7}}, ttl=60, stale_ttl=300) is True
+
+        key, ttl, value = mgr.client.pipe.setex.call_args.args
+        assert (key, ttl) == ("a", 360)
+        mgr.client.mget = AsyncMock(return_value=[value])
+        compute = AsyncMock()
+
+        assert await mgr.get_or_compute_many(["a"], compute, ttl=60, stale_ttl=300) == {"a": {"aqi": 7}}
+        compute.assert_not_called()
+
+    async def test_writer_without_l1_publishes_invalidations(self, mgr):
+        """A writer with no L1 of its own, like the materialization job, still invalidates readers."""
+        await mgr.prime_many({"a": {"aqi": 7}, "b": {"aqi": 8}}, ttl=60, stale_ttl=300)
+
+        messages = [call.args for call in mgr.client.pipe.publish.call_args_list]
+        assert [channel for channel, _ in messages] == [CACHE_INVALIDATION_CHANNEL] * 2
+        assert [message.rsplit(":", 1)[1] for _, message in messages] == ["a", "b"]
+
+        await mgr.set("c", {"aqi": 9}, ttl=60)
+        await mgr.delete("c")
+        assert [call.args[1].rsplit(":", 1)[1] for call in mgr.client.publish.call_args_list] == ["c", "c"]
+
+
+class TestCanonicalCacheKeys:
+    """Test that equivalent requests map onto the same cache key."""
+    
+    def test_location_spellings_share_key(self):
+        """Case, whitespace and aliases of a city resolve to one key."""
+        assert make_forecast_key("Delhi") == make_forecast_key("delhi ")
+        assert make_forecast_key("Bengaluru") == make_forecast_key("bangalore")
+    
+    def test_coordinates_near_city_snap_to_city(self):
+        """Coordinates close to a city centre share the city's entry."""
+        assert canonical_location("28.61,77.21") == "delhi"
+        assert make_forecast_key("28.61, 77.21", "24h") == make_forecast_key("Delhi", "24h")
+    
+    def test_remote_coordinates_snap_to_grid_cell(self):
+        """Coordinates away from known cities share a grid cell key."""
+        assert canonical_location("24.1234,80.5678") == canonical_location("24.1291, 80.5612")
+        assert canonical_location("24.1234,80.5678").startswith("cell:")
+        assert canonical_location("24.1234,80.5678") != canonical_location("24.2234,80.5678")
+    
+    def test_bucket_shares_one_canonical_location(self):
+        """Every location sharing a key resolves to the same point and name."""
+        city = [canonical_location_info(parse_location(loc)) for loc in ("28.61,77.21", "Delhi", "new delhi")]
+        assert {(info.latitude, info.longitude, info.name) for info in city} == {(28.6139, 77.2090, "Delhi")}
+        
+        cell = [canonical_location_info(parse_location(loc)) for loc in ("24.1234,80.5678", "24.1291, 80.5612")]
+        assert cell[0] == cell[1]
+        assert (cell[0].latitude, cell[0].longitude) == (24.125, 80.565)
+        assert canonical_location(f"{cell[0].latitude},{cell[0].longitude}") == canonical_location("24.1234,80.5678")
+    
+    def test_unparseable_location_is_normalised(self):
+        """Unknown locations still get a stable key."""
+        assert canonical_location("  Atlantis  ") == canonical_location("atlantis")
+    
+    def test_attribution_key_buckets_timestamp(self):
+        """Timestamps within one update hour share the attribution key."""
+        early = datetime(2024, 1, 15, 10, 0, 1, 123456)
+        late = datetime(2024, 1, 15, 10, 59, 59, 999999)
+        assert make_attribution_key("delhi", early) == make_attribution_key("Delhi", late)
+        assert make_attribution_key("delhi", early) != make_attribution_key(
+            "delhi", early + timedelta(hours=1)
+        )
+        assert time_bucket(early) == "20240115T1000"
+    
+    def test_spatial_and_query_keys(self):
+        """Spatial and data query keys ignore formatting differences."""
+        bounds = {"north": 28.9, "south": 28.4, "east": 77.5, "west": 76.8}
+        assert make_spatial_key(bounds, 1) == make_spatial_key(
+            {k: str(v) for k, v in bounds.items()}, 1.0
+        )
+        assert make_query_key("stations", "Delhi ", None) == make_query_key("stations", "delhi", None)
+        assert canonical_point(None, 77.2) == "*"
+        assert canonical_point(28.6112, 77.2034) == canonical_point(28.6188, 77.2071)
+
+
 class TestCacheTTLConstants:
     """Test cache TTL constants are properly defined."""
     
@@ -299,14 +714,30 @@ class TestCacheInitialization:
     @patch('src.api.cache.redis')
     async def test_init_redis_success(self, mock_redis):
         """Test successful Redis initialization."""
+        async def no_messages():
+            return
+            yield
+        
+        mock_pubsub = MagicMock()
+        mock_pubsub.subscribe = AsyncMock()
+        mock_pubsub.unsubscribe = AsyncMock()
+        mock_pubsub.close = AsyncMock()
+        mock_pubsub.listen = no_messages
         mock_client = AsyncMock()
         mock_client.ping = AsyncMock(return_value=True)
+        mock_client.pubsub = MagicMock(return_value=mock_pubsub)
         mock_redis.from_url.return_value = mock_client
         
-        await init_redis()
-        
-        mock_redis.from_url.assert_called_once()
-        mock_client.ping.assert_called_once()
+        try:
+            await init_redis()
+            
+            mock_redis.from_url.assert_called_once()
+            mock_client.ping.assert_called_once()
+            assert cache_manager.client is mock_client
+            mock_pubsub.subscribe.assert_called_once_with(CACHE_INVALIDATION_CHANNEL)
+        finally:
+            await close_redis()
+        assert cache_manager.client is None
     
     @patch('src.api.cache.redis')
     async def test_init_redis_failure(self, mock_redis):
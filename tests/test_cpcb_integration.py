@@ -8,8 +8,9 @@ import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock
 
-from src.data.ingestion_clients import CPCBClient, DataPoint
+from src.data.ingestion_clients import CPCBClient, DataPoint, HostRateLimiter
 from src.tasks.data_ingestion import ingest_cpcb_data, get_cpcb_stations, check_cpcb_station_status
+from src.api.bulk_writer import BulkWriteResult
 
 
 class TestCPCBClient:
@@ -152,14 +153,129 @@ class TestCPCBClient:
                 assert point.metadata["data_source"] == "simulated_realistic"
 
 
+def _real_point(station_id: str) -> DataPoint:
+    return DataPoint(
+        timestamp=datetime.utcnow(), location=(28.6, 77.2), parameter="pm25",
+        value=100.0, unit="µg/m³", source="cpcb", station_id=station_id,
+        quality_flag="real_time"
+    )
+
+
+class TestCPCBConcurrentFetching:
+    """Stations are fetched concurrently under a semaphore, timeouts and a deadline."""
+    
+    STATIONS = ["DL001", "DL002", "DL003", "DL004", "DL005", "DL006"]
+    
+    @pytest.mark.asyncio
+    async def test_stations_fetched_concurrently(self):
+        """A batch takes about as long as its slowest station."""
+        async def slow_portal(station_id, station_info):
+            await asyncio.sleep(0.2)
+            return [_real_point(station_id)]
+        
+        async with CPCBClient() as client:
+            client.max_concurrency = len(self.STATIONS)
+            with patch.object(client, "_fetch_from_cpcb_portal", side_effect=slow_portal):
+                started = asyncio.get_running_loop().time()
+                data_points = await client.fetch_data(stations=self.STATIONS)
+                elapsed = asyncio.get_running_loop().time() - started
+        
+        assert [p.station_id for p in data_points] == self.STATIONS
+        assert elapsed < 0.2 * 3
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency stations are in flight at once."""
+        in_flight = 0
+        peak = 0
+        
+        async def tracked_portal(station_id, station_info):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return [_real_point(station_id)]
+        
+        async with CPCBClient() as client:
+            client.max_concurrency = 2
+            with patch.object(client, "_fetch_from_cpcb_portal", side_effect=tracked_portal):
+                data_points = await client.fetch_data(stations=self.STATIONS)
+        
+        assert peak == 2
+        assert len(data_points) == len(self.STATIONS)
+    
+    @pytest.mark.asyncio
+    async def test_station_timeout_falls_back_to_simulation(self):
+        """A hung upstream only costs its station the timeout, then simulated data is used."""
+        async def portal(station_id, station_info):
+            if station_id == "DL001":
+                await asyncio.sleep(10)
+            return [_real_point(station_id)]
+        
+        async with CPCBClient() as client:
+            client.station_timeout = 0.05
+            with patch.object(client, "_fetch_from_cpcb_portal", side_effect=portal):
+                data_points = await client.fetch_data(stations=["DL001", "DL002"])
+        
+        flags = {(p.station_id, p.quality_flag) for p in data_points}
+        assert ("DL001", "estimated") in flags
+        assert ("DL002", "real_time") in flags
+    
+    @pytest.mark.asyncio
+    async def test_batch_deadline_caps_total_time(self):
+        """Stations still queued when the deadline passes fall back without waiting."""
+        async def portal(station_id, station_info):
+            await asyncio.sleep(0.1)
+            return [_real_point(station_id)]
+        
+        async with CPCBClient() as client:
+            client.max_concurrency = 1
+            client.batch_deadline = 0.15
+            with patch.object(client, "_fetch_from_cpcb_portal", side_effect=portal):
+                started = asyncio.get_running_loop().time()
+                data_points = await client.fetch_data(stations=self.STATIONS)
+                elapsed = asyncio.get_running_loop().time() - started
+        
+        assert elapsed < 0.4
+        assert {p.station_id for p in data_points} == set(self.STATIONS)
+        assert any(p.quality_flag == "estimated" for p in data_points)
+    
+    @pytest.mark.asyncio
+    async def test_waqi_key_validated_once_per_batch(self):
+        """Concurrent stations share a single API key check."""
+        async with CPCBClient(api_key="test-key") as client:
+            with patch.object(client, "_make_request", new_callable=AsyncMock) as mock_request:
+                mock_request.return_value = {"status": "ok", "data": {}}
+                await client.fetch_data(stations=self.STATIONS)
+        
+        validation_calls = [c for c in mock_request.call_args_list if "beijing" in c.args[0]]
+        assert len(validation_calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_host_rate_limiter_spaces_requests(self):
+        """Requests to one host are spaced by the configured rate; other hosts are independent."""
+        limiter = HostRateLimiter(rate=20)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        await asyncio.gather(*(limiter.acquire("api.waqi.info") for _ in range(4)))
+        same_host = loop.time() - started
+        await limiter.acquire("api.openaq.org")
+        
+        assert same_host >= 3 / 20 - 0.01
+        assert loop.time() - started < same_host + 0.05
+
+
 class TestCPCBTasks:
     """Test cases for CPCB Celery tasks."""
     
     def test_ingest_cpcb_data_task(self):
         """Test CPCB data ingestion task."""
         # Mock database operations
-        with patch('src.tasks.data_ingestion.get_db'), \
-             patch('src.tasks.data_ingestion._store_air_quality_measurement'):
+        with patch('src.tasks.data_ingestion.get_db_session'), \
+             patch('src.tasks.data_ingestion._store_air_quality_points') as store:
+            store.side_effect = lambda db, points: BulkWriteResult(rows=len(points), written=len(points))
             
             result = ingest_cpcb_data.apply(
                 args=[["DL001", "DL002"], None, None]
@@ -0,0 +1,127 @@
+"""
+Tests for the space-time forecast cube
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.spatial_interpolation import SpatialInterpolator, create_delhi_bounds
+from src.utils.variogram_cache import VariogramCache
+from src.utils.forecast_cube import ForecastCubeStore, build_forecast_cube
+
+
+ISSUED_AT = datetime(2024, 1, 15, 10, 20)
+
+
+def make_station_forecasts(n_stations: int = 10, hours: int = 24, seed: int = 5):
+    """Random stations inside the Delhi bounds with diurnal forecast series"""
+    rng = np.random.default_rng(seed)
+    bounds = create_delhi_bounds()
+    coords = rng.uniform(
+        [bounds['south'], bounds['west']],
+        [bounds['north'], bounds['east']],
+        size=(n_stations, 2)
+    )
+    diurnal = 1 + 0.3 * np.sin(2 * np.pi * (np.arange(1, hours + 1) - 8) / 24)
+    forecasts = rng.uniform(40, 250, size=(n_stations, 1)) * diurnal
+    station_ids = [f"DL{i:03d}" for i in range(n_stations)]
+    return station_ids, coords, forecasts
+
+
+def make_interpolator():
+    return SpatialInterpolator(variogram_cache=VariogramCache(use_redis=False))
+
+
+class TestForecastCube:
+    """Test cases for building forecast cubes"""
+    
+    def test_cube_matches_per_hour_kriging(self):
+        """One weights x forecasts product equals kriging each hour separately"""
+        station_ids, coords, forecasts = make_station_forecasts()
+        interpolator = make_interpolator()
+        
+        cube = build_forecast_cube(
+            'delhi', station_ids, coords, forecasts, create_delhi_bounds(), 5.0,
+            issued_at=ISSUED_AT, interpolator=interpolator
+        )
+        
+        latitudes, longitudes = interpolator.grid_axes(create_delhi_bounds(), 5.0)
+        lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing='ij')
+        grid = np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
+        assert cube.values.shape == (24, len(latitudes), len(longitudes))
+        for h in (0, 11, 23):
+            expected, _ = interpolator.ordinary_kriging(coords, forecasts[:, h], grid)
+            np.testing.assert_allclose(
+                cube.values[h].ravel(), np.maximum(expected, 0), rtol=1e-4
+            )
+    
+    def test_forecast_times_follow_issue_hour(self):
+        """Horizons start one hour after the issue hour"""
+        station_ids, coords, forecasts = make_station_forecasts(hours=6)
+        
+        cube = build_forecast_cube(
+            'delhi', station_ids, coords, forecasts, create_delhi_bounds(), 5.0,
+            issued_at=ISSUED_AT, interpolator=make_interpolator()
+        )
+        
+        assert cube.n_hours == 6
+        assert cube.forecast_times()[0] == datetime(2024, 1, 15, 11)
+        assert cube.forecast_times()[-1] == datetime(2024, 1, 15, 16)
+        assert np.all((cube.confidence >= 0.1) & (cube.confidence <= 1.0))
+    
+    def test_requires_two_stations(self):
+        """A single station cannot be interpolated"""
+        station_ids, coords, forecasts = make_station_forecasts(n_stations=1)
+        
+        with pytest.raises(ValueError):
+            build_forecast_cube('delhi', station_ids, coords, forecasts, create_delhi_bounds(), 5.0)
+
+
+class TestForecastCubeStore:
+    """Test cases for storing and serving cubes"""
+    
+    @pytest.fixture
+    def cube(self):
+        station_ids, coords, forecasts = make_station_forecasts()
+        return build_forecast_cube(
+            'delhi', station_ids, coords, forecasts, create_delhi_bounds(), 5.0,
+            issued_at=ISSUED_AT, interpolator=make_interpolator()
+        )
+    
+    def test_round_trip_from_disk(self, tmp_path, cube):
+        """A fresh store in another process reads the same cube"""
+        ForecastCubeStore(root=str(tmp_path)).put(cube)
+        
+        loaded = ForecastCubeStore(root=str(tmp_path)).get('Delhi', 'pm25', 5.0, '2024011510')
+        
+        np.testing.assert_array_equal(loaded.values, cube.values)
+        np.testing.assert_array_equal(loaded.confidence, cube.confidence)
+        assert loaded.issued_at == datetime(2024, 1, 15, 10)
+        assert loaded.header() == cube.header()
+    
+    def test_latest_serves_previous_hour(self, tmp_path, cube):
+        """The last cube is served until the next one lands, then expires"""
+        store = ForecastCubeStore(root=str(tmp_path))
+        store.put(cube)
+        
+        assert store.latest('delhi', 'pm25', 5.0, now=ISSUED_AT + timedelta(hours=1)) is not None
+        assert store.latest('delhi', 'pm25', 1.0, now=ISSUED_AT) is None
+        assert store.latest('delhi', 'pm25', 5.0, now=ISSUED_AT + timedelta(hours=5)) is None
+    
+    def test_prune_old_cubes(self, tmp_path, cube):
+        """Cubes older than the retention window are deleted"""
+        store = ForecastCubeStore(root=str(tmp_path))
+        store.put(cube)
+        
+        assert store.prune('pm25', keep_hours=3, now=ISSUED_AT + timedelta(hours=6)) == 1
+        assert store.get('delhi', 'pm25', 5.0, '2024011510') is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
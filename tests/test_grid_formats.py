@@ -0,0 +1,130 @@
+"""
+Tests for columnar spatial grid encodings
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.grid_formats import (
+    encode_grid, negotiate_grid_format, ARROW_AVAILABLE, MSGPACK_AVAILABLE
+)
+from src.utils.spatial_interpolation import SpatialInterpolator, create_delhi_bounds
+from src.utils.variogram_cache import VariogramCache
+
+
+def make_grid():
+    """Kriged columnar grid over Delhi"""
+    rng = np.random.default_rng(11)
+    bounds = create_delhi_bounds()
+    station_data = {
+        f"DL{i:03d}": {
+            'lat': rng.uniform(bounds['south'], bounds['north']),
+            'lon': rng.uniform(bounds['west'], bounds['east']),
+            'pm25': rng.uniform(40, 250)
+        }
+        for i in range(8)
+    }
+    interpolator = SpatialInterpolator(variogram_cache=VariogramCache(use_redis=False))
+    return interpolator.interpolate_grid(station_data, bounds, 2.0)
+
+
+def grid_columns(grid):
+    cells = {
+        'value': grid.values,
+        'confidence': grid.confidence,
+        'aqi': grid.aqi,
+        'category_code': grid.category_codes
+    }
+    axes = {'latitudes': grid.latitudes, 'longitudes': grid.longitudes}
+    return cells, axes
+
+
+class TestColumnarSpatialGrid:
+    """Test cases for the array-backed SpatialGrid"""
+    
+    def test_arrays_match_generated_grid(self):
+        """Cells follow generate_grid order with compact dtypes"""
+        grid = make_grid()
+        latitudes, longitudes = grid.coordinates()
+        expected = SpatialInterpolator().generate_grid(create_delhi_bounds(), 2.0)
+        
+        np.testing.assert_allclose(np.column_stack([latitudes, longitudes]), expected)
+        assert grid.values.dtype == np.float32
+        assert grid.confidence.dtype == np.float32
+        assert grid.aqi.dtype == np.float32
+        assert grid.category_codes.dtype == np.uint8
+        assert len(grid.values) == grid.n_lat * grid.n_lon
+    
+    def test_grid_points_view(self):
+        """The per-cell view is still available for existing callers"""
+        grid = make_grid()
+        points = grid.grid_points
+        
+        assert len(points) == grid.n_points
+        assert points[5].category == grid.categories()[5]
+        assert points[5].latitude == pytest.approx(grid.latitudes[5 // grid.n_lon])
+
+
+class TestGridEncodings:
+    """Test cases for npz / Arrow / MessagePack grid encodings"""
+    
+    def test_negotiation(self):
+        """Explicit format wins, then Accept, then JSON"""
+        assert negotiate_grid_format('npz', 'application/x-msgpack') == 'npz'
+        assert negotiate_grid_format(None, 'text/html, application/x-msgpack;q=0.9') == 'msgpack'
+        assert negotiate_grid_format(None, 'application/json') == 'json'
+        assert negotiate_grid_format(None, None) == 'json'
+    
+    def test_npz_round_trip(self):
+        grid = make_grid()
+        cells, axes = grid_columns(grid)
+        
+        data = np.load(io.BytesIO(encode_grid(cells, axes, {'parameter': 'pm25'}, 'npz')))
+        
+        np.testing.assert_array_equal(data['value'], grid.values)
+        np.testing.assert_array_equal(data['category_code'], grid.category_codes)
+        np.testing.assert_array_equal(data['longitudes'], grid.longitudes)
+        header = json.loads(str(data['header']))
+        assert header['parameter'] == 'pm25'
+        assert header['category_legend']['codes'][0] == 'good'
+    
+    @pytest.mark.skipif(not ARROW_AVAILABLE, reason="pyarrow not installed")
+    def test_arrow_round_trip(self):
+        import pyarrow as pa
+        grid = make_grid()
+        cells, axes = grid_columns(grid)
+        
+        table = pa.ipc.open_stream(encode_grid(cells, axes, {'parameter': 'pm25'}, 'arrow')).read_all()
+        
+        np.testing.assert_array_equal(table.column('aqi').to_numpy(), grid.aqi)
+        assert table.schema.field('category_code').type == pa.uint8()
+        assert json.loads(table.schema.metadata[b'axes'])['latitudes'] == pytest.approx(grid.latitudes.tolist())
+    
+    @pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+    def test_msgpack_round_trip(self):
+        import msgpack
+        grid = make_grid()
+        cells, axes = grid_columns(grid)
+        
+        payload = msgpack.unpackb(encode_grid(cells, axes, {'parameter': 'pm25'}, 'msgpack'))
+        column = payload['cells']['confidence']
+        
+        np.testing.assert_array_equal(
+            np.frombuffer(column['data'], dtype=column['dtype']), grid.confidence
+        )
+        assert payload['header']['parameter'] == 'pm25'
+    
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            encode_grid({}, {}, {}, 'xml')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,126 @@
+"""
+Tests for the shared pooled HTTP transport used by data ingestion clients.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+import aiohttp
+from aiohttp import web
+
+from src.data.http_transport import HTTPTransport, TransportConfig, run_in_worker_loop
+from src.data import http_transport
+from src.data.ingestion_clients import CPCBClient, OpenAQClient
+
+
+@asynccontextmanager
+async def upstream():
+    """Local JSON server; ``/flaky`` answers 503 until its failure budget is spent."""
+    state = {"failures_left": 0, "requests": 0}
+
+    async def ok(request):
+        state["requests"] += 1
+        return web.json_response({"status": "ok"})
+
+    async def flaky(request):
+        state["requests"] += 1
+        if state["failures_left"] > 0:
+            state["failures_left"] -= 1
+            return web.json_response({"status": "error"}, status=503)
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/flaky", flaky)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", state
+
+    await runner.cleanup()
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Fresh process-wide transport and worker loop with fast retries."""
+    transport = HTTPTransport(TransportConfig(max_retries=2, backoff_base=0.01, backoff_max=0.02))
+    monkeypatch.setattr(http_transport, "_transport", transport)
+    monkeypatch.setattr(http_transport, "_worker_loop", None)
+    return transport
+
+
+class TestHTTPTransport:
+    """Test cases for HTTPTransport."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_one_session(self, transport):
+        """Clients open at the same time borrow the same pooled session."""
+        async with CPCBClient() as cpcb, OpenAQClient() as openaq:
+            assert cpcb.session is openaq.session
+            assert transport.get_stats()["open_sessions"] == 1
+
+        assert transport.stats["sessions_created"] == 1
+        assert transport.get_stats()["open_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_borrowed_session_survives_client_exit(self, transport):
+        """An outer borrow keeps the session open between consecutive clients."""
+        async with transport.borrowed() as session:
+            async with CPCBClient() as first:
+                assert first.session is session
+            async with OpenAQClient() as second:
+                assert second.session is session
+            assert not session.closed
+
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, transport):
+        """Sequential requests to one host go over a kept-alive connection."""
+        async with upstream() as (base_url, _), CPCBClient() as client:
+            for _ in range(3):
+                assert await client._make_request(f"{base_url}/ok") == {"status": "ok"}
+
+        stats = transport.get_stats()
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["connection_reuse_ratio"] == pytest.approx(2 / 3)
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, transport):
+        """503s are retried with backoff until the upstream recovers."""
+        async with upstream() as (base_url, state), CPCBClient() as client:
+            state["failures_left"] = 2
+            result = await client._make_request(f"{base_url}/flaky")
+
+        assert result == {"status": "ok"}
+        assert state["requests"] == 3
+        assert transport.stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self, transport):
+        """The last failure is raised once max_retries is spent."""
+        async with upstream() as (base_url, state), CPCBClient() as client:
+            state["failures_left"] = 10
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client._make_request(f"{base_url}/flaky")
+
+        assert state["requests"] == 3
+
+
+def test_worker_loop_keeps_session_between_runs(transport):
+    """Runs on the worker loop reuse one session instead of reopening it."""
+    async def borrow_session():
+        async with CPCBClient() as client:
+            return client.session
+
+    first = run_in_worker_loop(borrow_session())
+    second = run_in_worker_loop(borrow_session())
+
+    assert first is second
+    assert not first.closed
+    assert transport.stats["sessions_created"] == 1
+
+    run_in_worker_loop(transport.close())
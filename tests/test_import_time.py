@@ -0,0 +1,88 @@
+"""
+Cold-start import benchmark for API and worker entry points
+
+Each entry point is imported in a fresh interpreter; the test fails if it
+loads a heavy ML/SDK framework at import time or takes longer than
+IMPORT_TIME_BUDGET_SECONDS.
+"""
+
+import pytest
+import sys
+import os
+import re
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.import_audit import (
+    DEFAULT_IMPORT_BUDGET, parse_importtime, profile_import
+)
+from src.utils.lazy_imports import LazyModule, lazy_import, module_available
+
+
+ENTRY_POINTS = [
+    "src.api.main",
+    "src.api.routers.forecast",
+    "src.tasks.alerts",
+    "src.tasks.maintenance",
+    "src.tasks.monitoring",
+    "src.models",
+    "src.models.ensemble_forecaster",
+]
+
+_MISSING_DEPENDENCY = re.compile(r"ModuleNotFoundError: No module named '([^']+)'")
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_cold_start(module):
+    """Entry points stay within the import budget and defer heavy frameworks"""
+    profile = profile_import(module)
+
+    if profile.error:
+        missing = _MISSING_DEPENDENCY.search(profile.error)
+        if missing and not missing.group(1).startswith("src"):
+            pytest.skip(f"{module} needs {missing.group(1)}, which is not installed")
+        pytest.fail(f"importing {module} failed: {profile.error}")
+
+    assert profile.heavy_loaded == [], f"{module} imports {profile.heavy_loaded} at startup"
+    assert profile.total_seconds <= DEFAULT_IMPORT_BUDGET, (
+        f"{module} took {profile.total_seconds:.2f}s to import "
+        f"(budget {DEFAULT_IMPORT_BUDGET:.2f}s)"
+    )
+
+
+def test_parse_importtime():
+    """Self and cumulative times are read per module with nesting depth"""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+        "Traceback (most recent call last):\n"
+    )
+
+    timings = parse_importtime(stderr)
+
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("json.decoder", 120, 120, 1),
+        ("json", 300, 420, 0),
+    ]
+
+
+class TestLazyImport:
+    """Stand-in modules import on first attribute access"""
+
+    def test_already_imported_module_is_returned(self):
+        assert lazy_import("os") is os
+
+    def test_import_deferred_until_attribute_access(self):
+        module = lazy_import("wave")
+        if isinstance(module, LazyModule):
+            assert "wave" not in sys.modules
+        assert module.open is not None
+        assert "wave" in sys.modules
+
+    def test_missing_package_raises_import_error(self):
+        assert not module_available("this_module_does_not_exist_xyz")
+        with pytest.raises(ImportError):
+            lazy_import("this_module_does_not_exist_xyz")
+
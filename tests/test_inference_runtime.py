@@ -0,0 +1,118 @@
+"""
+Tests for the ONNX serving adapters
+"""
+
+import pytest
+import sys
+import os
+import json
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import inference_runtime
+from src.models.inference_runtime import OnnxGNN, OnnxLSTM, OnnxRegressor, load_runtime_models
+
+
+class _FakeSession:
+    """Stands in for an onnxruntime session; records inputs and applies a function"""
+
+    def __init__(self, input_names, fn):
+        self.inputs = [MagicMock() for _ in input_names]
+        for mock, name in zip(self.inputs, input_names):
+            mock.name = name
+        self.fn = fn
+        self.calls = []
+
+    def get_inputs(self):
+        return self.inputs
+
+    def run(self, output_names, feeds):
+        self.calls.append(feeds)
+        return [self.fn(**feeds)]
+
+
+@pytest.fixture
+def fake_ort(monkeypatch):
+    """Route InferenceSession construction to a queued fake session"""
+    sessions = []
+    ort = MagicMock()
+    ort.InferenceSession.side_effect = lambda *args, **kwargs: sessions.pop(0)
+    monkeypatch.setattr(inference_runtime, "ort", ort, raising=False)
+    monkeypatch.setattr(inference_runtime, "ONNXRUNTIME_AVAILABLE", True)
+    return sessions
+
+
+def test_regressor_aligns_and_scales_features(fake_ort):
+    """Columns are reordered to the training features and standardized"""
+    session = _FakeSession(["input"], lambda input: input.sum(axis=1, keepdims=True))
+    fake_ort.append(session)
+    model = OnnxRegressor("xgboost.onnx", {
+        "feature_names": ["a", "b"],
+        "scaler": {"mean": [1.0, 10.0], "scale": [1.0, 2.0]}
+    })
+
+    result = model.predict(pd.DataFrame({'b': [14.0, 10.0], 'a': [3.0, 1.0], 'extra': [9, 9]}))
+
+    np.testing.assert_allclose(session.calls[0]["input"], [[2.0, 2.0], [0.0, 0.0]])
+    np.testing.assert_allclose(result['predictions'], [4.0, 0.0])
+    assert (result['lower_bound'] < result['predictions']).all()
+    assert (result['upper_bound'] > result['predictions']).all()
+
+
+def test_lstm_unscales_and_uses_residual_bounds(fake_ort):
+    """Predictions are mapped back through the target scaler with fixed-width bounds"""
+    fake_ort.append(_FakeSession(["input"], lambda input: input[:, -1, :1]))
+    model = OnnxLSTM("lstm.onnx", {
+        "feature_names": ["a"],
+        "scaler": None,
+        "sequence_length": 3,
+        "target_scaler": {"min": [0.0], "scale": [0.01]},
+        "residual_std": 0.1
+    })
+
+    single = model.predict(pd.DataFrame({'a': [0.2, 0.5]}))
+    batch = model.predict_batch(pd.DataFrame({'a': [0.3, 0.7]}))
+
+    np.testing.assert_allclose(single['predictions'], [50.0])
+    assert single['uncertainty'] == pytest.approx(0.1)
+    np.testing.assert_allclose(batch['predictions'], [30.0, 70.0])
+    np.testing.assert_allclose(batch['upper_bound'] - batch['predictions'], [12.8, 12.8])
+
+
+def test_gnn_keeps_only_edges_between_present_stations(fake_ort):
+    """Edges touching a missing station are dropped and the rest renumbered"""
+    session = _FakeSession(
+        ["x", "edge_index", "edge_weight"],
+        lambda x, edge_index, edge_weight: x[:, :1] + len(edge_weight)
+    )
+    fake_ort.append(session)
+    model = OnnxGNN("gnn.onnx", {
+        "feature_names": ["f"],
+        "scaler": None,
+        "station_ids": ["s1", "s2", "s3"],
+        "edge_index": [[0, 1, 2, 0], [1, 0, 0, 2]],
+        "edge_weights": [0.5, 0.5, 0.2, 0.2]
+    })
+
+    result = model.predict_spatial({'s1': np.array([1.0]), 's3': np.array([3.0])})
+
+    np.testing.assert_array_equal(session.calls[0]["edge_index"], [[1, 0], [0, 1]])
+    np.testing.assert_allclose(session.calls[0]["edge_weight"], [0.2, 0.2])
+    assert result == {'s1': 3.0, 's3': 5.0}
+
+
+def test_load_runtime_models_skips_missing_exports(fake_ort, tmp_path):
+    """Only model types with both an ONNX file and a sidecar are loaded"""
+    fake_ort.append(_FakeSession(["input"], lambda input: input))
+    (tmp_path / "xgboost.onnx").write_bytes(b"")
+    (tmp_path / "xgboost.json").write_text(json.dumps({"feature_names": ["a"], "scaler": None}))
+    (tmp_path / "lstm.onnx").write_bytes(b"")
+
+    models = load_runtime_models(str(tmp_path))
+
+    assert list(models) == ['xgboost']
+    assert isinstance(models['xgboost'], OnnxRegressor)
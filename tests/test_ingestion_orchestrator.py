@@ -0,0 +1,160 @@
+"""
+Tests for concurrent multi-source ingestion in DataIngestionOrchestrator.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from src.data.ingestion_clients import DataIngestionOrchestrator, DataPoint, WeatherPoint
+
+
+def _point(source: str) -> DataPoint:
+    return DataPoint(
+        timestamp=datetime.utcnow(),
+        location=(28.6139, 77.2090),
+        parameter="pm25",
+        value=42.0,
+        unit="µg/m³",
+        source=source,
+        station_id=f"{source}_001"
+    )
+
+
+class FakeClient:
+    """Client stand-in that answers after ``delay`` seconds, or raises ``error``."""
+
+    def __init__(self, points, delay: float = 0.0, error: Exception = None):
+        self.points = points
+        self.delay = delay
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def _respond(self):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return list(self.points)
+
+    async def fetch_data(self, **kwargs):
+        return await self._respond()
+
+    async def fetch_weather_data(self, **kwargs):
+        return await self._respond()
+
+    async def fetch_forecast_data(self, **kwargs):
+        return []
+
+    async def fetch_traffic_data(self, **kwargs):
+        return await self._respond()
+
+
+def _orchestrator(deadlines=None, **overrides) -> DataIngestionOrchestrator:
+    orchestrator = DataIngestionOrchestrator(deadlines=deadlines)
+    weather = WeatherPoint(timestamp=datetime.utcnow(), location=(28.6139, 77.2090),
+                           temperature=30.0, source="imd")
+    orchestrator.clients = {
+        "cpcb": FakeClient([_point("cpcb")], delay=0.2),
+        "openaq": FakeClient([_point("openaq")], delay=0.2),
+        "imd": FakeClient([weather], delay=0.2),
+        "google_maps": FakeClient([], delay=0.2),
+        **overrides
+    }
+    return orchestrator
+
+
+class TestConcurrentIngestion:
+    """Test cases for per-source tasks, deadlines and streaming results."""
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self):
+        """Wall time follows the slowest source, not the sum of all sources."""
+        orchestrator = _orchestrator()
+
+        started = time.perf_counter()
+        results = await orchestrator.ingest_all_sources()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.6
+        assert [p.source for p in results["air_quality"]] == ["cpcb", "openaq"]
+        assert len(results["weather"]) == 1
+        assert set(results["source_stats"]) == {"cpcb", "openaq", "imd", "google_maps"}
+        for stats in results["source_stats"].values():
+            assert stats["status"] == "ok"
+            assert stats["latency_seconds"] >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_slow_source_hits_its_deadline(self):
+        """A hanging source is cut off at its own deadline without delaying the rest."""
+        orchestrator = _orchestrator(
+            deadlines={"openaq": 0.3},
+            openaq=FakeClient([_point("openaq")], delay=10)
+        )
+
+        started = time.perf_counter()
+        results = await orchestrator.ingest_all_sources()
+
+        assert time.perf_counter() - started < 1.0
+        assert [p.source for p in results["air_quality"]] == ["cpcb"]
+        assert results["source_stats"]["openaq"]["status"] == "timeout"
+        assert results["source_stats"]["openaq"]["points"] == 0
+        assert results["source_stats"]["cpcb"]["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_failing_source_is_isolated(self):
+        """One source raising does not drop the other sources' data."""
+        orchestrator = _orchestrator(cpcb=FakeClient([], error=RuntimeError("portal down")))
+
+        results = await orchestrator.ingest_all_sources()
+
+        assert [p.source for p in results["air_quality"]] == ["openaq"]
+        assert results["source_stats"]["cpcb"]["status"] == "failed"
+        assert results["source_stats"]["cpcb"]["error"] == "portal down"
+
+    @pytest.mark.asyncio
+    async def test_results_stream_as_sources_complete(self):
+        """on_source_complete sees each source as soon as it finishes, fastest first."""
+        orchestrator = _orchestrator(
+            cpcb=FakeClient([_point("cpcb")], delay=0.4),
+            openaq=FakeClient([_point("openaq")], delay=0.0)
+        )
+        completed = []
+
+        async def on_source_complete(result):
+            completed.append((result.source, result.kind, len(result.points)))
+
+        await orchestrator.ingest_all_sources(on_source_complete=on_source_complete)
+
+        assert completed[0] == ("openaq", "air_quality", 1)
+        assert completed[-1] == ("cpcb", "air_quality", 1)
+        assert len(completed) == 4
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_do_not_fail_the_run(self):
+        """A failing storage callback is logged and the run still returns every source."""
+        orchestrator = _orchestrator()
+
+        async def on_source_complete(result):
+            raise RuntimeError("database unavailable")
+
+        results = await orchestrator.ingest_all_sources(on_source_complete=on_source_complete)
+
+        assert len(results["air_quality"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_with_satellite_without_satellite_clients(self):
+        """Ground results and empty satellite buckets are returned when satellite is unavailable."""
+        orchestrator = _orchestrator()
+
+        results = await orchestrator.ingest_all_sources_with_satellite()
+
+        assert results["satellite"] == {"tropomi": [], "viirs": []}
+        assert len(results["air_quality"]) == 2
+        assert "tropomi" not in results["source_stats"]
@@ -0,0 +1,341 @@
+"""
+Tests for hourly prediction materialization and serving forecasts from it
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.cache import CacheManager
+from src.api.cache_keys import canonical_location_info
+from src.api.crud import PredictionCRUD, latest_runs_statement
+from src.api.routers import forecast
+from src.api.routers.forecast import (
+    build_materialized_predictions, materialized_forecast_payloads,
+    _load_materialized_forecasts, _materialized_current_forecast, _materialized_24h_forecast,
+    _compute_current_forecast, get_batch_forecast
+)
+from src.api.schemas import BatchForecastRequest
+from src.tasks import predictions
+from src.tasks.predictions import (
+    generate_hourly_predictions, _materialize_hourly_predictions, _prediction_targets
+)
+from src.utils.location_parser import parse_location
+
+
+RUN_TIME = datetime(2024, 1, 15, 6, tzinfo=timezone.utc)
+
+
+def _ensemble_step(pm25: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        pm25=pm25, pm25_lower=pm25 * 0.8, pm25_upper=pm25 * 1.2, aqi=int(pm25 * 2),
+        category='moderate', confidence=0.8, model_weights={'xgboost': 1.0}
+    )
+
+
+@pytest.fixture
+def ensemble():
+    """Ensemble whose hour-h forecast is 50 + h µg/m³ for every location"""
+    forecaster = MagicMock()
+    forecaster.forecast_sequence_batch.side_effect = lambda features, weather, hours: [
+        [_ensemble_step(50.0 + h) for h in range(1, hours + 1)] for _ in range(len(features))
+    ]
+    with patch.object(forecast, 'get_ensemble_forecaster', return_value=forecaster):
+        yield forecaster
+
+
+def _records(location_rows, run_time=RUN_TIME):
+    """Stored prediction rows as the serving path reads them back"""
+    return [
+        {key: value for key, value in dict(row, time=run_time).items() if key not in ('location', 'parameter')}
+        for row in location_rows
+    ]
+
+
+def _stored(location_rows):
+    """Prediction objects as returned by PredictionCRUD"""
+    return [SimpleNamespace(**row) for row in location_rows]
+
+
+def _session_factory(db):
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = db
+    return factory
+
+
+class TestBuildMaterializedPredictions:
+    """Test the rows written to the predictions hypertable"""
+
+    def test_rows_per_location_and_hour(self, ensemble):
+        """Every location gets 24 hourly rows at its canonical point"""
+        near_centre = parse_location("28.6150,77.2100")
+
+        rows = build_materialized_predictions([parse_location("Delhi"), near_centre], RUN_TIME)
+
+        ensemble.forecast_sequence_batch.assert_called_once()
+        assert [len(location_rows) for location_rows in rows] == [24, 24]
+        first = rows[0][0]
+        assert set(first) == {
+            'time', 'location', 'forecast_hour', 'parameter', 'predicted_value', 'confidence_lower',
+            'confidence_upper', 'model_version', 'aqi_value', 'aqi_category'
+        }
+        assert [row['forecast_hour'] for row in rows[0]] == list(range(1, 25))
+        assert first['time'] == RUN_TIME
+        assert first['parameter'] == 'pm25'
+        assert first['predicted_value'] == pytest.approx(51.0)
+        assert first['confidence_upper'] == pytest.approx(61.2)
+        assert first['model_version'] == 'ensemble_v1.0'
+        assert isinstance(first['aqi_value'], int)
+
+        centre = canonical_location_info(near_centre)
+        assert rows[1][0]['location'].data == f"POINT({centre.longitude} {centre.latitude})"
+
+    def test_fallback_when_ensemble_fails(self):
+        """A failing ensemble still materializes rule-based rows"""
+        with patch.object(forecast, 'get_ensemble_forecaster', side_effect=RuntimeError("no models")):
+            rows = build_materialized_predictions([parse_location("Mumbai")], RUN_TIME)
+
+        assert len(rows[0]) == 24
+        assert {row['model_version'] for row in rows[0]} == {'fallback_v1.0'}
+
+
+@pytest.mark.asyncio
+class TestPredictionTargets:
+    """Test which locations the hourly job materializes"""
+
+    async def test_requested_locations_are_deduplicated(self):
+        """Names sharing a forecast key are materialized once; unparseable ones are skipped"""
+        targets = await _prediction_targets(None, ["Delhi", "delhi", "28.6139,77.2090", "xyzzy???", "Mumbai"])
+
+        assert [name for name, _ in targets] == ["Delhi", "Mumbai"]
+
+    async def test_default_cities_and_stations(self):
+        """Without active cities the default list is used; stations add their own grid cells"""
+        stations = [
+            ("Anand Vihar", "Delhi", "Delhi", 28.6469, 77.3161),
+            ("Anand Vihar 2", "Delhi", "Delhi", 28.6471, 77.3162),
+            ("Centre", "Delhi", "Delhi", 28.6139, 77.2090)
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(all=lambda: []), MagicMock(all=lambda: stations)])
+
+        targets = await _prediction_targets(db)
+
+        names = [name for name, _ in targets]
+        assert names[:len(predictions.DEFAULT_PREDICTION_CITIES)] == predictions.DEFAULT_PREDICTION_CITIES
+        assert names[len(predictions.DEFAULT_PREDICTION_CITIES):] == ["28.6469,77.3161"]
+        assert targets[-1][1].source == "database"
+
+    async def test_database_cities_without_parser_entry(self):
+        """Cities unknown to the parser use their stored centre; without one they are skipped"""
+        cities = [("Shimla", "Himachal Pradesh", 31.1048, 77.1734), ("Nowhere", None, None, None)]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(all=lambda: cities), MagicMock(all=lambda: [])])
+
+        with patch('src.utils.location_parser.parse_location', side_effect=ValueError("unknown")):
+            targets = await _prediction_targets(db)
+
+        assert len(targets) == 1
+        name, info = targets[0]
+        assert name == "Shimla"
+        assert (info.latitude, info.longitude, info.source) == (31.1048, 77.1734, "database")
+
+
+class TestMaterializeHourlyPredictions:
+    """Test the hourly materialization job end to end"""
+
+    @pytest.mark.asyncio
+    async def test_writes_rows_and_primes_cache(self, ensemble):
+        """One ensemble pass is written to the hypertable and primed for both endpoints"""
+        db = MagicMock()
+        bulk_create = AsyncMock(side_effect=lambda session, rows: len(rows))
+        prime = AsyncMock(return_value=4)
+
+        with patch('src.api.database.AsyncSessionLocal', _session_factory(db)), \
+             patch.object(PredictionCRUD, 'bulk_create', bulk_create), \
+             patch.object(predictions, '_prime_forecast_cache', prime):
+            result = await _materialize_hourly_predictions(["Delhi", "Mumbai"])
+
+        ensemble.forecast_sequence_batch.assert_called_once()
+        assert result["locations_processed"] == 2
+        assert result["predictions_generated"] == 48
+        assert result["model_versions"] == ["ensemble_v1.0"]
+        assert result["cache_entries_primed"] == 4
+        assert bulk_create.await_args.args[0] is db
+
+        payloads = prime.await_args.args[0]
+        assert set(payloads) == {"Delhi", "Mumbai"}
+        assert len(payloads["Delhi"]["24h"]["forecasts"]) == 24
+        assert payloads["Mumbai"]["current"]["location"]["city"] == "Mumbai"
+
+    def test_task_runs_materialization(self):
+        """The Celery task runs the async job on its own loop and returns its summary"""
+        materialize = AsyncMock(return_value={"locations_processed": 1})
+
+        with patch.object(predictions, '_materialize_hourly_predictions', materialize):
+            result = generate_hourly_predictions.apply(args=[["Delhi"]]).get()
+
+        assert result == {"locations_processed": 1}
+        materialize.assert_awaited_once_with(["Delhi"])
+
+
+class TestLoadMaterializedForecasts:
+    """Test reading the latest materialized runs back"""
+
+    @pytest.mark.asyncio
+    async def test_runs_are_grouped_by_point(self):
+        """One query returns every point's run, grouped in request order"""
+        rows = [(0, "a1"), (0, "a2"), (2, "c1")]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(all=lambda: rows))
+
+        runs = await PredictionCRUD.get_latest_runs(db, [(28.6, 77.2), (19.0, 72.8), (13.0, 80.2)])
+
+        db.execute.assert_awaited_once()
+        assert runs == [["a1", "a2"], [], ["c1"]]
+        assert await PredictionCRUD.get_latest_runs(db, []) == []
+
+    @pytest.mark.asyncio
+    async def test_get_latest_run_is_one_point_of_the_batch(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(all=lambda: [(0, "a1")]))
+
+        assert await PredictionCRUD.get_latest_run(db, 28.6, 77.2) == ["a1"]
+        db.execute.assert_awaited_once()
+
+    def test_statement_picks_latest_run_per_point(self):
+        """The newest run per point is chosen by a LATERAL subquery over a VALUES list"""
+        sql = str(latest_runs_statement([(28.6, 77.2), (19.0, 72.8)], since=RUN_TIME).compile(
+            dialect=postgresql.dialect()
+        ))
+
+        assert "FROM (VALUES" in sql
+        assert "JOIN LATERAL" in sql
+        assert "ORDER BY predictions.time DESC" in sql
+        assert "ORDER BY requested_points.idx, predictions.forecast_hour" in sql
+
+    @pytest.mark.asyncio
+    async def test_uses_request_session_and_drops_incomplete_runs(self, ensemble):
+        """All locations share one lookup on the given session; partial runs are ignored"""
+        complete = build_materialized_predictions([parse_location("Delhi")], RUN_TIME)[0]
+        db = MagicMock()
+        get_latest_runs = AsyncMock(return_value=[_stored(complete), _stored(complete[:3])])
+
+        with patch.object(PredictionCRUD, 'get_latest_runs', get_latest_runs), \
+             patch.object(forecast, 'AsyncSessionLocal') as session_factory:
+            runs = await _load_materialized_forecasts(
+                [parse_location("Delhi"), parse_location("Mumbai")], db
+            )
+
+        session_factory.assert_not_called()
+        assert get_latest_runs.await_args.args[0] is db
+        assert get_latest_runs.await_args.args[1] == [(28.6139, 77.209), (19.076, 72.8777)]
+        assert len(runs[0]) == 24 and runs[0][0]['predicted_value'] == complete[0]['predicted_value']
+        assert runs[1] == []
+
+    @pytest.mark.asyncio
+    async def test_opens_session_without_one(self):
+        """Background refreshes, which outlive the request, get a session of their own"""
+        db = MagicMock()
+        get_latest_runs = AsyncMock(return_value=[[]])
+
+        with patch.object(PredictionCRUD, 'get_latest_runs', get_latest_runs), \
+             patch.object(forecast, 'AsyncSessionLocal', _session_factory(db)):
+            assert await _load_materialized_forecasts([parse_location("Delhi")]) == [[]]
+
+        assert get_latest_runs.await_args.args[0] is db
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_rolls_back(self):
+        """A failing query is rolled back and every location falls back to live inference"""
+        db = MagicMock()
+        db.rollback = AsyncMock()
+
+        with patch.object(PredictionCRUD, 'get_latest_runs', AsyncMock(side_effect=RuntimeError("down"))):
+            runs = await _load_materialized_forecasts([parse_location("Delhi"), parse_location("Mumbai")], db)
+
+        assert runs == [[], []]
+        db.rollback.assert_awaited_once()
+
+
+class TestServeFromMaterialized:
+    """Test the responses rebuilt from stored runs"""
+
+    def test_24h_response_from_rows(self, ensemble):
+        rows = _records(build_materialized_predictions([parse_location("Delhi")], RUN_TIME)[0])
+
+        response = _materialized_24h_forecast(parse_location("Delhi"), rows)
+
+        assert response["generated_at"] == RUN_TIME.replace(tzinfo=None).isoformat()
+        assert len(response["forecasts"]) == 24
+        first = response["forecasts"][0]
+        assert first["timestamp"] == (RUN_TIME.replace(tzinfo=None) + timedelta(hours=1)).isoformat()
+        assert first["pollutants"]["pm25"]["value"] == pytest.approx(51.0)
+        assert response["metadata"]["model_version"] == "ensemble_v1.0"
+
+    def test_current_response_uses_hour_closest_to_now(self, ensemble):
+        """The current response reads the run's hour matching the time since the run"""
+        run_time = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+        rows = _records(build_materialized_predictions([parse_location("Delhi")], run_time)[0], run_time)
+
+        response = _materialized_current_forecast(parse_location("Delhi"), rows)
+
+        assert response["pollutants"]["pm25"]["value"] == pytest.approx(53.0, abs=1.0)
+        assert response["model_version"] == "ensemble_v1.0"
+
+    def test_payloads_cover_both_endpoints(self, ensemble):
+        rows = _records(build_materialized_predictions([parse_location("Delhi")], RUN_TIME)[0])
+
+        payloads = materialized_forecast_payloads(parse_location("New Delhi"), rows)
+
+        assert set(payloads) == {"current", "24h"}
+        assert payloads["24h"]["location"]["name"] == "Delhi"
+
+    @pytest.mark.asyncio
+    async def test_current_forecast_served_without_inference(self, ensemble):
+        """A stored run answers the current endpoint; the ensemble is not consulted"""
+        complete = build_materialized_predictions([parse_location("Delhi")], datetime.now(timezone.utc))[0]
+        ensemble.reset_mock()
+
+        with patch.object(PredictionCRUD, 'get_latest_runs', AsyncMock(return_value=[_stored(complete)])):
+            response = await _compute_current_forecast("delhi", MagicMock())
+
+        ensemble.predict.assert_not_called()
+        assert response["pollutants"]["pm25"]["value"] == pytest.approx(51.0, abs=1.0)
+        assert response["location"]["city"] == "Delhi"
+
+    @pytest.mark.asyncio
+    async def test_batch_serves_materialized_and_computes_the_rest(self, ensemble):
+        """Locations with a stored run skip inference; only the others run the ensemble"""
+        complete = build_materialized_predictions([parse_location("Delhi")], RUN_TIME)[0]
+        ensemble.reset_mock()
+        db = MagicMock()
+        get_latest_runs = AsyncMock(return_value=[_stored(complete), []])
+
+        with patch.object(PredictionCRUD, 'get_latest_runs', get_latest_runs), \
+             patch.object(forecast, 'cache_manager', CacheManager(l1_max_entries=0)):
+            response = await get_batch_forecast(
+                BatchForecastRequest(locations=["Delhi", "delhi", "Mumbai"], forecast_type="24h"), db
+            )
+
+        get_latest_runs.assert_awaited_once()
+        assert get_latest_runs.await_args.args[0] is db
+        assert ensemble.forecast_sequence_batch.call_count == 1
+        assert len(ensemble.forecast_sequence_batch.call_args.args[0]) == 1
+        assert [r["location"] for r in response["results"]] == ["Delhi", "delhi", "Mumbai"]
+        delhi = response["results"][0]["forecast"]
+        assert delhi["generated_at"] == RUN_TIME.replace(tzinfo=None).isoformat()
+        assert response["results"][1]["forecast"] == delhi
+        assert len(response["results"][2]["forecast"]["forecasts"]) == 24
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
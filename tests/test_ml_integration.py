@@ -6,6 +6,7 @@ import pytest
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from unittest.mock import MagicMock
 import sys
 import os
 
@@ -14,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.models.forecaster import AQIForecaster
 from src.models.ensemble_forecaster import EnsembleForecaster
+from src.models.lstm_forecaster import LSTMForecaster
 from src.models.gnn_spatial import Station
 
 
@@ -112,6 +114,123 @@ class TestMLIntegration:
             assert forecast.timestamp > datetime.now()
             assert forecast.pm25_lower <= forecast.pm25 <= forecast.pm25_upper
 
+    def test_direct_forecast_runs_each_model_once(self):
+        """Direct mode predicts every horizon in a single model call"""
+        ensemble = EnsembleForecaster()
+        ensemble.lstm_model = MagicMock(is_trained=False)
+        ensemble.xgboost_model = MagicMock()
+        ensemble.xgboost_model.predict.side_effect = lambda X, return_confidence: {
+            'predictions': X['pm25_lag1'].to_numpy() + X['temperature'].to_numpy(),
+            'lower_bound': X['pm25_lag1'].to_numpy(),
+            'upper_bound': X['pm25_lag1'].to_numpy() + 2 * X['temperature'].to_numpy()
+        }
+
+        initial_features = pd.DataFrame([{
+            'temperature': 25.0,
+            'hour': 12,
+            'day_of_week': 1,
+            'pm25_lag1': 50.0
+        }])
+        weather_forecast = [{'temperature': 26}, {'temperature': 27}]
+
+        forecasts = ensemble.forecast_sequence(initial_features, weather_forecast, hours=3, mode="direct")
+
+        ensemble.xgboost_model.predict.assert_called_once()
+        horizon_features = ensemble.xgboost_model.predict.call_args.args[0]
+        assert len(horizon_features) == 3
+        # Weather past the end of the forecast keeps its last hour
+        assert horizon_features['temperature'].tolist() == [26, 27, 27]
+        assert (horizon_features['pm25_lag1'] == 50.0).all()
+        assert [f.pm25 for f in forecasts] == [76.0, 77.0, 77.0]
+        assert [f.timestamp.hour for f in forecasts] == horizon_features['hour'].tolist()
+
+    def test_recursive_forecast_feeds_back_predictions(self):
+        """Recursive mode, the default, uses each prediction as the next hour's lag"""
+        ensemble = EnsembleForecaster()
+        ensemble.lstm_model = MagicMock(is_trained=False)
+        ensemble.xgboost_model = MagicMock()
+        ensemble.xgboost_model.predict.side_effect = lambda X, return_confidence: {
+            'predictions': X['pm25_lag1'].to_numpy() + 1.0
+        }
+
+        initial_features = pd.DataFrame([{'temperature': 25.0, 'hour': 12, 'pm25_lag1': 50.0}])
+
+        forecasts = ensemble.forecast_sequence(initial_features, [], hours=3)
+
+        assert ensemble.xgboost_model.predict.call_count == 3
+        assert [f.pm25 for f in forecasts] == [51.0, 52.0, 53.0]
+
+    def test_unknown_forecast_mode(self):
+        """An unsupported mode is rejected"""
+        ensemble = EnsembleForecaster()
+
+        with pytest.raises(ValueError):
+            ensemble.forecast_sequence(pd.DataFrame([{'hour': 12}]), [], hours=1, mode="seq2seq")
+
+
+class _NoisyModel:
+    """Stand-in network: last step's first feature plus dropout-like noise"""
+
+    def __init__(self, noise=0.1):
+        self.noise = noise
+        self.batch_sizes = []
+        self.dtypes = set()
+
+    def __call__(self, X, training=False):
+        self.batch_sizes.append(len(X))
+        self.dtypes.add(X.dtype)
+        values = X[:, -1, 0] + (np.random.normal(0, self.noise, len(X)) if training else 0)
+        return MagicMock(numpy=lambda: values.reshape(-1, 1))
+
+
+class TestLSTMMonteCarloDropout:
+    """Monte Carlo dropout runs on tiled batches instead of one call per sample"""
+
+    @pytest.fixture
+    def lstm(self):
+        lstm = LSTMForecaster(sequence_length=4, features=2)
+        lstm.model = _NoisyModel()
+        lstm.is_trained = True
+        lstm.scaler = MagicMock(transform=lambda X: np.asarray(X, dtype=float))
+        lstm.target_scaler.fit([[0.0], [1.0]])
+        return lstm
+
+    def test_predict_uses_one_forward_pass(self, lstm):
+        """All samples of a prediction go through the network together"""
+        result = lstm.predict(pd.DataFrame({'a': [0.2, 0.5], 'b': [0.0, 0.0]}), n_samples=200)
+
+        assert lstm.model.batch_sizes == [200]
+        assert result['predictions'][0] == pytest.approx(0.5, abs=0.05)
+        assert result['uncertainty'] == pytest.approx(0.1, abs=0.03)
+        assert result['lower_bound'][0] < result['predictions'][0] < result['upper_bound'][0]
+
+    def test_locations_share_passes_split_by_max_batch(self, lstm):
+        """Locations are sampled a group at a time, in float32 passes of at most mc_max_batch rows"""
+        lstm.mc_samples = 50
+        lstm.mc_max_batch = 100
+        histories = [
+            pd.DataFrame({'a': [0.3], 'b': [0.0]}),
+            pd.DataFrame({'a': [0.1, 0.7], 'b': [0.0, 0.0]}),
+            pd.DataFrame({'a': [0.5], 'b': [0.0]})
+        ]
+
+        result = lstm.predict_locations(histories)
+
+        assert lstm.model.batch_sizes == [100, 50]
+        assert lstm.model.dtypes == {np.dtype(np.float32)}
+        assert result['predictions'] == pytest.approx([0.3, 0.7, 0.5], abs=0.05)
+        assert result['uncertainty'] == pytest.approx([0.1, 0.1, 0.1], abs=0.04)
+
+    def test_samples_beyond_max_batch_take_one_sequence_per_pass(self, lstm):
+        """A sample count above mc_max_batch still sends each sequence through once"""
+        lstm.mc_max_batch = 64
+        histories = [pd.DataFrame({'a': [0.3], 'b': [0.0]}), pd.DataFrame({'a': [0.6], 'b': [0.0]})]
+
+        result = lstm.predict_locations(histories, n_samples=100)
+
+        assert lstm.model.batch_sizes == [100, 100]
+        assert result['predictions'] == pytest.approx([0.3, 0.6], abs=0.05)
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
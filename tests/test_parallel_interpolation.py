@@ -0,0 +1,115 @@
+"""
+Tests for tile-partitioned parallel interpolation
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.spatial_interpolation import SpatialInterpolator, create_delhi_bounds
+from src.utils.variogram_cache import VariogramCache
+from src.utils.parallel_interpolation import ParallelGridInterpolator, SharedStationArrays
+
+
+def make_station_data(n_stations: int = 15, seed: int = 11):
+    """Random PM2.5 stations inside the Delhi bounds"""
+    rng = np.random.default_rng(seed)
+    bounds = create_delhi_bounds()
+    return {
+        f"DL{i:03d}": {
+            'lat': rng.uniform(bounds['south'], bounds['north']),
+            'lon': rng.uniform(bounds['west'], bounds['east']),
+            'pm25': rng.uniform(40, 250)
+        }
+        for i in range(n_stations)
+    }
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    yield executor
+    executor.shutdown()
+
+
+class TestParallelGridInterpolator:
+    """Test cases for block-wise interpolation in a process pool"""
+    
+    def test_plan_covers_grid_in_bounded_blocks(self, process_pool):
+        """Row blocks tile the grid without gaps and respect the cell budget"""
+        parallel = ParallelGridInterpolator(executor=process_pool, block_cells=500)
+        
+        latitudes, longitudes, row_blocks = parallel.plan(create_delhi_bounds(), 1.0)
+        
+        assert row_blocks[0].start == 0 and row_blocks[-1].stop == len(latitudes)
+        assert all(a.stop == b.start for a, b in zip(row_blocks, row_blocks[1:]))
+        assert all((rows.stop - rows.start) * len(longitudes) <= 500 for rows in row_blocks)
+    
+    def test_stitched_blocks_match_single_pass(self, process_pool):
+        """Blocks interpolated in workers stitch into the single-pass grid"""
+        station_data = make_station_data()
+        parallel = ParallelGridInterpolator(executor=process_pool, block_cells=300)
+        
+        blocks = list(parallel.iter_blocks(station_data, create_delhi_bounds(), 1.0))
+        
+        grid = SpatialInterpolator(variogram_cache=VariogramCache(use_redis=False)).interpolate_grid(
+            station_data, create_delhi_bounds(), 1.0
+        )
+        assert len(blocks) > 1
+        assert [b.row_start for b in blocks] == sorted(b.row_start for b in blocks)
+        np.testing.assert_allclose(np.vstack([b.values for b in blocks]).ravel(), grid.values, rtol=1e-5)
+        np.testing.assert_allclose(np.vstack([b.confidence for b in blocks]).ravel(), grid.confidence, rtol=1e-5)
+    
+    def test_async_blocks_match_sync(self, process_pool):
+        """The event-loop variant yields the same blocks"""
+        station_data = make_station_data()
+        parallel = ParallelGridInterpolator(executor=process_pool, block_cells=300)
+        
+        async def collect():
+            return [block async for block in parallel.aiter_blocks(station_data, create_delhi_bounds(), 2.0)]
+        
+        async_blocks = asyncio.run(collect())
+        sync_blocks = list(parallel.iter_blocks(station_data, create_delhi_bounds(), 2.0))
+        
+        for a, b in zip(async_blocks, sync_blocks):
+            assert a.row_start == b.row_start
+            np.testing.assert_array_equal(a.values, b.values)
+    
+    def test_requires_two_stations(self, process_pool):
+        """Too few stations fail before any block is submitted"""
+        station_data = dict(list(make_station_data().items())[:1])
+        parallel = ParallelGridInterpolator(executor=process_pool)
+        
+        with pytest.raises(ValueError):
+            list(parallel.iter_blocks(station_data, create_delhi_bounds(), 1.0))
+
+
+class TestSharedStationArrays:
+    """Test cases for the shared station segment"""
+    
+    def test_segment_holds_stations_and_is_unlinked(self):
+        """Workers see lat, lon, value rows; the segment is gone after exit"""
+        coords = np.array([[28.6, 77.2], [28.7, 77.1]])
+        values = np.array([100.0, 150.0])
+        
+        with SharedStationArrays(coords, values) as shared:
+            attached = shared_memory.SharedMemory(name=shared.name)
+            stations = np.ndarray(shared.shape, dtype=np.float64, buffer=attached.buf)
+            np.testing.assert_array_equal(stations, [[28.6, 77.2, 100.0], [28.7, 77.1, 150.0]])
+            del stations
+            attached.close()
+        
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared.name)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,215 @@
+"""
+Tests for the streaming rolling-window AQI engine
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rolling_aqi import RollingWindow, RollingAQIEngine
+from src.data.ingestion_clients import DataPoint
+
+
+BASE_TIME = datetime(2024, 1, 15, 0, 0)
+DELHI = (28.6139, 77.2090)
+
+
+class TestRollingWindow:
+    """Test cases for the hourly ring buffer"""
+    
+    def test_mean_covers_only_window(self):
+        """Running mean should only include the last window_hours hours"""
+        window = RollingWindow(24)
+        for h in range(30):
+            window.add(BASE_TIME + timedelta(hours=h), float(h))
+        
+        expected = sum(range(6, 30)) / 24
+        assert window.mean() == pytest.approx(expected)
+        assert window.count == 24
+    
+    def test_multiple_values_per_hour(self):
+        """Several readings in one hour are averaged into the same bin"""
+        window = RollingWindow(8)
+        window.add(BASE_TIME, 10.0)
+        window.add(BASE_TIME + timedelta(minutes=15), 20.0)
+        window.add(BASE_TIME + timedelta(minutes=30), 30.0)
+        
+        assert window.hourly_means(1) == [pytest.approx(20.0)]
+        assert window.mean() == pytest.approx(20.0)
+    
+    def test_late_data_outside_window_dropped(self):
+        """Observations older than the window are rejected"""
+        window = RollingWindow(8)
+        window.add(BASE_TIME + timedelta(hours=20), 50.0)
+        
+        assert window.add(BASE_TIME, 500.0) is False
+        assert window.mean() == pytest.approx(50.0)
+    
+    def test_advance_expires_everything(self):
+        """Advancing past the full window empties it"""
+        window = RollingWindow(8)
+        window.add(BASE_TIME, 50.0)
+        window.advance(window.latest_hour + 8)
+        
+        assert window.mean() is None
+        assert window.count == 0
+    
+    def test_nowcast_constant_series(self):
+        """NowCast of a constant series equals the constant"""
+        window = RollingWindow(24)
+        for h in range(12):
+            window.add(BASE_TIME + timedelta(hours=h), 80.0)
+        
+        assert window.nowcast(12, 0.5) == pytest.approx(80.0)
+    
+    def test_nowcast_weights_recent_hours(self):
+        """A rising series yields a NowCast above the plain mean"""
+        window = RollingWindow(24)
+        for h in range(12):
+            window.add(BASE_TIME + timedelta(hours=h), 20.0 + 10 * h)
+        
+        assert window.nowcast(12, 0.5) > window.mean()
+    
+    def test_nowcast_requires_recent_hours(self):
+        """NowCast needs two of the three most recent hours"""
+        window = RollingWindow(24)
+        window.add(BASE_TIME, 80.0)
+        window.add(BASE_TIME + timedelta(hours=5), 80.0)
+        
+        assert window.nowcast(12, 0.5) is None
+
+
+class TestRollingAQIEngine:
+    """Test cases for the per-station rolling AQI engine"""
+    
+    def _make_point(self, hours: int, value: float, parameter: str = 'pm25',
+                    station_id: str = 'DL001') -> DataPoint:
+        return DataPoint(
+            timestamp=BASE_TIME + timedelta(hours=hours),
+            location=DELHI,
+            parameter=parameter,
+            value=value,
+            unit='µg/m³',
+            source='cpcb',
+            station_id=station_id
+        )
+    
+    def test_update_from_data_points(self):
+        """DataPoints are folded into per-station windows"""
+        engine = RollingAQIEngine()
+        accepted = engine.update_many(
+            [self._make_point(h, 100.0) for h in range(24)] +
+            [self._make_point(h, 50.0, parameter='o3') for h in range(24)]
+        )
+        
+        assert accepted == 48
+        averages = engine.get_station_averages('DL001', now=BASE_TIME + timedelta(hours=23))
+        assert averages['pm25'] == pytest.approx(100.0)
+        assert averages['o3'] == pytest.approx(50.0)
+    
+    def test_ignores_non_aqi_parameters_and_invalid(self):
+        """Unknown parameters, negative and invalid values are skipped"""
+        engine = RollingAQIEngine()
+        point = self._make_point(0, 100.0)
+        point.quality_flag = 'invalid'
+        
+        assert engine.update(point) is False
+        assert engine.update(self._make_point(0, 25.0, parameter='temperature')) is False
+        assert engine.update(self._make_point(0, -5.0)) is False
+        assert engine.get_station_aqi('DL001') is None
+    
+    def test_station_aqi_matches_calculator(self):
+        """Rolling AQI uses the window averages"""
+        engine = RollingAQIEngine()
+        engine.update_many([self._make_point(h, 35.5) for h in range(24)])
+        
+        result = engine.get_station_aqi('DL001', method='rolling', now=BASE_TIME + timedelta(hours=23))
+        
+        assert result['aqi'] == 101
+        assert result['dominant_pollutant'] == 'pm25'
+        assert result['category'] == 'unhealthy_sensitive'
+    
+    def test_location_aqi_averages_nearby_stations(self):
+        """Location AQI averages stations inside the radius only"""
+        engine = RollingAQIEngine()
+        engine.add_measurement('near_1', 'pm25', 100.0, BASE_TIME, DELHI)
+        engine.add_measurement('near_2', 'pm25', 50.0, BASE_TIME, (28.62, 77.21))
+        engine.add_measurement('far', 'pm25', 400.0, BASE_TIME, (19.0760, 72.8777))
+        
+        result = engine.get_location_aqi(*DELHI, radius_km=5.0, method='rolling', now=BASE_TIME)
+        
+        assert sorted(result['stations']) == ['near_1', 'near_2']
+        assert result['pollutant_values']['pm25'] == pytest.approx(75.0)
+    
+    def test_evaluation_time_expires_stale_data(self):
+        """Evaluating far past the last reading yields no data"""
+        engine = RollingAQIEngine()
+        engine.update(self._make_point(0, 100.0))
+        
+        assert engine.get_station_aqi('DL001', now=BASE_TIME + timedelta(days=2)) is None
+    
+    def test_silent_station_left_out_by_default(self):
+        """Without an explicit time, a station with no reading inside its window is left out"""
+        engine = RollingAQIEngine()
+        fresh = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+        engine.add_measurement('silent', 'pm25', 400.0, fresh - timedelta(days=3), DELHI)
+        engine.add_measurement('fresh', 'pm25', 50.0, fresh, (28.62, 77.21))
+        
+        result = engine.get_location_aqi(*DELHI, radius_km=5.0, method='rolling')
+        
+        assert engine.get_station_aqi('silent') is None
+        assert result['stations'] == ['fresh']
+        assert result['pollutant_values']['pm25'] == pytest.approx(50.0)
+        assert result['as_of'] == fresh.isoformat()
+    
+    def test_ingest_rows(self):
+        """Stored measurement rows can warm the engine"""
+        engine = RollingAQIEngine()
+        rows = [
+            (BASE_TIME + timedelta(hours=h), 'DL002', 'pm10', 120.0, DELHI[0], DELHI[1])
+            for h in range(3)
+        ]
+        
+        assert engine.ingest_rows(rows) == 3
+        assert engine.stations_near(*DELHI, radius_km=1.0) == ['DL002']
+    
+    def test_repeated_reading_is_counted_once(self):
+        """A reading folded in by ingestion and again by a sync is not double counted"""
+        engine = RollingAQIEngine()
+        engine.update(self._make_point(0, 100.0))
+        
+        assert not engine.update(self._make_point(0, 100.0))
+        assert engine.get_station_averages('DL001', now=BASE_TIME)['pm25'] == pytest.approx(100.0)
+    
+    def test_sync_picks_up_late_station(self):
+        """A station reporting an older reading after another station's newer one is still synced"""
+        engine = RollingAQIEngine()
+        ingested = BASE_TIME + timedelta(hours=3)
+        engine.apply_sync([(BASE_TIME + timedelta(hours=2), 'DL001', 'pm25', 80.0, *DELHI, ingested)], ingested)
+        
+        late = (BASE_TIME + timedelta(hours=1), 'DL002', 'pm25', 60.0, *DELHI, ingested + timedelta(minutes=5))
+        
+        assert engine.apply_sync([late], ingested + timedelta(minutes=5)) == 1
+        assert engine.synced_through == ingested.replace(tzinfo=timezone.utc) + timedelta(minutes=5)
+        assert 'DL002' in engine.stations_near(*DELHI, radius_km=1.0)
+    
+    def test_sync_statement_tails_ingestion_time(self):
+        """After the first sync, rows are tailed by created_at within the longest window"""
+        from src.api.crud import rolling_aqi_sync_statement
+        
+        engine = RollingAQIEngine()
+        now = BASE_TIME.replace(tzinfo=timezone.utc)
+        assert "air_quality_measurements.time >=" in str(rolling_aqi_sync_statement(engine, now))
+        
+        engine.synced_through = now
+        sql = str(rolling_aqi_sync_statement(engine, now))
+        assert "air_quality_measurements.created_at >" in sql
+        assert "air_quality_measurements.time >=" in sql
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
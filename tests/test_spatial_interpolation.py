@@ -0,0 +1,247 @@
+"""
+Tests for spatial interpolation utilities
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from scipy.linalg import solve
+from scipy.spatial.distance import cdist
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.spatial_interpolation import (
+    SpatialInterpolator, create_delhi_bounds, idw_interpolate, idw_weight_matrix
+)
+from src.utils.variogram_cache import VariogramCache
+
+
+def make_stations(n_stations: int = 12, seed: int = 7):
+    """Random stations inside the Delhi bounds"""
+    rng = np.random.default_rng(seed)
+    bounds = create_delhi_bounds()
+    coords = rng.uniform(
+        [bounds['south'], bounds['west']],
+        [bounds['north'], bounds['east']],
+        size=(n_stations, 2)
+    )
+    values = rng.uniform(40, 250, size=n_stations)
+    return coords, values
+
+
+class TestOrdinaryKriging:
+    """Test cases for the batched kriging solve"""
+    
+    def test_batched_solve_matches_per_point_solve(self):
+        """One factorization for all grid points gives the per-point results"""
+        coords, values = make_stations()
+        interpolator = SpatialInterpolator()
+        grid = np.array(interpolator.generate_grid(create_delhi_bounds(), 5.0))
+        
+        predictions, variances = interpolator.ordinary_kriging(coords, values, grid)
+        
+        n = len(coords)
+        K = np.zeros((n + 1, n + 1))
+        K[:n, :n] = interpolator.variogram_function(cdist(coords, coords))
+        K[:n, n] = 1
+        K[n, :n] = 1
+        for i, point in enumerate(grid):
+            rhs = np.ones(n + 1)
+            rhs[:n] = interpolator.variogram_function(cdist([point], coords)[0])
+            weights = solve(K, rhs)
+            assert predictions[i] == pytest.approx(weights[:n] @ values)
+            assert variances[i] == pytest.approx(weights @ rhs)
+    
+    def test_kriging_reproduces_station_values(self):
+        """Kriging is an exact interpolator at the stations"""
+        coords, values = make_stations()
+        interpolator = SpatialInterpolator()
+        interpolator.fit_variogram(coords, values)
+        interpolator.variogram_params['nugget'] = 0.0
+        
+        predictions, _ = interpolator.ordinary_kriging(coords, values, coords)
+        
+        np.testing.assert_allclose(predictions, values, rtol=1e-6)
+    
+    def test_singular_system_falls_back_to_idw(self):
+        """Duplicate stations make K singular and trigger the IDW fallback"""
+        coords = np.array([[28.6, 77.2], [28.6, 77.2], [28.7, 77.3], [28.5, 77.1]])
+        values = np.array([100.0, 100.0, 150.0, 80.0])
+        interpolator = SpatialInterpolator()
+        interpolator.variogram_params = {
+            'nugget': 0.0, 'sill': 100.0, 'range': 0.1, 'model': 'exponential'
+        }
+        
+        predictions, variances = interpolator.ordinary_kriging(
+            coords, values, np.array([[28.65, 77.25]])
+        )
+        
+        assert np.all(np.isfinite(predictions))
+        assert np.all(variances >= 0)
+
+
+class TestIDWInterpolation:
+    """Test cases for the shared KD-tree IDW kernel"""
+    
+    def test_matches_per_point_idw(self):
+        """Chunked KD-tree IDW equals the brute-force per-point formula"""
+        coords, values = make_stations()
+        grid = np.array(SpatialInterpolator().generate_grid(create_delhi_bounds(), 5.0))
+        
+        predictions, variances = idw_interpolate(coords, values, grid, chunk_size=97)
+        
+        for i, point in enumerate(grid):
+            weights = 1 / cdist([point], coords)[0] ** 2
+            weights /= weights.sum()
+            assert predictions[i] == pytest.approx(weights @ values)
+            assert variances[i] == pytest.approx(np.var(values) * (1 - weights.max()))
+    
+    def test_exact_coincidence_returns_station_value(self):
+        """Grid points on top of a station take its value with zero variance"""
+        coords, values = make_stations()
+        
+        predictions, variances = idw_interpolate(coords, values, coords[:4])
+        
+        np.testing.assert_allclose(predictions, values[:4])
+        np.testing.assert_array_equal(variances, 0.0)
+    
+    def test_single_neighbour_is_nearest_station(self):
+        """With one neighbour IDW reduces to nearest-station lookup"""
+        coords, values = make_stations()
+        grid = np.array([[28.55, 77.05], [28.75, 77.3]])
+        
+        predictions, _ = idw_interpolate(coords, values, grid, n_neighbors=1)
+        
+        nearest = cdist(grid, coords).argmin(axis=1)
+        np.testing.assert_allclose(predictions, values[nearest])
+    
+    def test_radius_limits_contributing_stations(self):
+        """Stations outside the radius are ignored; empty neighbourhoods are NaN"""
+        coords = np.array([[28.60, 77.20], [28.61, 77.20], [29.50, 78.00]])
+        values = np.array([100.0, 200.0, 400.0])
+        grid = np.array([[28.605, 77.20], [20.0, 70.0]])
+        
+        predictions, variances = idw_interpolate(coords, values, grid, radius=0.1)
+        
+        assert predictions[0] == pytest.approx(150.0)
+        assert np.isnan(predictions[1]) and np.isnan(variances[1])
+
+
+
+class TestGridWeights:
+    """Test cases for cached grid x station weights"""
+    
+    def _build(self, coords, values, grid):
+        interpolator = SpatialInterpolator(variogram_cache=VariogramCache(use_redis=False))
+        interpolator.fit_variogram(coords, values)
+        station_ids = [f"DL{i:03d}" for i in range(len(coords))]
+        return interpolator, interpolator.build_grid_weights(station_ids, coords, values, grid)
+    
+    def test_rank_one_update_matches_kriging(self):
+        """Updating one station equals kriging the new values from scratch"""
+        coords, values = make_stations()
+        grid = np.array(SpatialInterpolator().generate_grid(create_delhi_bounds(), 5.0))
+        interpolator, grid_weights = self._build(coords, values, grid)
+        
+        assert grid_weights.update('DL004', 300.0)
+        
+        new_values = values.copy()
+        new_values[4] = 300.0
+        expected, variances = interpolator.ordinary_kriging(coords, new_values, grid)
+        assert grid_weights.method == 'ordinary_kriging'
+        np.testing.assert_allclose(grid_weights.predictions, expected)
+        np.testing.assert_allclose(grid_weights.variances, variances)
+    
+    def test_unknown_stations_reported(self):
+        """Stations outside the weight matrix are returned, not applied"""
+        coords, values = make_stations()
+        _, grid_weights = self._build(coords, values, coords[:3])
+        before = grid_weights.predictions.copy()
+        
+        assert grid_weights.update_many({'DL001': values[1], 'XX999': 10.0}) == ['XX999']
+        assert grid_weights.missing_stations(['DL000', 'XX999']) == ['XX999']
+        np.testing.assert_allclose(grid_weights.predictions, before)
+    
+    def test_idw_weight_matrix_matches_kernel(self):
+        """Dense IDW weights reproduce the KD-tree kernel"""
+        coords, values = make_stations()
+        grid = np.vstack([coords[:2], [[28.55, 77.05], [28.75, 77.3]]])
+        
+        weights = idw_weight_matrix(coords, grid, n_neighbors=4, chunk_size=3)
+        predictions, _ = idw_interpolate(coords, values, grid, n_neighbors=4)
+        
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        np.testing.assert_allclose(weights @ values, predictions)
+
+class TestVariogramCache:
+    """Test cases for the variogram fit cache"""
+    
+    def _station_data(self):
+        coords, values = make_stations()
+        return {
+            f"DL{i:03d}": {'lat': lat, 'lon': lon, 'pm25': value}
+            for i, ((lat, lon), value) in enumerate(zip(coords, values))
+        }
+    
+    def test_key_depends_on_stations_parameter_and_hour(self):
+        """Keys ignore station order but change with stations, parameter and hour"""
+        coords, _ = make_stations()
+        hour = datetime(2024, 1, 15, 10, 5)
+        key = VariogramCache.make_key(coords, 'pm25', hour)
+        
+        assert VariogramCache.make_key(coords[::-1], 'pm25', hour.replace(minute=55)) == key
+        assert VariogramCache.make_key(coords[1:], 'pm25', hour) != key
+        assert VariogramCache.make_key(coords, 'pm10', hour) != key
+        assert VariogramCache.make_key(coords, 'pm25', hour + timedelta(hours=1)) != key
+    
+    def test_repeated_grid_requests_skip_refit(self):
+        """A second interpolator for the same stations and hour reuses the fit"""
+        cache = VariogramCache(use_redis=False)
+        station_data = self._station_data()
+        hour = datetime(2024, 1, 15, 10)
+        
+        first = SpatialInterpolator(variogram_cache=cache)
+        first.interpolate_grid(station_data, create_delhi_bounds(), 5.0, timestamp=hour)
+        
+        second = SpatialInterpolator(variogram_cache=cache)
+        with patch.object(second, 'fit_variogram') as fit:
+            second.interpolate_grid(station_data, create_delhi_bounds(), 5.0, timestamp=hour)
+        
+        fit.assert_not_called()
+        assert second.variogram_params == pytest.approx(first.variogram_params)
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_lru_bound(self):
+        """Least recently used fits are evicted beyond max_entries"""
+        cache = VariogramCache(max_entries=2, use_redis=False)
+        params = {'nugget': 1.0, 'sill': 10.0, 'range': 0.1, 'model': 'exponential'}
+        cache.set('a', params)
+        cache.set('b', params)
+        cache.get('a')
+        cache.set('c', params)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == params
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_falls_back_to_redis(self):
+        """A local miss is served from Redis and promoted to memory"""
+        cache = VariogramCache()
+        redis_client = MagicMock()
+        redis_client.get.return_value = '{"nugget": 1.0, "sill": 10.0, "range": 0.1, "model": "exponential"}'
+        cache._redis_client = redis_client
+        
+        assert cache.get('key')['sill'] == 10.0
+        assert cache.get('key')['sill'] == 10.0
+        
+        redis_client.get.assert_called_once_with('variogram:key')
+        assert cache.get_stats()['redis_hits'] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
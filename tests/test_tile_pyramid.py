@@ -0,0 +1,307 @@
+"""
+Tests for the precomputed spatial tile pyramid
+"""
+
+import pytest
+import sys
+import os
+import struct
+import zlib
+import numpy as np
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.spatial_interpolation import SpatialInterpolator, create_delhi_bounds
+from src.utils.variogram_cache import VariogramCache
+from src.utils.tile_pyramid import (
+    TileStore, TilePyramidBuilder, assemble_bounds, cell_centers, choose_zoom,
+    render_tile_png, tile_bounds, tile_range, TILE_CELLS, TILE_PIXELS
+)
+
+
+HOUR = datetime(2024, 1, 15, 10, 0)
+
+
+def make_station_data(n_stations: int = 10, seed: int = 3):
+    """Random PM2.5 stations inside the Delhi bounds"""
+    rng = np.random.default_rng(seed)
+    bounds = create_delhi_bounds()
+    return {
+        f"DL{i:03d}": {
+            'lat': rng.uniform(bounds['south'], bounds['north']),
+            'lon': rng.uniform(bounds['west'], bounds['east']),
+            'pm25': rng.uniform(40, 250)
+        }
+        for i in range(n_stations)
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TileStore(root=str(tmp_path))
+
+
+@pytest.fixture
+def built_store(store):
+    builder = TilePyramidBuilder(store=store, min_zoom=8, max_zoom=10)
+    builder.build('delhi', make_station_data(), create_delhi_bounds(), 'pm25', HOUR)
+    return store
+
+
+class TestTileGeometry:
+    """Test cases for XYZ tile math"""
+    
+    def test_tile_range_covers_bounds(self):
+        """Tiles returned for a bounding box enclose it"""
+        bounds = create_delhi_bounds()
+        x_min, x_max, y_min, y_max = tile_range(bounds, 10)
+        
+        assert tile_bounds(10, x_min, y_min)['north'] >= bounds['north']
+        assert tile_bounds(10, x_min, y_min)['west'] <= bounds['west']
+        assert tile_bounds(10, x_max, y_max)['south'] <= bounds['south']
+        assert tile_bounds(10, x_max, y_max)['east'] >= bounds['east']
+    
+    def test_cell_centers_lie_inside_tile(self):
+        """Cell centers of a single tile stay within its bounds"""
+        latitudes, longitudes = cell_centers(10, 730, 730, 428, 428)
+        bounds = tile_bounds(10, 730, 428)
+        
+        assert len(latitudes) == len(longitudes) == TILE_CELLS
+        assert np.all((latitudes < bounds['north']) & (latitudes > bounds['south']))
+        assert np.all(np.diff(latitudes) < 0)
+        assert np.all((longitudes > bounds['west']) & (longitudes < bounds['east']))
+    
+    def test_choose_zoom(self):
+        """Finer resolutions select deeper zooms; beyond the pyramid is None"""
+        bounds = create_delhi_bounds()
+        
+        assert choose_zoom(bounds, 5.0, 8, 12) == 8
+        assert choose_zoom(bounds, 1.0, 8, 12) == 10
+        assert choose_zoom(bounds, 0.5, 8, 12) == 11
+        assert choose_zoom(bounds, 0.01, 8, 12) is None
+
+
+class TestTilePyramid:
+    """Test cases for building, storing and assembling tiles"""
+    
+    def test_tiles_match_direct_kriging(self, built_store):
+        """A stored tile holds the kriging surface at its cell centers"""
+        station_data = make_station_data()
+        coords = np.array([[d['lat'], d['lon']] for d in station_data.values()])
+        values = np.array([d['pm25'] for d in station_data.values()])
+        
+        x_min, _, y_min, _ = tile_range(create_delhi_bounds(), 10)
+        tile = built_store.get('pm25', '2024011510', 10, x_min, y_min)
+        
+        latitudes, longitudes = cell_centers(10, x_min, x_min, y_min, y_min)
+        lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing='ij')
+        interpolator = SpatialInterpolator(variogram_cache=VariogramCache(use_redis=False))
+        interpolator.fit_variogram(coords, values)
+        expected, _ = interpolator.ordinary_kriging(
+            coords, values, np.column_stack([lat_grid.ravel(), lon_grid.ravel()])
+        )
+        
+        assert tile.shape == (2, TILE_CELLS, TILE_CELLS)
+        np.testing.assert_allclose(tile[0].ravel(), np.maximum(expected, 0), rtol=1e-4)
+    
+    def test_assemble_arbitrary_bounds(self, built_store):
+        """Any box inside the pyramid is assembled without interpolation"""
+        bounds = {'north': 28.71, 'south': 28.52, 'east': 77.33, 'west': 77.05}
+        
+        grid = assemble_bounds(bounds, 1.0, 'pm25', built_store, now=HOUR + timedelta(minutes=20))
+        
+        assert grid['zoom'] == 10
+        assert grid['hour'] == '2024011510'
+        assert np.all((grid['latitude'] >= bounds['south']) & (grid['latitude'] <= bounds['north']))
+        assert np.all((grid['longitude'] >= bounds['west']) & (grid['longitude'] <= bounds['east']))
+        assert len(grid['value']) == len(grid['confidence']) == len(grid['latitude'])
+        assert np.all(grid['value'] >= 0)
+    
+    def test_previous_hour_serves_until_rebuilt(self, built_store):
+        """The last complete hour is used until the new pyramid lands"""
+        bounds = {'north': 28.7, 'south': 28.5, 'east': 77.3, 'west': 77.1}
+        
+        assert assemble_bounds(bounds, 1.0, 'pm25', built_store, now=HOUR + timedelta(hours=1))['hour'] == '2024011510'
+        assert assemble_bounds(bounds, 1.0, 'pm25', built_store, now=HOUR + timedelta(hours=5)) is None
+    
+    def test_assemble_outside_pyramid(self, built_store):
+        """Uncovered areas and too-fine resolutions fall through to live interpolation"""
+        mumbai = {'north': 19.3, 'south': 18.9, 'east': 72.9, 'west': 72.7}
+        delhi = {'north': 28.7, 'south': 28.5, 'east': 77.3, 'west': 77.1}
+        
+        assert assemble_bounds(mumbai, 1.0, 'pm25', built_store, now=HOUR) is None
+        assert assemble_bounds(delhi, 0.1, 'pm25', built_store, now=HOUR) is None
+        assert assemble_bounds(delhi, 1.0, 'pm10', built_store, now=HOUR) is None
+    
+    def test_tiles_read_back_from_disk(self, built_store):
+        """A fresh store in another process reads the same tiles"""
+        x_min, _, y_min, _ = tile_range(create_delhi_bounds(), 9)
+        other = TileStore(root=built_store.root)
+        
+        np.testing.assert_array_equal(
+            other.get('pm25', '2024011510', 9, x_min, y_min),
+            built_store.get('pm25', '2024011510', 9, x_min, y_min)
+        )
+    
+    def test_concurrent_manifest_writers_keep_all_regions(self, tmp_path):
+        """Writers in separate stores (as in separate processes) merge regions without losing any"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        stores = [TileStore(root=str(tmp_path)) for _ in range(4)]
+        
+        def write(i):
+            stores[i % 4].write_manifest('pm25', '2024011510', {'regions': {f"region{i}": {'zoom': i}}})
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, range(40)))
+        
+        manifest = stores[0].read_manifest('pm25', '2024011510')
+        assert set(manifest['regions']) == {f"region{i}" for i in range(40)}
+        assert not [name for name in os.listdir(tmp_path / 'pm25' / '2024011510') if name.endswith('.tmp')]
+    
+    def test_prune_old_hours(self, built_store):
+        """Pyramids older than the retention window are deleted"""
+        assert built_store.prune('pm25', keep_hours=3, now=HOUR + timedelta(hours=6)) == 1
+        assert built_store.resolve_hour('pm25', now=HOUR) is None
+    
+    def test_render_png(self, built_store):
+        """Rendered tiles are valid RGBA PNGs of the map tile size"""
+        x_min, _, y_min, _ = tile_range(create_delhi_bounds(), 8)
+        png = render_tile_png(built_store.get('pm25', '2024011510', 8, x_min, y_min))
+        
+        assert png.startswith(b"\x89PNG\r\n\x1a\n")
+        width, height, depth, color_type = struct.unpack(">IIBB", png[16:26])
+        assert (width, height, depth, color_type) == (TILE_PIXELS, TILE_PIXELS, 8, 6)
+        
+        idat_length = struct.unpack(">I", png[33:37])[0]
+        raw = zlib.decompress(png[41:41 + idat_length])
+        assert len(raw) == TILE_PIXELS * (TILE_PIXELS * 4 + 1)
+
+
+
+class TestIncrementalUpdates:
+    """Test cases for rank-1 tile updates from new station readings"""
+    
+    def _reading(self, station_data, station_id, value):
+        return {station_id: {**station_data[station_id], 'value': value}}
+    
+    def test_update_matches_rebuild(self, tmp_path):
+        """Folding in one new reading gives the tiles of a full rebuild"""
+        station_data = make_station_data()
+        updated_store = TileStore(root=str(tmp_path / 'updated'))
+        TilePyramidBuilder(store=updated_store, min_zoom=8, max_zoom=9).build(
+            'delhi', station_data, create_delhi_bounds(), 'pm25', HOUR
+        )
+        
+        # A builder in another worker picks the weights up from the store
+        summary = TilePyramidBuilder(store=updated_store, min_zoom=8, max_zoom=9).apply_updates(
+            'pm25', self._reading(station_data, 'DL003', 400.0), now=HOUR
+        )
+        
+        rebuilt_data = dict(station_data, DL003=dict(station_data['DL003'], pm25=400.0))
+        rebuilt_store = TileStore(root=str(tmp_path / 'rebuilt'))
+        TilePyramidBuilder(store=rebuilt_store, min_zoom=8, max_zoom=9).build(
+            'delhi', rebuilt_data, create_delhi_bounds(), 'pm25', HOUR
+        )
+        
+        assert summary['updated'] == ['delhi'] and summary['stale'] == []
+        x_min, x_max, y_min, y_max = tile_range(create_delhi_bounds(), 9)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                np.testing.assert_allclose(
+                    updated_store.get('pm25', '2024011510', 9, x, y),
+                    rebuilt_store.get('pm25', '2024011510', 9, x, y),
+                    rtol=1e-4, atol=1e-3
+                )
+    
+    def test_updates_accumulate_across_builders(self, store):
+        """Updates applied by one builder are the baseline for the next"""
+        station_data = make_station_data()
+        first = TilePyramidBuilder(store=store, min_zoom=8, max_zoom=8)
+        first.build('delhi', station_data, create_delhi_bounds(), 'pm25', HOUR)
+        second = TilePyramidBuilder(store=store, min_zoom=8, max_zoom=8)
+        
+        second.apply_updates('pm25', self._reading(station_data, 'DL001', 300.0), now=HOUR)
+        first.apply_updates('pm25', self._reading(station_data, 'DL002', 20.0), now=HOUR)
+        
+        state = store.get_layer_state('pm25', '2024011510', 'delhi')
+        values = dict(zip(state['station_ids'], state['values']))
+        assert values['DL001'] == 300.0
+        assert values['DL002'] == 20.0
+    
+    def test_concurrent_updates_from_separate_stores_all_land(self, tmp_path):
+        """Workers updating one layer (separate stores, as in separate processes) lose no reading"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        station_data = make_station_data()
+        TilePyramidBuilder(store=TileStore(root=str(tmp_path)), min_zoom=8, max_zoom=8).build(
+            'delhi', station_data, create_delhi_bounds(), 'pm25', HOUR
+        )
+        station_ids = sorted(station_data)[:6]
+        builders = [
+            TilePyramidBuilder(store=TileStore(root=str(tmp_path)), min_zoom=8, max_zoom=8)
+            for _ in station_ids
+        ]
+        
+        def update(i):
+            builders[i].apply_updates('pm25', self._reading(station_data, station_ids[i], 500.0 + i), now=HOUR)
+        
+        with ThreadPoolExecutor(max_workers=len(station_ids)) as pool:
+            list(pool.map(update, range(len(station_ids))))
+        
+        state = TileStore(root=str(tmp_path)).get_layer_state('pm25', '2024011510', 'delhi')
+        values = dict(zip(state['station_ids'], state['values']))
+        assert [values[station_id] for station_id in station_ids] == [500.0 + i for i in range(len(station_ids))]
+    
+    @pytest.mark.skipif(fcntl is None, reason="fcntl not available")
+    def test_update_holds_hour_lock(self, built_store, tmp_path):
+        """The layer state is written while other processes are locked out of the hour"""
+        builder = TilePyramidBuilder(store=built_store, min_zoom=8, max_zoom=10)
+        put_layer_state = built_store.put_layer_state
+        locked_out = []
+        
+        def checked_put_layer_state(*args):
+            with open(tmp_path / 'pm25' / '2024011510' / 'manifest.lock', 'w') as other:
+                try:
+                    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    locked_out.append(True)
+            put_layer_state(*args)
+        
+        built_store.put_layer_state = checked_put_layer_state
+        reading = self._reading(make_station_data(), 'DL001', 300.0)
+        
+        assert builder.apply_updates('pm25', reading, now=HOUR)['updated'] == ['delhi']
+        assert locked_out == [True]
+    
+    def test_new_station_marks_region_stale(self, built_store):
+        """A station outside the weight matrix needs a full rebuild"""
+        x_min, _, y_min, _ = tile_range(create_delhi_bounds(), 10)
+        before = built_store.get('pm25', '2024011510', 10, x_min, y_min).copy()
+        reading = {'DL999': {'lat': 28.6, 'lon': 77.2, 'value': 500.0}}
+        
+        summary = TilePyramidBuilder(store=built_store, min_zoom=8, max_zoom=10).apply_updates(
+            'pm25', reading, now=HOUR
+        )
+        
+        assert summary['stale'] == ['delhi'] and summary['updated'] == []
+        np.testing.assert_array_equal(built_store.get('pm25', '2024011510', 10, x_min, y_min), before)
+    
+    def test_readings_outside_regions_ignored(self, built_store):
+        """Readings outside every pyramid region touch nothing"""
+        reading = {'MH001': {'lat': 19.07, 'lon': 72.87, 'value': 90.0}}
+        
+        summary = TilePyramidBuilder(store=built_store).apply_updates('pm25', reading, now=HOUR)
+        
+        assert summary['updated'] == [] and summary['stale'] == []
+        assert summary['tiles_written'] == 0
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,113 @@
+"""
+Tests for watermark-based incremental ingestion and observation dedup.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.data.ingestion_clients import DataPoint
+from src.data.watermarks import DedupFilter, WatermarkStore
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+def _point(station_id: str, minutes_ago: int = 0, parameter: str = "pm25") -> DataPoint:
+    return DataPoint(
+        timestamp=NOW - timedelta(minutes=minutes_ago),
+        location=(28.6139, 77.2090),
+        parameter=parameter,
+        value=42.0,
+        unit="µg/m³",
+        source="cpcb",
+        station_id=station_id
+    )
+
+
+class TestWatermarkStore:
+    """Test cases for per-station high-watermarks."""
+
+    def test_advance_keeps_newest_per_station(self):
+        store = WatermarkStore(use_redis=False)
+
+        store.advance("cpcb", [_point("DL001", 30), _point("DL001", 0), _point("DL002", 45)])
+
+        assert store.get_many("cpcb", ["DL001", "DL002", "DL003"]) == {
+            "DL001": NOW,
+            "DL002": NOW - timedelta(minutes=45),
+            "DL003": None
+        }
+
+    def test_watermarks_never_move_back(self):
+        """A late, older batch does not lower a station's watermark."""
+        store = WatermarkStore(use_redis=False)
+
+        store.advance("cpcb", [_point("DL001", 0)])
+        store.advance("cpcb", [_point("DL001", 60)])
+
+        assert store.get_many("cpcb", ["DL001"])["DL001"] == NOW
+
+    def test_sources_are_kept_apart(self):
+        store = WatermarkStore(use_redis=False)
+        store.advance("cpcb", [_point("DL001")])
+
+        assert store.get_many("openaq", ["DL001"]) == {"DL001": None}
+
+    def test_due_stations_skips_recently_updated(self):
+        """Stations are only due once their update interval has passed."""
+        store = WatermarkStore(use_redis=False)
+        store.advance("cpcb", [_point("DL001", 10), _point("DL002", 90)])
+
+        due = store.due_stations("cpcb", ["DL001", "DL002", "DL003"],
+                                 interval=timedelta(hours=1), now=NOW)
+
+        assert due == ["DL002", "DL003"]
+
+    def test_aware_and_naive_timestamps_agree(self):
+        """Naive timestamps are UTC, so an aware evaluation time compares correctly."""
+        store = WatermarkStore(use_redis=False)
+        store.advance("cpcb", [_point("DL001", 90)])
+        now = NOW.replace(tzinfo=timezone.utc)
+
+        assert store.due_stations("cpcb", ["DL001"], interval=timedelta(hours=1), now=now) == ["DL001"]
+        assert store.due_stations("cpcb", ["DL001"], interval=timedelta(hours=2), now=now) == []
+
+
+class TestDedupFilter:
+    """Test cases for the in-memory (time, station_id, parameter) dedup set."""
+
+    def test_repeats_within_a_batch_are_dropped(self):
+        dedup = DedupFilter()
+
+        unique = dedup.filter([_point("DL001"), _point("DL001"), _point("DL001", parameter="pm10")])
+
+        assert [p.parameter for p in unique] == ["pm25", "pm10"]
+        assert dedup.dropped == 1
+
+    def test_only_stored_points_are_remembered(self):
+        """Filtering alone records nothing, so a failed store is retried next run."""
+        dedup = DedupFilter()
+        batch = [_point("DL001"), _point("DL002")]
+
+        assert len(dedup.filter(batch)) == 2
+        assert len(dedup.filter(batch)) == 2
+
+        dedup.add(batch)
+
+        assert dedup.filter(batch + [_point("DL003")]) == [_point("DL003")]
+
+    def test_late_parameter_of_stored_hour_is_kept(self):
+        """A parameter arriving after another parameter of the same station and hour is not a repeat."""
+        dedup = DedupFilter()
+        dedup.add([_point("DL001", parameter="pm25")])
+
+        late = dedup.filter([_point("DL001", parameter="no2"), _point("DL001", 30, parameter="pm10")])
+
+        assert [p.parameter for p in late] == ["no2", "pm10"]
+
+    def test_oldest_keys_are_evicted(self):
+        dedup = DedupFilter(max_keys=2)
+
+        dedup.add([_point("DL001"), _point("DL002"), _point("DL003")])
+
+        assert len(dedup) == 2
+        assert [p.station_id for p in dedup.filter([_point("DL001"), _point("DL003")])] == ["DL001"]